@@ -0,0 +1,8 @@
+# Creates Maya Pipeline assets from a JSON or CSV spec without prompts, in parallel mayapy workers, e.g.:
+# mayapy create_assets.py C:/Temp/props.csv C:/Projects/MyGame/scenes --workers 4
+import sys
+
+import maya_pipeline as mp
+
+if __name__ == "__main__":
+    sys.exit(mp.main_app.bulk_create.main())
@@ -0,0 +1,10 @@
+# Exports Maya Pipeline assets on several machines through a shared job folder, e.g.:
+# mayapy distributed_export.py submit //server/exports/2024-06-01 C:/MyGame/scenes C:/MyGameUnity/Assets
+# mayapy distributed_export.py work //server/exports/2024-06-01 --workers 4   (on each machine)
+# mayapy distributed_export.py wait //server/exports/2024-06-01
+import sys
+
+import maya_pipeline as mp
+
+if __name__ == "__main__":
+    sys.exit(mp.exporter.distributed_export.main())
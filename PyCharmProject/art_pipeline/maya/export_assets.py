@@ -0,0 +1,8 @@
+# Exports Maya Pipeline assets in parallel mayapy workers, longest exports first, e.g.:
+# mayapy export_assets.py C:/Projects/MyGame/scenes C:/Projects/MyGameUnity/Assets --workers 4
+import sys
+
+import maya_pipeline as mp
+
+if __name__ == "__main__":
+    sys.exit(mp.exporter.batch_export.main())
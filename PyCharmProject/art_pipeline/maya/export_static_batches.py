@@ -0,0 +1,10 @@
+# Merges the static meshes in a folder that share materials into one FBX per chunk plus a JSON manifest, e.g.:
+# mayapy export_static_batches.py C:/MyGame/scenes/Kits/Dungeon C:/MyGame/scenes C:/MyGameUnity/Assets
+import sys
+
+import maya_pipeline as mp
+
+if __name__ == "__main__":
+    # Runs in this process, so Maya has to be started first
+    mp.initialize_maya_worker()
+    sys.exit(mp.exporter.static_batch_export.main())
@@ -0,0 +1,8 @@
+# Reports what exported FBXs contain (objects, user properties, animation keys, array sizes) without Maya, e.g.:
+# python inspect_fbxs.py C:/Projects/MyGameUnity/Assets/Characters --json
+import sys
+
+import maya_pipeline as mp
+
+if __name__ == "__main__":
+    sys.exit(mp.exporter.fbx_inspection.main())
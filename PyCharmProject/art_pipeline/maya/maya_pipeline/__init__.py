@@ -1,57 +1,190 @@
 print("\nInitializing maya_pipeline package...")
 from . import misc
-from .misc.maya_utilities import (AttributeType, get_current_scene_path, get_maya_project_scenes_path,
-                                  get_current_scene_name_without_ext, get_maya_project_path,
-                                  get_path_relative_to_maya_project, get_path_relative_to_maya_project_scenes,
-                                  get_top_level_node, get_nodes_in_namespace)
+from .misc.maya_session import (MAYA_AVAILABLE, maya_is_running, get_mayapy_path)
+from .misc.process_pool import (create_process_pool, default_worker_count)
+from .misc.maya_worker import (MAYA_PLUGINS, initialize_maya_worker)
+from .misc.pipeline_paths import (PIPELINE_CACHE_DIR_NAME, get_pipeline_cache_path, iter_asset_files)
 from . import mp_logging
 from .mp_logging.logging import (FORCE_PRINT_TO_SCRIPT_EDITOR, LogMode, MAX_FILE_COUNT, WRITE_IMMEDIATELY,
                                  create_log, debug_error, debug_log, debug_warning, prune_logs, logging_script_directory)
+from .misc.profiling import (PROFILE_ENV_VAR, PROFILES_DIR_NAME, DEFAULT_PROFILE_SAMPLE_RATE,
+                             MIN_PROFILE_INTERVAL_SECONDS, PROFILE_SUMMARY_LINE_COUNT, MAX_PROFILE_COUNT,
+                             get_profile_sample_rate, get_profiles_path, profile_operation, profiled)
 
 from .misc.ui_creation_mode import (UI_Creation_Mode)
-from .main_app.main_model import (AssetType,AssetTypeSuffix,ASSET_EXT,ASSET_EXT_TYPE,
-                                  ASSET_NODE_NAME,ASSET_TYPE_ATTR_NAME, IMPORTED_NODES_NAMESPACE, STATIC_ATTR_NAME,
-                                  LOOP_ATTR_NAME,ANIMATIONS_DIR_NAME,Response,Operation, AssetsToImportOrRef,
-                                  MainModel,get_asset_type_from_node)
-from .main_app.main_view_ui import (Ui_MainWindow)
-from .main_app.main_view import (MainView)
-from .main_app.main_controller import (MainController)
-from .misc.dockable_main_window import (DockableMainWindow, create_dockable_main_win, create_workspace_control,
-                                        create_workspace_control_with_dockable_main_win, delete_workspace_control,
-                                        delete_workspace_control_widgets, get_dockable_main_win_child,
-                                        get_dockable_win_name, get_workspace_control_name, restore_workspace_control,
-                                        workspace_control_exists)
-from .misc.pyside_utilities import (scale_qobjects, print_qobject_tree)
-from . import settings
-from .settings.settings import(Settings)
-from .settings.settings_model import (settings_script_directory, settings_dir, SETTINGS_FILENAME, settings_filepath,
-                                      SettingsKeys, settings_defaults, SettingsModel, unity_project_asset_path,
-                                      create_settings_file, load_settings_file, save_settings_to_file, read_setting)
-from .settings.settings_controller import(SettingsController)
-from .settings.settings_view import (SettingsView)
-from .settings.settings_view_ui import (Ui_SettingsDialog)
 from . import main_app
-from .main_app.main_app import (MayaPipeline, open_mp, on_close, cleanup)
+from .main_app.asset_definitions import (AssetType, AssetTypeSuffix, ASSET_EXT, ASSET_EXT_TYPE, ASSET_NODE_NAME,
+                                         ASSET_TYPE_ATTR_NAME, IMPORTED_NODES_NAMESPACE, STATIC_ATTR_NAME,
+                                         LOOP_ATTR_NAME, SAMPLE_RATE_ATTR_NAME, KEEP_JOINTS_ATTR_NAME,
+                                         LOD_COUNT_ATTR_NAME, ANIMATIONS_DIR_NAME,
+                                         get_asset_type_from_filename, get_asset_name_from_filename,
+                                         get_new_asset_path)
+from .main_app.asset_spec import (ASSET_DEPENDENCY_TYPES, AssetSpec, load_asset_specs)
+from .main_app.bulk_create import (AssetCreationResult, plan_creation_waves, create_assets)
+from .main_app.asset_index import (SHARED_INDEX_MAX_AGE_SECONDS, AssetIndexEntry, AssetIndex, get_shared_asset_index)
+from . import validation
+from .validation.ma_parser import (MayaAsciiNode, MayaAsciiReference, MayaAsciiScene, parse_maya_ascii,
+                                   parse_maya_ascii_file, hash_file_bytes)
+from .validation.validation_rules import (ValidationSeverity, ValidationIssue, ValidationContext, RULES_VERSION,
+                                          validation_rule, get_validation_rules, get_scene_asset_type)
+from .validation.validation_engine import (VALIDATION_CACHE_FILENAME, FileValidationResult, ValidationReport,
+                                           validate_file, validate_project)
 from . import exporter
-from .exporter.export import (ConstraintType, FBX_PRESETS_DIR_NAME, export_asset)
+from .exporter.publishing import (PUBLISH_STAGING_ENV_VAR, PUBLISH_STAGING_DIR_NAME, PublishBatch,
+                                  get_publish_staging_root, get_pending_path, write_file_atomically, publish_bytes)
+from .exporter.export_history import (EXPORT_HISTORY_FILENAME, HISTORY_SAMPLE_SIZE, ExportOutcome, ExportRecord,
+                                      ExportHistory, get_export_history_path)
+from .exporter.export_journal import (EXPORT_JOURNAL_FILENAME, DEFAULT_MAX_EXPORT_ATTEMPTS, ExportJournal,
+                                      get_export_journal_path)
+from .exporter.batch_export import (EXPORTABLE_ASSET_TYPES, DEFAULT_REGRESSION_THRESHOLD, BatchExportJob,
+                                    ExportRegression, BatchExportResult, get_exportable_assets, create_batch_jobs,
+                                    plan_longest_first, find_regressions, export_batch, run_export_job)
+from .exporter.bake_cache import (BAKE_CACHE_DIR_NAME, BAKE_CACHE_VERSION, DEFAULT_BAKE_CACHE_BUDGET_BYTES,
+                                  BakedAnimation, BakeCache, hash_maya_ascii_content, get_bake_cache_key,
+                                  get_bake_cache_path)
+from .exporter.artifact_cache import (ARTIFACT_CACHE_DIR_NAME, ARTIFACT_CACHE_ENV_VAR, EXPORTER_VERSION,
+                                      DEFAULT_ARTIFACT_CACHE_BUDGET_BYTES, ArtifactCacheStats, ArtifactCache,
+                                      get_dependency_paths, get_artifact_cache_key, get_artifact_cache_path)
+from .exporter.resample import (ROTATE_ORDERS, ROTATE_CHANNELS, euler_to_quaternions, quaternions_to_euler, slerp,
+                                get_resample_frames, resample_baked_animation)
+from .exporter.skin_weights import (DEFAULT_MAX_INFLUENCES, DEFAULT_WEIGHT_THRESHOLD, InfluenceStats,
+                                    get_influence_stats, prune_skin_weights)
+from .exporter.mesh_optimization import (DEFAULT_WELD_TOLERANCE, DEFAULT_VERTEX_CACHE_SIZE, MeshStats, get_mesh_stats,
+                                         get_total_mesh_stats, weld_vertices, get_degenerate_triangles,
+                                         get_morton_codes, get_cache_friendly_triangle_order,
+                                         get_first_use_vertex_order, get_acmr)
+from .exporter.decimation import (DEFAULT_LOD_REDUCTION, BOUNDARY_WEIGHT, get_lod_triangle_counts, decimate)
+from .exporter.static_batching import (STATIC_BATCH_MANIFEST_VERSION, STATIC_BATCH_MANIFEST_SUFFIX,
+                                       DEFAULT_STATIC_BATCH_CHUNK_SIZE, DEFAULT_STATIC_BATCH_MAX_VERTICES,
+                                       StaticMeshPart, StaticBatchRange, StaticBatchChunk, StaticBatchManifest,
+                                       get_static_mesh_assets, get_static_batch_name, plan_static_batches,
+                                       merge_static_mesh_parts, create_static_batches)
+from .exporter.unity_meta import (UNITY_META_SUFFIX, MAYA_FBX_TAKE_NAME, USER_DATA_PREFIX, UnityAnimationType,
+                                  UnityMaterialImportMode, UnityClip, ModelImporterSettings,
+                                  get_model_importer_settings, get_unity_asset_path, get_meta_path, read_meta_guid,
+                                  read_meta_user_data, create_meta_guid, format_model_importer_meta,
+                                  write_model_importer_meta)
+from .exporter.fbx_normalization import (FBX_BINARY_MAGIC, FbxNode, parse_fbx, serialize_fbx, normalize_fbx,
+                                         write_fbx_if_changed)
+from .exporter.fbx_inspection import (FbxArray, FbxRecord, FbxFile, FbxInspection, read_fbx, inspect_fbx, verify_fbx)
+from .exporter.fbx_animation_writer import (NATIVE_ANIMATION_FBX_ENV_VAR, FBX_TIME_UNITS_PER_SECOND,
+                                            FBX_ANIMATION_CHANNELS, FbxJointDefinition, create_animation_fbx,
+                                            write_animation_fbx, read_animation_fbx)
+from .exporter.distributed_export import (DEFAULT_LEASE_SECONDS, DEFAULT_HEARTBEAT_INTERVAL,
+                                          DEFAULT_MAX_JOB_ATTEMPTS, DistributedExportStatus, DistributedExportWorker,
+                                          submit_distributed_export, get_distributed_export_status,
+                                          collect_distributed_results)
+from .exporter.watch_export import (DEFAULT_WATCH_DEBOUNCE_SECONDS, DEFAULT_WATCH_POLL_INTERVAL,
+                                    PollingSceneWatcher, InotifySceneWatcher, SceneDependencyGraph, WatchExporter,
+                                    create_scene_watcher, read_scene_references, get_watched_asset_type)
+from .exporter.joint_pruning import (DEFAULT_ANIMATION_TOLERANCE, parse_keep_joints, is_kept_joint,
+                                     get_animated_joints, get_needed_joints, get_topmost_joints)
 
-__all__ = list(
-    set(exporter.export.__all__) |
-    set(mp_logging.logging.__all__) |
-    set(main_app.main_app.__all__) |
-    set(main_app.main_controller.__all__) |
-    set(main_app.main_model.__all__) |
-    set(main_app.main_view.__all__) |
-    set(main_app.main_view_ui.__all__) |
-    set(misc.dockable_main_window.__all__) |
-    set(misc.maya_utilities.__all__) |
-    set(misc.pyside_utilities.__all__) |
-    set(misc.ui_creation_mode.__all__) |
-    set(settings.settings.__all__) |
-    set(settings.settings_controller.__all__) |
-    set(settings.settings_model.__all__) |
-    set(settings.settings_view.__all__) |
-    set(settings.settings_view_ui.__all__)
-)
+_all_modules = [
+    exporter.artifact_cache,
+    exporter.bake_cache,
+    exporter.batch_export,
+    exporter.decimation,
+    exporter.distributed_export,
+    exporter.export_history,
+    exporter.export_journal,
+    exporter.fbx_animation_writer,
+    exporter.fbx_inspection,
+    exporter.fbx_normalization,
+    exporter.joint_pruning,
+    exporter.mesh_optimization,
+    exporter.publishing,
+    exporter.resample,
+    exporter.skin_weights,
+    exporter.static_batching,
+    exporter.unity_meta,
+    exporter.watch_export,
+    misc.maya_session,
+    misc.maya_worker,
+    misc.pipeline_paths,
+    misc.process_pool,
+    misc.profiling,
+    misc.ui_creation_mode,
+    mp_logging.logging,
+    main_app.asset_definitions,
+    main_app.asset_index,
+    main_app.asset_spec,
+    main_app.bulk_create,
+    validation.ma_parser,
+    validation.validation_rules,
+    validation.validation_engine,
+]
 
-print("Finished initializing maya_pipeline package.\n")
\ No newline at end of file
+# Modules that need Maya and PySide2 are only loaded inside a running Maya session (the GUI or maya.standalone),
+# so worker processes can import maya_pipeline from plain Python or an uninitialized mayapy.
+if MAYA_AVAILABLE:
+    from .misc.maya_utilities import (AttributeType, get_current_scene_path, get_maya_project_scenes_path,
+                                      get_current_scene_name_without_ext, get_maya_project_path,
+                                      get_path_relative_to_maya_project, get_path_relative_to_maya_project_scenes,
+                                      get_top_level_node, get_nodes_in_namespace)
+    from .main_app.asset_quick_pick import (AssetQuickPickDialog, pick_asset)
+    from .main_app.asset_folder_model import (AssetFolderNode, AssetFolderTreeModel, list_asset_parent_folders)
+    from .main_app.main_model import (Response, Operation, AssetsToImportOrRef, MainModel, get_asset_type_from_node)
+    from .main_app.main_view_ui import (Ui_MainWindow)
+    from .main_app.main_view import (MainView)
+    from .main_app.main_controller import (MainController)
+    from .misc.dockable_main_window import (DockableMainWindow, create_dockable_main_win, create_workspace_control,
+                                            create_workspace_control_with_dockable_main_win, delete_workspace_control,
+                                            delete_workspace_control_widgets, get_dockable_main_win_child,
+                                            get_dockable_win_name, get_workspace_control_name,
+                                            restore_workspace_control, workspace_control_exists)
+    from .misc.pyside_utilities import (scale_qobjects, print_qobject_tree)
+    from .misc.reference_loading import (ReferenceLoadPolicy, should_load_reference, get_reference_load_policy,
+                                         install_reference_load_policy, uninstall_reference_load_policy,
+                                         apply_reference_load_policy, load_references_for_export)
+    from .misc.callback_registry import (ScriptJobRecord, register_script_job, kill_script_jobs, live_callback_count,
+                                         get_script_job_records)
+    from . import settings
+    from .settings.settings import(Settings)
+    from .settings.settings_model import (settings_script_directory, settings_dir, SETTINGS_FILENAME,
+                                          settings_filepath, SettingsKeys, settings_defaults, SettingsModel,
+                                          unity_project_asset_path, create_settings_file, load_settings_file,
+                                          save_settings_to_file, read_setting)
+    from .settings.settings_controller import(SettingsController)
+    from .settings.settings_view import (SettingsView)
+    from .settings.settings_view_ui import (Ui_SettingsDialog)
+    from .main_app.main_app import (MayaPipeline, open_mp, on_close, cleanup)
+    from .exporter.fast_bake import (BAKED_CHANNELS, VERIFY_BAKE_ENV_VAR, BAKE_TOLERANCE, bake_joints_isolated,
+                                     sample_joint_channels, compare_joint_samples, get_joint_names,
+                                     get_driven_joints, read_baked_animation, apply_baked_animation)
+    from .exporter.skin_export import (get_skin_clusters, get_weighted_joints, read_skin_weights,
+                                       write_skin_weights, prune_skin_clusters)
+    from .exporter.mesh_export import (LOD_SUFFIX, get_export_meshes, strip_empty_uv_and_color_sets, optimize_mesh,
+                                       optimize_meshes, create_lod, create_lods, get_static_mesh_parts)
+    from .exporter.export import (ConstraintType, FBX_PRESETS_DIR_NAME, export_asset, export_asset_and_measure,
+                                  fetch_cached_export)
+    from .exporter.static_batch_export import (export_static_batches)
+
+    _all_modules += [
+        exporter.export,
+        exporter.fast_bake,
+        exporter.mesh_export,
+        exporter.skin_export,
+        exporter.static_batch_export,
+        main_app.asset_folder_model,
+        main_app.asset_quick_pick,
+        main_app.main_app,
+        main_app.main_controller,
+        main_app.main_model,
+        main_app.main_view,
+        main_app.main_view_ui,
+        misc.callback_registry,
+        misc.dockable_main_window,
+        misc.maya_utilities,
+        misc.pyside_utilities,
+        misc.reference_loading,
+        settings.settings,
+        settings.settings_controller,
+        settings.settings_model,
+        settings.settings_view,
+        settings.settings_view_ui,
+    ]
+
+__all__ = list(set().union(*[module.__all__ for module in _all_modules]))
+
+print("Finished initializing maya_pipeline package.\n")
@@ -0,0 +1,246 @@
+# Python
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+
+from maya_pipeline.exporter.bake_cache import hash_maya_ascii_content
+from maya_pipeline.exporter.publishing import get_pending_path, publish_bytes
+from maya_pipeline.misc.pipeline_paths import get_pipeline_cache_path
+from maya_pipeline.validation.ma_parser import parse_maya_ascii_file
+
+__all__ = ["ARTIFACT_CACHE_DIR_NAME", "ARTIFACT_CACHE_ENV_VAR", "EXPORTER_VERSION",
+           "DEFAULT_ARTIFACT_CACHE_BUDGET_BYTES", "ArtifactCacheStats", "ArtifactCache", "get_dependency_paths",
+           "get_artifact_cache_key", "get_artifact_cache_path"]
+
+ARTIFACT_CACHE_DIR_NAME = "artifact_cache"
+# Set to a folder on a shared drive to share exports between machines, otherwise the cache is per project
+ARTIFACT_CACHE_ENV_VAR = "MAYA_PIPELINE_ARTIFACT_CACHE"
+# Bump when the exporter's output changes so old cached FBXs are never used
+EXPORTER_VERSION = 1
+DEFAULT_ARTIFACT_CACHE_BUDGET_BYTES = 10 * 1024 ** 3
+_ENTRY_FILENAME = "entry.json"
+# One byte per lookup, appended, so worker processes on any machine can count without a lock
+_LOOKUPS_FILENAME = "lookups.log"
+_HIT, _MISS = b"+", b"-"
+# Content hashes by path, reused while the file's size and mtime stay the same (e.g. a rig shared by many clips)
+_content_hashes: dict[Path, tuple[int, int, str]] = {}
+
+
+class ArtifactCacheStats:
+    def __init__(self, hits: int, misses: int):
+        self.hits = hits
+        self.misses = misses
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def to_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
+
+    def __repr__(self):
+        return f"ArtifactCacheStats({self.hits} hits, {self.misses} misses, {self.hit_rate:.0%})"
+
+
+class ArtifactCache:
+    """
+    Finished export files (FBXs and whatever goes with them), keyed on everything the export depends on (see
+    get_artifact_cache_key), so an asset exported once by anyone sharing the cache is never exported again.
+    The least recently used entries are deleted to stay under the disk budget.
+    """
+    def __init__(self, cache_path: Path, budget_bytes: int = DEFAULT_ARTIFACT_CACHE_BUDGET_BYTES):
+        self.cache_path = Path(cache_path)
+        self.budget_bytes = budget_bytes
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+
+    def fetch(self, key: str, destination_folder_path: Path) -> dict:
+        """
+        Copies the entry's files into the folder. Files that already have the same content aren't re-written, so
+        Unity doesn't re-import them.
+        :return: The metadata the entry was put with, None if there isn't an entry for the key
+        """
+        entry_path = self.cache_path / key
+        try:
+            with open(entry_path / _ENTRY_FILENAME, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+            destination_folder_path.mkdir(parents=True, exist_ok=True)
+            for filename in entry["files"]:
+                _copy_file_if_changed(entry_path / filename, destination_folder_path / filename)
+        except (OSError, ValueError, KeyError):
+            self._record_lookup(_MISS)
+            return None
+
+        # The entry's mtime is its last use, which eviction goes by
+        os.utime(entry_path)
+        self._record_lookup(_HIT)
+        return entry["metadata"]
+
+    def put(self, key: str, paths: list[Path], metadata: dict = None):
+        """
+        :param paths: Files to cache, fetched back under the same names
+        :param metadata: Anything JSON serializable that's needed to use the files, e.g. importer settings
+        """
+        entry_path = self.cache_path / key
+        if entry_path.is_dir():
+            return
+
+        # Written to a temporary folder and renamed into place, so other processes never see half an entry
+        temp_path = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self.cache_path))
+        try:
+            for path in paths:
+                shutil.copyfile(path, temp_path / Path(path).name)
+            entry = {"version": EXPORTER_VERSION, "files": [Path(path).name for path in paths],
+                     "metadata": metadata or {}}
+            with open(temp_path / _ENTRY_FILENAME, "w", encoding="utf-8") as file:
+                json.dump(entry, file)
+            os.replace(temp_path, entry_path)
+        except OSError:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            if not entry_path.is_dir():
+                raise  # Otherwise another process cached the same export first
+
+        self.evict()
+
+    def evict(self) -> list[str]:
+        """
+        Deletes the least recently used entries until the cache is under its disk budget.
+        :return: Keys of the deleted entries
+        """
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_path):
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            size = sum(file.stat().st_size for file in os.scandir(entry.path) if file.is_file())
+            entries.append((entry.stat().st_mtime, entry.name, size))
+            total_size += size
+
+        evicted = []
+        for _, key, size in sorted(entries):
+            if total_size <= self.budget_bytes:
+                break
+            shutil.rmtree(self.cache_path / key, ignore_errors=True)
+            total_size -= size
+            evicted.append(key)
+        return evicted
+
+    @property
+    def size(self) -> int:
+        return sum(file.stat().st_size for entry in os.scandir(self.cache_path) if entry.is_dir()
+                   for file in os.scandir(entry.path) if file.is_file())
+
+    @property
+    def stats(self) -> ArtifactCacheStats:
+        """
+        Hits and misses of every fetch from this cache folder, by any process
+        """
+        try:
+            lookups = (self.cache_path / _LOOKUPS_FILENAME).read_bytes()
+        except OSError:
+            lookups = b""
+        return ArtifactCacheStats(lookups.count(_HIT), lookups.count(_MISS))
+
+    def reset_stats(self):
+        (self.cache_path / _LOOKUPS_FILENAME).unlink(missing_ok=True)
+
+    def _record_lookup(self, lookup: bytes):
+        try:
+            with open(self.cache_path / _LOOKUPS_FILENAME, "ab") as file:
+                file.write(lookup)
+        except OSError:
+            pass  # Only the statistics are off
+
+
+def get_dependency_paths(asset_path: Path, maya_project_path: Path) -> list[Path]:
+    """
+    Every file the asset references, directly or through other references, read from the files without opening
+    them in Maya. References are resolved like Maya does, relative to the Maya project.
+    :return: The referenced files in the order they were found, including ones that don't exist
+    """
+    dependency_paths = []
+    seen = {Path(asset_path).resolve()}
+    to_parse = [Path(asset_path)]
+
+    while to_parse:
+        path = to_parse.pop(0)
+        try:
+            references = parse_maya_ascii_file(path).references
+        except OSError:
+            continue
+
+        for reference in references:
+            reference_path = Path(reference.path)
+            if not reference_path.is_absolute():
+                reference_path = Path(maya_project_path) / reference_path
+            if reference_path.resolve() in seen:
+                continue
+            seen.add(reference_path.resolve())
+            dependency_paths.append(reference_path)
+            if reference_path.suffix == ".ma":
+                to_parse.append(reference_path)
+    return dependency_paths
+
+
+def get_artifact_cache_key(asset_path: Path, maya_project_path: Path, preset_path: Path,
+                           settings: dict = None) -> str:
+    """
+    The asset's file name is part of the key, the FBX and its clips are named after it, so identical scenes of
+    different assets don't share an entry.
+    :param preset_path: The FBX export preset the asset is exported with
+    :param settings: Anything else the export depends on (e.g. the Maya and FBX plugin versions), JSON serializable
+    """
+    parts = [f"exporter:{EXPORTER_VERSION}", f"name:{Path(asset_path).name}",
+             f"asset:{_hash_content(Path(asset_path))}", f"preset:{_hash_content(Path(preset_path))}",
+             f"settings:{json.dumps(settings or {}, sort_keys=True)}"]
+    for dependency_path in get_dependency_paths(asset_path, maya_project_path):
+        # A missing reference still changes the key, it exports differently from one that's there
+        parts.append(f"dependency:{dependency_path.name}:{_hash_content(dependency_path)}")
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def get_artifact_cache_path(maya_project_path: Path) -> Path:
+    shared_path = os.environ.get(ARTIFACT_CACHE_ENV_VAR)
+    if shared_path:
+        return Path(shared_path)
+    return get_pipeline_cache_path(maya_project_path) / ARTIFACT_CACHE_DIR_NAME
+
+
+def _hash_content(path: Path) -> str:
+    """
+    :return: The .ma content hash (see hash_maya_ascii_content) or the hash of any other file's bytes,
+             "missing" if the file doesn't exist
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return "missing"
+
+    cached = _content_hashes.get(path)
+    if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[2]
+
+    if path.suffix == ".ma":
+        content_hash = hash_maya_ascii_content(path)
+    else:
+        with open(path, "rb") as file:
+            content_hash = hashlib.sha1(file.read()).hexdigest()
+    _content_hashes[path] = (stat.st_size, stat.st_mtime_ns, content_hash)
+    return content_hash
+
+
+def _copy_file_if_changed(source_path: Path, destination_path: Path):
+    data = source_path.read_bytes()
+    try:
+        current_path = get_pending_path(destination_path)
+        unchanged = current_path.stat().st_size == len(data) and current_path.read_bytes() == data
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        publish_bytes(data, destination_path)
@@ -0,0 +1,151 @@
+# Python
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+
+import numpy as np
+
+from maya_pipeline.misc.pipeline_paths import get_pipeline_cache_path
+
+__all__ = ["BAKE_CACHE_DIR_NAME", "BAKE_CACHE_VERSION", "DEFAULT_BAKE_CACHE_BUDGET_BYTES", "BakedAnimation",
+           "BakeCache", "hash_maya_ascii_content", "get_bake_cache_key", "get_bake_cache_path"]
+
+BAKE_CACHE_DIR_NAME = "bake_cache"
+# Bump when the baking changes so old cache entries are never used
+BAKE_CACHE_VERSION = 1
+DEFAULT_BAKE_CACHE_BUDGET_BYTES = 2 * 1024 ** 3
+_CHANNELS_FILENAME = "channels.npy"
+_META_FILENAME = "meta.json"
+# Lines Maya rewrites on every save even when nothing in the scene changed
+_VOLATILE_LINE_PREFIXES = (b"//", b"fileInfo")
+
+
+class BakedAnimation:
+    def __init__(self, joint_names: list[str], channel_names: list[str], start_frame: int, values: np.ndarray):
+        """
+        :param joint_names: Joint paths relative to the skeleton node
+        :param values: float32 array of shape (frame count, joint count, channel count)
+        """
+        self.joint_names = joint_names
+        self.channel_names = channel_names
+        self.start_frame = start_frame
+        self.values = values
+
+    @property
+    def frame_count(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def end_frame(self) -> int:
+        return self.start_frame + self.frame_count - 1
+
+    def get_channel(self, joint_index: int, channel_index: int) -> np.ndarray:
+        return self.values[:, joint_index, channel_index]
+
+    def get_joints(self, joint_names: list[str]) -> "BakedAnimation":
+        """
+        :return: The animation of only these joints, in this order
+        """
+        indices = [self.joint_names.index(joint_name) for joint_name in joint_names]
+        return BakedAnimation(list(joint_names), self.channel_names, self.start_frame, self.values[:, indices, :])
+
+
+class BakeCache:
+    """
+    Baked joint channels stored as float32 .npy files, keyed on the clip and rig they were baked from.
+    Entries are memory-mapped when read, and the least recently used ones are deleted to stay under the disk budget.
+    """
+    def __init__(self, cache_path: Path, budget_bytes: int = DEFAULT_BAKE_CACHE_BUDGET_BYTES):
+        self.cache_path = Path(cache_path)
+        self.budget_bytes = budget_bytes
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> BakedAnimation:
+        """
+        :return: The cached animation, None if there isn't one for the key
+        """
+        entry_path = self.cache_path / key
+        try:
+            with open(entry_path / _META_FILENAME, "r", encoding="utf-8") as file:
+                meta = json.load(file)
+            values = np.load(entry_path / _CHANNELS_FILENAME, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+        # The entry's mtime is its last use, which eviction goes by
+        os.utime(entry_path)
+        return BakedAnimation(meta["joint_names"], meta["channel_names"], meta["start_frame"], values)
+
+    def put(self, key: str, baked_animation: BakedAnimation):
+        entry_path = self.cache_path / key
+        if entry_path.is_dir():
+            return
+
+        # Written to a temporary folder and renamed into place, so other processes never see half an entry
+        temp_path = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self.cache_path))
+        try:
+            np.save(temp_path / _CHANNELS_FILENAME, np.ascontiguousarray(baked_animation.values, dtype=np.float32))
+            meta = {"version": BAKE_CACHE_VERSION, "joint_names": baked_animation.joint_names,
+                    "channel_names": baked_animation.channel_names, "start_frame": baked_animation.start_frame}
+            with open(temp_path / _META_FILENAME, "w", encoding="utf-8") as file:
+                json.dump(meta, file)
+            os.replace(temp_path, entry_path)
+        except OSError:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            if not entry_path.is_dir():
+                raise  # Otherwise another process cached the same animation first
+
+        self.evict()
+
+    def evict(self) -> list[str]:
+        """
+        Deletes the least recently used entries until the cache is under its disk budget.
+        :return: Keys of the deleted entries
+        """
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_path):
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            size = sum(file.stat().st_size for file in os.scandir(entry.path) if file.is_file())
+            entries.append((entry.stat().st_mtime, entry.name, size))
+            total_size += size
+
+        evicted = []
+        for _, key, size in sorted(entries):
+            if total_size <= self.budget_bytes:
+                break
+            shutil.rmtree(self.cache_path / key, ignore_errors=True)
+            total_size -= size
+            evicted.append(key)
+        return evicted
+
+    @property
+    def size(self) -> int:
+        return sum(file.stat().st_size for entry in os.scandir(self.cache_path) if entry.is_dir()
+                   for file in os.scandir(entry.path) if file.is_file())
+
+
+def hash_maya_ascii_content(path: Path) -> str:
+    """
+    Hashes a .ma file without the lines Maya changes on every save (e.g. the last modified date),
+    so saving an unchanged scene doesn't change its hash.
+    """
+    content_hash = hashlib.sha1()
+    with open(path, "rb") as file:
+        for line in file:
+            if not line.startswith(_VOLATILE_LINE_PREFIXES):
+                content_hash.update(line)
+    return content_hash.hexdigest()
+
+
+def get_bake_cache_key(clip_path: Path, rig_path: Path) -> str:
+    key = f"{BAKE_CACHE_VERSION}:{hash_maya_ascii_content(clip_path)}:{hash_maya_ascii_content(rig_path)}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def get_bake_cache_path(maya_project_path: Path) -> Path:
+    return get_pipeline_cache_path(maya_project_path) / BAKE_CACHE_DIR_NAME
@@ -0,0 +1,386 @@
+# Python
+import argparse
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+import contextlib
+import heapq
+import os
+import time
+from pathlib import Path
+
+import maya_pipeline as mp
+from maya_pipeline.exporter.artifact_cache import ArtifactCache, get_artifact_cache_path
+from maya_pipeline.exporter.export_history import (ExportHistory, ExportOutcome, ExportRecord,
+                                                   get_export_history_path)
+from maya_pipeline.exporter.export_journal import DEFAULT_MAX_EXPORT_ATTEMPTS, ExportJournal, get_export_journal_path
+from maya_pipeline.exporter.publishing import PublishBatch
+from maya_pipeline.main_app.asset_definitions import (AssetType, ASSET_EXT, ASSET_NODE_NAME,
+                                                      get_asset_type_from_filename)
+from maya_pipeline.misc.maya_worker import initialize_maya_worker
+from maya_pipeline.misc.pipeline_paths import iter_asset_files
+from maya_pipeline.misc.process_pool import create_process_pool
+
+__all__ = ["EXPORTABLE_ASSET_TYPES", "DEFAULT_REGRESSION_THRESHOLD", "BatchExportJob", "ExportRegression",
+           "BatchExportResult", "get_exportable_assets", "create_batch_jobs", "plan_longest_first",
+           "find_regressions", "export_batch", "run_export_job"]
+
+EXPORTABLE_ASSET_TYPES = [AssetType.MESH, AssetType.SKINNED_MESH, AssetType.ANIMATION]
+# An export is flagged when it takes this many times longer than its expected duration...
+DEFAULT_REGRESSION_THRESHOLD = 1.5
+# ...and at least this many seconds longer, so small assets don't get flagged for noise
+MIN_REGRESSION_SECONDS = 2.0
+# Rough starting point for estimating assets until the history has its own numbers
+DEFAULT_SECONDS_PER_MEGABYTE = 2.0
+
+
+class BatchExportJob:
+    def __init__(self, path: Path, asset_path: str, expected_duration: float, estimated: bool):
+        """
+        :param path: Absolute path of the .ma file
+        :param asset_path: Path relative to the scenes folder (posix style)
+        :param expected_duration: Seconds the export is expected to take
+        :param estimated: True if the asset has no export history, so expected_duration comes from its file size
+        """
+        self.path = path
+        self.asset_path = asset_path
+        self.expected_duration = expected_duration
+        self.estimated = estimated
+
+    def __repr__(self):
+        return f"BatchExportJob({self.asset_path}, {self.expected_duration:.2f}s)"
+
+
+class ExportRegression:
+    def __init__(self, asset_path: str, expected_duration: float, duration: float):
+        self.asset_path = asset_path
+        self.expected_duration = expected_duration
+        self.duration = duration
+
+    @property
+    def ratio(self) -> float:
+        return self.duration / self.expected_duration
+
+    def __repr__(self):
+        return (f"{self.asset_path} took {self.duration:.1f}s, {self.ratio:.1f}x its usual "
+                f"{self.expected_duration:.1f}s")
+
+
+class BatchExportResult:
+    def __init__(self, records: list[ExportRecord], regressions: list[ExportRegression], duration: float,
+                 planned_duration: float, resumed: list[str] = None):
+        """
+        :param planned_duration: How long the schedule was expected to take
+        :param resumed: Assets that weren't exported again, because an interrupted run of the batch already had
+        """
+        self.records = records
+        self.regressions = regressions
+        self.duration = duration
+        self.planned_duration = planned_duration
+        self.resumed = resumed or []
+
+    @property
+    def failed(self) -> list[ExportRecord]:
+        return [record for record in self.records if record.outcome is ExportOutcome.FAILED]
+
+    @property
+    def cached(self) -> list[ExportRecord]:
+        return [record for record in self.records if record.outcome is ExportOutcome.CACHED]
+
+
+def get_exportable_assets(scenes_path: Path) -> list[Path]:
+    # Rigs and skeletons aren't exported on their own
+    return [path for path, _ in iter_asset_files(scenes_path, ASSET_EXT)
+            if get_asset_type_from_filename(path) in EXPORTABLE_ASSET_TYPES]
+
+
+def create_batch_jobs(paths: list[Path], scenes_path: Path, history: ExportHistory) -> list[BatchExportJob]:
+    expected_durations = history.get_expected_durations()
+    seconds_per_byte = history.get_seconds_per_byte() or DEFAULT_SECONDS_PER_MEGABYTE / (1024 * 1024)
+    jobs = []
+
+    for path in paths:
+        path = Path(path)
+        asset_path = path.relative_to(scenes_path).as_posix()
+        expected_duration = expected_durations.get(asset_path)
+
+        if expected_duration is not None:
+            jobs.append(BatchExportJob(path, asset_path, expected_duration, estimated=False))
+        else:
+            jobs.append(BatchExportJob(path, asset_path, os.path.getsize(path) * seconds_per_byte, estimated=True))
+    return jobs
+
+
+def plan_longest_first(jobs: list[BatchExportJob], worker_count: int) -> tuple[list[BatchExportJob], float]:
+    """
+    Orders jobs longest-processing-time first. Workers take the next job as soon as they're free,
+    so the long exports start early and the short ones fill in the gaps at the end of the run.
+    :return: The jobs in the order to submit them, and the expected duration of the whole batch
+    """
+    ordered_jobs = sorted(jobs, key=lambda job: job.expected_duration, reverse=True)
+
+    worker_loads = [0.0] * max(1, min(worker_count, len(jobs)))
+    for job in ordered_jobs:
+        heapq.heappush(worker_loads, heapq.heappop(worker_loads) + job.expected_duration)
+
+    return ordered_jobs, max(worker_loads)
+
+
+def find_regressions(records: list[ExportRecord], expected_durations: dict[str, float],
+                     threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> list[ExportRegression]:
+    """
+    :param expected_durations: Expected durations from before the records were added to the history
+    :return: Successful exports that took more than threshold times their expected duration
+    """
+    regressions = []
+    for record in records:
+        expected_duration = expected_durations.get(record.asset_path)
+        if record.outcome is not ExportOutcome.SUCCEEDED or expected_duration is None:
+            continue
+
+        if (record.duration > expected_duration * threshold
+                and record.duration - expected_duration >= MIN_REGRESSION_SECONDS):
+            regressions.append(ExportRegression(record.asset_path, expected_duration, record.duration))
+    return regressions
+
+
+def export_batch(paths: list[Path], scenes_path: Path, export_root_path: Path, max_workers: int = None,
+                 history_path: Path = None, regression_threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+                 publish_at_end: bool = True, journal_path: Path = None,
+                 max_attempts: int = DEFAULT_MAX_EXPORT_ATTEMPTS) -> BatchExportResult:
+    """
+    Exports assets in parallel mayapy workers, scheduled from the export history, and records every export in it.
+    :param paths: .ma files to export
+    :param scenes_path: The Maya project's scenes folder
+    :param export_root_path: Exports go to the same relative folder under this one (e.g. the Unity Assets folder)
+    :param history_path: Export history database. Defaults to the one in the project's cache folder.
+    :param publish_at_end: Stage the exported files and move them into place together when the batch ends (see
+                           PublishBatch), so Unity refreshes once. Otherwise each is published as it's exported.
+    :param journal_path: Where progress is journaled (see ExportJournal). If the last batch was interrupted, the
+                         assets it finished are skipped. Defaults to the one in the project's cache folder, which is
+                         deleted once a batch completes.
+    :param max_attempts: Exports that crash Maya this many times (in this run or interrupted ones) are quarantined
+                         and fail, instead of taking more workers down. After a crash, the exports that were running
+                         are re-run one at a time, and only an export that crashes on its own is charged an attempt.
+    """
+    start_time = time.perf_counter()
+    scenes_path = Path(scenes_path)
+    worker_count = max_workers or mp.default_worker_count()
+
+    if history_path is None:
+        history_path = get_export_history_path(scenes_path.parent)
+    if journal_path is None:
+        journal_path = get_export_journal_path(scenes_path.parent)
+
+    records = []
+    resumed = []
+    # Started before the pool, the workers inherit the staging folder from the environment. Files staged by an
+    # interrupted batch are still there, and published with this batch's.
+    publish_batch = PublishBatch(export_root_path) if publish_at_end else contextlib.nullcontext()
+    with ExportHistory(history_path) as history, ExportJournal(journal_path) as journal, publish_batch:
+        expected_durations = history.get_expected_durations()
+        jobs = []
+        for job in create_batch_jobs(paths, scenes_path, history):
+            if journal.is_finished(job.asset_path, job.path, _get_output_path(job, export_root_path)):
+                resumed.append(job.asset_path)
+            else:
+                jobs.append(job)
+        ordered_jobs, planned_duration = plan_longest_first(jobs, worker_count)
+        estimated_count = sum(1 for job in jobs if job.estimated)
+        if resumed:
+            mp.debug_log(f"Resuming an interrupted batch, {len(resumed)} assets were already exported.")
+        mp.debug_log(f"Exporting {len(jobs)} assets with {worker_count} workers, expected to take "
+                     f"{planned_duration:.0f}s ({estimated_count} assets have no export history).")
+
+        def add_record(record: ExportRecord):
+            # Recorded as they finish, so an interrupted batch still improves the next schedule
+            history.add([record])
+            records.append(record)
+            if record.outcome is ExportOutcome.FAILED:
+                mp.debug_warning(f"Failed to export {record.asset_path}: {record.message}")
+
+        def start(job: BatchExportJob) -> bool:
+            """
+            :return: False if the job is quarantined, and so failed instead of starting
+            """
+            quarantine_message = journal.get_quarantine_message(job.asset_path)
+            if quarantine_message is None and journal.get_attempt_count(job.asset_path) >= max_attempts:
+                quarantine_message = (f"Quarantined, its export didn't finish in "
+                                      f"{journal.get_attempt_count(job.asset_path)} attempts.")
+                journal.quarantine(job.asset_path, quarantine_message)
+            if quarantine_message is not None:
+                add_record(_create_failed_record(job, quarantine_message))
+                return False
+            journal.start(job.asset_path)
+            return True
+
+        def finish(job: BatchExportJob, record: ExportRecord):
+            journal.finish(record, job.path, _get_output_path(job, export_root_path))
+            add_record(record)
+
+        def run_isolated(job: BatchExportJob):
+            # Alone in its own Maya, so a crash can only be this export's, and counts as one of its attempts
+            while start(job):
+                isolation_pool = create_process_pool(1, initializer=initialize_maya_worker)
+                try:
+                    future = isolation_pool.submit(run_export_job, str(job.path), str(scenes_path),
+                                                   str(export_root_path))
+                    finish(job, ExportRecord.from_dict(future.result()))
+                    return
+                except Exception as e:
+                    mp.debug_warning(f"Worker failed exporting {job.asset_path} on its own: {e}")
+                except BaseException:
+                    # Interrupted (e.g. Ctrl+C), which isn't a crash of the export
+                    journal.release(job.asset_path)
+                    raise
+                finally:
+                    isolation_pool.shutdown(wait=False, cancel_futures=True)
+
+        # Only as many jobs as there are workers are submitted, so the journal's started jobs are the running ones
+        queue = deque(ordered_jobs)
+        running = {}
+        pool = create_process_pool(worker_count, initializer=initialize_maya_worker)
+        try:
+            while queue or running:
+                while queue and len(running) < worker_count:
+                    job = queue.popleft()
+                    if start(job):
+                        future = pool.submit(run_export_job, str(job.path), str(scenes_path), str(export_root_path))
+                        running[future] = job
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                if any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+                    # A crashed Maya takes the whole pool down, every running export failed with it
+                    done, _ = wait(running)
+                    pool.shutdown(wait=False)
+                    pool = create_process_pool(worker_count, initializer=initialize_maya_worker)
+
+                failed_jobs = []
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        record = ExportRecord.from_dict(future.result())
+                    except Exception as e:
+                        mp.debug_warning(f"Worker failed exporting {job.asset_path}: {e}")
+                        failed_jobs.append(job)
+                        continue
+                    finish(job, record)
+
+                # Any of the exports that failed together could have crashed Maya, so none of them is charged an
+                # attempt until it crashes on its own
+                if len(failed_jobs) > 1:
+                    for job in failed_jobs:
+                        journal.release(job.asset_path)
+                for job in failed_jobs:
+                    run_isolated(job)
+        except BaseException:
+            # Interrupted (e.g. Ctrl+C), the running exports didn't crash and aren't charged an attempt
+            for job in running.values():
+                journal.release(job.asset_path)
+            raise
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # Only deleted once every job ran, an exception or Ctrl+C above leaves it for the next run to resume from
+    Path(journal_path).unlink(missing_ok=True)
+
+    regressions = find_regressions(records, expected_durations, regression_threshold)
+    for regression in regressions:
+        mp.debug_warning(f"Export time regressed: {regression}")
+
+    result = BatchExportResult(records, regressions, time.perf_counter() - start_time, planned_duration, resumed)
+    mp.debug_log(f"Exported {len(records) - len(result.failed)} of {len(records)} assets in {result.duration:.0f}s "
+                 f"(planned {planned_duration:.0f}s), {len(result.cached)} from the artifact cache, "
+                 f"{len(resumed)} resumed, {len(regressions)} regressions.")
+    mp.debug_log(f"Artifact cache: {ArtifactCache(get_artifact_cache_path(scenes_path.parent)).stats}")
+    return result
+
+
+def _get_output_path(job: BatchExportJob, export_root_path: Path) -> Path:
+    return Path(export_root_path) / Path(job.asset_path).with_suffix(".fbx")
+
+
+def _create_failed_record(job: BatchExportJob, message: str) -> ExportRecord:
+    return ExportRecord(job.asset_path, get_asset_type_from_filename(job.path).value, time.time(), 0.0,
+                        os.path.getsize(job.path), outcome=ExportOutcome.FAILED, message=message)
+
+
+def run_export_job(path_str: str, scenes_path_str: str, export_root_path_str: str) -> dict:
+    """
+    Exports one asset in a Maya worker process (see initialize_maya_worker), from the artifact cache if it can.
+    Only returns data and doesn't log, the coordinating process does.
+    :param path_str: The .ma file
+    :param export_root_path_str: Exports go to the same relative folder under this one
+    :return: The ExportRecord as a dict
+    """
+    import pymel.core as pm
+
+    path = Path(path_str)
+    scenes_path = Path(scenes_path_str)
+    started_at = time.time()
+
+    try:
+        # References are relative to the Maya project, so it has to be set before opening the file
+        pm.workspace(str(scenes_path.parent), openWorkspace=True)
+        export_folder_path = Path(export_root_path_str) / path.parent.relative_to(scenes_path)
+
+        # Opening the scene is often the slowest part, so the cache is tried first
+        fbx_path = mp.fetch_cached_export(path, export_folder_path)
+        if fbx_path is not None:
+            return ExportRecord(path.relative_to(scenes_path).as_posix(), get_asset_type_from_filename(path).value,
+                                started_at, time.time() - started_at, os.path.getsize(path),
+                                output_size=mp.get_pending_path(fbx_path).stat().st_size, outcome=ExportOutcome.CACHED,
+                                message="Fetched from the artifact cache.").to_dict()
+
+        pm.openFile(path_str, force=True)
+        node = mp.get_top_level_node(ASSET_NODE_NAME)
+        if node is None:
+            raise RuntimeError(f"No top level {ASSET_NODE_NAME} node.")
+
+        # The scene was only opened to export it, saving it could overwrite a newer save by an artist
+        record = mp.export_asset_and_measure(node, export_folder_path, scenes_path, use_cache=False,
+                                             save_scene=False)
+    except Exception as e:
+        record = ExportRecord(path.relative_to(scenes_path).as_posix(), get_asset_type_from_filename(path).value,
+                              started_at, time.time() - started_at, os.path.getsize(path),
+                              outcome=ExportOutcome.FAILED, message=str(e))
+    return record.to_dict()
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export Maya Pipeline assets in parallel mayapy workers, "
+                                                 "longest exports first.")
+    parser.add_argument("scenes_path", type=Path, help="The Maya project's scenes folder")
+    parser.add_argument("export_root_path", type=Path, help="Folder to export to, e.g. the Unity project's Assets")
+    parser.add_argument("--assets", nargs="*", type=Path, default=None,
+                        help="The .ma files to export. Every exportable asset if not set.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--regression-threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Flag exports that take this many times longer than usual")
+    parser.add_argument("--publish-immediately", action="store_true",
+                        help="Move each FBX into place as it's exported, instead of all of them at the end")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_EXPORT_ATTEMPTS,
+                        help="Quarantine exports that crash Maya this many times")
+    parser.add_argument("--restart", action="store_true",
+                        help="Export everything again, even if an interrupted batch already exported some of it")
+    args = parser.parse_args(argv)
+
+    scenes_path = args.scenes_path.resolve()
+    if args.restart:
+        get_export_journal_path(scenes_path.parent).unlink(missing_ok=True)
+    paths = [path.resolve() for path in args.assets] if args.assets else get_exportable_assets(scenes_path)
+    result = export_batch(paths, scenes_path, args.export_root_path, max_workers=args.workers,
+                          regression_threshold=args.regression_threshold,
+                          publish_at_end=not args.publish_immediately, max_attempts=args.max_attempts)
+
+    print(f"Exported {len(result.records) - len(result.failed)} of {len(result.records)} assets in "
+          f"{result.duration:.0f}s (planned {result.planned_duration:.0f}s), {len(result.cached)} from the artifact "
+          f"cache.")
+    if result.resumed:
+        print(f"Resumed an interrupted batch, {len(result.resumed)} assets were already exported.")
+    for record in result.failed:
+        print(f"FAILED {record.asset_path}: {record.message}")
+    for regression in result.regressions:
+        print(f"REGRESSED {regression}")
+
+    return 1 if result.failed else 0
@@ -0,0 +1,243 @@
+# Python
+import numpy as np
+
+from maya_pipeline.exporter.mesh_optimization import get_degenerate_triangles
+
+__all__ = ["DEFAULT_LOD_REDUCTION", "BOUNDARY_WEIGHT", "get_lod_triangle_counts", "decimate"]
+
+# Each LOD has this fraction of the previous LOD's triangles
+DEFAULT_LOD_REDUCTION = 0.5
+# How much more moving a border or UV seam costs than moving the surface, so they're collapsed last
+BOUNDARY_WEIGHT = 100.0
+# Collapses that turn a triangle further than this (cosine of the angle between its old and new normal) are skipped
+_MIN_NORMAL_DOT = 0.0
+# Border and seam vertices where the border or seam turns further than this (cosine of the angle between the two
+# edges) are corners, which never move. -0.7 is about 45 degrees away from straight.
+_MAX_BOUNDARY_CORNER_DOT = -0.7
+_FACE_EDGES = [(0, 1), (1, 2), (2, 0)]
+
+
+def get_lod_triangle_counts(triangle_count: int, lod_count: int, reduction: float = DEFAULT_LOD_REDUCTION) -> list[int]:
+    """
+    :return: Target triangle counts of LOD1 to LODn
+    """
+    return [max(1, int(triangle_count * reduction ** lod)) for lod in range(1, lod_count + 1)]
+
+
+def decimate(positions: np.ndarray, triangles: np.ndarray, target_triangle_count: int,
+             corner_ids: np.ndarray = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reduces the triangle count with quadric error metrics (Garland and Heckbert). Vertices are collapsed onto a
+    neighbour (half-edge collapses), so no new positions or attributes are made. Borders and seams are only collapsed
+    along themselves, so they keep their shape, and their ends and corners never move.
+    Collapses are done in rounds of cheapest first that don't share triangles, so most of the work is vectorized.
+    :param positions: Shape (vertex count, 3)
+    :param triangles: Vertex indices, shape (triangle count, 3)
+    :param corner_ids: Shape (triangle count, 3). Triangle corners with different ids have different attributes
+                       (e.g. UVs or hard edge normals), so edges between them are seams. Every id has to belong to a
+                       single vertex. Defaults to the vertex indices, which leaves only borders.
+    :return: Indices of the triangles that are left, their vertex indices, and their corner ids. Vertex indices and
+             corner ids are from the originals, so unused vertices aren't removed.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    triangles = np.array(triangles, dtype=np.int64)
+    corner_ids = triangles.copy() if corner_ids is None else np.array(corner_ids, dtype=np.int64)
+    faces = np.arange(len(triangles))
+
+    edges = _analyze_edges(positions, triangles, corner_ids)
+    quadrics = _get_quadrics(positions, triangles, edges)
+
+    while len(faces) > target_triangle_count:
+        collapses = _find_collapses(positions, triangles, corner_ids, quadrics, edges,
+                                    len(faces) - target_triangle_count)
+        if not collapses:
+            break
+
+        collapse_to = np.arange(len(positions))
+        corner_remap = np.arange(corner_ids.max() + 1)
+        for u, v, corner_map in collapses:
+            collapse_to[u] = v
+            quadrics[v] += quadrics[u]
+            for corner_u, corner_v in corner_map.items():
+                corner_remap[corner_u] = corner_v
+
+        triangles = collapse_to[triangles]
+        corner_ids = corner_remap[corner_ids]
+        kept = ~get_degenerate_triangles(triangles)
+        faces, triangles, corner_ids = faces[kept], triangles[kept], corner_ids[kept]
+        edges = _analyze_edges(positions, triangles, corner_ids)
+
+    return faces, triangles, corner_ids
+
+
+class _EdgeAnalysis:
+    def __init__(self, vertex_pairs: np.ndarray, face_indices: np.ndarray, is_boundary: np.ndarray,
+                 locked: np.ndarray, boundary_counts: np.ndarray):
+        self.vertex_pairs = vertex_pairs  # Unique edges as (smaller vertex, larger vertex)
+        self.face_indices = face_indices  # A triangle each edge is on
+        self.is_boundary = is_boundary  # Border or seam
+        self.locked = locked  # Per vertex, vertices that can't move
+        self.boundary_counts = boundary_counts  # Per vertex, number of border and seam edges
+
+
+def _analyze_edges(positions: np.ndarray, triangles: np.ndarray, corner_ids: np.ndarray) -> _EdgeAnalysis:
+    vertex_count = len(positions)
+    face_edges = np.concatenate([triangles[:, [a, b]] for a, b in _FACE_EDGES])
+    edge_corners = np.concatenate([corner_ids[:, [a, b]] for a, b in _FACE_EDGES])
+    edge_faces = np.tile(np.arange(len(triangles)), len(_FACE_EDGES))
+
+    # Corner ids in the same vertex order on every triangle the edge is on, so seams can be found by comparing them
+    swapped = face_edges[:, 0] > face_edges[:, 1]
+    face_edges[swapped] = face_edges[swapped][:, ::-1]
+    edge_corners[swapped] = edge_corners[swapped][:, ::-1]
+
+    keys = face_edges[:, 0] * max(vertex_count, 1) + face_edges[:, 1]
+    order = np.argsort(keys, kind="stable")
+    keys, face_edges, edge_corners, edge_faces = keys[order], face_edges[order], edge_corners[order], edge_faces[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, len(keys)])
+
+    group_starts = np.repeat(starts, counts)
+    differs = np.any(edge_corners != edge_corners[group_starts], axis=1)
+    is_seam = np.logical_or.reduceat(differs, starts) if len(starts) else np.zeros(0, dtype=bool)
+    is_boundary = is_seam | (counts == 1)
+
+    vertex_pairs = face_edges[starts]
+    boundary_counts = np.bincount(vertex_pairs[is_boundary].reshape(-1), minlength=vertex_count)
+    locked = np.zeros(vertex_count, dtype=bool)
+    locked[vertex_pairs[counts > 2].reshape(-1)] = True  # Non-manifold
+    # A seam that ends inside the surface, or where borders and seams meet
+    locked |= (boundary_counts == 1) | (boundary_counts > 2)
+    locked[_get_boundary_corners(positions, vertex_pairs[is_boundary], boundary_counts)] = True
+
+    return _EdgeAnalysis(vertex_pairs, edge_faces[starts], is_boundary, locked, boundary_counts)
+
+
+def _get_boundary_corners(positions: np.ndarray, boundary_pairs: np.ndarray, boundary_counts: np.ndarray) -> np.ndarray:
+    """
+    :return: The vertices on two border or seam edges that aren't close to a straight line
+    """
+    # Both directions of every edge, grouped by vertex, so each vertex's two edges are next to each other
+    starts = np.concatenate([boundary_pairs[:, 0], boundary_pairs[:, 1]])
+    ends = np.concatenate([boundary_pairs[:, 1], boundary_pairs[:, 0]])
+    on_two = boundary_counts[starts] == 2
+    starts, ends = starts[on_two], ends[on_two]
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+
+    vertices = starts[0::2]
+    first_directions = positions[ends[0::2]] - positions[vertices]
+    second_directions = positions[ends[1::2]] - positions[vertices]
+    dots = np.sum(first_directions * second_directions, axis=1) / np.maximum(
+        np.linalg.norm(first_directions, axis=1) * np.linalg.norm(second_directions, axis=1), 1e-20)
+    return vertices[dots > _MAX_BOUNDARY_CORNER_DOT]
+
+
+def _get_quadrics(positions: np.ndarray, triangles: np.ndarray, edges: _EdgeAnalysis) -> np.ndarray:
+    corners = positions[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    areas = np.linalg.norm(normals, axis=1) / 2
+    unit_normals = normals / np.maximum(areas * 2, 1e-20)[:, np.newaxis]
+
+    planes = np.concatenate([unit_normals, -np.sum(unit_normals * corners[:, 0], axis=1)[:, np.newaxis]], axis=1)
+    face_quadrics = areas[:, np.newaxis, np.newaxis] * np.einsum("ni,nj->nij", planes, planes)
+    quadrics = np.zeros((len(positions), 4, 4))
+    for corner in range(3):
+        np.add.at(quadrics, triangles[:, corner], face_quadrics)
+
+    # Planes through borders and seams, perpendicular to the surface, keep them from moving sideways
+    boundary_pairs = edges.vertex_pairs[edges.is_boundary]
+    start_points = positions[boundary_pairs[:, 0]]
+    directions = positions[boundary_pairs[:, 1]] - start_points
+    boundary_normals = np.cross(directions, unit_normals[edges.face_indices[edges.is_boundary]])
+    lengths = np.linalg.norm(boundary_normals, axis=1)
+    boundary_normals /= np.maximum(lengths, 1e-20)[:, np.newaxis]
+    boundary_planes = np.concatenate([boundary_normals,
+                                      -np.sum(boundary_normals * start_points, axis=1)[:, np.newaxis]], axis=1)
+    weights = BOUNDARY_WEIGHT * np.sum(directions * directions, axis=1)
+    boundary_quadrics = weights[:, np.newaxis, np.newaxis] * np.einsum("ni,nj->nij", boundary_planes, boundary_planes)
+    for end in range(2):
+        np.add.at(quadrics, boundary_pairs[:, end], boundary_quadrics)
+    return quadrics
+
+
+def _find_collapses(positions: np.ndarray, triangles: np.ndarray, corner_ids: np.ndarray, quadrics: np.ndarray,
+                    edges: _EdgeAnalysis, max_removed_faces: int) -> list[tuple[int, int, dict[int, int]]]:
+    """
+    :return: Collapses that don't touch the same triangles, as (removed vertex, vertex it moves to, corner id map)
+    """
+    pairs = np.concatenate([edges.vertex_pairs, edges.vertex_pairs[:, ::-1]])
+    is_boundary = np.tile(edges.is_boundary, 2)
+    removed, kept = pairs[:, 0], pairs[:, 1]
+    # Border and seam vertices can only slide along their border or seam
+    allowed = ~edges.locked[removed] & ((edges.boundary_counts[removed] == 0) | is_boundary)
+    removed, kept = removed[allowed], kept[allowed]
+
+    points = np.concatenate([positions[kept], np.ones((len(kept), 1))], axis=1)
+    costs = np.einsum("ni,nij,nj->n", points, quadrics[removed] + quadrics[kept], points)
+
+    vertex_faces = _get_vertex_faces(triangles, len(positions))
+    triangle_list = triangles.tolist()
+    corner_list = corner_ids.tolist()
+    touched = np.zeros(len(positions), dtype=bool)
+    removed_vertices = set()
+    collapses = []
+    moved_faces = []  # (collapse index, face, removed vertex, kept vertex) of every triangle that changes shape
+    removed_face_count = 0
+
+    for index in np.argsort(costs, kind="stable").tolist():
+        u, v = int(removed[index]), int(kept[index])
+        # Triangles around u change, so nothing else can change them this round
+        if touched[u] or v in removed_vertices:
+            continue
+
+        u_faces = vertex_faces[u]
+        shared_faces = [face for face in u_faces if v in triangle_list[face]]
+        u_ring = {vertex for face in u_faces for vertex in triangle_list[face]}
+        v_ring = {vertex for face in vertex_faces[v] for vertex in triangle_list[face]}
+        opposite = {vertex for face in shared_faces for vertex in triangle_list[face]} - {u, v}
+        if (u_ring & v_ring) - {u, v} != opposite:
+            continue  # Would join two parts of the surface that only touch here
+
+        corner_map = {}
+        for face in shared_faces:
+            corners = triangle_list[face]
+            corner_map[corner_list[face][corners.index(u)]] = corner_list[face][corners.index(v)]
+        if any(corner_list[face][triangle_list[face].index(u)] not in corner_map for face in u_faces):
+            continue  # A corner of u would have nothing to take its attributes from
+
+        touched[list(u_ring)] = True
+        removed_vertices.add(u)
+        moved_faces.extend((len(collapses), face, u, v) for face in u_faces if face not in shared_faces)
+        collapses.append((u, v, corner_map))
+        removed_face_count += len(shared_faces)
+        if removed_face_count >= max_removed_faces:
+            break
+
+    if not moved_faces:
+        return collapses
+
+    # Skip the collapses that would flip a triangle over
+    collapse_indices, moved, moved_removed, moved_kept = (np.array(column) for column in zip(*moved_faces))
+    old_triangles = triangles[moved]
+    new_triangles = np.where(old_triangles == moved_removed[:, np.newaxis], moved_kept[:, np.newaxis], old_triangles)
+    old_normals = _get_normals(positions, old_triangles)
+    new_normals = _get_normals(positions, new_triangles)
+    flipped = np.sum(old_normals * new_normals, axis=1) <= _MIN_NORMAL_DOT
+    rejected = set(collapse_indices[flipped].tolist())
+    return [collapse for index, collapse in enumerate(collapses) if index not in rejected]
+
+
+def _get_vertex_faces(triangles: np.ndarray, vertex_count: int) -> list[list[int]]:
+    flat = triangles.reshape(-1)
+    order = np.argsort(flat, kind="stable")
+    bounds = np.searchsorted(flat[order], np.arange(vertex_count + 1))
+    faces = (order // 3).tolist()
+    bounds = bounds.tolist()
+    return [faces[bounds[vertex]:bounds[vertex + 1]] for vertex in range(vertex_count)]
+
+
+def _get_normals(positions: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    corners = positions[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    return normals / np.maximum(np.linalg.norm(normals, axis=1), 1e-20)[:, np.newaxis]
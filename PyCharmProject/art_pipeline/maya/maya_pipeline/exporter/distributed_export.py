@@ -0,0 +1,463 @@
+# Python
+import argparse
+from collections import deque
+from concurrent.futures import Executor, FIRST_COMPLETED, Future, wait
+from concurrent.futures.process import BrokenProcessPool
+import json
+import os
+from pathlib import Path
+import re
+import socket
+import time
+from typing import Callable
+import uuid
+
+import maya_pipeline as mp
+from maya_pipeline.exporter.batch_export import (create_batch_jobs, get_exportable_assets, plan_longest_first,
+                                                 run_export_job)
+from maya_pipeline.exporter.export_history import (ExportHistory, ExportOutcome, ExportRecord,
+                                                   get_export_history_path)
+from maya_pipeline.exporter.publishing import write_file_atomically
+from maya_pipeline.main_app.asset_definitions import get_asset_type_from_filename
+from maya_pipeline.misc.maya_worker import initialize_maya_worker
+from maya_pipeline.misc.process_pool import create_process_pool
+
+__all__ = ["DEFAULT_LEASE_SECONDS", "DEFAULT_HEARTBEAT_INTERVAL", "DEFAULT_MAX_JOB_ATTEMPTS",
+           "DistributedExportStatus", "DistributedExportWorker", "submit_distributed_export",
+           "get_distributed_export_status", "collect_distributed_results"]
+
+# A lease that isn't renewed for this long belongs to a worker that crashed or lost the shared folder
+DEFAULT_LEASE_SECONDS = 120.0
+DEFAULT_HEARTBEAT_INTERVAL = 15.0
+# Exports that crash their worker this many times get a failed result instead of being retried again
+DEFAULT_MAX_JOB_ATTEMPTS = 3
+_CONFIG_FILENAME = "config.json"
+_JOBS_DIR_NAME = "jobs"
+_LEASES_DIR_NAME = "leases"
+_RESULTS_DIR_NAME = "results"
+# One file per failed attempt (an expired lease or a crashed export), named <job id>.<unique id>
+_ATTEMPTS_DIR_NAME = "attempts"
+# Touched by each worker when it looks for jobs, which also gives the shared folder's clock
+_WORKERS_DIR_NAME = "workers"
+_JOB_ID_PATTERN = re.compile(r"\W")
+
+
+class DistributedExportStatus:
+    def __init__(self, job_count: int, finished_count: int, failed_count: int, leased_count: int):
+        self.job_count = job_count
+        self.finished_count = finished_count
+        self.failed_count = failed_count
+        self.leased_count = leased_count
+
+    @property
+    def waiting_count(self) -> int:
+        return self.job_count - self.finished_count - self.leased_count
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_count >= self.job_count
+
+    def __repr__(self):
+        return (f"DistributedExportStatus({self.finished_count} of {self.job_count} finished, {self.failed_count} "
+                f"failed, {self.leased_count} running, {self.waiting_count} waiting)")
+
+
+class _JobLease:
+    def __init__(self, job_id: str, asset_path: str, lease_path: Path, token: str):
+        self.job_id = job_id
+        self.asset_path = asset_path
+        self.lease_path = lease_path
+        self.token = token
+        self.lost = False
+
+
+class DistributedExportWorker:
+    """
+    Claims jobs from a shared job folder (see submit_distributed_export) and exports them in a pool of Maya workers
+    until every job has a result. Run one per machine, any number of machines can share the folder.
+    A claim is a lease file created atomically, which is touched while the export runs. Leases that aren't touched
+    for lease_seconds (the machine crashed or lost the share) are reclaimed by other workers. A job whose exports
+    failed to finish max_attempts times gets a failed result. Exports that fail together (one crashed Maya takes the
+    whole pool down) are re-run one at a time before any of them is charged an attempt.
+    Only the Maya workers block on Maya, so this process keeps renewing leases during long exports.
+    """
+    def __init__(self, job_dir: Path, scenes_path: Path = None, export_root_path: Path = None,
+                 max_workers: int = 1, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL, max_attempts: int = DEFAULT_MAX_JOB_ATTEMPTS,
+                 export_job: Callable[[str, str, str], dict] = None, executor: Executor = None,
+                 worker_id: str = None):
+        """
+        :param scenes_path: Where this machine has the scenes folder. Defaults to the path the jobs were
+                            submitted with.
+        :param export_root_path: Where this machine has the export folder. Defaults to the submitted path.
+        :param export_job: Takes the .ma file, scenes folder and export root as strings and returns an ExportRecord
+                           dict. Defaults to run_export_job.
+        :param executor: Runs the export jobs. Defaults to a pool of max_workers Maya workers.
+        """
+        self.job_dir = Path(job_dir)
+        with open(self.job_dir / _CONFIG_FILENAME, encoding="utf-8") as file:
+            config = json.load(file)
+        self.scenes_path = Path(scenes_path or config["scenes_path"])
+        self.export_root_path = Path(export_root_path or config["export_root_path"])
+        self.max_workers = max_workers
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = heartbeat_interval
+        self.max_attempts = max_attempts
+        self.export_job = export_job or run_export_job
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.records: list[ExportRecord] = []
+        self._executor = executor
+
+    def run(self, poll_interval: float = 5.0) -> list[ExportRecord]:
+        """
+        Exports until every job has a result. While there's nothing to claim, waits for other workers' leases to
+        finish or expire.
+        :return: The records of the jobs this worker finished
+        """
+        executor = self._executor or self._create_pool(self.max_workers)
+        running: dict[Future, _JobLease] = {}
+        # Exports that failed along with others are re-run one at a time, still leased by this worker, so a crash is
+        # only counted as an attempt of the export that caused it
+        isolated: deque[_JobLease] = deque()
+        isolated_running: dict[Future, _JobLease] = {}
+        isolation_executor = None
+        try:
+            while True:
+                while len(running) < self.max_workers:
+                    lease = self._claim_next_job()
+                    if lease is None:
+                        break
+                    running[self._submit(executor, lease)] = lease
+
+                if isolated and not isolated_running:
+                    isolation_executor = isolation_executor or self._executor or self._create_pool(1)
+                    lease = isolated.popleft()
+                    isolated_running[self._submit(isolation_executor, lease)] = lease
+
+                if not running and not isolated_running:
+                    if get_distributed_export_status(self.job_dir).finished:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                done, _ = wait({**running, **isolated_running}, timeout=self.heartbeat_interval,
+                               return_when=FIRST_COMPLETED)
+                for future in done & isolated_running.keys():
+                    if isinstance(future.exception(), BrokenProcessPool) and self._executor is None:
+                        isolation_executor.shutdown(wait=False)
+                        isolation_executor = None
+                    self._finish_job(isolated_running.pop(future), future)
+
+                done = done & running.keys()
+                if any(isinstance(future.exception(), BrokenProcessPool) for future in done) \
+                        and self._executor is None:
+                    # A crashed Maya takes the whole pool down, the other exports failed with it
+                    done, _ = wait(running)
+                    executor.shutdown(wait=False)
+                    executor = self._create_pool(self.max_workers)
+
+                failed = [future for future in done if future.exception() is not None]
+                for future in done:
+                    lease = running.pop(future)
+                    if len(failed) > 1 and future in failed:
+                        isolated.append(lease)
+                    else:
+                        self._finish_job(lease, future)
+
+                for lease in [*running.values(), *isolated_running.values(), *isolated]:
+                    self._renew_lease(lease)
+        finally:
+            # Released so other workers can claim them straight away, instead of after the leases expire
+            for lease in [*running.values(), *isolated_running.values(), *isolated]:
+                self._release_lease(lease)
+            if self._executor is None:
+                executor.shutdown(wait=False, cancel_futures=True)
+                if isolation_executor is not None:
+                    isolation_executor.shutdown(wait=False, cancel_futures=True)
+        return self.records
+
+    def _create_pool(self, worker_count: int) -> Executor:
+        return create_process_pool(worker_count, initializer=initialize_maya_worker)
+
+    def _submit(self, executor: Executor, lease: _JobLease) -> Future:
+        mp.debug_log(f"{self.worker_id} exporting {lease.asset_path}")
+        return executor.submit(self.export_job, str(self.scenes_path / lease.asset_path), str(self.scenes_path),
+                               str(self.export_root_path))
+
+    def _claim_next_job(self) -> _JobLease:
+        """
+        Jobs are claimed in the order they were submitted, longest expected export first.
+        :return: None if every job is finished or leased
+        """
+        shared_time = self._touch_worker_file()
+        finished = set(_list_job_ids(self.job_dir / _RESULTS_DIR_NAME, ".json"))
+        leased = set(_list_job_ids(self.job_dir / _LEASES_DIR_NAME, ".lease"))
+
+        for job_id in _list_job_ids(self.job_dir / _JOBS_DIR_NAME, ".json"):
+            if job_id in finished:
+                continue
+            if job_id in leased and not self._reclaim_expired_lease(job_id, shared_time):
+                continue
+
+            attempt_count = self._get_attempt_count(job_id)
+            if attempt_count >= self.max_attempts:
+                self._write_result(job_id, self._create_failed_record(
+                    job_id, f"Didn't finish in {attempt_count} attempts, its export probably crashes Maya."))
+                continue
+
+            lease = self._create_lease(job_id)
+            if lease is not None:
+                return lease
+        return None
+
+    def _create_lease(self, job_id: str) -> _JobLease:
+        lease_path = self.job_dir / _LEASES_DIR_NAME / f"{job_id}.lease"
+        token = uuid.uuid4().hex
+        try:
+            # Only one worker can create the file, that's the claim
+            descriptor = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return None
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump({"worker": self.worker_id, "token": token, "claimed_at": time.time()}, file)
+
+        # Another worker may have finished the job between listing the results and the claim
+        if (self.job_dir / _RESULTS_DIR_NAME / f"{job_id}.json").is_file():
+            lease_path.unlink(missing_ok=True)
+            return None
+
+        with open(self.job_dir / _JOBS_DIR_NAME / f"{job_id}.json", encoding="utf-8") as file:
+            job = json.load(file)
+        return _JobLease(job_id, job["asset_path"], lease_path, token)
+
+    def _reclaim_expired_lease(self, job_id: str, shared_time: float) -> bool:
+        """
+        Moves an expired lease to the job's attempts, which frees the job.
+        :return: True if the job isn't leased anymore
+        """
+        lease_path = self.job_dir / _LEASES_DIR_NAME / f"{job_id}.lease"
+        try:
+            lease_stat = lease_path.stat()
+        except FileNotFoundError:
+            return True  # Released while this worker was looking
+        if shared_time - lease_stat.st_mtime < self.lease_seconds:
+            return False
+
+        attempt_path = self.job_dir / _ATTEMPTS_DIR_NAME / f"{job_id}.{uuid.uuid4().hex}"
+        lease = _read_lease(lease_path)
+        try:
+            os.rename(lease_path, attempt_path)
+        except OSError:
+            return False  # Another worker reclaimed it first
+
+        # The lease could have been renewed, or reclaimed and claimed again, between the checks and the rename
+        if attempt_path.stat().st_mtime != lease_stat.st_mtime or _read_lease(attempt_path) != lease:
+            try:
+                os.link(attempt_path, lease_path)
+                attempt_path.unlink()
+            except OSError:
+                pass  # Claimed again in the meantime, its owner finds out when it renews the lease
+            return False
+
+        mp.debug_warning(f"Reclaimed {job_id} from {lease.get('worker')}, its lease expired.")
+        return True
+
+    def _renew_lease(self, lease: _JobLease):
+        if _read_lease(lease.lease_path).get("token") == lease.token:
+            try:
+                os.utime(lease.lease_path)
+                return
+            except OSError:
+                pass
+        if not lease.lost:
+            # The export still finishes and writes its result, another worker may be exporting it too
+            lease.lost = True
+            mp.debug_warning(f"{self.worker_id} lost its lease on {lease.job_id}.")
+
+    def _release_lease(self, lease: _JobLease):
+        if _read_lease(lease.lease_path).get("token") == lease.token:
+            lease.lease_path.unlink(missing_ok=True)
+
+    def _finish_job(self, lease: _JobLease, future: Future):
+        try:
+            record = ExportRecord.from_dict(future.result())
+        except Exception as e:
+            # Counted as a failed attempt, the job is retried by whichever worker claims it next
+            if _read_lease(lease.lease_path).get("token") == lease.token:
+                try:
+                    os.rename(lease.lease_path, self.job_dir / _ATTEMPTS_DIR_NAME / f"{lease.job_id}.{lease.token}")
+                except OSError:
+                    pass
+            mp.debug_warning(f"{self.worker_id} failed to export {lease.asset_path}: Worker failed: {e}")
+            return
+
+        self._write_result(lease.job_id, record)
+        self._release_lease(lease)
+        self.records.append(record)
+        if record.outcome is ExportOutcome.FAILED:
+            mp.debug_warning(f"Failed to export {record.asset_path}: {record.message}")
+
+    def _write_result(self, job_id: str, record: ExportRecord):
+        result = dict(record.to_dict(), worker=self.worker_id)
+        write_file_atomically(self.job_dir / _RESULTS_DIR_NAME / f"{job_id}.json",
+                              json.dumps(result).encode("utf-8"))
+
+    def _create_failed_record(self, job_id: str, message: str) -> ExportRecord:
+        with open(self.job_dir / _JOBS_DIR_NAME / f"{job_id}.json", encoding="utf-8") as file:
+            asset_path = json.load(file)["asset_path"]
+        return ExportRecord(asset_path, get_asset_type_from_filename(Path(asset_path)).value, time.time(), 0.0, 0,
+                            outcome=ExportOutcome.FAILED, message=message)
+
+    def _get_attempt_count(self, job_id: str) -> int:
+        return sum(1 for name in os.listdir(self.job_dir / _ATTEMPTS_DIR_NAME) if name.startswith(f"{job_id}."))
+
+    def _touch_worker_file(self) -> float:
+        """
+        :return: The shared folder's current time, machines' clocks can be minutes apart
+        """
+        worker_path = self.job_dir / _WORKERS_DIR_NAME / self.worker_id
+        worker_path.touch()
+        os.utime(worker_path)
+        return worker_path.stat().st_mtime
+
+
+def submit_distributed_export(job_dir: Path, paths: list[Path], scenes_path: Path, export_root_path: Path,
+                              history_path: Path = None) -> list[str]:
+    """
+    Writes a job per asset to the shared job folder for DistributedExportWorkers to claim, longest expected export
+    first (see plan_longest_first).
+    :param job_dir: A new folder every machine can reach
+    :param paths: .ma files to export
+    :param export_root_path: Exports go to the same relative folder under this one (e.g. the Unity Assets folder)
+    :param history_path: Export history database the durations are expected from. Defaults to the one in the
+                         project's cache folder.
+    :return: The job ids
+    :raises FileExistsError: If the folder already has jobs
+    """
+    job_dir = Path(job_dir)
+    scenes_path = Path(scenes_path)
+    if (job_dir / _JOBS_DIR_NAME).is_dir() and any(os.scandir(job_dir / _JOBS_DIR_NAME)):
+        raise FileExistsError(f"{job_dir} already has jobs, use a new folder for each export.")
+    for dir_name in (_JOBS_DIR_NAME, _LEASES_DIR_NAME, _RESULTS_DIR_NAME, _ATTEMPTS_DIR_NAME, _WORKERS_DIR_NAME):
+        (job_dir / dir_name).mkdir(parents=True, exist_ok=True)
+
+    with ExportHistory(history_path or get_export_history_path(scenes_path.parent)) as history:
+        jobs = create_batch_jobs(paths, scenes_path, history)
+    ordered_jobs, planned_duration = plan_longest_first(jobs, 1)
+
+    config = {"scenes_path": str(scenes_path), "export_root_path": str(export_root_path), "submitted_at": time.time()}
+    write_file_atomically(job_dir / _CONFIG_FILENAME, json.dumps(config).encode("utf-8"))
+    job_ids = []
+    for index, job in enumerate(ordered_jobs):
+        # Numbered so workers claim them in order
+        job_id = f"{index:06d}_{_JOB_ID_PATTERN.sub('_', job.path.stem)}"
+        write_file_atomically(job_dir / _JOBS_DIR_NAME / f"{job_id}.json",
+                              json.dumps({"asset_path": job.asset_path,
+                                          "expected_duration": job.expected_duration}).encode("utf-8"))
+        job_ids.append(job_id)
+
+    mp.debug_log(f"Submitted {len(job_ids)} export jobs to {job_dir}, {planned_duration:.0f}s of exports.")
+    return job_ids
+
+
+def get_distributed_export_status(job_dir: Path) -> DistributedExportStatus:
+    job_dir = Path(job_dir)
+    job_ids = set(_list_job_ids(job_dir / _JOBS_DIR_NAME, ".json"))
+    records = collect_distributed_results(job_dir)
+    leased = set(_list_job_ids(job_dir / _LEASES_DIR_NAME, ".lease")) & job_ids
+    return DistributedExportStatus(len(job_ids), len(records),
+                                   sum(1 for record in records if record.outcome is ExportOutcome.FAILED),
+                                   len(leased - set(_list_job_ids(job_dir / _RESULTS_DIR_NAME, ".json"))))
+
+
+def collect_distributed_results(job_dir: Path) -> list[ExportRecord]:
+    """
+    :return: The records of the finished jobs, in job order
+    """
+    records = []
+    for job_id in _list_job_ids(Path(job_dir) / _RESULTS_DIR_NAME, ".json"):
+        try:
+            with open(Path(job_dir) / _RESULTS_DIR_NAME / f"{job_id}.json", encoding="utf-8") as file:
+                records.append(ExportRecord.from_dict(json.load(file)))
+        except (OSError, ValueError, KeyError):
+            continue
+    return records
+
+
+def _list_job_ids(folder_path: Path, suffix: str) -> list[str]:
+    try:
+        return sorted(name[:-len(suffix)] for name in os.listdir(folder_path) if name.endswith(suffix))
+    except FileNotFoundError:
+        return []
+
+
+def _read_lease(lease_path: Path) -> dict:
+    # Empty while the lease is being written or after it's gone
+    try:
+        with open(lease_path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export Maya Pipeline assets on several machines through a shared "
+                                                 "job folder.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    submit_parser = subparsers.add_parser("submit", help="Write a job for each asset to the job folder")
+    submit_parser.add_argument("job_dir", type=Path, help="A new folder every machine can reach")
+    submit_parser.add_argument("scenes_path", type=Path, help="The Maya project's scenes folder")
+    submit_parser.add_argument("export_root_path", type=Path,
+                               help="Folder to export to, e.g. the Unity project's Assets")
+    submit_parser.add_argument("--assets", nargs="*", type=Path, default=None,
+                               help="The .ma files to export. Every exportable asset if not set.")
+
+    work_parser = subparsers.add_parser("work", help="Export jobs from the job folder until they're all finished")
+    work_parser.add_argument("job_dir", type=Path, help="The job folder")
+    work_parser.add_argument("--scenes-path", type=Path, default=None,
+                             help="The scenes folder on this machine, if it's somewhere else than on the submitter")
+    work_parser.add_argument("--export-root-path", type=Path, default=None,
+                             help="The export folder on this machine, if it's somewhere else than on the submitter")
+    work_parser.add_argument("--workers", type=int, default=1, help="Number of Maya worker processes")
+    work_parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS,
+                             help="Seconds before other workers reclaim a job this one stopped renewing")
+
+    wait_parser = subparsers.add_parser("wait", help="Wait for every job to finish and record them in the export "
+                                                     "history")
+    wait_parser.add_argument("job_dir", type=Path, help="The job folder")
+    wait_parser.add_argument("--poll-interval", type=float, default=10.0, help="Seconds between status checks")
+    args = parser.parse_args(argv)
+
+    if args.command == "submit":
+        scenes_path = args.scenes_path.resolve()
+        paths = [path.resolve() for path in args.assets] if args.assets else get_exportable_assets(scenes_path)
+        job_ids = submit_distributed_export(args.job_dir, paths, scenes_path, args.export_root_path)
+        print(f"Submitted {len(job_ids)} jobs to {args.job_dir}")
+        return 0
+
+    if args.command == "work":
+        worker = DistributedExportWorker(args.job_dir, args.scenes_path, args.export_root_path,
+                                         max_workers=args.workers, lease_seconds=args.lease_seconds,
+                                         heartbeat_interval=min(DEFAULT_HEARTBEAT_INTERVAL, args.lease_seconds / 4))
+        records = worker.run()
+        print(f"{worker.worker_id} exported {len(records)} assets.")
+        return 0
+
+    status = get_distributed_export_status(args.job_dir)
+    while not status.finished:
+        print(status)
+        time.sleep(args.poll_interval)
+        status = get_distributed_export_status(args.job_dir)
+
+    with open(args.job_dir / _CONFIG_FILENAME, encoding="utf-8") as file:
+        scenes_path = Path(json.load(file)["scenes_path"])
+    records = collect_distributed_results(args.job_dir)
+    with ExportHistory(get_export_history_path(scenes_path.parent)) as history:
+        history.add(records)
+
+    failed = [record for record in records if record.outcome is ExportOutcome.FAILED]
+    print(f"Exported {len(records) - len(failed)} of {len(records)} assets.")
+    for record in failed:
+        print(f"FAILED {record.asset_path}: {record.message}")
+    return 1 if failed else 0
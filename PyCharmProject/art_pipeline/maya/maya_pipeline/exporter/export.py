@@ -3,68 +3,271 @@ import pathlib
 from pathlib import Path
 import os
 import inspect
+import struct
+import tempfile
+import time
 from enum import Enum
 
+import numpy as np
+
 # Maya
 import pymel.core as pm
 
 # Internal
 import maya_pipeline as mp
 
-__all__ = ["ConstraintType", "FBX_PRESETS_DIR_NAME", "export_asset"]
+__all__ = ["ConstraintType", "FBX_PRESETS_DIR_NAME", "export_asset", "export_asset_and_measure",
+           "fetch_cached_export"]
 
 SCRIPT_DIRECTORY: Path = Path(os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe()))))
 FBX_PRESETS_DIR_NAME = "fbx_presets"
 FBX_PRESETS_PATH: Path = SCRIPT_DIRECTORY / FBX_PRESETS_DIR_NAME
+_FBX_PRESETS = {
+    mp.AssetType.MESH: "mesh.fbxexportpreset",
+    mp.AssetType.SKINNED_MESH: "skinned_mesh.fbxexportpreset",
+    mp.AssetType.ANIMATION: "animation.fbxexportpreset",
+}
+
+
+@mp.profiled("export_asset")
+def export_asset(node: pm.PyNode, export_folder_path: pathlib.Path, use_cache: bool = True,
+                 save_scene: bool = True) -> bool:
+    """
+    Fetches the FBX from the artifact cache if the same scene, references and presets were exported before, and
+    only exports it otherwise.
+    :param use_cache: False if the caller already tried the cache
+    :param save_scene: Save the scene first, so changes aren't lost when exporting re-opens it. False in headless
+                       workers, which only opened the scene to export it and would overwrite newer saves.
+    :return: True if the FBX was exported or fetched, even if it's unchanged and so wasn't re-written
+    """
+    return _export_asset(node, export_folder_path, use_cache, save_scene) is not mp.ExportOutcome.FAILED
+
+
+def fetch_cached_export(scene_path: Path, export_folder_path: Path, asset_type: mp.AssetType = None) -> Path:
+    """
+    Copies the asset's FBX from the artifact cache and writes its .meta, without opening the scene.
+    The Maya project has to be set, references are resolved relative to it.
+    :param asset_type: Read from the file name if not set
+    :return: The FBX's path, None if it isn't cached
+    """
+    asset_type = asset_type or mp.get_asset_type_from_filename(scene_path)
+    if asset_type not in _FBX_PRESETS:
+        return None
+
+    try:
+        metadata = _get_artifact_cache().fetch(_get_artifact_cache_key(scene_path, asset_type), export_folder_path)
+    except OSError as e:
+        mp.debug_warning(f"Couldn't read the artifact cache: {e}")
+        return None
+    if metadata is None:
+        return None
+
+    fbx_path = export_folder_path / f"{scene_path.stem}.fbx"
+    _write_model_importer_meta(fbx_path, mp.ModelImporterSettings.from_dict(metadata["importer_settings"]))
+    mp.debug_log(f"Fetched {fbx_path.name} from the artifact cache: {fbx_path}", print_to_script_editor=True)
+    return fbx_path
+
+
+@mp.profiled("export_asset")
+def export_asset_and_measure(node: pm.PyNode, export_folder_path: pathlib.Path, scenes_path: pathlib.Path,
+                             use_cache: bool = True, save_scene: bool = True) -> mp.ExportRecord:
+    """
+    Exports like export_asset and measures the export for the export history.
+    Counts are taken before exporting, because exporting re-opens the scene.
+    """
+    scene_path = mp.get_current_scene_path()
+    asset_type = mp.get_asset_type_from_node(node)
+    joint_count = len(pm.ls(type="joint"))
+    frame_count = 0
+    if asset_type is mp.AssetType.ANIMATION:
+        min_time = pm.playbackOptions(query=True, minTime=True)
+        max_time = pm.playbackOptions(query=True, maxTime=True)
+        frame_count = int(max_time - min_time) + 1
+
+    export_filepath = export_folder_path / (mp.get_current_scene_name_without_ext() + ".fbx")
+    started_at = time.time()
+    start_time = time.perf_counter()
+    message = ""
+    outcome = mp.ExportOutcome.FAILED
+
+    try:
+        outcome = _export_asset(node, export_folder_path, use_cache, save_scene)
+    except Exception as e:
+        message = str(e)
+
+    duration = time.perf_counter() - start_time
+    record = mp.ExportRecord(scene_path.relative_to(scenes_path).as_posix(), asset_type.value, started_at, duration,
+                             os.path.getsize(scene_path), joint_count=joint_count, frame_count=frame_count)
+
+    # An unchanged FBX isn't re-written, so its modified time doesn't tell whether the export worked
+    export_filepath = mp.get_pending_path(export_filepath)
+    if outcome is not mp.ExportOutcome.FAILED and export_filepath.is_file():
+        record.output_size = export_filepath.stat().st_size
+        record.outcome = outcome
+        if outcome is mp.ExportOutcome.CACHED:
+            record.message = "Fetched from the artifact cache."
+    else:
+        record.outcome = mp.ExportOutcome.FAILED
+        record.message = message or f"{export_filepath.name} wasn't exported."
+    return record
 
 
-def export_asset(node: pm.PyNode, export_folder_path: pathlib.Path):
-    pm.saveFile(force=True)  # save file to avoid losing changes to file done during export process
+def _export_asset(node: pm.PyNode, export_folder_path: pathlib.Path, use_cache: bool,
+                  save_scene: bool) -> mp.ExportOutcome:
+    if save_scene:
+        pm.saveFile(force=True)  # save file to avoid losing changes to file done during export process
     asset_type = mp.get_asset_type_from_node(node)
 
     # Based on the asset type, create an export filepath and export
     if asset_type is mp.AssetType.RIG or asset_type is mp.AssetType.SKELETON:
         mp.debug_warning(f"Can't export a {asset_type.value}.", print_to_script_editor=True)
-        return
+        return mp.ExportOutcome.FAILED
+
+    scene_path = mp.get_current_scene_path()
+    if use_cache and fetch_cached_export(scene_path, export_folder_path, asset_type) is not None:
+        return mp.ExportOutcome.CACHED
 
     export_filename = mp.get_current_scene_name_without_ext()
     export_filepath = export_folder_path / export_filename
+    # Read before exporting, exporting re-opens the scene
+    importer_settings = _get_model_importer_settings(node, asset_type, export_filename)
+    user_properties = _get_user_properties(node, asset_type)
 
+    exported = False
     if asset_type is mp.AssetType.MESH:
-        _export_mesh(node, export_filepath)
+        exported = _export_mesh(node, export_filepath)
     elif asset_type is mp.AssetType.SKINNED_MESH:
-        _export_skinned_mesh(node, export_filepath)
+        exported = _export_skinned_mesh(node, export_filepath)
     elif asset_type is mp.AssetType.ANIMATION:
-        _export_animation(node, export_filepath)
+        exported = _export_animation(node, export_filepath)
+    if not exported:
+        return mp.ExportOutcome.FAILED
+
+    # Unity imports the FBX with these settings the first time, instead of fixing them up and re-importing it
+    fbx_path = export_folder_path / f"{export_filename}.fbx"
+    _write_model_importer_meta(fbx_path, importer_settings)
+    # While a PublishBatch is active the new FBX is still in the staging folder
+    fbx_path = mp.get_pending_path(fbx_path)
+    if not _verify_fbx(fbx_path, user_properties, asset_type is mp.AssetType.ANIMATION):
+        return mp.ExportOutcome.SUCCEEDED  # Not cached, so the next export tries again
+
+    try:
+        _get_artifact_cache().put(_get_artifact_cache_key(scene_path, asset_type), [fbx_path],
+                                  {"importer_settings": importer_settings.to_dict()})
+    except OSError as e:
+        # Only means the next export of the same asset isn't fetched, so it doesn't stop this one
+        mp.debug_warning(f"Couldn't cache {fbx_path.name}: {e}")
+    return mp.ExportOutcome.SUCCEEDED
+
+
+def _get_artifact_cache() -> mp.ArtifactCache:
+    return mp.ArtifactCache(mp.get_artifact_cache_path(mp.get_maya_project_path()))
+
+
+def _get_artifact_cache_key(scene_path: Path, asset_type: mp.AssetType) -> str:
+    # Other exporter versions write different FBXs from the same scene
+    pm.loadPlugin("fbxmaya", quiet=True)
+    settings = {"maya": pm.about(apiVersion=True), "fbx": pm.pluginInfo("fbxmaya", query=True, version=True)}
+    if asset_type is mp.AssetType.ANIMATION:
+        settings["sample_rate"] = _get_default_animation_sample_rate()
+        settings["native_fbx"] = os.environ.get(mp.NATIVE_ANIMATION_FBX_ENV_VAR) == "1"
+    return mp.get_artifact_cache_key(scene_path, mp.get_maya_project_path(),
+                                     FBX_PRESETS_PATH / _FBX_PRESETS[asset_type], settings)
+
+
+def _get_user_properties(node: pm.PyNode, asset_type: mp.AssetType) -> dict[str, object]:
+    """
+    :return: The Asset node's extra attributes the AssetPostProcessor reads from the FBX, asset_type first
+    """
+    user_properties = {mp.ASSET_TYPE_ATTR_NAME: asset_type.value}
+    for attr_name in (mp.STATIC_ATTR_NAME, mp.LOOP_ATTR_NAME):
+        if node.hasAttr(attr_name):
+            user_properties[attr_name] = bool(node.getAttr(attr_name))
+    return user_properties
+
+
+def _verify_fbx(fbx_path: Path, user_properties: dict[str, object], has_animation: bool) -> bool:
+    """
+    Checks the exported FBX has the user properties and data Unity needs. Problems are logged, the FBX is kept.
+    :return: False if the FBX has problems
+    """
+    try:
+        inspection = mp.inspect_fbx(fbx_path)
+    except (OSError, ValueError, struct.error) as e:
+        mp.debug_log(f"Not verifying {fbx_path.name}: {e}")
+        return True
+
+    problems = mp.verify_fbx(inspection, user_properties, has_animation)
+    for problem in problems:
+        mp.debug_error(f"{fbx_path.name}: {problem}", print_to_script_editor=True)
+    mp.debug_log(f"Verified {inspection} in {inspection.duration * 1000:.0f}ms.")
+    return not problems
+
+
+def _write_model_importer_meta(fbx_path: Path, importer_settings: mp.ModelImporterSettings):
+    try:
+        if mp.write_model_importer_meta(fbx_path, importer_settings):
+            mp.debug_log(f"Wrote: {mp.get_meta_path(fbx_path)}")
+    except OSError as e:
+        mp.debug_warning(f"Couldn't write the .meta file for {fbx_path.name}: {e}", print_to_script_editor=True)
 
 
 def _export_mesh(node: pm.PyNode, export_filepath: Path):
     mp.debug_log("Exporting Mesh...")
 
-    _export_fbx(node, export_filepath, fbx_preset="mesh.fbxexportpreset")
+    # Saves Unity from cleaning up the meshes on every import, and adds LODs if the asset asks for them. The scene is
+    # re-opened after exporting, so the saved meshes aren't changed.
+    try:
+        mp.optimize_meshes(node)
+        lod_count = node.getAttr(mp.LOD_COUNT_ATTR_NAME) if node.hasAttr(mp.LOD_COUNT_ATTR_NAME) else 0
+        if lod_count > 0:
+            mp.create_lods(node, lod_count)
+    except Exception as e:
+        mp.debug_error(f"Exception while optimizing meshes: {e}", print_to_script_editor=True)
+        _reopen_current_file()
+        return False
+
+    return _export_fbx(node, export_filepath, fbx_preset=_FBX_PRESETS[mp.AssetType.MESH])
 
 
 def _export_skinned_mesh(node: pm.PyNode, export_filepath: Path):
     mp.debug_log("Exporting Skinned Mesh...")
-    _export_fbx(node, export_filepath, fbx_preset="skinned_mesh.fbxexportpreset")
+
+    # Unity only skins with a few influences per vertex anyway. The scene is re-opened after exporting, so the
+    # saved weights aren't changed.
+    try:
+        mp.prune_skin_clusters(node)
+    except Exception as e:
+        mp.debug_error(f"Exception while pruning skin weights: {e}", print_to_script_editor=True)
+        _reopen_current_file()
+        return False
+
+    return _export_fbx(node, export_filepath, fbx_preset=_FBX_PRESETS[mp.AssetType.SKINNED_MESH])
 
 
 def _export_animation(node: pm.PyNode, export_filepath: Path):
     try:
         mp.debug_log("Exporting Animation...")
 
+        # Baking only needs the rig and skeleton, so whatever else is referenced isn't loaded or evaluated
+        mp.load_references_for_export([mp.AssetType.RIG, mp.AssetType.SKELETON])
+
         # Find the rig
         rig_node = _get_descendent_of_asset_type(node, mp.AssetType.RIG)
         if not rig_node:
             mp.debug_error("Didn't find rig node.", print_to_script_editor=True)
-            return
+            return False
 
         rig_ref_node = pm.referenceQuery(rig_node, referenceNode=True)
         rig_ref = pm.FileReference(rig_ref_node)
 
         if not rig_ref:
             mp.debug_error("No rig reference found.", print_to_script_editor=True)
-            return
+            return False
+
+        # The same clip and rig always bake to the same keys, so hashing them before the rig is imported lets
+        # re-exports reuse the last bake
+        bake_cache_key = mp.get_bake_cache_key(mp.get_current_scene_path(), Path(rig_ref.path))
 
         # Import rig and remove its namespace
         rig_ref.importContents(removeNamespace=True)
@@ -73,15 +276,33 @@ def _export_animation(node: pm.PyNode, export_filepath: Path):
         skeleton_node = _get_descendent_of_asset_type(node, mp.AssetType.SKELETON)
         if not skeleton_node:
             mp.debug_error("No skeleton found.", print_to_script_editor=True)
-            return
+            return False
 
         # Move Skeleton under the Asset node
         skeleton_node.unlock()
         skeleton_node.setParent(node)
 
-        # Bake animation
+        # Joints that aren't skinned, animated or in the rig's keep list aren't baked or exported
         joints = pm.listRelatives(skeleton_node, allDescendents=True, type="joint")
-        _bake_joints(joints)  # Bake animation on skeleton
+        joint_names = mp.get_joint_names(joints, skeleton_node)
+        keep_patterns = mp.parse_keep_joints(rig_node.getAttr(mp.KEEP_JOINTS_ATTR_NAME)
+                                             if rig_node.hasAttr(mp.KEEP_JOINTS_ATTR_NAME) else "")
+        skinned_joint_names = set(mp.get_joint_names(mp.get_weighted_joints(pm.ls(type="skinCluster")),
+                                                     skeleton_node))
+        driven_joint_names = set(mp.get_joint_names(mp.get_driven_joints(joints), skeleton_node))
+        joints_to_bake = set(mp.get_needed_joints(joint_names, skinned_joint_names | driven_joint_names,
+                                                  keep_patterns))
+        joints = [joint for joint, joint_name in zip(joints, joint_names) if joint_name in joints_to_bake]
+
+        # Bake animation
+        baked_animation = _bake_joints_or_use_cache(joints, skeleton_node, bake_cache_key)  # Bake animation on skeleton
+        needed_joint_names = set()
+        frames = None
+        if baked_animation:
+            needed_joint_names = set(mp.get_needed_joints(
+                joint_names, skinned_joint_names | set(mp.get_animated_joints(baked_animation)), keep_patterns))
+            frames, baked_animation = _resample_joints(node, skeleton_node, baked_animation.get_joints(
+                [joint_name for joint_name in baked_animation.joint_names if joint_name in needed_joint_names]))
 
         # Delete constraints
         _delete_constraints_in_descendents(skeleton_node)
@@ -92,27 +313,98 @@ def _export_animation(node: pm.PyNode, export_filepath: Path):
         rig_node.unlock()
         pm.delete(rig_node)
 
-        _export_fbx(node, export_filepath, fbx_preset="animation.fbxexportpreset")
+        _delete_unused_joints(skeleton_node, [joint_name for joint_name in joint_names
+                                              if joint_name not in needed_joint_names])
+
+        if baked_animation and os.environ.get(mp.NATIVE_ANIMATION_FBX_ENV_VAR) == "1":
+            exported = _write_animation_fbx(node, skeleton_node, export_filepath, baked_animation, frames)
+        else:
+            exported = _export_fbx(node, export_filepath, fbx_preset=_FBX_PRESETS[mp.AssetType.ANIMATION])
     except Exception as e:
         mp.debug_error(f"Exception during animation export: {e}", print_to_script_editor=True)
+        return False
     else:
         mp.debug_log("Finished animation export.")
+        return exported
 
 
-def _export_fbx(node: pm.PyNode, export_filepath: Path, fbx_preset: str):
+def _export_fbx(node: pm.PyNode, export_filepath: Path, fbx_preset: str) -> bool:
+    """
+    Exports to a temporary folder first, and only replaces the FBX if the normalized export is different, so Unity
+    doesn't re-import assets that didn't change.
+    :return: True if the export worked
+    """
     pm.select(node, replace=True)
 
     mp.debug_log(f"Trying to export FBX to: {export_filepath}.fbx")
     try:
         export_filepath.parent.mkdir(parents=True, exist_ok=True)
         pm.mel.FBXLoadExportPresetFile(f=FBX_PRESETS_PATH / fbx_preset)
-        pm.mel.FBXExport(f=export_filepath, s=True)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_filepath = Path(temp_dir) / export_filepath.name
+            pm.mel.FBXExport(f=temp_filepath, s=True)
+            changed = mp.write_fbx_if_changed(Path(f"{temp_filepath}.fbx"), Path(f"{export_filepath}.fbx"))
     except Exception as e:
         mp.debug_error(f"Exception during export: {e}", print_to_script_editor=True)
         _reopen_current_file()
+        return False
     else:
-        mp.debug_log(f"Exported: {export_filepath}.fbx", print_to_script_editor=True)
+        if changed:
+            mp.debug_log(f"Exported: {export_filepath}.fbx", print_to_script_editor=True)
+        else:
+            mp.debug_log(f"Exported: {export_filepath}.fbx is unchanged, left it as it was.",
+                         print_to_script_editor=True)
+        _reopen_current_file()
+        return True
+
+
+def _write_animation_fbx(node: pm.PyNode, skeleton_node: pm.PyNode, export_filepath: Path,
+                         baked_animation: mp.BakedAnimation, frames: np.ndarray) -> bool:
+    """
+    Writes the FBX with write_animation_fbx instead of Maya's FBX plugin, from the joints left in the skeleton and
+    their baked animation. Exports with the FBX plugin instead if a joint is under a node that isn't a joint, which
+    write_animation_fbx doesn't write.
+    :param frames: The frame of each sample if the animation was resampled
+    :return: True if the export worked
+    """
+    mp.debug_log(f"Writing FBX to: {export_filepath}.fbx")
+    try:
+        joints = pm.listRelatives(skeleton_node, allDescendents=True, type="joint")
+        joint_names = mp.get_joint_names(joints, skeleton_node)
+        definitions = []
+        # Parents before their children
+        for joint, joint_name in sorted(zip(joints, joint_names), key=lambda pair: pair[1].count("|")):
+            definitions.append(mp.FbxJointDefinition(
+                joint_name, tuple(joint.getAttr("jointOrient")), joint.getAttr("rotateOrder"),
+                tuple(joint.getAttr(channel) for channel in mp.BAKED_CHANNELS)))
+    except Exception as e:
+        mp.debug_error(f"Exception while reading the joints: {e}", print_to_script_editor=True)
         _reopen_current_file()
+        return False
+
+    exported_joint_names = set(joint_names)
+    if any(definition.parent_name and definition.parent_name not in exported_joint_names
+           for definition in definitions):
+        mp.debug_log("A joint is under a node that isn't a joint, exporting with the FBX plugin instead.")
+        return _export_fbx(node, export_filepath, fbx_preset=_FBX_PRESETS[mp.AssetType.ANIMATION])
+
+    try:
+        export_filepath.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_filepath = Path(temp_dir) / f"{export_filepath.name}.fbx"
+            mp.write_animation_fbx(temp_filepath, node.nodeName(), skeleton_node.nodeName(), definitions,
+                                   baked_animation, pm.mel.currentTimeUnitToFPS(), frames,
+                                   _get_user_properties(node, mp.AssetType.ANIMATION))
+            changed = mp.write_fbx_if_changed(temp_filepath, Path(f"{export_filepath}.fbx"))
+    except Exception as e:
+        mp.debug_error(f"Exception while writing the FBX: {e}", print_to_script_editor=True)
+        _reopen_current_file()
+        return False
+
+    mp.debug_log(f"Exported: {export_filepath}.fbx{'' if changed else ' is unchanged, left it as it was.'}",
+                 print_to_script_editor=True)
+    _reopen_current_file()
+    return True
 
 
 def _get_descendent_of_asset_type(node: pm.PyNode, asset_type: mp.AssetType) -> pm.PyNode:
@@ -140,6 +432,103 @@ def _reopen_current_file():
     pm.openFile(filepath=filepath_str, force=True)
 
 
+def _bake_joints_or_use_cache(joints: list[pm.joint], skeleton_node: pm.PyNode,
+                              cache_key: str) -> mp.BakedAnimation:
+    """
+    :return: The baked animation, None if there are no joints
+    """
+    if not joints:
+        mp.debug_log("No joints to bake.")
+        return None
+
+    start_frame = int(pm.playbackOptions(query=True, minTime=True))
+    end_frame = int(pm.playbackOptions(query=True, maxTime=True))
+    cache = mp.BakeCache(mp.get_bake_cache_path(mp.get_maya_project_path()))
+
+    baked_animation = cache.get(cache_key)
+    if (baked_animation and baked_animation.joint_names == mp.get_joint_names(joints, skeleton_node)
+            and baked_animation.start_frame == start_frame and baked_animation.end_frame == end_frame):
+        mp.debug_log("Using cached bake...")
+        mp.apply_baked_animation(baked_animation, skeleton_node)
+        return baked_animation
+
+    _bake_joints(joints)
+    baked_animation = mp.read_baked_animation(joints, skeleton_node, start_frame, end_frame)
+    try:
+        cache.put(cache_key, baked_animation)
+    except OSError as e:
+        # Only makes the next export slower, so it doesn't stop this one
+        mp.debug_warning(f"Couldn't cache the bake: {e}")
+    return baked_animation
+
+
+def _resample_joints(node: pm.PyNode, skeleton_node: pm.PyNode,
+                     baked_animation: mp.BakedAnimation) -> tuple[np.ndarray, mp.BakedAnimation]:
+    """
+    :return: The frame of each sample (None if it wasn't resampled) and the animation the joints have now
+    """
+    scene_rate = pm.mel.currentTimeUnitToFPS()
+    sample_rate = _get_animation_sample_rate(node)
+    if not sample_rate or sample_rate >= scene_rate:
+        return None, baked_animation  # Only ever fewer keys, resampling up would just make the file bigger
+
+    skeleton_name = skeleton_node.longName()
+    rotate_orders = [pm.getAttr(f"{skeleton_name}{joint_name}.rotateOrder")
+                     for joint_name in baked_animation.joint_names]
+    frames, resampled_animation = mp.resample_baked_animation(baked_animation, scene_rate, sample_rate, rotate_orders)
+    mp.debug_log(f"Resampling animation from {scene_rate:g} to {sample_rate:g} fps "
+                 f"({baked_animation.frame_count} -> {len(frames)} keys per channel)...")
+    mp.apply_baked_animation(resampled_animation, skeleton_node, frames=frames.tolist())
+    return frames, resampled_animation
+
+
+def _delete_unused_joints(skeleton_node: pm.PyNode, unused_joint_names: list[str]):
+    if not unused_joint_names:
+        return
+
+    skeleton_name = skeleton_node.longName()
+    # Deleting a joint deletes everything under it, and nothing under an unused joint is used
+    for joint_name in mp.get_topmost_joints(unused_joint_names):
+        joint = pm.PyNode(f"{skeleton_name}{joint_name}")
+        joint.unlock()
+        pm.delete(joint)
+    mp.debug_log(f"Pruned {len(unused_joint_names)} unused joints: "
+                 f"{', '.join(joint_name.rsplit('|', 1)[-1] for joint_name in unused_joint_names)}")
+
+
+def _get_model_importer_settings(node: pm.PyNode, asset_type: mp.AssetType,
+                                 export_filename: str) -> mp.ModelImporterSettings:
+    if asset_type is not mp.AssetType.ANIMATION:
+        return mp.get_model_importer_settings(asset_type)
+
+    # A new Hero@Walk.fbx gets a Walk clip, one that was imported before keeps its clip's name (see
+    # write_model_importer_meta)
+    return mp.get_model_importer_settings(
+        asset_type, clip_name=export_filename.split("@", 1)[-1],
+        first_frame=pm.playbackOptions(query=True, minTime=True),
+        last_frame=pm.playbackOptions(query=True, maxTime=True),
+        loop=node.hasAttr(mp.LOOP_ATTR_NAME) and bool(node.getAttr(mp.LOOP_ATTR_NAME)))
+
+
+def _get_animation_sample_rate(node: pm.PyNode) -> float:
+    """
+    :return: The Asset node's sample_rate attribute, or the sample rate from the Settings if it doesn't have one.
+             0 keeps every frame.
+    """
+    if node.hasAttr(mp.SAMPLE_RATE_ATTR_NAME):
+        sample_rate = node.getAttr(mp.SAMPLE_RATE_ATTR_NAME)
+        if sample_rate > 0:
+            return sample_rate
+    return _get_default_animation_sample_rate()
+
+
+def _get_default_animation_sample_rate() -> float:
+    try:
+        return float(mp.read_setting(mp.SettingsKeys.ANIMATION_SAMPLE_RATE))
+    except ValueError:
+        return 0.0
+
+
 def _bake_joints(joints: list[pm.joint]):
     if not joints:
         mp.debug_log("No joints to bake.")
@@ -148,7 +537,8 @@ def _bake_joints(joints: list[pm.joint]):
     minTime = (pm.playbackOptions(query=True, minTime=True))
     maxTime = (pm.playbackOptions(query=True, maxTime=True))
     mp.debug_log("Baking animation...")
-    pm.bakeResults(joints, time=(minTime, maxTime))
+    # The FBX only keeps the joints, so the deformers on the skinned mesh don't need to be evaluated while baking
+    mp.bake_joints_isolated(joints, minTime, maxTime)
 
 
 class ConstraintType(Enum):
@@ -0,0 +1,152 @@
+# Python
+from enum import Enum
+from pathlib import Path
+import sqlite3
+import statistics
+
+from maya_pipeline.misc.pipeline_paths import get_pipeline_cache_path
+
+__all__ = ["EXPORT_HISTORY_FILENAME", "HISTORY_SAMPLE_SIZE", "ExportOutcome", "ExportRecord", "ExportHistory",
+           "get_export_history_path"]
+
+EXPORT_HISTORY_FILENAME = "export_history.sqlite"
+# Expected durations are the median of this many recent successful exports, so one slow run doesn't skew them
+HISTORY_SAMPLE_SIZE = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exports (
+    id INTEGER PRIMARY KEY,
+    asset_path TEXT NOT NULL,
+    asset_type TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    source_size INTEGER NOT NULL,
+    output_size INTEGER NOT NULL,
+    joint_count INTEGER NOT NULL,
+    frame_count INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS exports_by_asset ON exports (asset_path, started_at);
+"""
+
+
+class ExportOutcome(Enum):
+    SUCCEEDED = "Succeeded"
+    # Fetched from the artifact cache instead of exported, so it doesn't count towards the expected durations
+    CACHED = "Cached"
+    FAILED = "Failed"
+
+
+class ExportRecord:
+    def __init__(self, asset_path: str, asset_type: str, started_at: float, duration: float, source_size: int,
+                 output_size: int = 0, joint_count: int = 0, frame_count: int = 0,
+                 outcome: ExportOutcome = ExportOutcome.SUCCEEDED, message: str = ""):
+        """
+        :param asset_path: Path relative to the scenes folder (posix style)
+        :param started_at: Time the export started (seconds since the epoch)
+        :param duration: Seconds the export took
+        :param source_size: Size of the .ma file in bytes
+        :param output_size: Size of the exported .fbx file in bytes
+        """
+        self.asset_path = asset_path
+        self.asset_type = asset_type
+        self.started_at = started_at
+        self.duration = duration
+        self.source_size = source_size
+        self.output_size = output_size
+        self.joint_count = joint_count
+        self.frame_count = frame_count
+        self.outcome = outcome
+        self.message = message
+
+    def to_dict(self) -> dict:
+        return {"asset_path": self.asset_path, "asset_type": self.asset_type, "started_at": self.started_at,
+                "duration": self.duration, "source_size": self.source_size, "output_size": self.output_size,
+                "joint_count": self.joint_count, "frame_count": self.frame_count, "outcome": self.outcome.value,
+                "message": self.message}
+
+    @staticmethod
+    def from_dict(data: dict) -> "ExportRecord":
+        return ExportRecord(data["asset_path"], data["asset_type"], data["started_at"], data["duration"],
+                            data["source_size"], data["output_size"], data["joint_count"], data["frame_count"],
+                            ExportOutcome(data["outcome"]), data["message"])
+
+    def __repr__(self):
+        return f"ExportRecord({self.asset_path}, {self.outcome.value}, {self.duration:.2f}s)"
+
+
+class ExportHistory:
+    """
+    SQLite database of every export's duration, output size, joint/frame counts and outcome.
+    Only the coordinating process writes to it; worker processes return ExportRecords instead.
+    """
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.db_path))
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "ExportHistory":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._connection.close()
+
+    def add(self, records: list[ExportRecord]):
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO exports (asset_path, asset_type, started_at, duration, source_size, output_size, "
+                "joint_count, frame_count, outcome, message) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(record.asset_path, record.asset_type, record.started_at, record.duration, record.source_size,
+                  record.output_size, record.joint_count, record.frame_count, record.outcome.value, record.message)
+                 for record in records])
+
+    def get_records(self, asset_path: str, limit: int = 20) -> list[ExportRecord]:
+        """
+        :return: The asset's most recent exports, newest first
+        """
+        rows = self._connection.execute(
+            "SELECT asset_path, asset_type, started_at, duration, source_size, output_size, joint_count, "
+            "frame_count, outcome, message FROM exports WHERE asset_path = ? ORDER BY started_at DESC LIMIT ?",
+            (asset_path, limit)).fetchall()
+        return [ExportRecord(*row[:8], ExportOutcome(row[8]), row[9]) for row in rows]
+
+    def get_expected_durations(self, asset_path: str = None) -> dict[str, float]:
+        """
+        :param asset_path: Only get this asset's expected duration
+        :return: Median duration of each asset's recent successful exports, by asset path
+        """
+        asset_filter = "AND asset_path = ?" if asset_path is not None else ""
+        parameters = [ExportOutcome.SUCCEEDED.value] + ([asset_path] if asset_path is not None else [])
+        rows = self._connection.execute(
+            "SELECT asset_path, duration FROM ("
+            "  SELECT asset_path, duration, "
+            "  ROW_NUMBER() OVER (PARTITION BY asset_path ORDER BY started_at DESC) AS recency "
+            f"  FROM exports WHERE outcome = ? {asset_filter}"
+            ") WHERE recency <= ?",
+            parameters + [HISTORY_SAMPLE_SIZE]).fetchall()
+
+        durations: dict[str, list[float]] = {}
+        for path, duration in rows:
+            durations.setdefault(path, []).append(duration)
+        return {path: statistics.median(values) for path, values in durations.items()}
+
+    def get_seconds_per_byte(self) -> float:
+        """
+        :return: Average export time per byte of .ma file, used to estimate assets that were never exported.
+                 None if nothing has been exported yet.
+        """
+        total_duration, total_size = self._connection.execute(
+            "SELECT SUM(duration), SUM(source_size) FROM exports WHERE outcome = ? AND source_size > 0",
+            (ExportOutcome.SUCCEEDED.value,)).fetchone()
+        if not total_size:
+            return None
+        return total_duration / total_size
+
+
+def get_export_history_path(maya_project_path: Path) -> Path:
+    return get_pipeline_cache_path(maya_project_path) / EXPORT_HISTORY_FILENAME
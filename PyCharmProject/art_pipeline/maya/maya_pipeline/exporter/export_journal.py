@@ -0,0 +1,170 @@
+# Python
+import hashlib
+import json
+import os
+from pathlib import Path
+import time
+
+from maya_pipeline.exporter.export_history import ExportOutcome, ExportRecord
+from maya_pipeline.exporter.publishing import get_pending_path
+from maya_pipeline.misc.pipeline_paths import get_pipeline_cache_path
+
+__all__ = ["EXPORT_JOURNAL_FILENAME", "DEFAULT_MAX_EXPORT_ATTEMPTS", "ExportJournal", "get_export_journal_path"]
+
+EXPORT_JOURNAL_FILENAME = "export_journal.jsonl"
+# Exports that were running when Maya (or the whole batch) crashed this many times are quarantined
+DEFAULT_MAX_EXPORT_ATTEMPTS = 3
+_START, _RELEASE, _FINISH, _QUARANTINE = "start", "release", "finish", "quarantine"
+
+
+class _AssetProgress:
+    def __init__(self):
+        # Starts since the last finish, each one but a running export's is a crash
+        self.unfinished_starts = 0
+        self.finish: dict = None
+        self.quarantine_message: str = None
+
+
+class ExportJournal:
+    """
+    Append-only log of a batch export's progress: when each export started and finished, and a hash of the FBX it
+    wrote. A batch restarted after a crash reads it back to skip the exports that finished, and to retry the ones
+    that were running (a bounded number of times, see DEFAULT_MAX_EXPORT_ATTEMPTS).
+    Every line is flushed to disk before the export it describes goes on, so a crash loses at most the line being
+    written, which is ignored when reading.
+    """
+    def __init__(self, journal_path: Path):
+        self.journal_path = Path(journal_path)
+        self._progress: dict[str, _AssetProgress] = {}
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        ends_with_newline = self._read()
+        self._file = open(self.journal_path, "a", encoding="utf-8")
+        if not ends_with_newline:
+            self._file.write("\n")  # After a line a crash cut off, which would swallow the next one otherwise
+
+    def __enter__(self) -> "ExportJournal":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._progress)
+
+    def close(self):
+        self._file.close()
+
+    def start(self, asset_path: str):
+        self._append({"event": _START, "asset_path": asset_path, "time": time.time()})
+
+    def release(self, asset_path: str):
+        """
+        Takes back the last start, for an export that failed along with others without being shown to be the cause
+        """
+        self._append({"event": _RELEASE, "asset_path": asset_path, "time": time.time()})
+
+    def finish(self, record: ExportRecord, source_path: Path, output_path: Path):
+        """
+        :param source_path: The .ma file, which the export saves, so it's read after the export
+        :param output_path: The FBX the export wrote (or left unchanged), where it's published. Its staged copy is
+                            read while it waits in a PublishBatch (see get_pending_path).
+        """
+        current_output_path = get_pending_path(output_path)
+        entry = {"event": _FINISH, "asset_path": record.asset_path, "time": time.time(),
+                 "outcome": record.outcome.value, "source": _get_signature(source_path),
+                 "output_path": str(output_path), "output": _get_signature(current_output_path),
+                 "output_hash": _hash_file(current_output_path)}
+        self._append(entry)
+
+    def quarantine(self, asset_path: str, message: str):
+        self._append({"event": _QUARANTINE, "asset_path": asset_path, "time": time.time(), "message": message})
+
+    def is_finished(self, asset_path: str, source_path: Path, output_path: Path) -> bool:
+        """
+        Publishing a staged FBX moves it and keeps its modified time, so it's still finished after its PublishBatch
+        commits.
+        :param output_path: Where the FBX is published
+        :return: True if the asset was exported, and neither its .ma file nor its FBX changed since
+        """
+        progress = self._progress.get(asset_path)
+        if progress is None or progress.finish is None or progress.unfinished_starts:
+            return False
+
+        finish = progress.finish
+        if finish["outcome"] == ExportOutcome.FAILED.value or finish["output_hash"] is None:
+            return False
+        if finish["source"] != _get_signature(source_path) or finish["output_path"] != str(output_path):
+            return False
+        # Only hashed when the stats changed, so resuming a big batch doesn't read every FBX again
+        output_path = get_pending_path(output_path)
+        output_signature = _get_signature(output_path)
+        return output_signature is not None and (output_signature == finish["output"]
+                                                 or _hash_file(output_path) == finish["output_hash"])
+
+    def get_attempt_count(self, asset_path: str) -> int:
+        """
+        :return: How many times the asset's export was started without finishing, e.g. because it crashed Maya
+        """
+        progress = self._progress.get(asset_path)
+        return progress.unfinished_starts if progress is not None else 0
+
+    def get_quarantine_message(self, asset_path: str) -> str:
+        """
+        :return: Why the asset was quarantined, None if it isn't
+        """
+        progress = self._progress.get(asset_path)
+        return progress.quarantine_message if progress is not None else None
+
+    def _append(self, entry: dict):
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._apply(entry)
+
+    def _read(self) -> bool:
+        """
+        :return: False if the last line didn't end, because a crash cut it off
+        """
+        line = "\n"
+        try:
+            with open(self.journal_path, "r", encoding="utf-8", errors="replace") as file:
+                for line in file:
+                    try:
+                        self._apply(json.loads(line))
+                    except (ValueError, KeyError):
+                        continue  # The line a crash cut off
+        except FileNotFoundError:
+            pass
+        return line.endswith("\n")
+
+    def _apply(self, entry: dict):
+        progress = self._progress.setdefault(entry["asset_path"], _AssetProgress())
+        if entry["event"] == _START:
+            progress.unfinished_starts += 1
+        elif entry["event"] == _RELEASE:
+            progress.unfinished_starts = max(0, progress.unfinished_starts - 1)
+        elif entry["event"] == _FINISH:
+            progress.unfinished_starts = 0
+            progress.finish = entry
+        elif entry["event"] == _QUARANTINE:
+            progress.quarantine_message = entry["message"]
+
+
+def get_export_journal_path(maya_project_path: Path) -> Path:
+    return get_pipeline_cache_path(maya_project_path) / EXPORT_JOURNAL_FILENAME
+
+
+def _get_signature(path: Path) -> list[int]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _hash_file(path: Path) -> str:
+    try:
+        with open(path, "rb") as file:
+            return hashlib.sha1(file.read()).hexdigest()
+    except OSError:
+        return None
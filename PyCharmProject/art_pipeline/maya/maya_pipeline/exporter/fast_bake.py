@@ -0,0 +1,231 @@
+# Python
+import os
+import time
+
+import numpy as np
+
+# Maya
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+import maya.cmds as cmds
+import pymel.core as pm
+
+import maya_pipeline as mp
+
+__all__ = ["BAKED_CHANNELS", "VERIFY_BAKE_ENV_VAR", "BAKE_TOLERANCE", "bake_joints_isolated", "sample_joint_channels",
+           "compare_joint_samples", "get_joint_names", "get_driven_joints", "read_baked_animation",
+           "apply_baked_animation"]
+
+BAKED_CHANNELS = ["translateX", "translateY", "translateZ", "rotateX", "rotateY", "rotateZ",
+                  "scaleX", "scaleY", "scaleZ"]
+# Set to 1 to check every isolated bake against the full scene evaluation (slower, for testing rigs)
+VERIFY_BAKE_ENV_VAR = "MAYA_PIPELINE_VERIFY_BAKE"
+# Largest allowed difference between the isolated bake and the full evaluation, in scene units and degrees
+BAKE_TOLERANCE = 1e-3
+# Connections to these move a joint, so it needs baking
+_DRIVEN_ATTRIBUTES = ["translate", "rotate", "scale", "offsetParentMatrix"] + BAKED_CHANNELS
+# nodeState value that makes a node pass its input through without computing anything
+_HAS_NO_EFFECT = 1
+# Nodes a deformed mesh can feed without anything in the rig depending on it
+_GEOMETRY_CONSUMER_TYPES = ["geometryFilter", "shape", "shadingEngine", "groupParts", "objectSet"]
+
+
+def bake_joints_isolated(joints: list[pm.joint], start_time: float, end_time: float, verify: bool = None):
+    """
+    Bakes the joints while evaluating as little of the scene as possible:
+    deformers (skin clusters, blend shapes, etc.) are switched off, the viewport doesn't refresh, and the scene is
+    evaluated in DG mode, which only pulls the rig-to-joint part of the graph instead of the whole scene every frame.
+    Everything is restored afterwards.
+    :param verify: Compare the result with the full scene evaluation, and undo the bake and bake again normally if
+                   they differ. Defaults to the VERIFY_BAKE_ENV_VAR environment variable.
+    """
+    if verify is None:
+        verify = os.environ.get(VERIFY_BAKE_ENV_VAR, "0") == "1"
+
+    if not verify:
+        _bake_in_isolation(joints, start_time, end_time)
+        return
+
+    # The reference values come from the unmodified scene, so they're sampled before anything is switched off
+    reference_samples = sample_joint_channels(joints, start_time, end_time)
+
+    # The bake switches off the constraints driving the joints, so to bake again it's undone first. getAttr isn't
+    # undoable, so sampling the bake doesn't add anything to undo after it.
+    undo_state = pm.undoInfo(query=True, state=True)
+    pm.undoInfo(state=True)
+    try:
+        pm.undoInfo(openChunk=True, chunkName="bake_joints_isolated")
+        try:
+            _bake_in_isolation(joints, start_time, end_time)
+        finally:
+            pm.undoInfo(closeChunk=True)
+
+        max_difference, worst_channel = compare_joint_samples(reference_samples,
+                                                              sample_joint_channels(joints, start_time, end_time))
+        if max_difference > BAKE_TOLERANCE:
+            mp.debug_warning(f"Isolated bake differs from the full evaluation by {max_difference} on "
+                             f"{worst_channel}, baking again with the whole scene.", print_to_script_editor=True)
+            pm.undo()
+            pm.bakeResults(joints, time=(start_time, end_time))
+        else:
+            mp.debug_log(f"Isolated bake matches the full evaluation (max difference: {max_difference}).")
+    finally:
+        pm.undoInfo(stateWithoutFlush=undo_state)
+
+
+def sample_joint_channels(joints: list[pm.joint], start_time: float,
+                          end_time: float) -> dict[str, list[float]]:
+    """
+    :return: Each channel's value on every frame, keyed on "joint.channel"
+    """
+    frames = range(int(start_time), int(end_time) + 1)
+    samples = {}
+    for joint in joints:
+        for channel in BAKED_CHANNELS:
+            plug = f"{joint.longName()}.{channel}"
+            samples[plug] = [cmds.getAttr(plug, time=frame) for frame in frames]
+    return samples
+
+
+def compare_joint_samples(expected: dict[str, list[float]], actual: dict[str, list[float]]) -> tuple[float, str]:
+    """
+    :return: The largest difference between the samples, and the channel and frame index it's on
+    """
+    max_difference = 0.0
+    worst_channel = ""
+    for plug, expected_values in expected.items():
+        for index, (expected_value, actual_value) in enumerate(zip(expected_values, actual[plug])):
+            difference = abs(expected_value - actual_value)
+            if difference > max_difference:
+                max_difference = difference
+                worst_channel = f"{plug} (frame index {index})"
+    return max_difference, worst_channel
+
+
+def get_joint_names(joints: list[pm.joint], skeleton_node: pm.PyNode) -> list[str]:
+    # Relative to the skeleton node, so the names don't depend on where the skeleton is parented
+    skeleton_name = skeleton_node.longName()
+    return [joint.longName()[len(skeleton_name):] for joint in joints]
+
+
+def get_driven_joints(joints: list[pm.joint]) -> list[pm.joint]:
+    """
+    :return: The joints with something connected to their transform (e.g. keys or constraints from the rig)
+    """
+    driven = []
+    for joint in joints:
+        joint_name = joint.longName()
+        if any(cmds.listConnections(f"{joint_name}.{attribute}", source=True, destination=False)
+               for attribute in _DRIVEN_ATTRIBUTES):
+            driven.append(joint)
+    return driven
+
+
+def read_baked_animation(joints: list[pm.joint], skeleton_node: pm.PyNode, start_frame: int,
+                         end_frame: int) -> mp.BakedAnimation:
+    """
+    Reads the baked keys of every joint channel into a BakedAnimation, for the bake cache.
+    """
+    frame_count = end_frame - start_frame + 1
+    values = np.empty((frame_count, len(joints), len(BAKED_CHANNELS)), dtype=np.float32)
+
+    for joint_index, joint in enumerate(joints):
+        for channel_index, channel in enumerate(BAKED_CHANNELS):
+            plug = f"{joint.longName()}.{channel}"
+            keys = cmds.keyframe(plug, query=True, time=(start_frame, end_frame), valueChange=True) or []
+            if len(keys) != frame_count:
+                # Not keyed on every frame (e.g. a locked channel), so sample it instead
+                keys = [cmds.getAttr(plug, time=frame) for frame in range(start_frame, end_frame + 1)]
+            values[:, joint_index, channel_index] = keys
+
+    return mp.BakedAnimation(get_joint_names(joints, skeleton_node), list(BAKED_CHANNELS), start_frame, values)
+
+
+def apply_baked_animation(baked_animation: mp.BakedAnimation, skeleton_node: pm.PyNode, frames: list[float] = None):
+    """
+    Keys the joints with baked values (e.g. from the bake cache), replacing their keys and whatever drives their
+    channels.
+    :param frames: The frame of each sample, defaults to every frame from the animation's start frame
+    """
+    skeleton_name = skeleton_node.longName()
+    if frames is None:
+        frames = range(baked_animation.start_frame, baked_animation.end_frame + 1)
+    times = om2.MTimeArray([om2.MTime(float(frame), om2.MTime.uiUnit()) for frame in frames])
+    # Keys are added in internal units (centimeters and radians), the cache holds UI units like getAttr returns
+    linear_scale = om2.MDistance.uiToInternal(1.0)
+    angular_scale = om2.MAngle.uiToInternal(1.0)
+
+    for joint_index, joint_name in enumerate(baked_animation.joint_names):
+        for channel_index, channel in enumerate(baked_animation.channel_names):
+            plug_name = f"{skeleton_name}{joint_name}.{channel}"
+            if cmds.getAttr(plug_name, lock=True):
+                continue
+
+            cmds.cutKey(plug_name, clear=True)
+            for source in cmds.listConnections(plug_name, source=True, destination=False, plugs=True) or []:
+                cmds.disconnectAttr(source, plug_name)
+
+            values = baked_animation.get_channel(joint_index, channel_index).astype(np.float64)
+            if channel.startswith("translate"):
+                values = values * linear_scale
+            elif channel.startswith("rotate"):
+                values = values * angular_scale
+
+            selection = om2.MSelectionList()
+            selection.add(plug_name)
+            anim_curve = oma2.MFnAnimCurve()
+            anim_curve.create(selection.getPlug(0))
+            anim_curve.addKeys(times, values.tolist())
+
+
+def _bake_in_isolation(joints: list[pm.joint], start_time: float, end_time: float):
+    bake_start_time = time.perf_counter()
+    evaluation_mode = pm.evaluationManager(query=True, mode=True)[0]
+    disabled_deformers = _disable_deformers_the_joints_dont_need()
+    cmds.refresh(suspend=True)
+
+    try:
+        pm.evaluationManager(mode="off")
+        pm.bakeResults(joints, time=(start_time, end_time), simulation=False, sampleBy=1,
+                       preserveOutsideKeys=True, disableImplicitControl=True)
+    finally:
+        pm.evaluationManager(mode=evaluation_mode)
+        cmds.refresh(suspend=False)
+        _restore_node_states(disabled_deformers)
+
+    mp.debug_log(f"Baked {len(joints)} joints ({len(disabled_deformers)} deformers disabled) in "
+                 f"{time.perf_counter() - bake_start_time:.2f}s.")
+
+
+def _disable_deformers_the_joints_dont_need() -> dict[str, int]:
+    """
+    :return: The original nodeState of every deformer that was disabled
+    """
+    disabled = {}
+    for deformer in cmds.ls(type="geometryFilter") or []:
+        if _deformer_drives_something(deformer):
+            continue  # e.g. a follicle or pointOnPoly constraint on the skinned mesh that the rig depends on
+
+        plug = f"{deformer}.nodeState"
+        if cmds.getAttr(plug, lock=True) or cmds.listConnections(plug, source=True, destination=False):
+            continue
+
+        disabled[deformer] = cmds.getAttr(plug)
+        cmds.setAttr(plug, _HAS_NO_EFFECT)
+    return disabled
+
+
+def _deformer_drives_something(deformer: str) -> bool:
+    shapes = cmds.deformer(deformer, query=True, geometry=True) or []
+    for shape in shapes:
+        consumers = cmds.listConnections(shape, source=False, destination=True) or []
+        for consumer in consumers:
+            if not any(cmds.objectType(consumer, isAType=node_type) for node_type in _GEOMETRY_CONSUMER_TYPES):
+                return True
+    return False
+
+
+def _restore_node_states(node_states: dict[str, int]):
+    for node, node_state in node_states.items():
+        if cmds.objExists(node):
+            cmds.setAttr(f"{node}.nodeState", node_state)
@@ -0,0 +1,433 @@
+# Python
+import itertools
+import os
+import struct
+from pathlib import Path
+import zlib
+
+import numpy as np
+
+from maya_pipeline.exporter.bake_cache import BakedAnimation
+from maya_pipeline.exporter.fbx_inspection import FbxRecord, read_fbx
+from maya_pipeline.exporter.fbx_normalization import FbxNode, serialize_fbx
+from maya_pipeline.exporter.unity_meta import MAYA_FBX_TAKE_NAME
+
+__all__ = ["NATIVE_ANIMATION_FBX_ENV_VAR", "FBX_TIME_UNITS_PER_SECOND", "FBX_ANIMATION_CHANNELS",
+           "FbxJointDefinition", "create_animation_fbx", "write_animation_fbx", "read_animation_fbx"]
+
+# Set to 1 to write animation FBXs with write_animation_fbx instead of Maya's FBX plugin
+NATIVE_ANIMATION_FBX_ENV_VAR = "MAYA_PIPELINE_NATIVE_ANIMATION_FBX"
+# FBX times (KTime) are in these units
+FBX_TIME_UNITS_PER_SECOND = 46186158000
+# Maya channels (like BakedAnimation.channel_names) and the FBX property and curve they're written to
+FBX_ANIMATION_CHANNELS = {
+    "translateX": ("Lcl Translation", "d|X"), "translateY": ("Lcl Translation", "d|Y"),
+    "translateZ": ("Lcl Translation", "d|Z"), "rotateX": ("Lcl Rotation", "d|X"),
+    "rotateY": ("Lcl Rotation", "d|Y"), "rotateZ": ("Lcl Rotation", "d|Z"),
+    "scaleX": ("Lcl Scaling", "d|X"), "scaleY": ("Lcl Scaling", "d|Y"), "scaleZ": ("Lcl Scaling", "d|Z"),
+}
+_CURVE_NODE_NAMES = {"Lcl Translation": "T", "Lcl Rotation": "R", "Lcl Scaling": "S"}
+_REST_VALUES = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0)
+# Maya's rotateOrder to FBX's EFbxRotationOrder
+_FBX_ROTATION_ORDERS = [0, 2, 4, 1, 3, 5]
+# FbxTime::EMode of the frame rates that have one, everything else is custom (14)
+_FBX_TIME_MODES = {120: 1, 100: 2, 60: 3, 50: 4, 48: 5, 30: 6, 25: 10, 24: 11, 1000: 12, 96: 15, 72: 16}
+_FBX_CUSTOM_TIME_MODE = 14
+# Linear interpolation, baked keys are on every sample so there's nothing to interpolate smoothly
+_KEY_ATTR_FLAGS_LINEAR = 0x00000004
+_FIRST_OBJECT_ID = 1000000000
+# Same fixed file id and creation time as fbx_normalization writes, so both produce the same kind of file
+_FILE_ID = b"\x28\xb3\x2a\xeb\xb6\x24\xcc\xc2\xbf\xc8\xb0\x2a\xa9\x2b\xfc\xf1"
+_CREATION_TIME = "1970-01-01 10:00:00:000"
+_CREATOR = "maya_pipeline"
+_FBX_VERSION = 7700
+
+
+class FbxJointDefinition:
+    def __init__(self, name: str, joint_orient: tuple[float, float, float] = (0.0, 0.0, 0.0),
+                 rotate_order: int = 0, rest_values: tuple[float, ...] = _REST_VALUES):
+        """
+        :param name: Joint path relative to the skeleton node, e.g. |Hips|Spine (like BakedAnimation.joint_names)
+        :param joint_orient: In degrees, written as the FBX's pre-rotation like Maya's exporter does
+        :param rotate_order: Maya's rotateOrder
+        :param rest_values: translate, rotate and scale for the channels that aren't animated
+        """
+        self.name = name
+        self.joint_orient = tuple(joint_orient)
+        self.rotate_order = rotate_order
+        self.rest_values = tuple(rest_values)
+
+    @property
+    def short_name(self) -> str:
+        return self.name.rsplit("|", 1)[-1]
+
+    @property
+    def parent_name(self) -> str:
+        """
+        :return: The parent's path, "" for joints directly under the skeleton node
+        """
+        return self.name.rsplit("|", 1)[0] if "|" in self.name.lstrip("|") else ""
+
+    def __repr__(self):
+        return f"FbxJointDefinition({self.name})"
+
+
+def create_animation_fbx(root_name: str, skeleton_name: str, joints: list[FbxJointDefinition],
+                         baked_animation: BakedAnimation, frame_rate: float, frames: np.ndarray = None,
+                         user_properties: dict[str, object] = None, take_name: str = MAYA_FBX_TAKE_NAME) -> bytes:
+    """
+    Builds a binary FBX of a joint hierarchy and its baked animation, laid out like Maya's FBX plugin does:
+    <root_name> (with the user properties) > <skeleton_name> > joints, and one take with a curve per channel.
+    The same input always gives the same bytes.
+    :param joints: Parents before their children, and every joint's parent one of them (or the skeleton node), so it
+                   reads back with the same paths. Joints without baked animation keep their rest values.
+    :param frame_rate: Frames per second the frames are in
+    :param frames: Frame of each sample, defaults to every frame from the animation's start frame
+    :param user_properties: Written in order, so the asset type should be first for Unity
+    :raises ValueError: If a joint's parent isn't one of the joints
+    """
+    if frames is None:
+        frames = np.arange(baked_animation.start_frame, baked_animation.start_frame + baked_animation.frame_count)
+    times = np.round(np.asarray(frames, dtype=np.float64) / frame_rate * FBX_TIME_UNITS_PER_SECOND).astype(np.int64)
+    start_time, stop_time = (int(times[0]), int(times[-1])) if len(times) else (0, 0)
+    # Numbered in the order they're written, like fbx_normalization renumbers them
+    ids = itertools.count(_FIRST_OBJECT_ID)
+
+    document_id = next(ids)
+    objects, connections = [], []
+    counts = {}
+
+    def add_model(name: str, model_type: str, parent_id: int, properties: list[FbxNode]) -> int:
+        attribute_id, model_id = next(ids), next(ids)
+        objects.append(FbxNode("NodeAttribute", [("L", attribute_id), _string("\x00\x01NodeAttribute"),
+                                                 _string(model_type)],
+                               [FbxNode("TypeFlags", [_string("Skeleton" if model_type == "LimbNode" else "Null")])]))
+        objects.append(FbxNode("Model", [("L", model_id), _string(f"{name}\x00\x01Model"), _string(model_type)], [
+            FbxNode("Version", [("I", 232)]),
+            FbxNode("Properties70", children=properties, has_sentinel=True),
+            FbxNode("Shading", [("C", 1)]),
+            FbxNode("Culling", [_string("CullingOff")]),
+        ]))
+        connections.append(_connect(attribute_id, model_id))
+        connections.append(_connect(model_id, parent_id))
+        counts["NodeAttribute"] = counts.get("NodeAttribute", 0) + 1
+        counts["Model"] = counts.get("Model", 0) + 1
+        return model_id
+
+    root_properties = _get_transform_properties(_REST_VALUES)
+    for name, value in (user_properties or {}).items():
+        root_properties.append(_get_user_property(name, value))
+    root_id = add_model(root_name, "Null", 0, root_properties)
+    skeleton_id = add_model(skeleton_name, "Null", root_id, _get_transform_properties(_REST_VALUES))
+
+    joint_ids = {}
+    for joint in joints:
+        parent_name = joint.parent_name
+        if parent_name and parent_name not in joint_ids:
+            raise ValueError(f"The parent of {joint.name} isn't one of the joints (or comes after it).")
+        properties = [
+            _property("RotationOrder", "enum", "", "", ("I", _FBX_ROTATION_ORDERS[joint.rotate_order])),
+            _property("RotationActive", "bool", "", "", ("I", 1)),
+            _property("InheritType", "enum", "", "", ("I", 1)),
+            _property("PreRotation", "Vector3D", "Vector", "",
+                      *[("D", float(value)) for value in joint.joint_orient]),
+            _property("DefaultAttributeIndex", "int", "Integer", "", ("I", 0)),
+        ] + _get_transform_properties(joint.rest_values)
+        joint_ids[joint.name] = add_model(joint.short_name, "LimbNode", joint_ids.get(parent_name, skeleton_id),
+                                          properties)
+
+    stack_id, layer_id = next(ids), next(ids)
+    objects.append(FbxNode("AnimationStack", [("L", stack_id), _string(f"{take_name}\x00\x01AnimStack"),
+                                              _string("")], [
+        FbxNode("Properties70", children=[
+            _property(name, "KTime", "Time", "", ("L", value))
+            for name, value in (("LocalStart", start_time), ("LocalStop", stop_time),
+                                ("ReferenceStart", start_time), ("ReferenceStop", stop_time))]),
+    ]))
+    objects.append(FbxNode("AnimationLayer", [("L", layer_id), _string("BaseLayer\x00\x01AnimLayer"), _string("")],
+                           has_sentinel=True))
+    connections.append(_connect(layer_id, stack_id))
+    counts["AnimationStack"] = counts["AnimationLayer"] = 1
+
+    key_times = _array("l", times)
+    key_attributes = [("KeyAttrFlags", _array("i", np.array([_KEY_ATTR_FLAGS_LINEAR], dtype=np.int32))),
+                      ("KeyAttrDataFloat", _array("f", np.zeros(4, dtype=np.float32))),
+                      ("KeyAttrRefCount", _array("i", np.array([len(times)], dtype=np.int32)))]
+    joint_indices = {joint_name: index for index, joint_name in enumerate(baked_animation.joint_names)}
+    for joint in joints:
+        joint_index = joint_indices.get(joint.name)
+        if joint_index is None:
+            continue
+
+        curve_nodes = {}
+        for channel_index, channel_name in enumerate(baked_animation.channel_names):
+            if channel_name not in FBX_ANIMATION_CHANNELS:
+                continue
+            property_name, curve_name = FBX_ANIMATION_CHANNELS[channel_name]
+            values = np.asarray(baked_animation.get_channel(joint_index, channel_index), dtype=np.float32)
+
+            if property_name not in curve_nodes:
+                curve_node_id = next(ids)
+                curve_nodes[property_name] = (curve_node_id, FbxNode("Properties70", has_sentinel=True))
+                objects.append(FbxNode("AnimationCurveNode", [
+                    ("L", curve_node_id), _string(f"{_CURVE_NODE_NAMES[property_name]}\x00\x01AnimCurveNode"),
+                    _string("")], [curve_nodes[property_name][1]]))
+                connections.append(_connect(curve_node_id, layer_id))
+                connections.append(_connect(curve_node_id, joint_ids[joint.name], property_name))
+                counts["AnimationCurveNode"] = counts.get("AnimationCurveNode", 0) + 1
+            curve_node_id, curve_node_properties = curve_nodes[property_name]
+            default = float(values[0]) if len(values) else 0.0
+            curve_node_properties.children.append(_property(curve_name, "Number", "", "A", ("D", default)))
+
+            curve_id = next(ids)
+            objects.append(FbxNode("AnimationCurve", [("L", curve_id), _string("\x00\x01AnimCurve"), _string("")], [
+                FbxNode("Default", [("D", default)]),
+                FbxNode("KeyVer", [("I", 4009)]),
+                FbxNode("KeyTime", [key_times]),
+                FbxNode("KeyValueFloat", [_array("f", values)]),
+            ] + [FbxNode(name, [value]) for name, value in key_attributes]))
+            connections.append(_connect(curve_id, curve_node_id, curve_name))
+            counts["AnimationCurve"] = counts.get("AnimationCurve", 0) + 1
+
+    nodes = [
+        _get_header_extension(),
+        FbxNode("FileId", [("R", _FILE_ID)]),
+        FbxNode("CreationTime", [_string(_CREATION_TIME)]),
+        FbxNode("Creator", [_string(_CREATOR)]),
+        _get_global_settings(frame_rate, start_time, stop_time),
+        FbxNode("Documents", children=[
+            FbxNode("Count", [("I", 1)]),
+            FbxNode("Document", [("L", document_id), _string("Scene"), _string("Scene")], [
+                FbxNode("Properties70", children=[_property("SourceObject", "object", "", ""),
+                                                  _property("ActiveAnimStackName", "KString", "", "",
+                                                            _string(take_name))]),
+                FbxNode("RootNode", [("L", 0)]),
+            ]),
+        ]),
+        FbxNode("References", has_sentinel=True),
+        FbxNode("Definitions", children=[
+            FbxNode("Version", [("I", 100)]),
+            FbxNode("Count", [("I", sum(counts.values()) + 1)]),
+            FbxNode("ObjectType", [_string("GlobalSettings")], [FbxNode("Count", [("I", 1)])]),
+        ] + [FbxNode("ObjectType", [_string(object_type)], [FbxNode("Count", [("I", count)])])
+             for object_type, count in counts.items()]),
+        FbxNode("Objects", children=objects, has_sentinel=True),
+        FbxNode("Connections", children=connections, has_sentinel=True),
+        FbxNode("Takes", children=[
+            FbxNode("Current", [_string(take_name)]),
+            FbxNode("Take", [_string(take_name)], [
+                FbxNode("FileName", [_string(f"{take_name.replace(' ', '_')}.tak")]),
+                FbxNode("LocalTime", [("L", start_time), ("L", stop_time)]),
+                FbxNode("ReferenceTime", [("L", start_time), ("L", stop_time)]),
+            ]),
+        ]),
+    ]
+    return serialize_fbx(_FBX_VERSION, nodes)
+
+
+def write_animation_fbx(path: Path, root_name: str, skeleton_name: str, joints: list[FbxJointDefinition],
+                        baked_animation: BakedAnimation, frame_rate: float, frames: np.ndarray = None,
+                        user_properties: dict[str, object] = None, verify: bool = True):
+    """
+    Writes the FBX from create_animation_fbx, through a .tmp file so Unity never sees half of it.
+    :param verify: Read the file back and check it has the same animation
+    :raises ValueError: If a joint's parent isn't one of the joints, or verify is on and the file doesn't read back
+                        the same
+    """
+    data = create_animation_fbx(root_name, skeleton_name, joints, baked_animation, frame_rate, frames,
+                                user_properties)
+    temp_path = Path(path).with_name(Path(path).name + ".tmp")
+    with open(temp_path, "wb") as file:
+        file.write(data)
+
+    if verify:
+        try:
+            _verify_animation_fbx(temp_path, joints, baked_animation, frame_rate, frames)
+        except (ValueError, KeyError, struct.error, zlib.error) as e:
+            temp_path.unlink(missing_ok=True)
+            raise ValueError(f"{Path(path).name} didn't read back the same: {e}") from e
+    os.replace(temp_path, path)
+
+
+def read_animation_fbx(path: Path) -> tuple[np.ndarray, BakedAnimation]:
+    """
+    Reads the joints' animation from a binary FBX, like BakedAnimation holds it. Every curve has to have the same
+    keys, like baked ones do. Channels without a curve get the joint's value.
+    :return: The frame of each key, and the animation of every LimbNode in the order they're in the file, named
+             by their path from the first model above them that isn't a joint
+    :raises ValueError: If it isn't a binary FBX
+    """
+    with read_fbx(path) as fbx_file:
+        frame_rate = 0.0
+        global_settings = fbx_file.find("GlobalSettings")
+        for prop in _get_properties70(global_settings):
+            if prop.properties[0] == "CustomFrameRate":
+                frame_rate = prop.properties[4]
+        if frame_rate <= 0:
+            raise ValueError(f"{Path(path).name} has no frame rate.")
+
+        objects = fbx_file.find("Objects")
+        objects_by_id = {fbx_object.properties[0]: fbx_object for fbx_object in objects.children} if objects else {}
+        parents, curve_node_targets, curve_targets = {}, {}, {}
+        connections = fbx_file.find("Connections")
+        for connection in connections.children if connections else []:
+            kind, child_id, parent_id = connection.properties[:3]
+            if kind == "OO":
+                parents.setdefault(child_id, parent_id)
+            elif kind == "OP" and child_id in objects_by_id:
+                child_type = objects_by_id[child_id].name
+                if child_type == "AnimationCurveNode":
+                    curve_node_targets[child_id] = (parent_id, connection.properties[3])
+                elif child_type == "AnimationCurve":
+                    curve_targets[child_id] = (parent_id, connection.properties[3])
+
+        joint_ids = [object_id for object_id, fbx_object in objects_by_id.items()
+                     if fbx_object.name == "Model" and fbx_object.properties[2] == "LimbNode"]
+        joint_names = [_get_joint_path(joint_id, objects_by_id, parents) for joint_id in joint_ids]
+        joint_indices = {joint_id: index for index, joint_id in enumerate(joint_ids)}
+        channel_indices = {target: index for index, target in enumerate(FBX_ANIMATION_CHANNELS.values())}
+
+        times = None
+        curves = []
+        for curve_id, (curve_node_id, curve_name) in curve_targets.items():
+            joint_id, property_name = curve_node_targets.get(curve_node_id, (None, None))
+            if joint_id not in joint_indices or (property_name, curve_name) not in channel_indices:
+                continue
+            curve = objects_by_id[curve_id]
+            curve_times = curve.find("KeyTime").properties[0].read()
+            if times is None:
+                times = curve_times
+            elif not np.array_equal(times, curve_times):
+                raise ValueError(f"The curves in {Path(path).name} don't all have the same keys.")
+            curves.append((joint_indices[joint_id], channel_indices[(property_name, curve_name)],
+                           curve.find("KeyValueFloat").properties[0].read()))
+
+        times = times if times is not None else np.zeros(0, dtype=np.int64)
+        values = np.empty((len(times), len(joint_ids), len(FBX_ANIMATION_CHANNELS)), dtype=np.float32)
+        for joint_index, joint_id in enumerate(joint_ids):
+            values[:, joint_index, :] = _get_transform_values(objects_by_id[joint_id])
+        for joint_index, channel_index, curve_values in curves:
+            values[:, joint_index, channel_index] = curve_values
+
+    frames = times / FBX_TIME_UNITS_PER_SECOND * frame_rate
+    start_frame = int(round(frames[0])) if len(frames) else 0
+    return frames, BakedAnimation(joint_names, list(FBX_ANIMATION_CHANNELS), start_frame, values)
+
+
+def _verify_animation_fbx(path: Path, joints: list[FbxJointDefinition], baked_animation: BakedAnimation,
+                          frame_rate: float, frames: np.ndarray):
+    read_frames, read_animation = read_animation_fbx(path)
+    if read_animation.joint_names != [joint.name for joint in joints]:
+        raise ValueError("The joints are different.")
+    if frames is None:
+        frames = np.arange(baked_animation.start_frame, baked_animation.start_frame + baked_animation.frame_count)
+    # Times are whole FBX time units, so frames come back a tiny bit off
+    if not np.allclose(read_frames, frames, rtol=0.0, atol=1e-6 * frame_rate):
+        raise ValueError("The key times are different.")
+
+    read_indices = {joint_name: index for index, joint_name in enumerate(read_animation.joint_names)}
+    channel_indices = [index for index, channel_name in enumerate(baked_animation.channel_names)
+                       if channel_name in FBX_ANIMATION_CHANNELS]
+    read_channel_indices = [list(FBX_ANIMATION_CHANNELS).index(baked_animation.channel_names[index])
+                            for index in channel_indices]
+    for joint_index, joint_name in enumerate(baked_animation.joint_names):
+        if joint_name not in read_indices:
+            continue
+        expected = np.asarray(baked_animation.values[:, joint_index, channel_indices], dtype=np.float32)
+        if not np.array_equal(read_animation.values[:, read_indices[joint_name], read_channel_indices], expected):
+            raise ValueError(f"The keys of {joint_name} are different.")
+
+
+def _get_joint_path(joint_id: int, objects_by_id: dict[int, FbxRecord], parents: dict[int, int]) -> str:
+    names = []
+    while joint_id in objects_by_id and objects_by_id[joint_id].properties[2] == "LimbNode":
+        names.append(objects_by_id[joint_id].properties[1].split("\x00\x01", 1)[0])
+        joint_id = parents.get(joint_id)
+    return "".join(f"|{name}" for name in reversed(names))
+
+
+def _get_transform_values(model: FbxRecord) -> list[float]:
+    values = list(_REST_VALUES)
+    offsets = {"Lcl Translation": 0, "Lcl Rotation": 3, "Lcl Scaling": 6}
+    for prop in _get_properties70(model):
+        if prop.properties[0] in offsets:
+            offset = offsets[prop.properties[0]]
+            values[offset:offset + 3] = prop.properties[4:7]
+    return values
+
+
+def _get_properties70(record: FbxRecord) -> list[FbxRecord]:
+    properties70 = record.find("Properties70") if record is not None else None
+    return [prop for prop in properties70.children if prop.name == "P"] if properties70 is not None else []
+
+
+def _get_header_extension() -> FbxNode:
+    time_stamp = [FbxNode("Version", [("I", 1000)])] + [
+        FbxNode(name, [("I", value)]) for name, value in (("Year", 1970), ("Month", 1), ("Day", 1), ("Hour", 10),
+                                                          ("Minute", 0), ("Second", 0), ("Millisecond", 0))]
+    return FbxNode("FBXHeaderExtension", children=[
+        FbxNode("FBXHeaderVersion", [("I", 1003)]),
+        FbxNode("FBXVersion", [("I", _FBX_VERSION)]),
+        FbxNode("EncryptionType", [("I", 0)]),
+        FbxNode("CreationTimeStamp", children=time_stamp),
+        FbxNode("Creator", [_string(_CREATOR)]),
+    ])
+
+
+def _get_global_settings(frame_rate: float, start_time: int, stop_time: int) -> FbxNode:
+    # Maya's defaults: Y up, centimeters
+    properties = [_property(name, "int", "Integer", "", ("I", value))
+                  for name, value in (("UpAxis", 1), ("UpAxisSign", 1), ("FrontAxis", 2), ("FrontAxisSign", 1),
+                                      ("CoordAxis", 0), ("CoordAxisSign", 1), ("OriginalUpAxis", 1),
+                                      ("OriginalUpAxisSign", 1))]
+    properties += [
+        _property("UnitScaleFactor", "double", "Number", "", ("D", 1.0)),
+        _property("OriginalUnitScaleFactor", "double", "Number", "", ("D", 1.0)),
+        _property("TimeMode", "enum", "", "",
+                  ("I", _FBX_TIME_MODES.get(frame_rate, _FBX_CUSTOM_TIME_MODE) if float(frame_rate).is_integer()
+                   else _FBX_CUSTOM_TIME_MODE)),
+        _property("TimeSpanStart", "KTime", "Time", "", ("L", start_time)),
+        _property("TimeSpanStop", "KTime", "Time", "", ("L", stop_time)),
+        _property("CustomFrameRate", "double", "Number", "", ("D", float(frame_rate))),
+    ]
+    return FbxNode("GlobalSettings", children=[FbxNode("Version", [("I", 1000)]),
+                                               FbxNode("Properties70", children=properties)])
+
+
+def _get_transform_properties(values: tuple[float, ...]) -> list[FbxNode]:
+    return [_property(name, name, "", "A", *[("D", float(value)) for value in values[offset:offset + 3]])
+            for offset, name in ((0, "Lcl Translation"), (3, "Lcl Rotation"), (6, "Lcl Scaling"))]
+
+
+def _get_user_property(name: str, value: object) -> FbxNode:
+    # The types Maya's FBX plugin writes extra attributes as
+    if isinstance(value, bool):
+        return _property(name, "Bool", "", "A+U", ("I", int(value)))
+    if isinstance(value, int):
+        return _property(name, "int", "Integer", "A+U", ("I", value))
+    if isinstance(value, float):
+        return _property(name, "Number", "", "A+U", ("D", value))
+    return _property(name, "KString", "", "U", _string(str(value)))
+
+
+def _property(name: str, type_name: str, data_type: str, flags: str, *values: tuple[str, object]) -> FbxNode:
+    return FbxNode("P", [_string(name), _string(type_name), _string(data_type), _string(flags)] + list(values))
+
+
+def _connect(child_id: int, parent_id: int, property_name: str = None) -> FbxNode:
+    if property_name is None:
+        return FbxNode("C", [_string("OO"), ("L", child_id), ("L", parent_id)])
+    return FbxNode("C", [_string("OP"), ("L", child_id), ("L", parent_id), _string(property_name)])
+
+
+def _string(value: str) -> tuple[str, bytes]:
+    return "S", value.encode("utf-8")
+
+
+def _array(type_code: str, values: np.ndarray) -> tuple[str, bytes]:
+    """
+    :return: An array property, zlib compressed like the FBX SDK writes them
+    """
+    dtype = {"f": "<f4", "d": "<f8", "l": "<i8", "i": "<i4"}[type_code]
+    data = zlib.compress(np.ascontiguousarray(values, dtype=dtype).tobytes())
+    return type_code, struct.pack("<III", len(values), 1, len(data)) + data
@@ -0,0 +1,347 @@
+# Python
+import argparse
+import json
+import mmap
+import struct
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from maya_pipeline.exporter.fbx_normalization import FBX_BINARY_MAGIC
+
+__all__ = ["FbxArray", "FbxRecord", "FbxFile", "FbxInspection", "read_fbx", "inspect_fbx", "verify_fbx"]
+
+_SCALAR_FORMATS = {"Y": "<h", "C": "<?", "I": "<i", "F": "<f", "D": "<d", "L": "<q"}
+_ARRAY_DTYPES = {"f": np.float32, "d": np.float64, "l": np.int64, "i": np.int32, "b": np.bool_}
+# How the FBX SDK flags a user defined property (Maya's extra attributes) in a Properties70 "P" record
+_USER_PROPERTY_FLAG = "U"
+
+
+class FbxArray:
+    """
+    An array property that's only decompressed when it's read, until then it's just a position in the file.
+    """
+    def __init__(self, type_code: str, length: int, encoding: int, buffer: mmap.mmap, offset: int, byte_count: int):
+        """
+        :param encoding: 0 for raw, 1 for zlib
+        :param offset: Where the array's bytes start in the buffer
+        :param byte_count: Size of the array in the file, compressed if it's compressed
+        """
+        self.type_code = type_code
+        self.length = length
+        self.encoding = encoding
+        self.byte_count = byte_count
+        self._buffer = buffer
+        self._offset = offset
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(_ARRAY_DTYPES[self.type_code]).newbyteorder("<")
+
+    def read(self) -> np.ndarray:
+        """
+        :raises ValueError: If the FbxFile it's from was closed
+        """
+        data = self._buffer[self._offset:self._offset + self.byte_count]
+        if self.encoding == 1:
+            data = zlib.decompress(data)
+        return np.frombuffer(data, dtype=self.dtype, count=self.length)
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return f"FbxArray({self.type_code}, {self.length})"
+
+
+class FbxRecord:
+    def __init__(self, name: str, properties: list, children: list["FbxRecord"]):
+        """
+        :param properties: Numbers, str for S properties, bytes for R, and FbxArray for arrays
+        """
+        self.name = name
+        self.properties = properties
+        self.children = children
+
+    def find(self, name: str) -> "FbxRecord":
+        for child in self.children:
+            if child.name == name:
+                return child
+        return None
+
+    def find_all(self, name: str) -> list["FbxRecord"]:
+        return [child for child in self.children if child.name == name]
+
+    def __repr__(self):
+        return f"FbxRecord({self.name}, {len(self.properties)} properties, {len(self.children)} children)"
+
+
+class FbxFile:
+    """
+    A binary FBX memory-mapped for reading. Records are parsed up front, but arrays stay in the file until they're
+    read, so large meshes cost no more than their record headers.
+    Use as a context manager, arrays can't be read after it's closed.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._buffer = b""  # An empty file can't be mapped
+        if self._buffer[:len(FBX_BINARY_MAGIC)] != FBX_BINARY_MAGIC:
+            self.close()
+            raise ValueError(f"{self.path.name} isn't a binary FBX.")
+
+        self.version = struct.unpack_from("<I", self._buffer, len(FBX_BINARY_MAGIC))[0]
+        self.records = []
+        offset = len(FBX_BINARY_MAGIC) + 4
+        while True:
+            record, offset = self._parse_record(offset)
+            if record is None:
+                break
+            self.records.append(record)
+
+    def __enter__(self) -> "FbxFile":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.records = []
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._file.close()
+
+    def find(self, name: str) -> FbxRecord:
+        for record in self.records:
+            if record.name == name:
+                return record
+        return None
+
+    def _parse_record(self, offset: int) -> tuple[FbxRecord, int]:
+        """
+        :return: The record (None for a null record) and the offset after it
+        """
+        buffer = self._buffer
+        if self.version >= 7500:
+            end_offset, property_count, _, name_length = struct.unpack_from("<QQQB", buffer, offset)
+            offset += 25
+        else:
+            end_offset, property_count, _, name_length = struct.unpack_from("<IIIB", buffer, offset)
+            offset += 13
+        if end_offset == 0:
+            return None, offset
+
+        name = buffer[offset:offset + name_length].decode("utf-8")
+        offset += name_length
+        properties = []
+        for _ in range(property_count):
+            type_code = chr(buffer[offset])
+            offset += 1
+            if type_code in _SCALAR_FORMATS:
+                properties.append(struct.unpack_from(_SCALAR_FORMATS[type_code], buffer, offset)[0])
+                offset += struct.calcsize(_SCALAR_FORMATS[type_code])
+            elif type_code in "SR":
+                length = struct.unpack_from("<I", buffer, offset)[0]
+                value = buffer[offset + 4:offset + 4 + length]
+                properties.append(value.decode("utf-8", errors="replace") if type_code == "S" else value)
+                offset += 4 + length
+            elif type_code in _ARRAY_DTYPES:
+                length, encoding, compressed_length = struct.unpack_from("<III", buffer, offset)
+                properties.append(FbxArray(type_code, length, encoding, buffer, offset + 12, compressed_length))
+                offset += 12 + compressed_length
+            else:
+                raise ValueError(f"Unknown FBX property type {type_code!r} in {name}.")
+
+        children = []
+        null_record_length = 25 if self.version >= 7500 else 13
+        if offset < end_offset:
+            while offset < end_offset - null_record_length:
+                child, offset = self._parse_record(offset)
+                children.append(child)
+            offset += null_record_length
+        if offset != end_offset:
+            raise ValueError(f"FBX record {name} doesn't end where its header says.")
+        return FbxRecord(name, properties, children), offset
+
+
+class FbxInspection:
+    def __init__(self, path: Path, version: int):
+        """
+        What an exported FBX contains, read without decompressing any arrays.
+        """
+        self.path = path
+        self.version = version
+        self.record_count = 0
+        # By class, e.g. Model/LimbNode, Geometry/Mesh, AnimationCurve
+        self.object_counts: dict[str, int] = {}
+        # By model name, in the order they're in the file
+        self.user_properties: dict[str, dict[str, object]] = {}
+        self.root_models: list[str] = []
+        self.curve_count = 0
+        self.key_count = 0
+        self.vertex_count = 0
+        self.polygon_vertex_count = 0
+        # Total elements of each kind of array, e.g. Vertices, KeyTime
+        self.array_sizes: dict[str, int] = {}
+        self.duration = 0.0
+
+    @property
+    def root_user_properties(self) -> dict[str, object]:
+        """
+        The first root model's user properties, the ones Unity's OnPostprocessGameObjectWithUserProperties reads
+        """
+        return self.user_properties.get(self.root_models[0], {}) if self.root_models else {}
+
+    def to_dict(self) -> dict:
+        return {"path": str(self.path), "version": self.version, "record_count": self.record_count,
+                "object_counts": self.object_counts, "root_models": self.root_models,
+                "user_properties": self.user_properties, "curve_count": self.curve_count,
+                "key_count": self.key_count, "vertex_count": self.vertex_count,
+                "polygon_vertex_count": self.polygon_vertex_count, "array_sizes": self.array_sizes}
+
+    def __repr__(self):
+        return (f"FbxInspection({self.path.name}, {sum(self.object_counts.values())} objects, "
+                f"{self.vertex_count} vertices, {self.curve_count} curves, {self.key_count} keys)")
+
+
+def read_fbx(path: Path) -> FbxFile:
+    """
+    :raises ValueError: If it isn't a binary FBX
+    """
+    return FbxFile(path)
+
+
+def inspect_fbx(path: Path) -> FbxInspection:
+    """
+    :raises ValueError: If it isn't a binary FBX
+    """
+    start_time = time.perf_counter()
+    with read_fbx(path) as fbx_file:
+        inspection = FbxInspection(Path(path), fbx_file.version)
+        model_names = {}
+        for record in fbx_file.records:
+            _count_records(record, inspection)
+
+        objects = fbx_file.find("Objects")
+        for fbx_object in objects.children if objects is not None else []:
+            subclass = fbx_object.properties[2] if len(fbx_object.properties) > 2 else ""
+            object_class = f"{fbx_object.name}/{subclass}" if subclass else fbx_object.name
+            inspection.object_counts[object_class] = inspection.object_counts.get(object_class, 0) + 1
+
+            if fbx_object.name == "Model" and len(fbx_object.properties) > 1:
+                # Binary FBXs store names as "<name>\x00\x01<class>"
+                name = fbx_object.properties[1].split("\x00\x01", 1)[0]
+                model_names[fbx_object.properties[0]] = name
+                inspection.user_properties[name] = _get_user_properties(fbx_object)
+            elif fbx_object.name == "AnimationCurve":
+                inspection.curve_count += 1
+                key_time = fbx_object.find("KeyTime")
+                inspection.key_count += len(key_time.properties[0]) if key_time and key_time.properties else 0
+            elif fbx_object.name == "Geometry":
+                vertices = fbx_object.find("Vertices")
+                polygon_vertices = fbx_object.find("PolygonVertexIndex")
+                inspection.vertex_count += len(vertices.properties[0]) // 3 if vertices else 0
+                inspection.polygon_vertex_count += len(polygon_vertices.properties[0]) if polygon_vertices else 0
+
+        # Models connected to the scene's root (id 0) are the root game objects in Unity
+        connections = fbx_file.find("Connections")
+        for connection in connections.children if connections is not None else []:
+            properties = connection.properties
+            if len(properties) > 2 and properties[0] == "OO" and properties[2] == 0 and properties[1] in model_names:
+                inspection.root_models.append(model_names[properties[1]])
+
+    inspection.duration = time.perf_counter() - start_time
+    return inspection
+
+
+def verify_fbx(inspection: FbxInspection, expected_user_properties: dict[str, object],
+               has_animation: bool = False) -> list[str]:
+    """
+    Checks the exported FBX has what Unity's AssetPostProcessor needs.
+    :param expected_user_properties: User properties the first root model should have, the first one first
+    :param has_animation: The FBX should have animation curves with keys
+    :return: What's wrong with the FBX, nothing if it's fine
+    """
+    problems = []
+    if not inspection.root_models:
+        problems.append("Has no root model.")
+    user_properties = inspection.root_user_properties
+    if expected_user_properties and list(user_properties)[:1] != list(expected_user_properties)[:1]:
+        # Unity only reads the user properties if the asset type is the first one
+        problems.append(f"The first user property isn't {list(expected_user_properties)[0]}, Unity won't read them.")
+
+    for name, expected_value in expected_user_properties.items():
+        if name not in user_properties:
+            problems.append(f"Missing the {name} user property.")
+        elif (user_properties[name] != expected_value
+              and not (isinstance(expected_value, bool) and bool(user_properties[name]) == expected_value)):
+            problems.append(f"The {name} user property is {user_properties[name]!r}, not {expected_value!r}.")
+
+    if has_animation and inspection.key_count == 0:
+        problems.append("Has no animation keys.")
+    if not has_animation and "Geometry/Mesh" in inspection.object_counts and inspection.vertex_count == 0:
+        problems.append("Has meshes without vertices.")
+    return problems
+
+
+def _count_records(record: FbxRecord, inspection: FbxInspection):
+    records = [record]
+    while records:
+        record = records.pop()
+        inspection.record_count += 1
+        for value in record.properties:
+            if isinstance(value, FbxArray):
+                inspection.array_sizes[record.name] = inspection.array_sizes.get(record.name, 0) + value.length
+        records += record.children
+
+
+def _get_user_properties(model: FbxRecord) -> dict[str, object]:
+    """
+    :return: The values of the model's user defined properties by name, in the order they're in the file
+    """
+    properties70 = model.find("Properties70")
+    user_properties = {}
+    for record in properties70.children if properties70 is not None else []:
+        properties = record.properties
+        # P: name, type, data type, flags, value...
+        if record.name != "P" or len(properties) < 5 or _USER_PROPERTY_FLAG not in str(properties[3]):
+            continue
+        values = properties[4:]
+        user_properties[properties[0]] = values[0] if len(values) == 1 else list(values)
+    return user_properties
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report what binary FBXs contain: object counts, user properties, "
+                                                 "animation keys and array sizes.")
+    parser.add_argument("paths", nargs="+", type=Path, help="FBX files, or folders to search for them")
+    parser.add_argument("--json", action="store_true", help="Print the full reports as JSON")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for path in args.paths:
+        paths += sorted(path.rglob("*.fbx")) if path.is_dir() else [path]
+
+    start_time = time.perf_counter()
+    reports = []
+    unreadable = 0
+    for path in paths:
+        try:
+            inspection = inspect_fbx(path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"UNREADABLE {path}: {e}")
+            unreadable += 1
+            continue
+        reports.append(inspection.to_dict())
+        if not args.json:
+            print(f"{inspection}, user properties: {inspection.root_user_properties}")
+
+    if args.json:
+        print(json.dumps(reports, indent=4))
+    print(f"Inspected {len(paths)} FBXs in {time.perf_counter() - start_time:.2f}s.")
+    return 1 if unreadable else 0
@@ -0,0 +1,288 @@
+# Python
+import re
+import struct
+from pathlib import Path
+
+from maya_pipeline.exporter.publishing import get_pending_path, publish_bytes
+
+__all__ = ["FBX_BINARY_MAGIC", "FbxNode", "parse_fbx", "serialize_fbx", "normalize_fbx", "write_fbx_if_changed"]
+
+FBX_BINARY_MAGIC = b"Kaydara FBX Binary  \x00\x1a\x00"
+# The FBX SDK checks the file id, creation time and footer id against each other, so they're replaced with a set
+# that belongs together (the same ones Blender writes)
+_FILE_ID = b"\x28\xb3\x2a\xeb\xb6\x24\xcc\xc2\xbf\xc8\xb0\x2a\xa9\x2b\xfc\xf1"
+_CREATION_TIME = "1970-01-01 10:00:00:000"
+_FOOTER_ID = b"\xfa\xbc\xab\x09\xd0\xc8\xd4\x66\xb1\x76\xfb\x83\x1c\xf7\x26\x7e"
+_FOOTER_MAGIC = b"\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b"
+_CREATION_TIME_STAMP = {"Year": 1970, "Month": 1, "Day": 1, "Hour": 10, "Minute": 0, "Second": 0, "Millisecond": 0}
+_SCENE_INFO_DATE = "01/01/1970 00:00:00.000"
+# Scene info properties with the export time, or a path that's different on every machine
+_SCENE_INFO_DATES = {"Original|DateTime_GMT", "LastSaved|DateTime_GMT"}
+_SCENE_INFO_PATHS = {"DocumentUrl", "SrcDocumentUrl", "Original|FileName", "Original|ApplicationNativeFile"}
+# Object ids start here after renumbering, like the ids the FBX SDK writes they stay clear of small numbers
+_FIRST_OBJECT_ID = 1000000000
+_SCALAR_FORMATS = {"Y": "<h", "C": "<B", "I": "<i", "F": "<f", "D": "<d", "L": "<q"}
+_ARRAY_TYPES = "fdlib"
+
+
+class FbxNode:
+    def __init__(self, name: str, properties: list[tuple[str, object]] = None, children: list["FbxNode"] = None,
+                 has_sentinel: bool = False):
+        """
+        :param properties: (type code, value). Scalars are numbers, S and R are bytes, arrays are their encoded bytes
+                           (length, encoding, compressed length and data) because they're never changed.
+        :param has_sentinel: The node's children end with a null record. Always the case with children, the FBX SDK
+                             also writes one for some nodes without.
+        """
+        self.name = name
+        self.properties = properties or []
+        self.children = children or []
+        self.has_sentinel = has_sentinel or bool(self.children)
+
+    def find(self, name: str) -> "FbxNode":
+        for child in self.children:
+            if child.name == name:
+                return child
+        return None
+
+    def __repr__(self):
+        return f"FbxNode({self.name}, {len(self.properties)} properties, {len(self.children)} children)"
+
+
+def parse_fbx(data: bytes) -> tuple[int, list[FbxNode]]:
+    """
+    :return: The FBX version (e.g. 7700) and the top level nodes
+    :raises ValueError: If it isn't a binary FBX
+    """
+    if not data.startswith(FBX_BINARY_MAGIC):
+        raise ValueError("Not a binary FBX.")
+
+    version = struct.unpack_from("<I", data, len(FBX_BINARY_MAGIC))[0]
+    offset = len(FBX_BINARY_MAGIC) + 4
+    nodes = []
+    while True:
+        node, offset = _parse_node(data, offset, version)
+        if node is None:
+            return version, nodes
+        nodes.append(node)
+
+
+def serialize_fbx(version: int, nodes: list[FbxNode]) -> bytes:
+    """
+    Writes the nodes with the footer the FBX SDK expects for _FILE_ID and _CREATION_TIME.
+    """
+    chunks = [FBX_BINARY_MAGIC, struct.pack("<I", version)]
+    offset = len(FBX_BINARY_MAGIC) + 4
+    for node in nodes:
+        offset = _serialize_node(node, version, offset, chunks)
+    chunks.append(_get_null_record(version))
+    offset += len(chunks[-1])
+
+    chunks.append(_FOOTER_ID)
+    chunks.append(b"\x00" * 4)
+    offset += 20
+    # Aligned to 16 bytes, a whole 16 if it already is
+    chunks.append(b"\x00" * (((offset + 15) & ~15) - offset or 16))
+    chunks.append(struct.pack("<I", version))
+    chunks.append(b"\x00" * 120)
+    chunks.append(_FOOTER_MAGIC)
+    return b"".join(chunks)
+
+
+def normalize_fbx(data: bytes) -> bytes:
+    """
+    Replaces everything in a binary FBX that changes from one export of the same scene to the next: the creation
+    time and file id, export dates and absolute paths in the scene info, and object ids (the FBX SDK uses memory
+    addresses), which are renumbered in the order the objects are written.
+    :raises ValueError: If it isn't a binary FBX
+    """
+    version, nodes = parse_fbx(data)
+    top_level = {node.name: node for node in nodes}
+
+    if "FileId" in top_level:
+        top_level["FileId"].properties = [("R", _FILE_ID)]
+    if "CreationTime" in top_level:
+        top_level["CreationTime"].properties = [("S", _CREATION_TIME.encode("utf-8"))]
+
+    header = top_level.get("FBXHeaderExtension")
+    if header is not None:
+        _normalize_header(header)
+
+    _renumber_object_ids(top_level)
+    return serialize_fbx(version, nodes)
+
+
+def write_fbx_if_changed(source_path: Path, destination_path: Path) -> bool:
+    """
+    Normalizes the FBX at source_path (see normalize_fbx) and writes it to destination_path, unless that already has
+    the same content. An unchanged file keeps its modified time, so Unity doesn't re-import it.
+    Written with publish_bytes, so it's atomic and staged in a PublishBatch.
+    The source file is deleted. ASCII FBXs are copied as they are.
+    :return: True if destination_path was written
+    """
+    data = Path(source_path).read_bytes()
+    try:
+        data = normalize_fbx(data)
+    except (ValueError, struct.error):
+        pass  # Written as exported, it only means Unity re-imports it every time
+
+    try:
+        current_path = get_pending_path(destination_path)
+        unchanged = current_path.stat().st_size == len(data) and current_path.read_bytes() == data
+    except OSError:
+        unchanged = False
+
+    if not unchanged:
+        publish_bytes(data, destination_path)
+    Path(source_path).unlink(missing_ok=True)
+    return not unchanged
+
+
+def _parse_node(data: bytes, offset: int, version: int) -> tuple[FbxNode, int]:
+    """
+    :return: The node (None for a null record) and the offset after it
+    """
+    if version >= 7500:
+        end_offset, property_count, _, name_length = struct.unpack_from("<QQQB", data, offset)
+        offset += 25
+    else:
+        end_offset, property_count, _, name_length = struct.unpack_from("<IIIB", data, offset)
+        offset += 13
+
+    if end_offset == 0:
+        return None, offset
+
+    name = data[offset:offset + name_length].decode("utf-8")
+    offset += name_length
+    properties = []
+    for _ in range(property_count):
+        type_code = chr(data[offset])
+        offset += 1
+        if type_code in _SCALAR_FORMATS:
+            value = struct.unpack_from(_SCALAR_FORMATS[type_code], data, offset)[0]
+            offset += struct.calcsize(_SCALAR_FORMATS[type_code])
+        elif type_code in "SR":
+            length = struct.unpack_from("<I", data, offset)[0]
+            value = data[offset + 4:offset + 4 + length]
+            offset += 4 + length
+        elif type_code in _ARRAY_TYPES:
+            compressed_length = struct.unpack_from("<III", data, offset)[2]
+            value = data[offset:offset + 12 + compressed_length]
+            offset += 12 + compressed_length
+        else:
+            raise ValueError(f"Unknown FBX property type {type_code!r} in {name}.")
+        properties.append((type_code, value))
+
+    node = FbxNode(name, properties)
+    null_record_length = len(_get_null_record(version))
+    if offset < end_offset:
+        node.has_sentinel = True
+        while offset < end_offset - null_record_length:
+            child, offset = _parse_node(data, offset, version)
+            node.children.append(child)
+        offset += null_record_length
+    if offset != end_offset:
+        raise ValueError(f"FBX node {name} doesn't end where its header says.")
+    return node, offset
+
+
+def _serialize_node(node: FbxNode, version: int, offset: int, chunks: list[bytes]) -> int:
+    """
+    Appends the node to chunks
+    :param offset: Where in the file the node starts
+    :return: Where the next node starts
+    """
+    property_chunks = []
+    for type_code, value in node.properties:
+        property_chunks.append(type_code.encode("ascii"))
+        if type_code in _SCALAR_FORMATS:
+            property_chunks.append(struct.pack(_SCALAR_FORMATS[type_code], value))
+        elif type_code in "SR":
+            property_chunks.append(struct.pack("<I", len(value)) + value)
+        else:
+            property_chunks.append(value)
+    properties = b"".join(property_chunks)
+    name = node.name.encode("utf-8")
+
+    header_length = 25 if version >= 7500 else 13
+    children_offset = offset + header_length + len(name) + len(properties)
+    child_chunks = []
+    end_offset = children_offset
+    for child in node.children:
+        end_offset = _serialize_node(child, version, end_offset, child_chunks)
+    if node.has_sentinel:
+        child_chunks.append(_get_null_record(version))
+        end_offset += len(child_chunks[-1])
+
+    header_format = "<QQQB" if version >= 7500 else "<IIIB"
+    chunks.append(struct.pack(header_format, end_offset, len(node.properties), len(properties), len(name)))
+    chunks.append(name)
+    chunks.append(properties)
+    chunks.extend(child_chunks)
+    return end_offset
+
+
+def _get_null_record(version: int) -> bytes:
+    return b"\x00" * (25 if version >= 7500 else 13)
+
+
+def _normalize_header(header: FbxNode):
+    time_stamp = header.find("CreationTimeStamp")
+    if time_stamp is not None:
+        for child in time_stamp.children:
+            if child.name in _CREATION_TIME_STAMP and child.properties:
+                child.properties = [("I", _CREATION_TIME_STAMP[child.name])]
+
+    scene_info = header.find("SceneInfo")
+    properties70 = scene_info.find("Properties70") if scene_info is not None else None
+    for prop in properties70.children if properties70 is not None else []:
+        if not prop.properties or prop.properties[0][0] != "S" or prop.properties[-1][0] != "S":
+            continue
+        prop_name = prop.properties[0][1].decode("utf-8", errors="replace")
+        if prop_name in _SCENE_INFO_DATES:
+            prop.properties[-1] = ("S", _SCENE_INFO_DATE.encode("utf-8"))
+        elif prop_name in _SCENE_INFO_PATHS:
+            # Only the file name, the folders are different on every machine
+            file_name = re.split(rb"[\\/]", prop.properties[-1][1])[-1]
+            prop.properties[-1] = ("S", file_name)
+
+
+def _renumber_object_ids(top_level: dict[str, FbxNode]):
+    """
+    Objects are only referred to by id from the connections, the document's root and bind poses, so those are all
+    renumbered. If a connection refers to an id that isn't an object's, the ids are left as they are.
+    """
+    documents = top_level.get("Documents")
+    document_nodes = [document for document in documents.children
+                      if document.name == "Document"] if documents is not None else []
+    id_nodes = list(document_nodes)
+    objects = top_level.get("Objects")
+    if objects is not None:
+        id_nodes += objects.children
+
+    id_map = {}
+    for node in id_nodes:
+        if node.properties and node.properties[0][0] == "L" and node.properties[0][1] not in id_map:
+            id_map[node.properties[0][1]] = _FIRST_OBJECT_ID + len(id_map)
+    id_map[0] = 0  # The scene's root
+
+    # (node, index of the property with an id)
+    references = [(node, 0) for node in id_nodes if node.properties and node.properties[0][0] == "L"]
+    connections = top_level.get("Connections")
+    for connection in connections.children if connections is not None else []:
+        references += [(connection, index) for index in (1, 2)
+                       if index < len(connection.properties) and connection.properties[index][0] == "L"]
+    for pose in objects.children if objects is not None else []:
+        for pose_node in pose.children if pose.name == "Pose" else []:
+            node = pose_node.find("Node") if pose_node.name == "PoseNode" else None
+            if node is not None and node.properties and node.properties[0][0] == "L":
+                references.append((node, 0))
+    for document in document_nodes:
+        root_node = document.find("RootNode")
+        if root_node is not None and root_node.properties and root_node.properties[0][0] == "L":
+            references.append((root_node, 0))
+
+    if any(node.properties[index][1] not in id_map for node, index in references):
+        return
+    for node, index in references:
+        node.properties[index] = ("L", id_map[node.properties[index][1]])
@@ -0,0 +1,71 @@
+# Python
+from fnmatch import fnmatchcase
+import re
+
+import numpy as np
+
+from maya_pipeline.exporter.bake_cache import BakedAnimation
+
+__all__ = ["DEFAULT_ANIMATION_TOLERANCE", "parse_keep_joints", "is_kept_joint", "get_animated_joints",
+           "get_needed_joints", "get_topmost_joints"]
+
+# Channels that move less than this over the whole clip (in scene units, degrees and scale) count as not animated
+DEFAULT_ANIMATION_TOLERANCE = 1e-4
+
+
+def parse_keep_joints(text: str) -> list[str]:
+    """
+    :param text: Joint names or wildcard patterns separated by commas, semicolons or whitespace,
+                 e.g. "Weapon_R, Prop_*"
+    """
+    return [pattern for pattern in re.split(r"[,;\s]+", text or "") if pattern]
+
+
+def is_kept_joint(joint_name: str, keep_patterns: list[str]) -> bool:
+    """
+    :param joint_name: A joint path like |Root|Hips|Spine, or only its last name. Patterns match the last name.
+    """
+    short_name = joint_name.rsplit("|", 1)[-1]
+    return any(fnmatchcase(short_name, pattern) for pattern in keep_patterns)
+
+
+def get_animated_joints(baked_animation: BakedAnimation,
+                        tolerance: float = DEFAULT_ANIMATION_TOLERANCE) -> list[str]:
+    """
+    :return: The joints with at least one channel that changes during the clip
+    """
+    values = np.asarray(baked_animation.values)
+    if values.shape[0] == 0:
+        return []
+    ranges = values.max(axis=0) - values.min(axis=0)
+    animated = np.any(ranges > tolerance, axis=1)
+    return [name for name, is_animated in zip(baked_animation.joint_names, animated) if is_animated]
+
+
+def get_needed_joints(joint_names: list[str], used_joint_names: set[str], keep_patterns: list[str] = None) -> list[str]:
+    """
+    :param joint_names: Joint paths relative to the skeleton node, e.g. |Root|Hips|Spine
+    :param used_joint_names: Joints that have to be exported (e.g. skinned or animated)
+    :return: The used and kept joints and everything above them, in the order of joint_names
+    """
+    keep_patterns = keep_patterns or []
+    needed = set()
+    for joint_name in joint_names:
+        if joint_name in used_joint_names or is_kept_joint(joint_name, keep_patterns):
+            # A joint can't be exported without its parents
+            parts = joint_name.split("|")
+            needed.update("|".join(parts[:index]) for index in range(2, len(parts) + 1))
+    return [joint_name for joint_name in joint_names if joint_name in needed]
+
+
+def get_topmost_joints(joint_names: list[str]) -> list[str]:
+    """
+    :return: The joints that aren't below another joint in the list, so deleting them deletes the whole list
+    """
+    joint_set = set(joint_names)
+    topmost = []
+    for joint_name in joint_names:
+        parts = joint_name.split("|")
+        if not any("|".join(parts[:index]) in joint_set for index in range(2, len(parts))):
+            topmost.append(joint_name)
+    return topmost
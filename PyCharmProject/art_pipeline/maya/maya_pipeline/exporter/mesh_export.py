@@ -0,0 +1,325 @@
+# Python
+import time
+
+import numpy as np
+
+# Maya
+import maya.api.OpenMaya as om2
+import pymel.core as pm
+
+# Internal
+import maya_pipeline as mp
+
+__all__ = ["LOD_SUFFIX", "get_export_meshes", "strip_empty_uv_and_color_sets", "optimize_mesh", "optimize_meshes",
+           "create_lod", "create_lods", "get_static_mesh_parts"]
+
+# Unity puts meshes named <name>_LOD0, <name>_LOD1, ... under one parent into a LOD Group
+LOD_SUFFIX = "_LOD"
+
+
+def get_export_meshes(node: pm.PyNode) -> list[pm.nt.Mesh]:
+    """
+    :return: The meshes under the node that are exported, without intermediate objects (e.g. a skin cluster's input)
+    """
+    return [mesh for mesh in pm.listRelatives(node, allDescendents=True, type="mesh")
+            if not mesh.intermediateObject.get()]
+
+
+def strip_empty_uv_and_color_sets(mesh: pm.nt.Mesh) -> list[str]:
+    """
+    :return: Names of the deleted sets
+    """
+    mesh_fn = om2.MFnMesh(_get_dag_path(mesh))
+    deleted = []
+
+    uv_sets = mesh_fn.getUVSetNames()
+    for uv_set in uv_sets[1:]:  # A mesh always needs its first UV set
+        if mesh_fn.numUVs(uv_set) == 0:
+            pm.polyUVSet(mesh, delete=True, uvSet=uv_set)
+            deleted.append(uv_set)
+
+    for color_set in mesh_fn.getColorSetNames():
+        if mesh_fn.numColors(color_set) == 0:
+            pm.polyColorSet(mesh, delete=True, colorSet=color_set)
+            deleted.append(color_set)
+    return deleted
+
+
+def optimize_mesh(mesh: pm.nt.Mesh, weld_tolerance: float = None) -> tuple[mp.MeshStats, mp.MeshStats]:
+    """
+    Deletes history, strips empty UV and color sets, triangulates, welds vertices, and rebuilds the mesh with its
+    triangles and vertices in vertex cache friendly order. UVs, vertex colors, normals and materials are kept.
+    Changes the scene, so only for scenes that are re-opened after exporting.
+    :return: The stats before and after
+    """
+    weld_tolerance = mp.DEFAULT_WELD_TOLERANCE if weld_tolerance is None else weld_tolerance
+    transform = mesh.getParent()
+    pm.delete(transform, constructionHistory=True)
+    deleted_sets = strip_empty_uv_and_color_sets(mesh)
+    if deleted_sets:
+        mp.debug_log(f"Deleted empty UV and color sets on {mesh}: {', '.join(deleted_sets)}")
+
+    pm.polyTriangulate(mesh)
+    pm.delete(transform, constructionHistory=True)
+
+    mesh_data = _read_mesh_data(mesh)
+    before = mp.MeshStats(len(mesh_data.positions), mesh_data.triangles.size, mp.get_acmr(mesh_data.triangles))
+
+    welded_positions, weld_remap = mp.weld_vertices(mesh_data.positions, weld_tolerance)
+    triangles = weld_remap[mesh_data.triangles]
+    faces = np.flatnonzero(~mp.get_degenerate_triangles(triangles))
+    after = _rebuild_mesh(mesh, mesh_data, welded_positions, faces, triangles[faces], _get_face_corners(faces))
+    return before, after
+
+
+def optimize_meshes(node: pm.PyNode, weld_tolerance: float = None):
+    """
+    Optimizes every exported mesh under the node, see optimize_mesh. Instanced meshes are left as they are.
+    """
+    start_time = time.perf_counter()
+    befores, afters = [], []
+    for mesh in get_export_meshes(node):
+        if mesh.isInstanced():
+            mp.debug_log(f"Not optimizing {mesh}, it's instanced.")
+            continue
+
+        before, after = optimize_mesh(mesh, weld_tolerance)
+        mp.debug_log(f"Optimized {mesh}: {before} -> {after}")
+        befores.append(before)
+        afters.append(after)
+
+    before, after = mp.get_total_mesh_stats(befores), mp.get_total_mesh_stats(afters)
+    mp.debug_log(f"Optimized {len(afters)} meshes in {time.perf_counter() - start_time:.2f}s: "
+                 f"{before.vertex_count} -> {after.vertex_count} vertices, ACMR {before.acmr:.3f} -> {after.acmr:.3f}",
+                 print_to_script_editor=True)
+
+
+def create_lod(mesh: pm.nt.Mesh, triangle_count: int, name: str) -> pm.nt.Transform:
+    """
+    Duplicates the mesh under the same parent and decimates the copy, keeping its UV seams, hard edges and borders.
+    The mesh should already be triangulated (see optimize_mesh).
+    :return: The copy's transform
+    """
+    transform = mesh.getParent()
+    lod_transform = pm.duplicate(transform, name=name)[0]
+    # Everything under the transform was duplicated too (e.g. child meshes, which get their own LODs), only the
+    # mesh's copy is kept
+    lod_mesh = lod_transform.getChildren()[transform.getChildren().index(mesh)]
+    other_children = [child for child in lod_transform.getChildren() if child != lod_mesh]
+    if other_children:
+        pm.lockNode(other_children + pm.listRelatives(other_children, allDescendents=True), lock=False)
+        pm.delete(other_children)
+    mesh_data = _read_mesh_data(lod_mesh)
+
+    faces, triangles, corners = mp.decimate(mesh_data.positions, mesh_data.triangles, triangle_count,
+                                            corner_ids=_get_corner_ids(mesh_data))
+    stats = _rebuild_mesh(lod_mesh, mesh_data, mesh_data.positions, faces, triangles, corners)
+    mp.debug_log(f"Created {name}: {stats}")
+    return lod_transform
+
+
+def create_lods(node: pm.PyNode, lod_count: int, reduction: float = None):
+    """
+    Renames every exported mesh under the node to <name>_LOD0 and adds LOD1 to LODn copies next to it (under the same
+    parent, which Unity needs to make them one LOD group), each with reduction times the triangles of the one before.
+    Changes the scene, so only for scenes that are re-opened after exporting.
+    """
+    reduction = reduction or mp.DEFAULT_LOD_REDUCTION
+    start_time = time.perf_counter()
+
+    for mesh in get_export_meshes(node):
+        if mesh.isInstanced():
+            mp.debug_log(f"Not creating LODs for {mesh}, it's instanced.")
+            continue
+
+        transform = mesh.getParent()
+        name = transform.nodeName()
+        triangle_count = om2.MFnMesh(_get_dag_path(mesh)).numPolygons
+        for lod, lod_triangle_count in enumerate(mp.get_lod_triangle_counts(triangle_count, lod_count, reduction),
+                                                 start=1):
+            # Duplicated under the mesh's parent
+            create_lod(mesh, lod_triangle_count, f"{name}{LOD_SUFFIX}{lod}")
+        transform.unlock()
+        transform.rename(f"{name}{LOD_SUFFIX}0")
+
+    mp.debug_log(f"Created {lod_count} LODs in {time.perf_counter() - start_time:.2f}s.")
+
+
+def get_static_mesh_parts(node: pm.PyNode, asset_path: str) -> list[mp.StaticMeshPart]:
+    """
+    Reads every exported mesh under the node in world space, as one part per material, for static batching.
+    The meshes should already be triangulated (see optimize_meshes).
+    :param asset_path: The .ma file relative to the scenes folder (posix style), for the batch manifest
+    """
+    parts = []
+    for mesh in get_export_meshes(node):
+        mesh_path = _get_dag_path(mesh)
+        data = _read_mesh_data(mesh)
+        world_matrix = np.array(list(mesh_path.inclusiveMatrix()), dtype=np.float64).reshape(4, 4)
+        positions = data.positions @ world_matrix[:3, :3] + world_matrix[3, :3]
+        normals = data.normals @ np.linalg.inv(world_matrix[:3, :3]).T
+        normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+        corner_ids = _get_corner_ids(data).reshape(-1)
+        # Mirrored transforms turn the triangles inside out
+        winding = [0, 2, 1] if np.linalg.det(world_matrix[:3, :3]) < 0 else [0, 1, 2]
+
+        material_names = [_get_material_name(shading_group) for shading_group in data.shading_groups]
+        for shading_group_index in np.unique(data.face_shading_groups).tolist():
+            faces = np.flatnonzero(data.face_shading_groups == shading_group_index)
+            # Each distinct corner becomes one vertex, so vertices are only split at UV seams and hard edges
+            corners = _get_face_corners(faces)[:, winding].reshape(-1)
+            vertex_corners, triangles = np.unique(corner_ids[corners], return_inverse=True)
+            vertices = data.triangles.reshape(-1)[vertex_corners]
+
+            uvs = {}
+            for uv_set, (us, vs, uv_ids) in data.uvs.items():
+                uv_values = np.zeros((len(us) + 1, 2))  # Row 0 for unmapped corners
+                uv_values[1:, 0], uv_values[1:, 1] = us, vs
+                uvs[uv_set] = uv_values[uv_ids[vertex_corners] + 1]
+            colors = {color_set: np.where(corner_colors[vertex_corners] == -1, 1.0, corner_colors[vertex_corners])
+                      for color_set, corner_colors in data.colors.items()}
+
+            material = material_names[shading_group_index] if shading_group_index >= 0 else "lambert1"
+            parts.append(mp.StaticMeshPart(asset_path, mesh.getParent().nodeName(), material, positions[vertices],
+                                           normals[vertex_corners], triangles.reshape(-1, 3), uvs, colors))
+    return parts
+
+
+class _MeshData:
+    """
+    A triangulated mesh, with the attributes of every triangle corner. Corner arrays are indexed by
+    triangle index * 3 + corner.
+    """
+    def __init__(self):
+        self.positions: np.ndarray = None
+        self.triangles: np.ndarray = None
+        # Per UV set: (u values, v values, UV id of each corner, -1 where unmapped)
+        self.uvs: dict[str, tuple[list[float], list[float], np.ndarray]] = {}
+        # Per color set: RGBA of each corner, -1 where there's no color
+        self.colors: dict[str, np.ndarray] = {}
+        self.normals: np.ndarray = None
+        self.normal_ids: np.ndarray = None
+        self.shading_groups: list[om2.MObject] = []
+        # Index of each triangle's shading group, -1 for none
+        self.face_shading_groups: np.ndarray = None
+
+
+def _read_mesh_data(mesh: pm.nt.Mesh) -> _MeshData:
+    mesh_fn = om2.MFnMesh(_get_dag_path(mesh))
+    data = _MeshData()
+    data.positions = np.array([tuple(point)[:3] for point in mesh_fn.getPoints(om2.MSpace.kObject)],
+                              dtype=np.float64)
+    _, vertex_ids = mesh_fn.getVertices()
+    data.triangles = np.array(vertex_ids, dtype=np.int64).reshape(-1, 3)
+    face_count = len(data.triangles)
+
+    for uv_set in mesh_fn.getUVSetNames():
+        us, vs = mesh_fn.getUVs(uv_set)
+        uv_counts, uv_ids = mesh_fn.getAssignedUVs(uv_set)
+        face_uv_ids = np.full((face_count, 3), -1, dtype=np.int64)
+        mapped = np.array(uv_counts, dtype=np.int64) == 3
+        face_uv_ids[mapped] = np.array(uv_ids, dtype=np.int64).reshape(-1, 3)
+        data.uvs[uv_set] = (list(us), list(vs), face_uv_ids.reshape(-1))
+
+    for color_set in mesh_fn.getColorSetNames():
+        colors = mesh_fn.getFaceVertexColors(color_set)
+        data.colors[color_set] = np.array([tuple(color) for color in colors], dtype=np.float64).reshape(-1, 4)
+
+    normals = np.array([tuple(normal) for normal in mesh_fn.getNormals()], dtype=np.float64)
+    _, normal_ids = mesh_fn.getNormalIds()
+    data.normal_ids = np.array(normal_ids, dtype=np.int64)
+    data.normals = normals[data.normal_ids]
+
+    data.shading_groups, face_shading_groups = mesh_fn.getConnectedShaders(0)
+    data.face_shading_groups = np.array(face_shading_groups, dtype=np.int64)
+    return data
+
+
+def _get_face_corners(faces: np.ndarray) -> np.ndarray:
+    return faces[:, np.newaxis] * 3 + np.arange(3)
+
+
+def _get_corner_ids(data: _MeshData) -> np.ndarray:
+    """
+    :return: For each corner, the first corner with the same vertex, UVs and normal, shape (triangle count, 3).
+             Corners with different ids are on different sides of a UV seam or hard edge.
+    """
+    columns = [data.triangles.reshape(-1), data.normal_ids] + [uv_ids for _, _, uv_ids in data.uvs.values()]
+    _, first_corners, inverse = np.unique(np.stack(columns, axis=1), axis=0, return_index=True, return_inverse=True)
+    return first_corners[inverse.reshape(-1)].reshape(-1, 3)
+
+
+def _rebuild_mesh(mesh: pm.nt.Mesh, data: _MeshData, positions: np.ndarray, faces: np.ndarray,
+                  triangles: np.ndarray, corners: np.ndarray) -> mp.MeshStats:
+    """
+    Replaces the mesh's geometry with the triangles, in vertex cache friendly order.
+    :param faces: The original triangle of each new triangle, for its material
+    :param triangles: Indices into positions, shape (triangle count, 3)
+    :param corners: The original corner each new corner takes its attributes from, shape (triangle count, 3)
+    :return: The stats of the new mesh
+    """
+    face_shading_groups = data.face_shading_groups[faces]
+    # Grouped by material, so each material's triangles stay one range (one submesh in Unity)
+    order = mp.get_cache_friendly_triangle_order(positions, triangles, groups=face_shading_groups)
+    triangles, corners, face_shading_groups = triangles[order], corners[order].reshape(-1), face_shading_groups[order]
+    vertex_order, vertex_remap = mp.get_first_use_vertex_order(triangles, len(positions))
+    triangles = vertex_remap[triangles]
+    positions = positions[vertex_order]
+
+    mesh_fn = om2.MFnMesh(_get_dag_path(mesh))
+    mesh_fn.createInPlace(om2.MPointArray([om2.MPoint(*position) for position in positions.tolist()]),
+                          [3] * len(triangles), triangles.reshape(-1).tolist())
+    _set_corner_data(mesh_fn, data, triangles, corners)
+    _assign_shading_groups(mesh, data.shading_groups, face_shading_groups)
+
+    return mp.MeshStats(len(positions), triangles.size, mp.get_acmr(triangles))
+
+
+def _set_corner_data(mesh_fn: om2.MFnMesh, data: _MeshData, triangles: np.ndarray, corners: np.ndarray):
+    face_ids = np.repeat(np.arange(len(triangles)), 3)
+    vertex_ids = triangles.reshape(-1)
+
+    for uv_set, (us, vs, uv_ids) in data.uvs.items():
+        if uv_set not in mesh_fn.getUVSetNames():
+            mesh_fn.createUVSet(uv_set)
+        mesh_fn.setUVs(us, vs, uv_set)
+        face_uv_ids = uv_ids[corners].reshape(-1, 3)
+        mapped = np.all(face_uv_ids >= 0, axis=1)
+        mesh_fn.assignUVs(np.where(mapped, 3, 0).tolist(), face_uv_ids[mapped].reshape(-1).tolist(), uv_set)
+
+    for color_set, corner_colors in data.colors.items():
+        if color_set not in mesh_fn.getColorSetNames():
+            mesh_fn.createColorSet(color_set, True)
+        colors = corner_colors[corners]
+        has_color = ~np.all(colors == -1, axis=1)
+        mesh_fn.setCurrentColorSetName(color_set)
+        mesh_fn.setFaceVertexColors(om2.MColorArray([om2.MColor(color) for color in colors[has_color].tolist()]),
+                                    face_ids[has_color].tolist(), vertex_ids[has_color].tolist())
+
+    # Locked normals export exactly like the original hard and soft edges
+    mesh_fn.setFaceVertexNormals(om2.MVectorArray([om2.MVector(*normal) for normal in
+                                                   data.normals[corners].tolist()]),
+                                 face_ids.tolist(), vertex_ids.tolist())
+
+
+def _assign_shading_groups(mesh: pm.nt.Mesh, shading_groups: list[om2.MObject], face_shading_groups: np.ndarray):
+    """
+    :param face_shading_groups: Index of each face's shading group, -1 for none. The faces are grouped by it.
+    """
+    for shading_group_index, shading_group in enumerate(shading_groups):
+        faces = np.flatnonzero(face_shading_groups == shading_group_index)
+        if len(faces):
+            shading_group_name = om2.MFnDependencyNode(shading_group).name()
+            pm.sets(shading_group_name, forceElement=f"{mesh}.f[{faces[0]}:{faces[-1]}]")
+
+
+def _get_material_name(shading_group: om2.MObject) -> str:
+    shading_group_name = om2.MFnDependencyNode(shading_group).name()
+    shaders = pm.listConnections(f"{shading_group_name}.surfaceShader", source=True, destination=False)
+    return shaders[0].nodeName() if shaders else shading_group_name
+
+
+def _get_dag_path(mesh: pm.nt.Mesh) -> om2.MDagPath:
+    selection = om2.MSelectionList()
+    selection.add(mesh.longName())
+    return selection.getDagPath(0)
@@ -0,0 +1,195 @@
+# Python
+from collections import deque
+import itertools
+
+import numpy as np
+
+__all__ = ["DEFAULT_WELD_TOLERANCE", "DEFAULT_VERTEX_CACHE_SIZE", "MeshStats", "get_mesh_stats", "get_total_mesh_stats",
+           "weld_vertices",
+           "get_degenerate_triangles", "get_morton_codes", "get_cache_friendly_triangle_order",
+           "get_first_use_vertex_order", "get_acmr"]
+
+# Vertices closer than this (in scene units) are merged
+DEFAULT_WELD_TOLERANCE = 1e-4
+# Post-transform cache size the average cache miss ratio is measured with, a common size on current GPUs
+DEFAULT_VERTEX_CACHE_SIZE = 32
+_MORTON_BITS = 21  # Per axis, so three axes fit in 63 bits
+# Spatial hash of a grid cell (from "Optimized Spatial Hashing for Collision Detection of Deformable Objects").
+# Different cells can share a hash, which only adds vertex pairs that the distance test then rejects.
+_CELL_HASH_PRIMES = np.array([73856093, 19349663, 83492791], dtype=np.int64)
+# The cell itself and half of its neighbours, the other half find the same vertex pairs from the other side
+_NEIGHBOR_CELL_OFFSETS = np.array([offset for offset in itertools.product((-1, 0, 1), repeat=3)
+                                   if offset >= (0, 0, 0)], dtype=np.int64)
+_OCCUPIED_CELL_TABLE_BITS = 22
+
+
+class MeshStats:
+    def __init__(self, vertex_count: int, index_count: int, acmr: float):
+        """
+        :param acmr: Average cache miss ratio, vertices transformed per triangle. 0.5 is the best possible, 3 the worst.
+        """
+        self.vertex_count = vertex_count
+        self.index_count = index_count
+        self.acmr = acmr
+
+    def __repr__(self):
+        return f"{self.vertex_count} vertices, {self.index_count} indices, ACMR {self.acmr:.3f}"
+
+
+def get_mesh_stats(triangles: np.ndarray, cache_size: int = DEFAULT_VERTEX_CACHE_SIZE) -> MeshStats:
+    triangles = np.asarray(triangles)
+    vertex_count = len(np.unique(triangles)) if triangles.size else 0
+    return MeshStats(vertex_count, triangles.size, get_acmr(triangles, cache_size))
+
+
+def get_total_mesh_stats(stats: list[MeshStats]) -> MeshStats:
+    """
+    :return: The stats of all the meshes together, their ACMR weighted by their triangle counts
+    """
+    index_count = sum(mesh_stats.index_count for mesh_stats in stats)
+    acmr = sum(mesh_stats.acmr * mesh_stats.index_count for mesh_stats in stats) / index_count if index_count else 0.0
+    return MeshStats(sum(mesh_stats.vertex_count for mesh_stats in stats), index_count, acmr)
+
+
+def weld_vertices(positions: np.ndarray, tolerance: float = DEFAULT_WELD_TOLERANCE) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merges vertices that are closer than the tolerance to each other, and so also chains of them (like Maya's Merge
+    Vertices does). Each group of merged vertices takes the position of the one that comes first.
+    Vertices are bucketed in a tolerance sized grid, and only the ones in neighbouring cells are compared.
+    :param positions: Shape (vertex count, 3)
+    :return: The welded positions, and the index of each original vertex in them
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    if len(positions) == 0:
+        return positions.reshape(0, 3), np.zeros(0, dtype=np.int64)
+
+    # Vertices closer than the tolerance are at most one cell apart on each axis
+    cells = np.floor(positions / tolerance).astype(np.int64)
+    hashes = _hash_cells(cells)
+    order = np.argsort(hashes, kind="stable")
+    sorted_hashes = hashes[order]
+    # Most neighbouring cells are empty, this skips looking them up (searchsorted is most of the time otherwise)
+    table_mask = (1 << _OCCUPIED_CELL_TABLE_BITS) - 1
+    occupied = np.zeros(table_mask + 1, dtype=bool)
+    occupied[hashes & table_mask] = True
+
+    first_indices, second_indices = [], []
+    for offset in _NEIGHBOR_CELL_OFFSETS:
+        neighbor_hashes = _hash_cells(cells + offset)
+        vertices = np.flatnonzero(occupied[neighbor_hashes & table_mask])
+        starts = np.searchsorted(sorted_hashes, neighbor_hashes[vertices], side="left")
+        counts = np.searchsorted(sorted_hashes, neighbor_hashes[vertices], side="right") - starts
+        vertices = np.repeat(vertices, counts)
+        # Index of each candidate in its vertex's run of them
+        run_indices = np.arange(len(vertices)) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidates = order[np.repeat(starts, counts) + run_indices]
+        # Each pair in the same cell is found twice, and hash collisions can pair a vertex with itself
+        close = ((vertices < candidates) if not offset.any() else (vertices != candidates)) & \
+            (np.sum((positions[vertices] - positions[candidates]) ** 2, axis=1) < tolerance * tolerance)
+        first_indices.append(vertices[close])
+        second_indices.append(candidates[close])
+    first_indices, second_indices = np.concatenate(first_indices), np.concatenate(second_indices)
+
+    # Every vertex ends up labeled with the first vertex of its group
+    labels = np.arange(len(positions))
+    while True:
+        lowest = np.minimum(labels[first_indices], labels[second_indices])
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, first_indices, lowest)
+        np.minimum.at(new_labels, second_indices, lowest)
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+    # Keep the welded vertices in the order they first appeared in
+    kept, remap = np.unique(labels, return_inverse=True)
+    return positions[kept], remap.reshape(-1)
+
+
+def _hash_cells(cells: np.ndarray) -> np.ndarray:
+    # Overflow wraps, which is fine for a hash
+    with np.errstate(over="ignore"):
+        hashes = cells * _CELL_HASH_PRIMES
+    return hashes[:, 0] ^ hashes[:, 1] ^ hashes[:, 2]
+
+
+def get_degenerate_triangles(triangles: np.ndarray) -> np.ndarray:
+    """
+    :return: Mask of the triangles that use a vertex more than once, e.g. after welding
+    """
+    triangles = np.asarray(triangles)
+    return ((triangles[:, 0] == triangles[:, 1]) | (triangles[:, 1] == triangles[:, 2])
+            | (triangles[:, 0] == triangles[:, 2]))
+
+
+def get_morton_codes(points: np.ndarray) -> np.ndarray:
+    """
+    :return: Z-order curve index of each point within their bounding box, so sorting by it keeps nearby points together
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) == 0:
+        return np.zeros(0, dtype=np.uint64)
+
+    minimum = points.min(axis=0)
+    extent = np.maximum(points.max(axis=0) - minimum, 1e-12)
+    cells = ((points - minimum) / extent * ((1 << _MORTON_BITS) - 1)).astype(np.uint64)
+
+    codes = np.zeros(len(points), dtype=np.uint64)
+    for bit in range(_MORTON_BITS):
+        for axis in range(3):
+            codes |= ((cells[:, axis] >> np.uint64(bit)) & np.uint64(1)) << np.uint64(3 * bit + axis)
+    return codes
+
+
+def get_cache_friendly_triangle_order(positions: np.ndarray, triangles: np.ndarray,
+                                      groups: np.ndarray = None) -> np.ndarray:
+    """
+    Orders triangles along a Z-order curve through their centers, so consecutive triangles share vertices that are
+    still in the GPU's vertex cache.
+    :param groups: Triangles are kept grouped by this first (e.g. their material), one value per triangle
+    :return: Triangle indices in the new order
+    """
+    triangles = np.asarray(triangles)
+    centers = np.asarray(positions, dtype=np.float64)[triangles].mean(axis=1)
+    codes = get_morton_codes(centers)
+    if groups is None:
+        return np.argsort(codes, kind="stable")
+    return np.lexsort((codes, np.asarray(groups)))
+
+
+def get_first_use_vertex_order(triangles: np.ndarray, vertex_count: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Orders the vertices by when the triangles first use them, so the vertex buffer is read front to back.
+    Unused vertices are dropped.
+    :return: Old vertex indices in the new order, and the new index of each old vertex (-1 for unused ones)
+    """
+    flat = np.asarray(triangles).reshape(-1)
+    used, first_uses = np.unique(flat, return_index=True)
+    order = used[np.argsort(first_uses)]
+    remap = np.full(vertex_count, -1, dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    return order, remap
+
+
+def get_acmr(triangles: np.ndarray, cache_size: int = DEFAULT_VERTEX_CACHE_SIZE) -> float:
+    """
+    Simulates a FIFO vertex cache.
+    :return: Average cache miss ratio, vertices transformed per triangle
+    """
+    triangles = np.asarray(triangles)
+    if len(triangles) == 0:
+        return 0.0
+
+    cache = deque()
+    cached = set()
+    misses = 0
+    for vertex in triangles.reshape(-1).tolist():
+        if vertex in cached:
+            continue
+        misses += 1
+        cache.append(vertex)
+        cached.add(vertex)
+        if len(cache) > cache_size:
+            cached.discard(cache.popleft())
+    return misses / len(triangles)
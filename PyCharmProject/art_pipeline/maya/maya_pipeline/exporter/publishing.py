@@ -0,0 +1,170 @@
+# Python
+import os
+from pathlib import Path
+import shutil
+
+__all__ = ["PUBLISH_STAGING_ENV_VAR", "PUBLISH_STAGING_DIR_NAME", "PublishBatch", "get_publish_staging_root",
+           "get_pending_path", "write_file_atomically", "publish_bytes"]
+
+# Set by PublishBatch, so worker processes it starts stage their files too
+PUBLISH_STAGING_ENV_VAR = "MAYA_PIPELINE_PUBLISH_STAGING"
+# Unity doesn't import folders that start with a dot, so staged files are never seen before they're published
+PUBLISH_STAGING_DIR_NAME = ".maya_pipeline_staging"
+_TEMP_SUFFIX = ".tmp"
+# Unity's settings files (see unity_meta), which import with their asset
+_META_SUFFIX = ".meta"
+
+
+class PublishBatch:
+    """
+    Stages every file published under root_path while it's active (in this process and in processes started from
+    it) and moves them all into place when it ends. Unity then sees one burst of changes and refreshes once,
+    instead of once per exported file.
+    The staging folder is inside root_path, so the final moves are renames on the same volume.
+    """
+    def __init__(self, root_path: Path, discard_on_error: bool = False):
+        """
+        :param discard_on_error: Discard the staged files if the batch ends with an exception, for files that are
+                                 only right together. Otherwise whatever was staged is still published.
+        """
+        self.root_path = Path(root_path)
+        self.discard_on_error = discard_on_error
+        self.staging_path = self.root_path / PUBLISH_STAGING_DIR_NAME
+        self.published: list[Path] = []
+        self.deleted: list[Path] = []
+        self._deletions: list[Path] = []
+        self._previous_root = None
+
+    def __enter__(self) -> "PublishBatch":
+        self.staging_path.mkdir(parents=True, exist_ok=True)
+        self._previous_root = os.environ.get(PUBLISH_STAGING_ENV_VAR)
+        os.environ[PUBLISH_STAGING_ENV_VAR] = str(self.root_path)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._previous_root is None:
+            os.environ.pop(PUBLISH_STAGING_ENV_VAR, None)
+        else:
+            os.environ[PUBLISH_STAGING_ENV_VAR] = self._previous_root
+        if exc_type is not None and self.discard_on_error:
+            self.discard()
+            return
+        # Whatever finished is published even if the batch failed part way, but nothing is deleted
+        if exc_type is not None:
+            self._deletions.clear()
+        self.commit()
+
+    def delete(self, path: Path):
+        """
+        Deletes the file and its .meta when the batch is committed, after the staged files are published
+        """
+        self._deletions.append(Path(path))
+
+    def discard(self):
+        """
+        Deletes the staged files without publishing them, and forgets the files passed to delete
+        """
+        shutil.rmtree(self.staging_path, ignore_errors=True)
+        self._deletions.clear()
+
+    def commit(self) -> list[Path]:
+        """
+        Moves the staged files into place, .meta files before their assets so Unity never imports an asset
+        without its settings, then deletes the files passed to delete. Half written files left by a crashed process
+        are deleted.
+        :return: The published files
+        """
+        published = []
+        if self.staging_path.is_dir():
+            staged = [Path(directory) / filename for directory, _, filenames in os.walk(self.staging_path)
+                      for filename in filenames]
+            for staged_path in sorted(staged, key=lambda path: (path.suffix != _META_SUFFIX, path)):
+                if staged_path.name.endswith(_TEMP_SUFFIX):
+                    continue
+                destination_path = self.root_path / staged_path.relative_to(self.staging_path)
+                destination_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(staged_path, destination_path)
+                published.append(destination_path)
+
+            for directory in {path.parent for path in published}:
+                _fsync_directory(directory)
+            shutil.rmtree(self.staging_path, ignore_errors=True)
+        self.published += published
+
+        for path in self._deletions:
+            # Assets before their .meta files, so Unity doesn't see an asset without its settings. Files that were
+            # just published again are kept.
+            for deleted_path in (path, path.with_name(path.name + _META_SUFFIX)):
+                if deleted_path not in published and deleted_path.is_file():
+                    deleted_path.unlink()
+                    self.deleted.append(deleted_path)
+        self._deletions.clear()
+        return published
+
+
+def get_publish_staging_root() -> Path:
+    """
+    :return: The root of the active PublishBatch, None if files are published straight away
+    """
+    root = os.environ.get(PUBLISH_STAGING_ENV_VAR)
+    return Path(root) if root else None
+
+
+def get_pending_path(path: Path) -> Path:
+    """
+    :return: Where the file's latest content is, its staged copy while that waits in a PublishBatch, otherwise the
+             file itself
+    """
+    path = Path(path)
+    staged_path = _get_staged_path(path)
+    return staged_path if staged_path is not None and staged_path.is_file() else path
+
+
+def write_file_atomically(path: Path, data: bytes):
+    """
+    Writes to a .tmp file next to the file (which Unity ignores), flushes it to disk and renames it into place, so
+    readers only ever see the old or the new file.
+    """
+    path = Path(path)
+    temp_path = path.with_name(path.name + _TEMP_SUFFIX)
+    with open(temp_path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    _fsync_directory(path.parent)
+
+
+def publish_bytes(data: bytes, path: Path):
+    """
+    Writes the file atomically, or stages it if a PublishBatch for a folder it's in is active.
+    """
+    path = Path(path)
+    path = _get_staged_path(path) or path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_file_atomically(path, data)
+
+
+def _get_staged_path(path: Path) -> Path:
+    # None if no PublishBatch is active or the file isn't under its folder, so it's written straight away
+    root = get_publish_staging_root()
+    if root is None:
+        return None
+    try:
+        return root / PUBLISH_STAGING_DIR_NAME / path.relative_to(root)
+    except ValueError:
+        return None
+
+
+def _fsync_directory(path: Path):
+    # Makes the rename itself durable. Windows can't open folders and doesn't need it.
+    if os.name == "nt":
+        return
+    try:
+        descriptor = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
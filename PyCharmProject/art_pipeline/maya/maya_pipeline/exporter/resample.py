@@ -0,0 +1,169 @@
+# Python
+import numpy as np
+
+from maya_pipeline.exporter.bake_cache import BakedAnimation
+
+__all__ = ["ROTATE_ORDERS", "ROTATE_CHANNELS", "euler_to_quaternions", "quaternions_to_euler", "slerp",
+           "get_resample_frames", "resample_baked_animation"]
+
+# Maya's rotateOrder enum, axes listed in the order they're applied
+ROTATE_ORDERS = ["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]
+ROTATE_CHANNELS = ["rotateX", "rotateY", "rotateZ"]
+_AXIS_INDICES = {"x": 0, "y": 1, "z": 2}
+# Cosine of the middle angle below which it's +-90 degrees, where the other two angles aren't unique
+_GIMBAL_LOCK_EPSILON = 1e-9
+
+
+def euler_to_quaternions(angles: np.ndarray, rotate_order: int = 0) -> np.ndarray:
+    """
+    :param angles: Euler angles in degrees, shape (..., 3) in x, y, z order like Maya's rotate channels
+    :return: Unit quaternions, shape (..., 4) as w, x, y, z
+    """
+    half_angles = np.radians(np.asarray(angles, dtype=np.float64)) / 2
+    quaternions = np.zeros(half_angles.shape[:-1] + (4,))
+    quaternions[..., 0] = 1
+
+    for axis in ROTATE_ORDERS[rotate_order]:
+        axis_index = _AXIS_INDICES[axis]
+        axis_quaternions = np.zeros_like(quaternions)
+        axis_quaternions[..., 0] = np.cos(half_angles[..., axis_index])
+        axis_quaternions[..., axis_index + 1] = np.sin(half_angles[..., axis_index])
+        # Each rotation is applied after the previous ones, so it multiplies from the left
+        quaternions = _multiply_quaternions(axis_quaternions, quaternions)
+    return quaternions
+
+
+def quaternions_to_euler(quaternions: np.ndarray, rotate_order: int = 0, previous: np.ndarray = None) -> np.ndarray:
+    """
+    :param quaternions: Shape (frame count, ..., 4) as w, x, y, z
+    :param previous: Euler angles the first frame should stay close to, shape (..., 3)
+    :return: Euler angles in degrees, shape (frame count, ..., 3). Every frame picks the equivalent angles closest to
+             the frame before, so the curves don't flip by 180 or 360 degrees between keys.
+    """
+    i, j, k = (_AXIS_INDICES[axis] for axis in ROTATE_ORDERS[rotate_order])
+    # Orders that aren't a cyclic shift of xyz flip the signs of the off-diagonal terms
+    parity = 1.0 if (j - i) % 3 == 1 else -1.0
+    matrices = _quaternions_to_matrices(quaternions)
+
+    cos_middle = np.hypot(matrices[..., k, k], matrices[..., k, j])
+    first = np.arctan2(parity * matrices[..., k, j], matrices[..., k, k])
+    middle = np.arctan2(-parity * matrices[..., k, i], cos_middle)
+    last = np.arctan2(parity * matrices[..., j, i], matrices[..., i, i])
+
+    # In gimbal lock only first + last (or first - last) is defined, so all of it goes to the first angle
+    locked = cos_middle < _GIMBAL_LOCK_EPSILON
+    if np.any(locked):
+        locked_first = np.arctan2(-parity * matrices[..., j, k], matrices[..., j, j])
+        first = np.where(locked, locked_first, first)
+        last = np.where(locked, 0.0, last)
+
+    angles = np.zeros(matrices.shape[:-2] + (3,))
+    angles[..., i] = first
+    angles[..., j] = middle
+    angles[..., k] = last
+    # The other solution for the same rotation: first and last turned half way round and the middle mirrored
+    alternate_angles = angles.copy()
+    alternate_angles[..., i] += np.pi
+    alternate_angles[..., j] = np.pi - middle
+    alternate_angles[..., k] += np.pi
+
+    angles = np.degrees(angles)
+    alternate_angles = np.degrees(alternate_angles)
+    previous = angles[0] if previous is None else np.asarray(previous, dtype=np.float64)
+    for frame in range(len(angles)):
+        closest = _closest_equivalent_angles(angles[frame], previous)
+        alternate_closest = _closest_equivalent_angles(alternate_angles[frame], previous)
+        use_alternate = (np.abs(alternate_closest - previous).sum(axis=-1)
+                         < np.abs(closest - previous).sum(axis=-1))[..., np.newaxis]
+        angles[frame] = previous = np.where(use_alternate, alternate_closest, closest)
+    return angles
+
+
+def slerp(start: np.ndarray, end: np.ndarray, amount: np.ndarray) -> np.ndarray:
+    """
+    Spherical linear interpolation between unit quaternions, taking the shortest path.
+    :param amount: 0 for start, 1 for end, broadcast against the quaternions without their last axis
+    """
+    amount = np.asarray(amount, dtype=np.float64)[..., np.newaxis]
+    dot = np.sum(start * end, axis=-1, keepdims=True)
+    end = np.where(dot < 0, -end, end)
+    dot = np.abs(dot)
+
+    angle = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin_angle = np.sin(angle)
+    nearly_parallel = sin_angle < 1e-6
+    safe_sin_angle = np.where(nearly_parallel, 1.0, sin_angle)
+    start_weights = np.where(nearly_parallel, 1.0 - amount, np.sin((1.0 - amount) * angle) / safe_sin_angle)
+    end_weights = np.where(nearly_parallel, amount, np.sin(amount * angle) / safe_sin_angle)
+
+    result = start_weights * start + end_weights * end
+    return result / np.linalg.norm(result, axis=-1, keepdims=True)
+
+
+def get_resample_frames(start_frame: float, end_frame: float, source_rate: float, target_rate: float) -> np.ndarray:
+    """
+    :return: Evenly spaced frames (in the source frame rate) from start_frame to end_frame at about target_rate.
+             The spacing is adjusted so the last frame lands exactly on end_frame, which keeps looping clips seamless.
+    """
+    duration = end_frame - start_frame
+    if duration <= 0:
+        return np.array([start_frame], dtype=np.float64)
+    sample_count = max(1, int(round(duration * target_rate / source_rate)))
+    return np.linspace(start_frame, end_frame, sample_count + 1)
+
+
+def resample_baked_animation(baked_animation: BakedAnimation, source_rate: float, target_rate: float,
+                             rotate_orders: list[int]) -> tuple[np.ndarray, BakedAnimation]:
+    """
+    Resamples a bake to a lower frame rate. Translation and scale are interpolated linearly, rotations are converted to
+    quaternions and interpolated with slerp, so joints turn along the shortest path instead of however the Euler
+    angles happen to lerp.
+    :param rotate_orders: Each joint's rotateOrder
+    :return: The frames the samples are on (in the source frame rate, not whole numbers), and the resampled animation
+    """
+    values = np.asarray(baked_animation.values, dtype=np.float64)
+    frames = get_resample_frames(baked_animation.start_frame, baked_animation.end_frame, source_rate, target_rate)
+
+    # The source key before each new frame, and how far the new frame is towards the next key
+    positions = frames - baked_animation.start_frame
+    indices = np.clip(np.floor(positions).astype(int), 0, max(baked_animation.frame_count - 2, 0))
+    next_indices = np.minimum(indices + 1, baked_animation.frame_count - 1)
+    amounts = positions - indices
+
+    weights = amounts[:, np.newaxis, np.newaxis]
+    resampled = (values[indices] * (1.0 - weights) + values[next_indices] * weights).astype(np.float32)
+
+    rotate_indices = [baked_animation.channel_names.index(channel) for channel in ROTATE_CHANNELS
+                      if channel in baked_animation.channel_names]
+    if len(rotate_indices) == len(ROTATE_CHANNELS):
+        for joint_index, rotate_order in enumerate(rotate_orders):
+            quaternions = euler_to_quaternions(values[:, joint_index, rotate_indices], rotate_order)
+            rotations = slerp(quaternions[indices], quaternions[next_indices], amounts)
+            resampled[:, joint_index, rotate_indices] = quaternions_to_euler(
+                rotations, rotate_order, previous=values[0, joint_index, rotate_indices])
+
+    return frames, BakedAnimation(baked_animation.joint_names, baked_animation.channel_names,
+                                  baked_animation.start_frame, resampled)
+
+
+def _multiply_quaternions(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack([aw * bw - ax * bx - ay * by - az * bz,
+                     aw * bx + ax * bw + ay * bz - az * by,
+                     aw * by - ax * bz + ay * bw + az * bx,
+                     aw * bz + ax * by - ay * bx + az * bw], axis=-1)
+
+
+def _quaternions_to_matrices(quaternions: np.ndarray) -> np.ndarray:
+    # Column vector convention: matrix @ point rotates the point
+    w, x, y, z = np.moveaxis(quaternions / np.linalg.norm(quaternions, axis=-1, keepdims=True), -1, 0)
+    return np.stack([np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)], axis=-1),
+                     np.stack([2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)], axis=-1),
+                     np.stack([2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)], axis=-1)],
+                    axis=-2)
+
+
+def _closest_equivalent_angles(angles: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    # Adding whole turns doesn't change the rotation
+    return angles - 360.0 * np.round((angles - reference) / 360.0)
@@ -0,0 +1,104 @@
+# Python
+import time
+
+import numpy as np
+
+# Maya
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+import pymel.core as pm
+
+# Internal
+import maya_pipeline as mp
+
+__all__ = ["get_skin_clusters", "get_weighted_joints", "read_skin_weights", "write_skin_weights",
+           "prune_skin_clusters"]
+
+
+def get_skin_clusters(node: pm.PyNode) -> list[pm.PyNode]:
+    """
+    :return: The skin clusters deforming meshes under the node
+    """
+    meshes = pm.listRelatives(node, allDescendents=True, type="mesh")
+    skin_clusters = []
+    for mesh in meshes:
+        for skin_cluster in pm.listHistory(mesh, type="skinCluster"):
+            if skin_cluster not in skin_clusters:
+                skin_clusters.append(skin_cluster)
+    return skin_clusters
+
+
+def get_weighted_joints(skin_clusters: list[pm.PyNode]) -> list[pm.joint]:
+    """
+    :return: The joints with non-zero weights in any of the skin clusters
+    """
+    weighted = []
+    for skin_cluster in skin_clusters:
+        for influence in pm.skinCluster(skin_cluster, query=True, weightedInfluence=True) or []:
+            if isinstance(influence, pm.nt.Joint) and influence not in weighted:
+                weighted.append(influence)
+    return weighted
+
+
+def read_skin_weights(skin_cluster: pm.PyNode) -> list[tuple[om2.MDagPath, np.ndarray]]:
+    """
+    :return: Each deformed mesh and its weights, shape (vertex count, influence count)
+    """
+    skin_fn = _get_skin_cluster_fn(skin_cluster)
+    weights = []
+    for mesh_path in _get_deformed_meshes(skin_fn):
+        mesh_weights, influence_count = skin_fn.getWeights(mesh_path, _get_all_vertices(mesh_path))
+        weights.append((mesh_path, np.array(mesh_weights, dtype=np.float64).reshape(-1, influence_count)))
+    return weights
+
+
+def write_skin_weights(skin_cluster: pm.PyNode, mesh_path: om2.MDagPath, weights: np.ndarray):
+    """
+    Sets every weight of the mesh in one call. The weights should already add up to 1 for each vertex.
+    """
+    skin_fn = _get_skin_cluster_fn(skin_cluster)
+    influence_indices = om2.MIntArray(list(range(weights.shape[1])))
+    skin_fn.setWeights(mesh_path, _get_all_vertices(mesh_path), influence_indices,
+                       om2.MDoubleArray(weights.ravel().tolist()), normalize=False)
+
+
+def prune_skin_clusters(node: pm.PyNode, max_influences: int = None, threshold: float = None):
+    """
+    Limits the influences of every vertex skinned under the node, see prune_skin_weights.
+    Changes the scene, so only for scenes that are re-opened after exporting.
+    """
+    max_influences = max_influences or mp.DEFAULT_MAX_INFLUENCES
+    threshold = mp.DEFAULT_WEIGHT_THRESHOLD if threshold is None else threshold
+    start_time = time.perf_counter()
+
+    for skin_cluster in get_skin_clusters(node):
+        for mesh_path, weights in read_skin_weights(skin_cluster):
+            before = mp.get_influence_stats(weights)
+            pruned_weights = mp.prune_skin_weights(weights, max_influences, threshold)
+            write_skin_weights(skin_cluster, mesh_path, pruned_weights)
+            mp.debug_log(f"Pruned {skin_cluster} weights on {mesh_path.partialPathName()}: {before} -> "
+                         f"{mp.get_influence_stats(pruned_weights)}")
+
+    mp.debug_log(f"Pruned skin weights in {time.perf_counter() - start_time:.2f}s.")
+
+
+def _get_skin_cluster_fn(skin_cluster: pm.PyNode) -> oma2.MFnSkinCluster:
+    selection = om2.MSelectionList()
+    selection.add(skin_cluster.name())
+    return oma2.MFnSkinCluster(selection.getDependNode(0))
+
+
+def _get_deformed_meshes(skin_fn: oma2.MFnSkinCluster) -> list[om2.MDagPath]:
+    mesh_paths = []
+    for output_index in range(skin_fn.numOutputConnections()):
+        path = skin_fn.getPathAtIndex(skin_fn.indexForOutputConnection(output_index))
+        if path.hasFn(om2.MFn.kMesh):
+            mesh_paths.append(path)
+    return mesh_paths
+
+
+def _get_all_vertices(mesh_path: om2.MDagPath) -> om2.MObject:
+    component_fn = om2.MFnSingleIndexedComponent()
+    components = component_fn.create(om2.MFn.kMeshVertComponent)
+    component_fn.setCompleteData(om2.MFnMesh(mesh_path).numVertices)
+    return components
@@ -0,0 +1,57 @@
+# Python
+import numpy as np
+
+__all__ = ["DEFAULT_MAX_INFLUENCES", "DEFAULT_WEIGHT_THRESHOLD", "InfluenceStats", "get_influence_stats",
+           "prune_skin_weights"]
+
+# Unity skins with up to 4 bones per vertex unless the project's quality settings allow more
+DEFAULT_MAX_INFLUENCES = 4
+# Weights below this don't visibly move the vertex
+DEFAULT_WEIGHT_THRESHOLD = 0.001
+
+
+class InfluenceStats:
+    def __init__(self, max_influences: int, mean_influences: float, vertex_count: int):
+        self.max_influences = max_influences
+        self.mean_influences = mean_influences
+        self.vertex_count = vertex_count
+
+    def __repr__(self):
+        return (f"{self.vertex_count} vertices, max {self.max_influences} influences, "
+                f"mean {self.mean_influences:.2f}")
+
+
+def get_influence_stats(weights: np.ndarray) -> InfluenceStats:
+    """
+    :param weights: Shape (vertex count, influence count)
+    """
+    counts = np.count_nonzero(weights, axis=1)
+    if counts.size == 0:
+        return InfluenceStats(0, 0.0, 0)
+    return InfluenceStats(int(counts.max()), float(counts.mean()), len(counts))
+
+
+def prune_skin_weights(weights: np.ndarray, max_influences: int = DEFAULT_MAX_INFLUENCES,
+                       threshold: float = DEFAULT_WEIGHT_THRESHOLD) -> np.ndarray:
+    """
+    Keeps each vertex's largest max_influences weights that are at least threshold, and scales them to add up to 1.
+    A vertex whose weights are all below the threshold keeps its largest one.
+    :param weights: Shape (vertex count, influence count)
+    :return: The pruned weights, same shape
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    pruned = np.where(weights >= threshold, weights, 0.0)
+
+    if max_influences < weights.shape[1]:
+        # Indices of everything but the largest max_influences weights in each row
+        dropped = np.argpartition(-pruned, max_influences, axis=1)[:, max_influences:]
+        np.put_along_axis(pruned, dropped, 0.0, axis=1)
+
+    totals = pruned.sum(axis=1)
+    empty = totals <= 0
+    if np.any(empty):
+        largest = np.argmax(weights[empty], axis=1)
+        pruned[np.flatnonzero(empty), largest] = 1.0
+        totals[empty] = 1.0
+
+    return pruned / totals[:, np.newaxis]
@@ -0,0 +1,186 @@
+# Python
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+# Maya
+import maya.api.OpenMaya as om2
+import pymel.core as pm
+
+import maya_pipeline as mp
+from maya_pipeline.exporter.export import FBX_PRESETS_PATH
+
+__all__ = ["export_static_batches"]
+
+
+def export_static_batches(folder_path: Path, export_folder_path: Path, scenes_path: Path,
+                          chunk_size: float = None, max_vertices: int = None) -> Path:
+    """
+    Merges the static mesh assets in the folder that share a material into one mesh per chunk (see
+    create_static_batches), exports each chunk to <export folder>/<chunk name>.fbx and writes a manifest of where each
+    asset's meshes ended up. Chunks left over from an earlier run of the same folder are deleted.
+    Opens every asset and ends with an empty scene, so save the current scene first.
+    :param folder_path: Folder with the .ma files, only the ones directly in it are batched
+    :return: The manifest's path, None if the folder has no static meshes
+    """
+    chunk_size = chunk_size or mp.DEFAULT_STATIC_BATCH_CHUNK_SIZE
+    max_vertices = max_vertices or mp.DEFAULT_STATIC_BATCH_MAX_VERTICES
+    start_time = time.perf_counter()
+    folder_path = Path(folder_path)
+
+    asset_paths = mp.get_static_mesh_assets(folder_path)
+    if not asset_paths:
+        mp.debug_warning(f"No static meshes to batch in {folder_path}.", print_to_script_editor=True)
+        return None
+
+    parts = []
+    for asset_path in asset_paths:
+        parts += _read_static_mesh_parts(asset_path, scenes_path)
+
+    chunks = mp.create_static_batches(parts, folder_path.name, chunk_size, max_vertices)
+    manifest_path = export_folder_path / f"{folder_path.name}{mp.STATIC_BATCH_MANIFEST_SUFFIX}"
+
+    pm.newFile(force=True)
+    # The chunks, their .meta files and the manifest are published together (and old chunks deleted), so Unity never
+    # imports a manifest that doesn't match its chunks. If a chunk fails, none of them is published.
+    with mp.PublishBatch(export_folder_path, discard_on_error=True) as publish_batch:
+        _delete_old_chunks(manifest_path, [chunk.name for chunk in chunks], publish_batch)
+        for chunk in chunks:
+            _export_chunk(chunk, export_folder_path)
+
+        manifest = mp.StaticBatchManifest(folder_path.relative_to(scenes_path).as_posix(), chunks, chunk_size,
+                                          max_vertices)
+        manifest.write(manifest_path)
+    mp.debug_log(f"Batched {len(parts)} static mesh parts from {len(asset_paths)} assets into {len(chunks)} chunks "
+                 f"in {time.perf_counter() - start_time:.2f}s. Wrote: {manifest_path}", print_to_script_editor=True)
+    return manifest_path
+
+
+def _read_static_mesh_parts(asset_path: Path, scenes_path: Path) -> list[mp.StaticMeshPart]:
+    pm.openFile(str(asset_path), force=True)
+    node = mp.get_top_level_node(mp.ASSET_NODE_NAME)
+    if node is None:
+        mp.debug_warning(f"No top level {mp.ASSET_NODE_NAME} node in {asset_path.name}, not batching it.")
+        return []
+
+    # Same clean up as a single mesh export, the file isn't saved
+    mp.optimize_meshes(node)
+    return mp.get_static_mesh_parts(node, asset_path.relative_to(scenes_path).as_posix())
+
+
+def _delete_old_chunks(manifest_path: Path, chunk_names: list[str], publish_batch: mp.PublishBatch):
+    """
+    Deletes the chunks (and their .meta files) the old manifest has and the new one won't, once the batch commits
+    """
+    if not manifest_path.is_file():
+        return
+
+    try:
+        with open(manifest_path, encoding="utf-8") as file:
+            old_chunk_names = [chunk["name"] for chunk in json.load(file)["chunks"]]
+    except (OSError, ValueError, KeyError) as e:
+        mp.debug_warning(f"Couldn't read the old manifest {manifest_path}: {e}")
+        return
+
+    for chunk_name in old_chunk_names:
+        if chunk_name not in chunk_names:
+            mp.debug_log(f"Deleting old chunk: {chunk_name}.fbx")
+            publish_batch.delete(manifest_path.parent / f"{chunk_name}.fbx")
+
+
+def _export_chunk(chunk: mp.StaticBatchChunk, export_folder_path: Path):
+    # The root carries the same attributes as an Asset node, so Unity makes a static prefab for it
+    root = pm.createNode("transform", name=chunk.name)
+    pm.addAttr(root, longName=mp.ASSET_TYPE_ATTR_NAME, dataType=mp.AttributeType.String.value)
+    pm.setAttr(f"{root}.{mp.ASSET_TYPE_ATTR_NAME}", mp.AssetType.MESH.value)
+    pm.addAttr(root, longName=mp.STATIC_ATTR_NAME, attributeType=mp.AttributeType.Boolean.value)
+    pm.setAttr(f"{root}.{mp.STATIC_ATTR_NAME}", True)
+
+    mesh = _create_mesh(chunk.mesh, root)
+    _assign_material(mesh, chunk.material)
+
+    export_filepath = export_folder_path / f"{chunk.name}.fbx"
+    export_filepath.parent.mkdir(parents=True, exist_ok=True)
+    pm.select(root, replace=True)
+    pm.mel.FBXLoadExportPresetFile(f=FBX_PRESETS_PATH / "mesh.fbxexportpreset")
+    # Like single assets, unchanged chunks aren't re-written so Unity doesn't re-import them
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_filepath = Path(temp_dir) / chunk.name
+        pm.mel.FBXExport(f=temp_filepath, s=True)
+        changed = mp.write_fbx_if_changed(Path(f"{temp_filepath}.fbx"), export_filepath)
+    mp.debug_log(f"Exported {chunk}: {export_filepath}{'' if changed else ' (unchanged)'}")
+    # Optimizing the mesh on import would reorder and weld the vertices, and the manifest's ranges would be wrong
+    mp.write_model_importer_meta(export_filepath,
+                                 mp.ModelImporterSettings(mp.UnityAnimationType.NONE, optimize_mesh=False))
+    pm.delete(root)
+
+
+def _create_mesh(part: mp.StaticMeshPart, parent: pm.PyNode) -> pm.nt.Mesh:
+    """
+    Creates the mesh with the part's buffers as they are, so the manifest's ranges stay valid.
+    """
+    selection = om2.MSelectionList()
+    selection.add(parent.longName())
+    mesh_fn = om2.MFnMesh()
+    vertex_ids = part.triangles.reshape(-1).tolist()
+    mesh_fn.create(om2.MPointArray([om2.MPoint(*position) for position in part.positions.tolist()]),
+                   [3] * len(part.triangles), vertex_ids, parent=selection.getDependNode(0))
+
+    all_vertices = list(range(part.vertex_count))
+    for index, (uv_set, uvs) in enumerate(part.uvs.items()):
+        if index == 0:
+            mesh_fn.renameUVSet(mesh_fn.getUVSetNames()[0], uv_set)
+        else:
+            mesh_fn.createUVSet(uv_set)
+        mesh_fn.setUVs(uvs[:, 0].tolist(), uvs[:, 1].tolist(), uv_set)
+        mesh_fn.assignUVs([3] * len(part.triangles), vertex_ids, uv_set)
+
+    for color_set, colors in part.colors.items():
+        mesh_fn.createColorSet(color_set, True)
+        mesh_fn.setCurrentColorSetName(color_set)
+        mesh_fn.setVertexColors(om2.MColorArray([om2.MColor(color) for color in colors.tolist()]), all_vertices)
+
+    # Locked normals, so the hard edges come out like in the original meshes
+    mesh_fn.setVertexNormals(om2.MVectorArray([om2.MVector(*normal) for normal in part.normals.tolist()]),
+                             all_vertices)
+    return pm.PyNode(mesh_fn.fullPathName())
+
+
+def _assign_material(mesh: pm.nt.Mesh, material: str):
+    # Unity doesn't import materials (see the AssetPostProcessor), it only needs the name to remap them
+    material = material.rsplit(":", 1)[-1]
+    shading_group_name = "initialShadingGroup" if material == "lambert1" else f"{material}SG"
+    if not pm.objExists(shading_group_name):
+        shader = pm.shadingNode("lambert", asShader=True, name=material)
+        shading_group = pm.sets(renderable=True, noSurfaceShader=True, empty=True, name=shading_group_name)
+        pm.connectAttr(shader.outColor, shading_group.surfaceShader)
+    pm.sets(shading_group_name, forceElement=mesh)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Merge the static meshes in a folder into one FBX per material and "
+                                                 "chunk, plus a JSON manifest.")
+    parser.add_argument("folder_path", type=Path, help="Folder with the static mesh assets")
+    parser.add_argument("scenes_path", type=Path, help="The Maya project's scenes folder")
+    parser.add_argument("export_root_path", type=Path, help="Folder to export to, e.g. the Unity project's Assets")
+    parser.add_argument("--chunk-size", type=float, default=mp.DEFAULT_STATIC_BATCH_CHUNK_SIZE,
+                        help="Side of the grid cells meshes are chunked by, in scene units")
+    parser.add_argument("--max-vertices", type=int, default=mp.DEFAULT_STATIC_BATCH_MAX_VERTICES,
+                        help="Split chunks with more vertices than this")
+    args = parser.parse_args(argv)
+
+    scenes_path = args.scenes_path.resolve()
+    folder_path = args.folder_path.resolve()
+    # References are relative to the Maya project, so it has to be set before opening the files
+    pm.workspace(str(scenes_path.parent), openWorkspace=True)
+    export_folder_path = args.export_root_path / folder_path.relative_to(scenes_path)
+    manifest_path = export_static_batches(folder_path, export_folder_path, scenes_path, args.chunk_size,
+                                          args.max_vertices)
+    if manifest_path is None:
+        print(f"No static meshes in {folder_path}.")
+        return 1
+
+    print(f"Wrote {manifest_path}")
+    return 0
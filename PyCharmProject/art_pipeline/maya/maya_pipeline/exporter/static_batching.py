@@ -0,0 +1,265 @@
+# Python
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+
+from maya_pipeline.exporter.mesh_optimization import get_morton_codes
+from maya_pipeline.exporter.publishing import get_pending_path, publish_bytes
+from maya_pipeline.main_app.asset_definitions import (AssetType, ASSET_EXT, ASSET_NODE_NAME, STATIC_ATTR_NAME,
+                                                      get_asset_type_from_filename)
+from maya_pipeline.validation.ma_parser import parse_maya_ascii_file
+
+__all__ = ["STATIC_BATCH_MANIFEST_VERSION", "STATIC_BATCH_MANIFEST_SUFFIX", "DEFAULT_STATIC_BATCH_CHUNK_SIZE",
+           "DEFAULT_STATIC_BATCH_MAX_VERTICES", "StaticMeshPart", "StaticBatchRange", "StaticBatchChunk",
+           "StaticBatchManifest", "get_static_mesh_assets", "get_static_batch_name", "plan_static_batches",
+           "merge_static_mesh_parts", "create_static_batches"]
+
+STATIC_BATCH_MANIFEST_VERSION = 1
+# The manifest is written next to the chunk FBXs as <folder name><suffix>
+STATIC_BATCH_MANIFEST_SUFFIX = "_StaticBatches.json"
+# Side of the grid cells meshes are chunked by, in scene units (50m in centimeters). Keeps each chunk small enough
+# for Unity to cull it as a whole.
+DEFAULT_STATIC_BATCH_CHUNK_SIZE = 5000.0
+# Chunks stay below this so Unity can use 16 bit index buffers
+DEFAULT_STATIC_BATCH_MAX_VERTICES = 65535
+# How Maya writes a true bool attribute in .ma files
+_TRUE_VALUES = {"yes", "on", "true", "1"}
+
+
+class StaticMeshPart:
+    def __init__(self, asset_path: str, mesh_name: str, material: str, positions: np.ndarray, normals: np.ndarray,
+                 triangles: np.ndarray, uvs: dict[str, np.ndarray] = None, colors: dict[str, np.ndarray] = None):
+        """
+        The triangles of one mesh that use one material, as a vertex buffer and an index buffer.
+        Each vertex has exactly one normal, UV per UV set and color per color set (split at seams and hard edges).
+        :param asset_path: Path of the .ma file relative to the scenes folder (posix style)
+        :param positions: World space, shape (vertex count, 3)
+        :param normals: World space, shape (vertex count, 3)
+        :param triangles: Indices into the vertices, shape (triangle count, 3)
+        :param uvs: Per UV set, shape (vertex count, 2)
+        :param colors: Per color set, RGBA, shape (vertex count, 4)
+        """
+        self.asset_path = asset_path
+        self.mesh_name = mesh_name
+        self.material = material
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        self.normals = np.asarray(normals, dtype=np.float64).reshape(-1, 3)
+        self.triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        self.uvs = uvs or {}
+        self.colors = colors or {}
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.positions)
+
+    @property
+    def index_count(self) -> int:
+        return self.triangles.size
+
+    @property
+    def center(self) -> np.ndarray:
+        if self.vertex_count == 0:
+            return np.zeros(3)
+        return (self.positions.min(axis=0) + self.positions.max(axis=0)) / 2
+
+    def __repr__(self):
+        return f"StaticMeshPart({self.asset_path} {self.mesh_name} {self.material}, {self.vertex_count} vertices)"
+
+
+class StaticBatchRange:
+    def __init__(self, asset_path: str, mesh_name: str, vertex_start: int, vertex_count: int, index_start: int,
+                 index_count: int):
+        """
+        Where a part ended up in its chunk's buffers. Triangles keep their order, so the index range of a part is
+        also its triangle range times 3.
+        """
+        self.asset_path = asset_path
+        self.mesh_name = mesh_name
+        self.vertex_start = vertex_start
+        self.vertex_count = vertex_count
+        self.index_start = index_start
+        self.index_count = index_count
+
+    def to_dict(self) -> dict:
+        return {"mesh": self.mesh_name, "vertex_start": self.vertex_start, "vertex_count": self.vertex_count,
+                "index_start": self.index_start, "index_count": self.index_count}
+
+
+class StaticBatchChunk:
+    def __init__(self, name: str, mesh: StaticMeshPart, ranges: list[StaticBatchRange]):
+        """
+        :param mesh: The merged parts, named after the chunk
+        :param ranges: Where each part is in the merged buffers
+        """
+        self.name = name
+        self.mesh = mesh
+        self.ranges = ranges
+
+    @property
+    def material(self) -> str:
+        return self.mesh.material
+
+    def to_dict(self) -> dict:
+        positions = self.mesh.positions
+        return {"name": self.name, "fbx": f"{self.name}.fbx", "material": self.material,
+                "vertex_count": self.mesh.vertex_count, "index_count": self.mesh.index_count,
+                "bounds_min": positions.min(axis=0).round(4).tolist() if len(positions) else [0.0, 0.0, 0.0],
+                "bounds_max": positions.max(axis=0).round(4).tolist() if len(positions) else [0.0, 0.0, 0.0]}
+
+    def __repr__(self):
+        return f"StaticBatchChunk({self.name}, {len(self.ranges)} parts, {self.mesh.vertex_count} vertices)"
+
+
+class StaticBatchManifest:
+    def __init__(self, folder: str, chunks: list[StaticBatchChunk], chunk_size: float, max_vertices: int):
+        """
+        :param folder: The batched folder relative to the scenes folder (posix style)
+        """
+        self.folder = folder
+        self.chunks = chunks
+        self.chunk_size = chunk_size
+        self.max_vertices = max_vertices
+
+    def to_dict(self) -> dict:
+        assets = {}
+        for chunk in self.chunks:
+            for part_range in chunk.ranges:
+                assets.setdefault(part_range.asset_path, []).append(
+                    dict(part_range.to_dict(), chunk=chunk.name, material=chunk.material))
+
+        # Sorted, so re-batching the same folder writes the same file
+        return {
+            "version": STATIC_BATCH_MANIFEST_VERSION,
+            "folder": self.folder,
+            "chunk_size": self.chunk_size,
+            "max_vertices": self.max_vertices,
+            "chunks": [chunk.to_dict() for chunk in self.chunks],
+            "assets": {asset_path: sorted(ranges, key=lambda entry: (entry["mesh"], entry["chunk"]))
+                       for asset_path, ranges in sorted(assets.items())},
+        }
+
+    def write(self, manifest_path: Path):
+        """
+        Leaves an unchanged manifest as it is, so Unity doesn't re-import it.
+        """
+        text = json.dumps(self.to_dict(), indent=4)
+        current_path = get_pending_path(manifest_path)
+        if current_path.is_file() and current_path.read_text(encoding="utf-8") == text:
+            return
+        publish_bytes(text.encode("utf-8"), manifest_path)
+
+
+def get_static_mesh_assets(folder_path: Path) -> list[Path]:
+    """
+    :return: The mesh assets directly in the folder with the static attribute on, read from the files without
+             opening them in Maya
+    """
+    paths = []
+    for path in sorted(Path(folder_path).glob(f"*{ASSET_EXT}")):
+        if get_asset_type_from_filename(path) is not AssetType.MESH:
+            continue
+        asset_node = parse_maya_ascii_file(path).get_top_level_node(ASSET_NODE_NAME)
+        if asset_node is not None and asset_node.attr_values.get(STATIC_ATTR_NAME, "").lower() in _TRUE_VALUES:
+            paths.append(path)
+    return paths
+
+
+def get_static_batch_name(prefix: str, material: str, index: int) -> str:
+    """
+    :return: A name that's valid for a Maya node and a file, e.g. Kit_Stone_M_003
+    """
+    return f"{_get_static_batch_base_name(prefix, material)}_{index:03d}"
+
+
+def plan_static_batches(parts: list[StaticMeshPart], chunk_size: float = DEFAULT_STATIC_BATCH_CHUNK_SIZE,
+                        max_vertices: int = DEFAULT_STATIC_BATCH_MAX_VERTICES) -> list[list[int]]:
+    """
+    Groups parts that share a material and whose centers are in the same chunk_size grid cell. Groups with more than
+    max_vertices are split along a Z-order curve, so each chunk stays spatially compact.
+    A part with more than max_vertices on its own gets a chunk of its own.
+    :return: Indices of the parts in each chunk, ordered by material and then position
+    """
+    groups = {}
+    for index, part in enumerate(parts):
+        cell = tuple(np.floor(part.center / chunk_size).astype(np.int64).tolist())
+        groups.setdefault((part.material, cell), []).append(index)
+
+    chunks = []
+    for key in sorted(groups):
+        indices = groups[key]
+        codes = get_morton_codes(np.array([parts[index].center for index in indices]))
+        # Asset and mesh names break ties, so the chunks don't depend on the order the files were read in
+        order = sorted(range(len(indices)), key=lambda position: (int(codes[position]),
+                                                                  parts[indices[position]].asset_path,
+                                                                  parts[indices[position]].mesh_name))
+        chunk, vertex_count = [], 0
+        for position in order:
+            index = indices[position]
+            if chunk and vertex_count + parts[index].vertex_count > max_vertices:
+                chunks.append(chunk)
+                chunk, vertex_count = [], 0
+            chunk.append(index)
+            vertex_count += parts[index].vertex_count
+        if chunk:
+            chunks.append(chunk)
+    return chunks
+
+
+def merge_static_mesh_parts(name: str, parts: list[StaticMeshPart]) -> StaticBatchChunk:
+    """
+    Appends the parts' vertex and index buffers in order. Parts without one of the UV or color sets get zero UVs
+    and white colors for it.
+    The parts should all have the same material.
+    """
+    uv_sets = list(dict.fromkeys(uv_set for part in parts for uv_set in part.uvs))
+    color_sets = list(dict.fromkeys(color_set for part in parts for color_set in part.colors))
+    ranges = []
+    triangles = []
+    vertex_start, index_start = 0, 0
+
+    for part in parts:
+        ranges.append(StaticBatchRange(part.asset_path, part.mesh_name, vertex_start, part.vertex_count,
+                                       index_start, part.index_count))
+        triangles.append(part.triangles + vertex_start)
+        vertex_start += part.vertex_count
+        index_start += part.index_count
+
+    def merge_attribute(attribute: str, set_name: str, width: int, default: float) -> np.ndarray:
+        return np.concatenate([getattr(part, attribute).get(set_name, np.full((part.vertex_count, width), default))
+                               for part in parts]) if parts else np.zeros((0, width))
+
+    mesh = StaticMeshPart(
+        "", name, parts[0].material if parts else "",
+        np.concatenate([part.positions for part in parts]) if parts else np.zeros((0, 3)),
+        np.concatenate([part.normals for part in parts]) if parts else np.zeros((0, 3)),
+        np.concatenate(triangles) if triangles else np.zeros((0, 3), dtype=np.int64),
+        uvs={uv_set: merge_attribute("uvs", uv_set, 2, 0.0) for uv_set in uv_sets},
+        colors={color_set: merge_attribute("colors", color_set, 4, 1.0) for color_set in color_sets})
+    return StaticBatchChunk(name, mesh, ranges)
+
+
+def create_static_batches(parts: list[StaticMeshPart], prefix: str,
+                          chunk_size: float = DEFAULT_STATIC_BATCH_CHUNK_SIZE,
+                          max_vertices: int = DEFAULT_STATIC_BATCH_MAX_VERTICES) -> list[StaticBatchChunk]:
+    """
+    Plans the chunks (see plan_static_batches) and merges their parts.
+    :param prefix: Chunks are named <prefix>_<material>_<index>, counting per material
+    """
+    chunks = []
+    material_counts = {}
+    for part_indices in plan_static_batches(parts, chunk_size, max_vertices):
+        material = parts[part_indices[0]].material
+        # Counted by name, materials that only differ by namespace would get the same names otherwise
+        base_name = _get_static_batch_base_name(prefix, material)
+        index = material_counts.get(base_name, 0)
+        material_counts[base_name] = index + 1
+        chunks.append(merge_static_mesh_parts(get_static_batch_name(prefix, material, index),
+                                              [parts[part_index] for part_index in part_indices]))
+    return chunks
+
+
+def _get_static_batch_base_name(prefix: str, material: str) -> str:
+    material = material.rsplit(":", 1)[-1]  # Without its namespace
+    return re.sub(r"\W", "_", f"{prefix}_{material}")
@@ -0,0 +1,429 @@
+# Python
+from enum import Enum
+import hashlib
+import re
+from pathlib import Path
+
+from maya_pipeline.exporter.publishing import get_pending_path, publish_bytes
+from maya_pipeline.exporter.skin_weights import DEFAULT_MAX_INFLUENCES
+from maya_pipeline.main_app.asset_definitions import AssetType
+
+__all__ = ["UNITY_META_SUFFIX", "MAYA_FBX_TAKE_NAME", "USER_DATA_PREFIX", "UnityAnimationType",
+           "UnityMaterialImportMode", "UnityClip", "ModelImporterSettings", "get_model_importer_settings",
+           "get_unity_asset_path", "get_meta_path", "read_meta_guid", "read_meta_user_data", "create_meta_guid",
+           "format_model_importer_meta", "write_model_importer_meta"]
+
+UNITY_META_SUFFIX = ".meta"
+# The take Maya's FBX exporter writes the timeline to
+MAYA_FBX_TAKE_NAME = "Take 001"
+# Marks the settings in the .meta's userData, which Unity keeps when it re-writes the file after importing
+USER_DATA_PREFIX = "maya_pipeline:"
+_GUID_PATTERN = re.compile(r"^guid: ([0-9a-f]{32})[ \t]*$", re.MULTILINE)
+_USER_DATA_PATTERN = re.compile(r"^  userData: (.*?)[ \t]*$", re.MULTILINE)
+# The ModelImporter settings the exporter decides, everything else in an existing .meta is kept (artists' remaps,
+# clip events, masks, the internalIDToNameTable...)
+_EXPORTER_SETTING_PATHS = [("materials", "materialImportMode"), ("meshes", "weldVertices"),
+                           ("meshes", "maxBonesPerVertex"), ("meshes", "meshOptimizationFlags"), ("importAnimation",),
+                           ("animationType",), ("avatarSetup",), ("userData",)]
+_EXPORTER_CLIP_KEYS = ["firstFrame", "lastFrame", "loopTime"]
+_CLIP_INDENT = 4
+
+
+class UnityAnimationType(Enum):
+    # ModelImporterAnimationType values
+    NONE = 0
+    LEGACY = 1
+    GENERIC = 2
+    HUMAN = 3
+
+
+class UnityMaterialImportMode(Enum):
+    # ModelImporterMaterialImportMode values
+    NONE = 0
+    IMPORT_STANDARD = 1
+    IMPORT_VIA_MATERIAL_DESCRIPTION = 2
+
+
+class UnityClip:
+    def __init__(self, name: str, first_frame: float, last_frame: float, loop_time: bool,
+                 take_name: str = MAYA_FBX_TAKE_NAME):
+        self.name = name
+        self.first_frame = first_frame
+        self.last_frame = last_frame
+        self.loop_time = loop_time
+        self.take_name = take_name
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "first_frame": self.first_frame, "last_frame": self.last_frame,
+                "loop_time": self.loop_time, "take_name": self.take_name}
+
+    @staticmethod
+    def from_dict(data: dict) -> "UnityClip":
+        return UnityClip(data["name"], data["first_frame"], data["last_frame"], data["loop_time"], data["take_name"])
+
+    def __repr__(self):
+        return f"UnityClip({self.name}, {self.first_frame:g}-{self.last_frame:g}, loop_time={self.loop_time})"
+
+
+class ModelImporterSettings:
+    def __init__(self, animation_type: UnityAnimationType,
+                 material_import_mode: UnityMaterialImportMode = UnityMaterialImportMode.NONE,
+                 clips: list[UnityClip] = None, max_bones_per_vertex: int = DEFAULT_MAX_INFLUENCES,
+                 optimize_mesh: bool = True):
+        """
+        The ModelImporter settings the exporter decides. Everything else is written with Unity's defaults.
+        :param clips: Animation is only imported if there are clips
+        :param optimize_mesh: Off keeps the FBX's vertex and triangle order, and its vertices unwelded
+        """
+        self.animation_type = animation_type
+        self.material_import_mode = material_import_mode
+        self.clips = clips or []
+        self.max_bones_per_vertex = max_bones_per_vertex
+        self.optimize_mesh = optimize_mesh
+
+    def to_dict(self) -> dict:
+        return {"animation_type": self.animation_type.value, "material_import_mode": self.material_import_mode.value,
+                "clips": [clip.to_dict() for clip in self.clips], "max_bones_per_vertex": self.max_bones_per_vertex,
+                "optimize_mesh": self.optimize_mesh}
+
+    @staticmethod
+    def from_dict(data: dict) -> "ModelImporterSettings":
+        return ModelImporterSettings(UnityAnimationType(data["animation_type"]),
+                                     UnityMaterialImportMode(data["material_import_mode"]),
+                                     [UnityClip.from_dict(clip) for clip in data["clips"]],
+                                     data["max_bones_per_vertex"], data["optimize_mesh"])
+
+
+def get_model_importer_settings(asset_type: AssetType, clip_name: str = None, first_frame: float = 0.0,
+                                last_frame: float = 0.0, loop: bool = False) -> ModelImporterSettings:
+    """
+    Materials are set up in Unity, so they're never imported. Meshes don't get a rig, skinned meshes and animations
+    a generic one.
+    :param clip_name: Name of an animation's clip, e.g. Walk for Hero@Walk
+    """
+    if asset_type is AssetType.MESH:
+        return ModelImporterSettings(UnityAnimationType.NONE)
+    if asset_type is AssetType.SKINNED_MESH:
+        return ModelImporterSettings(UnityAnimationType.GENERIC)
+    if asset_type is AssetType.ANIMATION:
+        return ModelImporterSettings(UnityAnimationType.GENERIC,
+                                     clips=[UnityClip(clip_name, first_frame, last_frame, loop)])
+    raise ValueError(f"{asset_type.value} assets aren't exported.")
+
+
+def get_unity_asset_path(path: Path) -> str:
+    """
+    :return: The path from the Unity project's Assets folder, e.g. Assets/Props/Crate_MSH.fbx, or the file name if
+             it isn't in one
+    """
+    path = Path(path)
+    for index, part in enumerate(path.parts):
+        if part == "Assets":
+            return Path(*path.parts[index:]).as_posix()
+    return path.name
+
+
+def get_meta_path(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + UNITY_META_SUFFIX)
+
+
+def read_meta_guid(meta_path: Path) -> str:
+    """
+    :return: The GUID in the .meta file, None if there's no readable one
+    """
+    return _read_meta_value(meta_path, _GUID_PATTERN)
+
+
+def read_meta_user_data(meta_path: Path) -> str:
+    """
+    :return: The ModelImporter's userData in the .meta file, None if there's no readable one
+    """
+    return _read_meta_value(meta_path, _USER_DATA_PATTERN)
+
+
+def create_meta_guid(path: Path) -> str:
+    """
+    A GUID from the file's path in the Unity project, so everyone exporting the same new asset gets the same one
+    """
+    return hashlib.md5(get_unity_asset_path(path).encode("utf-8")).hexdigest()
+
+
+def format_model_importer_meta(guid: str, settings: ModelImporterSettings) -> str:
+    """
+    :return: The .meta file's text, the same for the same GUID and settings. Its userData is a hash of the rest.
+    """
+    values = {
+        "guid": guid,
+        "material_import_mode": settings.material_import_mode.value,
+        "clip_animations": "".join(_format_clip(clip) for clip in settings.clips) + "\n" if settings.clips else " []\n",
+        "weld_vertices": int(settings.optimize_mesh),
+        "max_bones_per_vertex": settings.max_bones_per_vertex,
+        "mesh_optimization_flags": -1 if settings.optimize_mesh else 0,
+        "import_animation": int(bool(settings.clips)),
+        "animation_type": settings.animation_type.value,
+        "avatar_setup": int(settings.animation_type is not UnityAnimationType.NONE),
+    }
+    settings_hash = hashlib.sha1(_MODEL_IMPORTER_META.format(user_data="", **values).encode("utf-8")).hexdigest()
+    return _MODEL_IMPORTER_META.format(user_data=f"{USER_DATA_PREFIX}{settings_hash}", **values)
+
+
+def write_model_importer_meta(path: Path, settings: ModelImporterSettings) -> bool:
+    """
+    Writes <path>.meta. An existing one keeps its GUID and everything the exporter doesn't decide, and its clips keep
+    their names, so references to the asset and its clips in Unity don't break and edits made in Unity are kept.
+    The file isn't touched if it already has these settings (even after Unity re-wrote it), because Unity
+    re-imports the asset when it changes.
+    :param path: The exported FBX
+    :return: True if the file was written
+    """
+    meta_path = get_meta_path(path)
+    current_path = get_pending_path(meta_path)
+    guid = read_meta_guid(current_path) or create_meta_guid(path)
+    text = format_model_importer_meta(guid, settings)
+    if read_meta_user_data(current_path) == _USER_DATA_PATTERN.search(text).group(1):
+        return False
+
+    try:
+        current_text = current_path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        current_text = None
+    if current_text is not None:
+        # Not a ModelImporter .meta Unity wrote, so there's nothing to keep
+        text = _merge_model_importer_meta(current_text, text, settings) or text
+
+    publish_bytes(text.encode("utf-8"), meta_path)
+    return True
+
+
+def _read_meta_value(meta_path: Path, pattern: re.Pattern) -> str:
+    try:
+        with open(meta_path, encoding="utf-8") as file:
+            match = pattern.search(file.read())
+    except (OSError, UnicodeDecodeError):
+        return None
+    return match.group(1) if match else None
+
+
+def _merge_model_importer_meta(current_text: str, text: str, settings: ModelImporterSettings) -> str:
+    """
+    Sets the exporter's settings from the formatted .meta text in the current one.
+    A clip that's already there keeps its name, anything else about it except its frame range and loopTime is kept.
+    A .meta without clips had Unity's default clip, named after the take, so the new clip gets that name. Unity
+    derives the clip's fileID from its name, so references to it keep working.
+    :return: None if the current text doesn't have the settings
+    """
+    lines = current_text.splitlines()
+    new_lines = text.splitlines()
+    for path in _EXPORTER_SETTING_PATHS:
+        index = _find_yaml_key(lines, ("ModelImporter",) + path)
+        new_index = _find_yaml_key(new_lines, ("ModelImporter",) + path)
+        if index < 0:
+            return None
+        lines[index] = new_lines[new_index]
+
+    index = _find_yaml_key(lines, ("ModelImporter", "animations", "clipAnimations"))
+    if index < 0:
+        return None
+    end = _get_yaml_block_end(lines, index, _CLIP_INDENT)
+    clip_starts = [line_index for line_index in range(index + 1, end)
+                   if lines[line_index].startswith(" " * _CLIP_INDENT + "- ")]
+    # Without clips animation isn't imported, the current ones are kept for if it is again
+    if settings.clips and not clip_starts:
+        clips = [UnityClip(clip.take_name, clip.first_frame, clip.last_frame, clip.loop_time, clip.take_name)
+                 for clip in settings.clips]
+        lines[index:end] = (" " * _CLIP_INDENT + "clipAnimations:" + "".join(_format_clip(clip) for clip in clips)
+                            ).splitlines()
+    elif settings.clips:
+        clip_ends = clip_starts[1:] + [end]
+        for clip_index, clip in enumerate(settings.clips[:len(clip_starts)]):
+            clip_lines = _format_clip(clip).splitlines()
+            for key in _EXPORTER_CLIP_KEYS:
+                line_index = _find_clip_key(lines, clip_starts[clip_index], clip_ends[clip_index], key)
+                new_line_index = _find_clip_key(clip_lines, 0, len(clip_lines), key)
+                if line_index >= 0:
+                    lines[line_index] = clip_lines[new_line_index]
+    return "\n".join(lines) + "\n"
+
+
+def _find_yaml_key(lines: list[str], path: tuple[str, ...]) -> int:
+    """
+    :param path: Keys from the top level down, each nested 2 spaces deeper
+    :return: The line the last key is on, -1 if it isn't there
+    """
+    start, end = 0, len(lines)
+    index = -1
+    for indent, key in enumerate(path):
+        prefix = " " * (indent * 2) + key + ":"
+        index = next((line_index for line_index in range(start, end) if lines[line_index].startswith(prefix)), -1)
+        if index < 0:
+            return -1
+        start, end = index + 1, _get_yaml_block_end(lines, index, indent * 2)
+    return index
+
+
+def _get_yaml_block_end(lines: list[str], index: int, indent: int) -> int:
+    """
+    :return: The line after the block that starts with the key on the line, Unity writes list items at its indent
+    """
+    for line_index in range(index + 1, len(lines)):
+        line = lines[line_index]
+        line_indent = len(line) - len(line.lstrip(" "))
+        if line.strip() and (line_indent < indent or (line_indent == indent and not line[indent:].startswith("- "))):
+            return line_index
+    return len(lines)
+
+
+def _find_clip_key(lines: list[str], start: int, end: int, key: str) -> int:
+    first_prefix = " " * _CLIP_INDENT + "- " + key + ":"
+    prefix = " " * (_CLIP_INDENT + 2) + key + ":"
+    return next((index for index in range(start, end)
+                 if lines[index].startswith(prefix) or lines[index].startswith(first_prefix)), -1)
+
+
+def _format_clip(clip: UnityClip) -> str:
+    return _CLIP_ANIMATION.format(name=clip.name, take_name=clip.take_name, first_frame=f"{clip.first_frame:g}",
+                                  last_frame=f"{clip.last_frame:g}", loop_time=int(clip.loop_time))
+
+
+# Unity 2022.3's ModelImporter, with Unity's defaults for everything the exporter doesn't decide
+_MODEL_IMPORTER_META = """fileFormatVersion: 2
+guid: {guid}
+ModelImporter:
+  serializedVersion: 22200
+  internalIDToNameTable: []
+  externalObjects: {{}}
+  materials:
+    materialImportMode: {material_import_mode}
+    materialName: 0
+    materialSearch: 1
+    materialLocation: 1
+  animations:
+    legacyGenerateAnimations: 4
+    bakeSimulation: 0
+    resampleCurves: 1
+    optimizeGameObjects: 0
+    removeConstantScaleCurves: 0
+    motionNodeName: 
+    rigImportErrors: 
+    rigImportWarnings: 
+    animationImportErrors: 
+    animationImportWarnings: 
+    animationRetargetingWarnings: 
+    animationDoRetargetingWarnings: 0
+    importAnimatedCustomProperties: 0
+    importConstraints: 0
+    animationCompression: 1
+    animationRotationError: 0.5
+    animationPositionError: 0.5
+    animationScaleError: 0.5
+    animationWrapMode: 0
+    extraExposedTransformPaths: []
+    extraUserProperties: []
+    clipAnimations:{clip_animations}    isReadable: 0
+  meshes:
+    lODScreenPercentages: []
+    globalScale: 1
+    meshCompression: 0
+    addColliders: 0
+    useSRGBMaterialColor: 1
+    sortHierarchyByName: 1
+    importPhysicalCameras: 1
+    importVisibility: 1
+    importBlendShapes: 1
+    importCameras: 1
+    importLights: 1
+    nodeNameCollisionStrategy: 1
+    fileIdsGeneration: 2
+    swapUVChannels: 0
+    generateSecondaryUV: 0
+    useFileUnits: 1
+    keepQuads: 0
+    weldVertices: {weld_vertices}
+    bakeAxisConversion: 0
+    preserveHierarchy: 0
+    skinWeightsMode: 0
+    maxBonesPerVertex: {max_bones_per_vertex}
+    minBoneWeight: 0.001
+    optimizeBones: 1
+    meshOptimizationFlags: {mesh_optimization_flags}
+    indexFormat: 0
+    secondaryUVAngleDistortion: 8
+    secondaryUVAreaDistortion: 15.000001
+    secondaryUVHardAngle: 88
+    secondaryUVMarginMethod: 1
+    secondaryUVMinLightmapResolution: 40
+    secondaryUVMinObjectScale: 1
+    secondaryUVPackMargin: 4
+    useFileScale: 1
+    strictVertexDataChecks: 0
+  tangentSpace:
+    normalSmoothAngle: 60
+    normalImportMode: 0
+    tangentImportMode: 3
+    normalCalculationMode: 4
+    legacyComputeAllNormalsFromSmoothingGroupsWhenMeshHasBlendShapes: 0
+    blendShapeNormalImportMode: 1
+    normalSmoothingSource: 0
+  referencedClips: []
+  importAnimation: {import_animation}
+  humanDescription:
+    serializedVersion: 3
+    human: []
+    skeleton: []
+    armTwist: 0.5
+    foreArmTwist: 0.5
+    upperLegTwist: 0.5
+    legTwist: 0.5
+    armStretch: 0.05
+    legStretch: 0.05
+    feetSpacing: 0
+    globalScale: 1
+    rootMotionBoneName: 
+    hasTranslationDoF: 0
+    hasExtraRoot: 0
+    skeletonHasParents: 1
+  lastHumanDescriptionAvatarSource: {{instanceID: 0}}
+  autoGenerateAvatarMappingIfUnspecified: 1
+  animationType: {animation_type}
+  humanoidOversampling: 1
+  avatarSetup: {avatar_setup}
+  addHumanoidExtraRootOnlyWhenUsingAvatar: 1
+  importBlendShapeDeformPercent: 1
+  remapMaterialsIfMaterialImportModeIsNone: 0
+  additionalBone: 0
+  userData: {user_data}
+  assetBundleName: 
+  assetBundleVariant: 
+"""
+
+_CLIP_ANIMATION = """
+    - serializedVersion: 16
+      name: {name}
+      takeName: {take_name}
+      internalID: 0
+      firstFrame: {first_frame}
+      lastFrame: {last_frame}
+      wrapMode: 0
+      orientationOffsetY: 0
+      level: 0
+      cycleOffset: 0
+      loop: 0
+      hasAdditiveReferencePose: 0
+      loopTime: {loop_time}
+      loopBlend: 0
+      loopBlendOrientation: 0
+      loopBlendPositionY: 0
+      loopBlendPositionXZ: 0
+      keepOriginalOrientation: 0
+      keepOriginalPositionY: 1
+      keepOriginalPositionXZ: 0
+      heightFromFeet: 0
+      mirror: 0
+      bodyMask: {{instanceID: 0}}
+      curves: []
+      events: []
+      transformMask: []
+      maskType: 3
+      maskSource: {{instanceID: 0}}
+      additiveReferencePoseFrame: 0"""
@@ -0,0 +1,482 @@
+# Python
+import argparse
+from concurrent.futures import Executor, Future
+import ctypes
+import ctypes.util
+import os
+from pathlib import Path
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable
+
+import maya_pipeline as mp
+from maya_pipeline.exporter.bake_cache import hash_maya_ascii_content
+from maya_pipeline.exporter.batch_export import EXPORTABLE_ASSET_TYPES, run_export_job
+from maya_pipeline.exporter.export_history import (ExportHistory, ExportOutcome, ExportRecord,
+                                                   get_export_history_path)
+from maya_pipeline.main_app.asset_definitions import AssetType, ASSET_EXT, get_asset_type_from_filename
+from maya_pipeline.misc.maya_worker import initialize_maya_worker
+from maya_pipeline.misc.pipeline_paths import iter_asset_files
+from maya_pipeline.misc.process_pool import create_process_pool
+from maya_pipeline.validation.ma_parser import parse_maya_ascii, parse_maya_ascii_file
+from maya_pipeline.validation.validation_rules import get_scene_asset_type
+
+__all__ = ["DEFAULT_WATCH_DEBOUNCE_SECONDS", "DEFAULT_WATCH_POLL_INTERVAL", "PollingSceneWatcher",
+           "InotifySceneWatcher", "SceneDependencyGraph", "WatchExporter", "create_scene_watcher",
+           "read_scene_references", "get_watched_asset_type"]
+
+# Maya saves a scene in several writes, and artists often save a few times in a row
+DEFAULT_WATCH_DEBOUNCE_SECONDS = 2.0
+# Seconds between scans of the scenes folder when inotify isn't available (e.g. on Windows)
+DEFAULT_WATCH_POLL_INTERVAL = 2.0
+# Longest the watch loop sleeps, so finished exports and stop requests are handled promptly
+_MAX_WAIT_SECONDS = 0.5
+
+# From <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class PollingSceneWatcher:
+    """
+    Finds changed .ma files by comparing the scenes folder's file stats between scans. A scan only lists folders
+    (see iter_asset_files), so tens of thousands of files cost a few tens of milliseconds per scan.
+    """
+    def __init__(self, scenes_path: Path, poll_interval: float = DEFAULT_WATCH_POLL_INTERVAL):
+        self.scenes_path = Path(scenes_path)
+        self.poll_interval = poll_interval
+        self._stats = self._scan()
+        self._next_scan_time = time.monotonic() + poll_interval
+
+    def wait_for_changes(self, timeout: float) -> set[Path]:
+        """
+        :return: .ma files that were saved, created or deleted since the last call
+        """
+        wait_time = self._next_scan_time - time.monotonic()
+        if wait_time > timeout:
+            time.sleep(timeout)
+            return set()
+
+        time.sleep(max(0.0, wait_time))
+        self._next_scan_time = time.monotonic() + self.poll_interval
+        stats = self._scan()
+        changed = {path for path, stat in stats.items() if self._stats.get(path) != stat}
+        changed.update(path for path in self._stats if path not in stats)
+        self._stats = stats
+        return changed
+
+    def close(self):
+        pass
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        return {path: (stat.st_mtime_ns, stat.st_size)
+                for path, stat in iter_asset_files(self.scenes_path, ASSET_EXT)}
+
+
+class InotifySceneWatcher:
+    """
+    Gets changed .ma files from Linux's inotify, so nothing is scanned while nothing changes. Every folder under the
+    scenes folder is watched, new ones as they're created.
+    :raises OSError: If inotify isn't available or the folders can't be watched (e.g. fs.inotify.max_user_watches
+                     is too low), use a PollingSceneWatcher then
+    """
+    def __init__(self, scenes_path: Path):
+        self.scenes_path = Path(scenes_path)
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux.")
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "Couldn't start inotify.")
+        self._folders: dict[int, Path] = {}
+        self._last_read_time = time.time()
+        try:
+            self._watch_tree(self.scenes_path)
+        except OSError:
+            self.close()
+            raise
+
+    def wait_for_changes(self, timeout: float) -> set[Path]:
+        """
+        :return: .ma files that were saved, created or deleted since the last call
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        data = b""
+        while True:
+            try:
+                data += os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+        changed = set()
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            watch, mask, _, name_length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset:offset + name_length].rstrip(b"\0"))
+            offset += name_length
+            changed |= self._handle_event(watch, mask, name)
+
+        self._last_read_time = time.time()
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _handle_event(self, watch: int, mask: int, name: str) -> set[Path]:
+        if mask & _IN_Q_OVERFLOW:
+            # Events were dropped, so everything saved since the last read counts as changed
+            return {path for path, stat in iter_asset_files(self.scenes_path, ASSET_EXT)
+                    if stat.st_mtime >= self._last_read_time - 1.0}
+        if mask & (_IN_IGNORED | _IN_DELETE_SELF):
+            self._folders.pop(watch, None)
+            return set()
+
+        folder = self._folders.get(watch)
+        if folder is None or not name:
+            return set()
+        path = folder / name
+
+        if mask & _IN_ISDIR:
+            if mask & (_IN_CREATE | _IN_MOVED_TO) and not name.startswith("."):
+                # Files saved in the folder before it was watched wouldn't have events
+                try:
+                    self._watch_tree(path)
+                except OSError as e:
+                    mp.debug_warning(f"Not watching {path}: {e}")
+                return {asset_path for asset_path, _ in iter_asset_files(path, ASSET_EXT)}
+            return set()
+
+        if not name.endswith(ASSET_EXT) or mask == _IN_CREATE:
+            return set()  # A created file is reported when it's closed
+        return {path}
+
+    def _watch_tree(self, root_path: Path):
+        folders = [root_path]
+        while folders:
+            folder = folders.pop()
+            watch = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), _IN_WATCH_MASK)
+            if watch < 0:
+                raise OSError(ctypes.get_errno(), f"Couldn't watch {folder}")
+            self._folders[watch] = folder
+            try:
+                folders += [Path(entry.path) for entry in os.scandir(folder)
+                            if entry.is_dir(follow_symlinks=False) and not entry.name.startswith(".")]
+            except OSError:
+                continue
+
+
+class SceneDependencyGraph:
+    """
+    Which scenes reference which, read from the references at the top of the .ma files (see read_scene_references),
+    so the scenes that need re-exporting when a rig or skeleton changes can be found without opening anything.
+    """
+    def __init__(self, maya_project_path: Path):
+        self.maya_project_path = Path(maya_project_path)
+        self._references: dict[str, set[str]] = {}
+        self._dependents: dict[str, set[Path]] = {}
+
+    def build(self, scenes_path: Path):
+        for path, _ in iter_asset_files(scenes_path, ASSET_EXT):
+            self.update(path)
+
+    def update(self, path: Path):
+        """
+        Re-reads the scene's references
+        """
+        try:
+            reference_paths = read_scene_references(path)
+        except OSError:
+            reference_paths = []
+
+        references = set()
+        for reference_path in reference_paths:
+            if not reference_path.is_absolute():
+                reference_path = self.maya_project_path / reference_path
+            references.add(_get_path_key(reference_path))
+
+        key = _get_path_key(path)
+        for reference in self._references.get(key, set()) - references:
+            self._dependents[reference].discard(Path(path))
+        for reference in references:
+            self._dependents.setdefault(reference, set()).add(Path(path))
+        self._references[key] = references
+
+    def remove(self, path: Path):
+        for reference in self._references.pop(_get_path_key(path), set()):
+            self._dependents[reference].discard(Path(path))
+
+    def get_dependents(self, path: Path) -> set[Path]:
+        """
+        :return: Scenes that reference the scene, directly or through other references
+        """
+        dependents = set()
+        to_visit = [Path(path)]
+        while to_visit:
+            for dependent in self._dependents.get(_get_path_key(to_visit.pop()), ()):
+                if dependent not in dependents:
+                    dependents.add(dependent)
+                    to_visit.append(dependent)
+        dependents.discard(Path(path))
+        return dependents
+
+
+class WatchExporter:
+    """
+    Watches the scenes folder and exports assets when their .ma files are saved, along with the assets that
+    reference them (e.g. every animation of a rig). Saves are debounced, and files whose content didn't change since
+    the watch last handled them (like a save without edits) aren't exported again.
+    Exports run in a process pool of Maya workers, an asset that's saved again while it's exporting is exported
+    once more after that.
+    """
+    def __init__(self, scenes_path: Path, export_root_path: Path, max_workers: int = None,
+                 debounce_seconds: float = DEFAULT_WATCH_DEBOUNCE_SECONDS,
+                 poll_interval: float = DEFAULT_WATCH_POLL_INTERVAL, use_inotify: bool = True,
+                 history_path: Path = None, export_job: Callable[[str, str, str], dict] = None,
+                 executor: Executor = None):
+        """
+        :param export_root_path: Exports go to the same relative folder under this one (e.g. the Unity Assets folder)
+        :param history_path: Export history database. Defaults to the one in the project's cache folder.
+        :param export_job: Takes the .ma file, scenes folder and export root as strings and returns an ExportRecord
+                           dict. Defaults to run_export_job.
+        :param executor: Runs the export jobs. Defaults to a pool of Maya workers, which is shut down when the
+                         watch stops. A passed in executor is left running.
+        """
+        self.scenes_path = Path(scenes_path).resolve()
+        self.export_root_path = Path(export_root_path)
+        self.max_workers = max_workers
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.history_path = history_path or get_export_history_path(self.scenes_path.parent)
+        self.export_job = export_job or run_export_job
+        self.records: list[ExportRecord] = []
+        self._executor = executor
+        self._graph = SceneDependencyGraph(self.scenes_path.parent)
+        self._changed_at: dict[Path, float] = {}
+        self._running: dict[Future, Path] = {}
+        self._rerun: set[Path] = set()
+        self._content_hashes: dict[Path, str] = {}
+        self._stop_event = threading.Event()
+        self._watching = threading.Event()
+        self._idle = threading.Event()
+        self._thread: threading.Thread = None
+
+    def start(self) -> threading.Thread:
+        """
+        Watches on a background thread until stop() is called.
+        """
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, name="WatchExporter", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: float = None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wait_until_watching(self, timeout: float = None) -> bool:
+        return self._watching.wait(timeout)
+
+    def wait_until_idle(self, timeout: float = None) -> bool:
+        """
+        :return: True once no saves are waiting to settle and no exports are running
+        """
+        return self._idle.wait(timeout)
+
+    def run(self):
+        """
+        Watches until stop() is called (or KeyboardInterrupt when run from the command line).
+        """
+        watcher = create_scene_watcher(self.scenes_path, self.poll_interval, self.use_inotify)
+        executor = self._executor or create_process_pool(self.max_workers, initializer=initialize_maya_worker)
+        try:
+            with ExportHistory(self.history_path) as history:
+                start_time = time.perf_counter()
+                self._graph.build(self.scenes_path)
+                mp.debug_log(f"Watching {self.scenes_path} with {type(watcher).__name__} (read references in "
+                             f"{time.perf_counter() - start_time:.1f}s).")
+                self._watching.set()
+
+                while not self._stop_event.is_set():
+                    now = time.monotonic()
+                    for path in watcher.wait_for_changes(self._get_wait_time(now)):
+                        self._changed_at[path] = time.monotonic()
+                        self._idle.clear()
+                    self._submit_settled(executor)
+                    self._collect_finished(executor, history)
+                    if not self._changed_at and not self._running:
+                        self._idle.set()
+        finally:
+            watcher.close()
+            self._watching.clear()
+            if self._executor is None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_wait_time(self, now: float) -> float:
+        if not self._changed_at:
+            return _MAX_WAIT_SECONDS
+        settle_time = min(self._changed_at.values()) + self.debounce_seconds
+        return min(_MAX_WAIT_SECONDS, max(0.0, settle_time - now))
+
+    def _submit_settled(self, executor: Executor):
+        now = time.monotonic()
+        settled = [path for path, changed_at in self._changed_at.items() if now - changed_at >= self.debounce_seconds]
+        for path in settled:
+            del self._changed_at[path]
+
+        running_paths = set(self._running.values())
+        for path in sorted(self._get_assets_to_export(settled)):
+            if path in running_paths:
+                self._rerun.add(path)
+            else:
+                self._submit(executor, path)
+
+    def _get_assets_to_export(self, changed_paths: list[Path]) -> set[Path]:
+        asset_paths = set()
+        for path in changed_paths:
+            if not path.is_file():
+                self._graph.remove(path)
+                self._content_hashes.pop(path, None)
+                continue
+
+            self._graph.update(path)
+            content_hash = _hash_content(path)
+            if content_hash is not None and content_hash == self._content_hashes.get(path):
+                continue  # Saved without changes
+            self._content_hashes[path] = content_hash
+
+            if get_watched_asset_type(path) in EXPORTABLE_ASSET_TYPES:
+                asset_paths.add(path)
+            for dependent in self._graph.get_dependents(path):
+                if get_watched_asset_type(dependent) in EXPORTABLE_ASSET_TYPES:
+                    asset_paths.add(dependent)
+                    # Exported with its current content, so saving it without changes after doesn't export it again
+                    self._content_hashes.setdefault(dependent, _hash_content(dependent))
+        return asset_paths
+
+    def _submit(self, executor: Executor, path: Path):
+        mp.debug_log(f"Exporting {path.relative_to(self.scenes_path).as_posix()}")
+        future = executor.submit(self.export_job, str(path), str(self.scenes_path), str(self.export_root_path))
+        self._running[future] = path
+
+    def _collect_finished(self, executor: Executor, history: ExportHistory):
+        for future in [future for future in self._running if future.done()]:
+            path = self._running.pop(future)
+            try:
+                record = ExportRecord.from_dict(future.result())
+            except Exception as e:
+                # The worker died (e.g. Maya crashed), so there's nothing to measure
+                record = ExportRecord(path.relative_to(self.scenes_path).as_posix(),
+                                      get_watched_asset_type(path).value, time.time(), 0.0, 0,
+                                      outcome=ExportOutcome.FAILED, message=f"Worker failed: {e}")
+
+            history.add([record])
+            self.records.append(record)
+            if record.outcome is ExportOutcome.FAILED:
+                mp.debug_warning(f"Failed to export {record.asset_path}: {record.message}")
+            else:
+                mp.debug_log(f"Exported {record.asset_path} in {record.duration:.1f}s ({record.outcome.value}).")
+
+            if path in self._rerun:
+                self._rerun.discard(path)
+                self._submit(executor, path)
+
+
+def create_scene_watcher(scenes_path: Path, poll_interval: float = DEFAULT_WATCH_POLL_INTERVAL,
+                         use_inotify: bool = True):
+    """
+    :return: An InotifySceneWatcher where it works, otherwise a PollingSceneWatcher
+    """
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return InotifySceneWatcher(scenes_path)
+        except OSError as e:
+            mp.debug_warning(f"Can't use inotify, polling {scenes_path} every {poll_interval}s instead: {e}")
+    return PollingSceneWatcher(scenes_path, poll_interval)
+
+
+def read_scene_references(path: Path) -> list[Path]:
+    """
+    Maya writes a scene's references before its first node, so only the top of the file is read.
+    :return: The referenced files as they're written in the file (often relative to the Maya project)
+    """
+    header = []
+    with open(path, "rb") as file:
+        for line in file:
+            if line.startswith(b"createNode"):
+                break
+            header.append(line)
+    return [Path(reference.path) for reference in parse_maya_ascii(b"".join(header), path).references]
+
+
+def get_watched_asset_type(path: Path) -> AssetType:
+    """
+    :return: The asset type from the file name, or from the Asset node's asset_type attribute for files that
+             don't follow the naming conventions
+    """
+    asset_type = get_asset_type_from_filename(path)
+    if asset_type is not AssetType.NONE:
+        return asset_type
+    try:
+        return get_scene_asset_type(parse_maya_ascii_file(path))
+    except OSError:
+        return AssetType.NONE
+
+
+def _get_path_key(path: Path) -> str:
+    # References can be written with other slashes or case (on Windows) than the files are listed with
+    return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+
+def _hash_content(path: Path) -> str:
+    try:
+        return hash_maya_ascii_content(path)
+    except OSError:
+        return None
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export Maya Pipeline assets in mayapy workers whenever their .ma "
+                                                 "files (or the files they reference) are saved.")
+    parser.add_argument("scenes_path", type=Path, help="The Maya project's scenes folder")
+    parser.add_argument("export_root_path", type=Path, help="Folder to export to, e.g. the Unity project's Assets")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_WATCH_DEBOUNCE_SECONDS,
+                        help="Seconds a file has to stay unchanged before it's exported")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_WATCH_POLL_INTERVAL,
+                        help="Seconds between scans when polling")
+    parser.add_argument("--poll", action="store_true", help="Poll the scenes folder instead of using inotify")
+    args = parser.parse_args(argv)
+
+    watch_exporter = WatchExporter(args.scenes_path, args.export_root_path, max_workers=args.workers,
+                                   debounce_seconds=args.debounce, poll_interval=args.poll_interval,
+                                   use_inotify=not args.poll)
+    print(f"Watching {watch_exporter.scenes_path}, press Ctrl+C to stop.")
+    try:
+        watch_exporter.run()
+    except KeyboardInterrupt:
+        pass
+
+    failed = [record for record in watch_exporter.records if record.outcome is ExportOutcome.FAILED]
+    print(f"Exported {len(watch_exporter.records) - len(failed)} of {len(watch_exporter.records)} assets.")
+    return 1 if failed else 0
@@ -0,0 +1,89 @@
+# Python
+from enum import Enum
+from pathlib import Path, PurePath
+
+__all__ = ["AssetType", "AssetTypeSuffix", "ASSET_EXT", "ASSET_EXT_TYPE", "ASSET_NODE_NAME", "ASSET_TYPE_ATTR_NAME",
+           "IMPORTED_NODES_NAMESPACE", "STATIC_ATTR_NAME", "LOOP_ATTR_NAME", "SAMPLE_RATE_ATTR_NAME",
+           "KEEP_JOINTS_ATTR_NAME", "LOD_COUNT_ATTR_NAME", "ANIMATIONS_DIR_NAME", "get_asset_type_from_filename",
+           "get_asset_name_from_filename", "get_new_asset_path"]
+
+# Asset definitions shared by the Maya UI and the tools that run outside of Maya (e.g. the validation workers),
+# so this module must not import Maya or PySide2.
+
+
+class AssetType(Enum):
+    NONE = "None"
+    ANIMATION = "Animation"
+    MESH = "Mesh"
+    SKELETON = "Skeleton"
+    SKINNED_MESH = "SkinnedMesh"
+    RIG = "Rig"
+
+
+class AssetTypeSuffix(Enum):
+    MESH = "_MSH"
+    SKELETON = "_SKL"
+    SKINNED_MESH = "_SKM"
+    RIG = "_RIG"
+
+
+ASSET_EXT = ".ma"
+ASSET_EXT_TYPE = "mayaAscii"
+ASSET_NODE_NAME = "Asset"
+ASSET_TYPE_ATTR_NAME = "asset_type"
+IMPORTED_NODES_NAMESPACE = "ImportedNodes"
+STATIC_ATTR_NAME = "static"
+LOOP_ATTR_NAME = "loop"
+# Optional float attribute on an animation's Asset node: frames per second to resample the exported keys to
+SAMPLE_RATE_ATTR_NAME = "sample_rate"
+# Optional string attribute on a rig's Asset node: joints animations always export even when nothing uses them,
+# e.g. "Weapon_R, Prop_*"
+KEEP_JOINTS_ATTR_NAME = "keep_joints"
+# Optional integer attribute on a mesh's Asset node: number of LODs to generate when exporting, after LOD0
+LOD_COUNT_ATTR_NAME = "lod_count"
+ANIMATIONS_DIR_NAME = "Animations"
+
+
+def get_asset_type_from_filename(path: PurePath) -> AssetType:
+    # Based on the naming conventions used by MainModel._create_new_asset_path, so no need to open the file
+    if path.suffix != ASSET_EXT:
+        return AssetType.NONE
+
+    if "@" in path.stem and path.parent.name == ANIMATIONS_DIR_NAME:
+        return AssetType.ANIMATION
+
+    for suffix in AssetTypeSuffix:
+        if path.stem.endswith(suffix.value):
+            return AssetType[suffix.name]
+
+    return AssetType.NONE
+
+
+def get_asset_name_from_filename(path: PurePath) -> str:
+    # e.g. Crate_MSH.ma -> Crate, Hero@Walk.ma -> Hero@Walk
+    for suffix in AssetTypeSuffix:
+        if path.stem.endswith(suffix.value):
+            return path.stem[0:-len(suffix.value)]
+
+    return path.stem
+
+
+def get_new_asset_path(scenes_path: Path, parent_folder: str, asset_type: AssetType, name: str,
+                       rig_path: PurePath = None) -> Path:
+    """
+    Where a new asset is created, e.g. Props/Crate/Crate_MSH.ma or Characters/Hero/Animations/Hero@Walk.ma
+    :param parent_folder: Folder relative to the scenes folder
+    :param rig_path: The rig an animation references. Animations are named after it and go in its folder.
+    """
+    if asset_type is AssetType.ANIMATION:
+        rig_basename = rig_path.name[0:-len(ASSET_EXT)]  # remove extension
+        rig_basename = rig_basename[0:-len(AssetTypeSuffix.RIG.value)]  # remove RIG suffix
+        rig_dir = rig_path.parent.name
+        animation_filename = rig_basename + "@" + name + ASSET_EXT
+        return Path(scenes_path) / parent_folder / rig_dir / ANIMATIONS_DIR_NAME / animation_filename
+
+    if asset_type.name not in AssetTypeSuffix.__members__:
+        raise ValueError(f"Can't create an asset of type: {asset_type.value}")
+
+    filename = name + AssetTypeSuffix[asset_type.name].value + ASSET_EXT
+    return Path(scenes_path) / parent_folder / name / filename
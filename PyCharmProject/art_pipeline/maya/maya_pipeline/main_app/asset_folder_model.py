@@ -0,0 +1,317 @@
+# Python
+import os
+from pathlib import Path
+from typing import Any
+
+# PySide2
+from PySide2.QtCore import (QAbstractItemModel, QFileSystemWatcher, QModelIndex, QObject, QRunnable, Qt, QThreadPool,
+                            QTimer, Signal)
+from PySide2.QtWidgets import QApplication, QStyle
+
+from maya_pipeline.main_app.asset_definitions import (AssetType, ANIMATIONS_DIR_NAME, get_asset_name_from_filename,
+                                                      get_asset_type_from_filename)
+
+__all__ = ["AssetFolderNode", "AssetFolderTreeModel", "list_asset_parent_folders"]
+
+# Watcher events usually come in bursts (e.g. creating an asset writes several files), so they're batched
+REFRESH_DELAY_MS = 300
+# Network drives don't always report changes to the watcher, so fetched folders are also re-listed on this interval
+POLL_INTERVAL_MS = 15000
+
+
+class AssetFolderNode:
+    def __init__(self, path: Path, parent: "AssetFolderNode" = None):
+        self.path = path
+        self.parent = parent
+        self.row = 0
+        self.children: list[AssetFolderNode] = []
+        self.fetched = False
+        self.fetching = False
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def update_rows(self, start: int = 0):
+        for row in range(start, len(self.children)):
+            self.children[row].row = row
+
+
+def list_asset_parent_folders(path: Path) -> list[str]:
+    """
+    Lists the folders that new assets can be created in, which skips asset folders (they hold an asset named after
+    them, e.g. Crate/Crate_MSH.ma), Animations folders and hidden folders.
+    :return: Folder names in display order
+    """
+    names = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if (not entry.is_dir(follow_symlinks=False) or entry.name.startswith(".")
+                        or entry.name == ANIMATIONS_DIR_NAME or _is_asset_folder(entry.path)):
+                    continue
+                names.append(entry.name)
+    except OSError:
+        pass
+
+    return sorted(names, key=str.lower)
+
+
+def _is_asset_folder(path: str) -> bool:
+    # Other .ma files (e.g. reference scenes or backups) don't make a folder an asset folder
+    folder_name = os.path.basename(path)
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                filename = Path(entry.name)
+                if (get_asset_type_from_filename(filename) is not AssetType.NONE
+                        and get_asset_name_from_filename(filename) == folder_name and entry.is_file()):
+                    return True
+    except OSError:
+        pass
+    return False
+
+
+class _FolderListerSignals(QObject):
+    # QRunnable isn't a QObject, so its results are sent through this object (queued to the UI thread)
+    listed = Signal(str, list)
+
+
+class _FolderLister(QRunnable):
+    def __init__(self, path: Path):
+        super().__init__()
+        self.path = path
+        self.signals = _FolderListerSignals()
+
+    def run(self):
+        self.signals.listed.emit(str(self.path), list_asset_parent_folders(self.path))
+
+
+class AssetFolderTreeModel(QAbstractItemModel):
+    """
+    Folder tree over the Maya project's scenes folder.
+    Children are listed on a background thread the first time a folder is expanded, and folders that have been
+    listed are kept up to date from a file system watcher, so large projects never block the Maya UI.
+    """
+    folders_listed = Signal(QModelIndex)
+
+    def __init__(self, scenes_path: Path = None, parent: QObject = None):
+        super().__init__(parent)
+        self._root: AssetFolderNode = None
+        self._nodes: dict[str, AssetFolderNode] = {}
+        self._listers: set[_FolderLister] = set()
+        self._pending_refreshes: set[str] = set()
+        # Folders that changed while they were being listed, listed again once that finishes
+        self._rerun: set[str] = set()
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(2)
+        self._folder_icon = QApplication.style().standardIcon(QStyle.SP_DirIcon)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(REFRESH_DELAY_MS)
+        self._refresh_timer.timeout.connect(self._refresh_pending)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self.refresh)
+        self._poll_timer.start()
+
+        if scenes_path is not None:
+            self.set_scenes_path(scenes_path)
+
+    @property
+    def scenes_path(self) -> Path:
+        return self._root.path if self._root is not None else None
+
+    def set_scenes_path(self, scenes_path: Path):
+        scenes_path = Path(scenes_path)
+        if self._root is not None and self._root.path == scenes_path:
+            return
+
+        self.beginResetModel()
+        watched = self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self._pending_refreshes.clear()
+        self._rerun.clear()
+        self._root = AssetFolderNode(scenes_path)
+        self._nodes = {str(scenes_path): self._root}
+        self.endResetModel()
+
+        self._start_listing(self._root)
+
+    def get_relative_folder(self, index: QModelIndex) -> str:
+        """
+        :return: The folder's path relative to the scenes folder (posix style), e.g. Characters/Humans
+        """
+        node = self._get_node(index)
+        if node is self._root or node is None:
+            return ""
+        return node.path.relative_to(self._root.path).as_posix()
+
+    def refresh(self):
+        # Re-lists every folder that has already been listed; unexpanded folders are listed when they're expanded
+        for path, node in self._nodes.items():
+            if node.fetched:
+                self._pending_refreshes.add(path)
+        self._refresh_pending()
+
+    # region QAbstractItemModel
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        parent_node = self._get_node(parent)
+        if parent_node is None or column != 0 or not 0 <= row < len(parent_node.children):
+            return QModelIndex()
+        return self.createIndex(row, column, parent_node.children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+
+        parent_node = index.internalPointer().parent
+        if parent_node is None or parent_node is self._root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row, 0, parent_node)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        node = self._get_node(parent)
+        return len(node.children) if node is not None else 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 1
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+
+        node: AssetFolderNode = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return node.name
+        if role == Qt.ToolTipRole:
+            return self.get_relative_folder(index)
+        if role == Qt.DecorationRole:
+            return self._folder_icon
+        return None
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        # Unlisted folders show an expand arrow until listing them proves they're empty
+        node = self._get_node(parent)
+        if node is None:
+            return False
+        return not node.fetched or len(node.children) > 0
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        node = self._get_node(parent)
+        return node is not None and not node.fetched and not node.fetching
+
+    def fetchMore(self, parent: QModelIndex):
+        node = self._get_node(parent)
+        if node is not None:
+            self._start_listing(node)
+    # endregion
+
+    def _get_node(self, index: QModelIndex) -> AssetFolderNode:
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def _get_index(self, node: AssetFolderNode) -> QModelIndex:
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    # region Background Listing
+    def _start_listing(self, node: AssetFolderNode):
+        if node.fetching:
+            # The listing that's running may have missed the change this is for
+            self._rerun.add(str(node.path))
+            return
+
+        node.fetching = True
+        lister = _FolderLister(node.path)
+        lister.setAutoDelete(False)
+        lister.signals.listed.connect(self._on_folder_listed)
+        # Keep a reference until the results arrive, otherwise Python can delete the runnable while it runs
+        self._listers.add(lister)
+        self._thread_pool.start(lister)
+
+    def _on_folder_listed(self, path: str, names: list[str]):
+        self._listers = {lister for lister in self._listers if str(lister.path) != path}
+
+        node = self._nodes.get(path)
+        if node is None:
+            self._rerun.discard(path)
+            return  # Removed, or the scenes folder changed, while it was being listed
+
+        first_fetch = not node.fetched
+        node.fetching = False
+        node.fetched = True
+        self._apply_listing(node, names)
+
+        if first_fetch:
+            self._watcher.addPath(path)
+            self.folders_listed.emit(self._get_index(node))
+
+        if path in self._rerun:
+            self._rerun.discard(path)
+            self._start_listing(node)
+
+    def _apply_listing(self, node: AssetFolderNode, names: list[str]):
+        parent_index = self._get_index(node)
+        new_names = set(names)
+
+        # Remove folders that no longer exist, back to front so the rows stay valid
+        for row in reversed(range(len(node.children))):
+            child = node.children[row]
+            if child.name not in new_names:
+                self.beginRemoveRows(parent_index, row, row)
+                node.children.pop(row)
+                self._forget(child)
+                self.endRemoveRows()
+        node.update_rows()
+
+        # Insert new folders in sorted position. Both lists are sorted, so this is a single merge.
+        existing_names = {child.name for child in node.children}
+        row = 0
+        for name in names:
+            if name in existing_names:
+                row += 1
+                continue
+
+            self.beginInsertRows(parent_index, row, row)
+            child = AssetFolderNode(node.path / name, node)
+            node.children.insert(row, child)
+            self._nodes[str(child.path)] = child
+            self.endInsertRows()
+            row += 1
+
+        node.update_rows()
+
+    def _forget(self, node: AssetFolderNode):
+        path = str(node.path)
+        self._nodes.pop(path, None)
+        self._pending_refreshes.discard(path)
+        self._rerun.discard(path)
+        if node.fetched:
+            self._watcher.removePath(path)
+        for child in node.children:
+            self._forget(child)
+    # endregion
+
+    # region Incremental Refresh
+    def _on_directory_changed(self, path: str):
+        self._pending_refreshes.add(path)
+        self._refresh_timer.start()
+
+    def _refresh_pending(self):
+        pending, self._pending_refreshes = self._pending_refreshes, set()
+        for path in pending:
+            node = self._nodes.get(path)
+            if node is not None:
+                self._start_listing(node)
+    # endregion
@@ -0,0 +1,278 @@
+# Python
+from collections import Counter
+import heapq
+from pathlib import Path
+import threading
+import time
+
+from maya_pipeline.main_app.asset_definitions import (AssetType, ASSET_EXT, get_asset_type_from_filename,
+                                                      get_asset_name_from_filename)
+from maya_pipeline.misc.pipeline_paths import iter_asset_files
+
+__all__ = ["SHARED_INDEX_MAX_AGE_SECONDS", "AssetIndexEntry", "AssetIndex", "get_shared_asset_index"]
+
+# Names are padded so the first characters produce their own trigrams ("$$c", "$cr"),
+# which lets queries shorter than 3 characters be answered as prefix matches.
+_PAD = "$$"
+# Trigrams shared by more than this fraction of the assets say almost nothing about a match,
+# so fuzzy matching ignores them to keep each keystroke fast.
+_COMMON_TRIGRAM_FRACTION = 0.2
+# Upper bound on the number of postings counted for fuzzy matching, so typos can't make a keystroke slow
+_MAX_FUZZY_POSTINGS = 40000
+# A shared index older than this is rebuilt in the background the next time it's asked for, for assets created
+# outside of this Maya session
+SHARED_INDEX_MAX_AGE_SECONDS = 300.0
+
+
+class AssetIndexEntry:
+    def __init__(self, path: Path, scenes_path: Path):
+        self.path = path
+        self.name = get_asset_name_from_filename(path)
+        self.asset_type = get_asset_type_from_filename(path)
+        self.folder = path.parent.relative_to(scenes_path).as_posix()
+        self.search_name = self.name.lower()
+
+    def __repr__(self):
+        return f"AssetIndexEntry(name={self.name}, asset_type={self.asset_type.value}, folder={self.folder})"
+
+
+class AssetIndex:
+    """
+    In-memory trigram index over every asset in the Maya project's scenes folder.
+    Building it only lists folders, so it can run on a background thread while the UI stays responsive.
+    """
+    def __init__(self):
+        self.scenes_path: Path = None
+        self._entries: list[AssetIndexEntry] = []
+        self._search_names: list[str] = []
+        self._entry_ids: dict[Path, int] = {}
+        self._all_ids: set[int] = set()
+        self._trigrams: dict[str, set[int]] = {}
+        self._type_ids: dict[AssetType, set[int]] = {}
+        self._lock = threading.RLock()
+        self._built = threading.Event()
+        self._build_thread: threading.Thread = None
+        self._build_time: float = None
+
+    def __len__(self) -> int:
+        return len(self._all_ids)
+
+    # region Building
+    def build(self, scenes_path: Path):
+        scenes_path = Path(scenes_path)
+        paths = [path for path, _ in iter_asset_files(scenes_path, ASSET_EXT)]
+
+        entries = []
+        for path in paths:
+            try:
+                entries.append(AssetIndexEntry(path, scenes_path))
+            except ValueError:
+                continue  # Not inside the scenes folder
+
+        # Ids are handed out in ranking order (shortest name first), so ranking a set of matches is just
+        # taking its smallest ids. Assets added later get larger ids and rank after equally good matches.
+        entries.sort(key=lambda entry: (len(entry.search_name), entry.search_name, entry.folder))
+
+        # Build into a new index and swap it in, so searches during a rebuild use the previous index
+        new_index = AssetIndex()
+        new_index.scenes_path = scenes_path
+        for entry in entries:
+            new_index._add_entry(entry)
+
+        with self._lock:
+            self.scenes_path = scenes_path
+            self._build_time = time.monotonic()
+            self._entries = new_index._entries
+            self._search_names = new_index._search_names
+            self._entry_ids = new_index._entry_ids
+            self._all_ids = new_index._all_ids
+            self._trigrams = new_index._trigrams
+            self._type_ids = new_index._type_ids
+
+        self._built.set()
+
+    def build_in_background(self, scenes_path: Path) -> threading.Thread:
+        """
+        Searches keep using the current index until the new one is built, if it's of the same scenes folder.
+        """
+        if self._build_thread is not None and self._build_thread.is_alive():
+            return self._build_thread
+        if self.scenes_path != Path(scenes_path):
+            self._built.clear()
+        self._build_thread = threading.Thread(target=self.build, args=(scenes_path,), name="AssetIndexBuild",
+                                              daemon=True)
+        self._build_thread.start()
+        return self._build_thread
+
+    def wait_until_built(self, timeout: float = None) -> bool:
+        return self._built.wait(timeout)
+
+    def get_age(self) -> float:
+        """
+        :return: Seconds since the index was last built, None if it hasn't been
+        """
+        return time.monotonic() - self._build_time if self._build_time is not None else None
+
+    def add(self, path: Path):
+        # Keeps the index up to date with assets created in this session without rescanning the project
+        with self._lock:
+            if self.scenes_path is not None and Path(path) not in self._entry_ids:
+                try:
+                    self._add_entry(AssetIndexEntry(Path(path), self.scenes_path))
+                except ValueError:
+                    pass  # Not inside the scenes folder
+
+    def remove(self, path: Path):
+        with self._lock:
+            entry_id = self._entry_ids.pop(Path(path), None)
+            if entry_id is None:
+                return
+
+            self._all_ids.discard(entry_id)
+            entry = self._entries[entry_id]
+            for trigram in _get_trigrams(entry.search_name, pad=True):
+                self._trigrams[trigram].discard(entry_id)
+            self._type_ids[entry.asset_type].discard(entry_id)
+
+    def _add_entry(self, entry: AssetIndexEntry):
+        entry_id = len(self._entries)
+        self._entries.append(entry)
+        self._search_names.append(entry.search_name)
+        self._entry_ids[entry.path] = entry_id
+        self._all_ids.add(entry_id)
+
+        for trigram in _get_trigrams(entry.search_name, pad=True):
+            self._trigrams.setdefault(trigram, set()).add(entry_id)
+        self._type_ids.setdefault(entry.asset_type, set()).add(entry_id)
+    # endregion
+
+    # region Searching
+    def search(self, query: str, asset_type: AssetType = None, limit: int = 50) -> list[AssetIndexEntry]:
+        """
+        :param query: Part of an asset name, typos are tolerated. Queries of 1 or 2 characters only match the start
+                      of names (there's no trigram to look up other substrings with), and aren't fuzzy matched.
+        :param asset_type: Only return assets of this type
+        :param limit: Maximum number of results
+        :return: Best matches first: exact names, then prefixes, then substrings, then fuzzy matches
+        """
+        query = query.strip().lower()
+
+        with self._lock:
+            allowed_ids = self._get_allowed_ids(asset_type)
+
+            if not query:
+                return self._rank(allowed_ids, query, limit)
+
+            # A name that contains the query contains all of the query's trigrams
+            substring_ids = self._intersect(_get_trigrams(query, pad=False) or _get_trigrams(query, pad=True),
+                                            allowed_ids)
+            search_names = self._search_names
+            substring_ids = {entry_id for entry_id in substring_ids if query in search_names[entry_id]}
+            results = self._rank(substring_ids, query, limit)
+
+            if len(results) < limit and len(query) >= 3:
+                fuzzy_ids = self._get_fuzzy_ids(query, allowed_ids, limit - len(results), exclude=substring_ids)
+                results += [self._entries[entry_id] for entry_id in fuzzy_ids]
+
+            return results
+
+    def _get_allowed_ids(self, asset_type: AssetType) -> set[int]:
+        if asset_type is None:
+            return self._all_ids
+        return self._type_ids.get(asset_type, set())
+
+    def _intersect(self, trigrams: list[str], allowed_ids: set[int]) -> set[int]:
+        postings = [self._trigrams.get(trigram, set()) for trigram in set(trigrams)]
+        postings.append(allowed_ids)
+        postings.sort(key=len)
+
+        # Starting from the rarest trigram keeps every intersection small
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result &= posting
+        return result
+
+    def _rank(self, entry_ids: set[int], query: str, limit: int) -> list[AssetIndexEntry]:
+        # Exact names, then prefixes, then word starts (after _ or @), then other substrings.
+        # Only ranks as many groups as it takes to fill the results.
+        if not query:
+            return [self._entries[entry_id] for entry_id in self._best(entry_ids, limit)]
+
+        search_names = self._search_names
+        # Names starting with the query have its padded first trigrams (e.g. "$$c" and "$cr")
+        prefix_candidates = self._intersect(_get_trigrams(query[:2], pad=True), entry_ids)
+        prefix_ids = {entry_id for entry_id in prefix_candidates if search_names[entry_id].startswith(query)}
+        exact_ids = {entry_id for entry_id in prefix_ids if search_names[entry_id] == query}
+
+        ranked_ids = self._best(exact_ids, limit)
+        ranked_ids += self._best(prefix_ids - exact_ids, limit - len(ranked_ids))
+
+        if len(ranked_ids) < limit:
+            other_ids = entry_ids - prefix_ids
+            word_start_ids = {entry_id for entry_id in other_ids
+                              if f"_{query}" in search_names[entry_id] or f"@{query}" in search_names[entry_id]}
+            ranked_ids += self._best(word_start_ids, limit - len(ranked_ids))
+            ranked_ids += self._best(other_ids - word_start_ids, limit - len(ranked_ids))
+
+        return [self._entries[entry_id] for entry_id in ranked_ids]
+
+    def _best(self, entry_ids: set[int], count: int) -> list[int]:
+        if count <= 0 or not entry_ids:
+            return []
+        return heapq.nsmallest(count, entry_ids)
+
+    def _get_fuzzy_ids(self, query: str, allowed_ids: set[int], limit: int, exclude: set[int]) -> list[int]:
+        max_posting_size = max(1000, int(len(self._all_ids) * _COMMON_TRIGRAM_FRACTION))
+        postings = []
+
+        for trigram in set(_get_trigrams(query, pad=True)):
+            posting = self._trigrams.get(trigram)
+            if posting and len(posting) <= max_posting_size:
+                postings.append(posting & allowed_ids)
+
+        # Count the rarest (most telling) trigrams first and stop once enough work has been done
+        postings.sort(key=len)
+        counts = Counter()
+        counted = 0
+        used_trigrams = 0
+
+        for posting in postings:
+            if counted + len(posting) > _MAX_FUZZY_POSTINGS and used_trigrams > 0:
+                break
+            counts.update(posting)
+            counted += len(posting)
+            used_trigrams += 1
+
+        # Require at least half the counted trigrams so fuzzy results are still relevant
+        min_count = max(2, (used_trigrams + 1) // 2)
+        candidates = [entry_id for entry_id, count in counts.items() if count >= min_count and entry_id not in exclude]
+        return heapq.nsmallest(limit, candidates, key=lambda entry_id: (-counts[entry_id], entry_id))
+    # endregion
+
+
+# Indexes shared by every MainModel in the Maya session, keyed on the scenes folder.
+# Maya re-creates the tool when it restores its dock, and rescanning a large project each time would be slow.
+_shared_indexes: dict[Path, AssetIndex] = {}
+
+
+def get_shared_asset_index(scenes_path: Path) -> AssetIndex:
+    """
+    :return: The session's index of the scenes folder. It's built in the background the first time, and rebuilt in
+             the background (still answering searches) once it's older than SHARED_INDEX_MAX_AGE_SECONDS.
+    """
+    scenes_path = Path(scenes_path)
+    index = _shared_indexes.get(scenes_path)
+    if index is None:
+        index = _shared_indexes[scenes_path] = AssetIndex()
+        index.build_in_background(scenes_path)
+    elif index.get_age() is not None and index.get_age() > SHARED_INDEX_MAX_AGE_SECONDS:
+        index.build_in_background(scenes_path)
+    return index
+
+
+def _get_trigrams(text: str, pad: bool) -> list[str]:
+    if pad:
+        text = _PAD + text
+    return [text[i:i + 3] for i in range(len(text) - 2)]
@@ -0,0 +1,93 @@
+# Python
+from pathlib import Path
+
+# PySide2
+from PySide2.QtCore import QObject, Qt
+from PySide2.QtWidgets import (QDialog, QDialogButtonBox, QLineEdit, QListWidget, QListWidgetItem, QPushButton,
+                               QVBoxLayout, QWidget)
+from shiboken2 import wrapInstance
+
+# Maya
+from maya import OpenMayaUI as omui
+import pymel.core as pm
+
+import maya_pipeline as mp
+
+__all__ = ["AssetQuickPickDialog", "pick_asset"]
+
+MAX_RESULTS = 50
+
+
+class AssetQuickPickDialog(QDialog):
+    def __init__(self, asset_index: mp.AssetIndex, asset_type: mp.AssetType, title: str, parent=None):
+        super().__init__(parent)
+        self._asset_index = asset_index
+        self._asset_type = asset_type
+        self.selected_path: Path = None
+        self.browse_requested = False
+        self.setWindowTitle(title)
+        self.setMinimumSize(400, 300)
+        self.setup_ui()
+        self._on_filter_edited("")
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.filter_line_edit = QLineEdit(self)
+        self.filter_line_edit.setPlaceholderText(f"Type to search {self._asset_type.value} assets...")
+        self.filter_line_edit.textEdited.connect(self._on_filter_edited)
+        self.filter_line_edit.returnPressed.connect(self._on_select)
+        layout.addWidget(self.filter_line_edit)
+
+        self.results_list_widget = QListWidget(self)
+        self.results_list_widget.itemDoubleClicked.connect(self._on_select)
+        layout.addWidget(self.results_list_widget)
+
+        self.buttons = QDialogButtonBox(QDialogButtonBox.Cancel | QDialogButtonBox.Ok, self)
+        self.browse_button = QPushButton("Browse...", self)
+        self.buttons.addButton(self.browse_button, QDialogButtonBox.ActionRole)
+        self.browse_button.clicked.connect(self._on_browse)
+        self.buttons.accepted.connect(self._on_select)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+
+        # Query Maya's current DPI scaling mode.
+        if pm.mayaDpiSetting(query=True, mode=True) == 1:  # 1 == Custom scaling
+            # Query the current scale value and use it to scale the UI widgets
+            scale_value: int = pm.mayaDpiSetting(query=True, scaleValue=True)
+            mp.scale_qobjects(self.findChildren(QObject), scale_value)
+
+    def _on_filter_edited(self, text: str):
+        self.results_list_widget.clear()
+
+        for entry in self._asset_index.search(text, asset_type=self._asset_type, limit=MAX_RESULTS):
+            item = QListWidgetItem(f"{entry.name}    ({entry.folder})")
+            item.setData(Qt.UserRole, str(entry.path))
+            item.setToolTip(str(entry.path))
+            self.results_list_widget.addItem(item)
+
+        if self.results_list_widget.count() > 0:
+            self.results_list_widget.setCurrentRow(0)
+
+    def _on_select(self):
+        item = self.results_list_widget.currentItem()
+        if item is None:
+            return
+
+        self.selected_path = Path(item.data(Qt.UserRole))
+        self.accept()
+
+    def _on_browse(self):
+        self.browse_requested = True
+        self.reject()
+
+
+def pick_asset(asset_index: mp.AssetIndex, asset_type: mp.AssetType, title: str) -> tuple[Path, bool]:
+    """
+    :return: The selected asset's path (None if cancelled), and whether the user asked for the file dialog instead
+    """
+    maya_main_window = wrapInstance(int(omui.MQtUtil.mainWindow()), QWidget)
+    dialog = AssetQuickPickDialog(asset_index, asset_type, title, parent=maya_main_window)
+    dialog.exec_()
+
+    return dialog.selected_path, dialog.browse_requested
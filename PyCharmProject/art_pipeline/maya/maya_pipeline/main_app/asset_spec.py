@@ -0,0 +1,131 @@
+# Python
+import csv
+import json
+from pathlib import Path
+
+from maya_pipeline.main_app.asset_definitions import AssetType, get_new_asset_path
+
+__all__ = ["ASSET_DEPENDENCY_TYPES", "AssetSpec", "load_asset_specs"]
+
+# The assets create_asset asks for (to import or reference) when creating each type of asset
+ASSET_DEPENDENCY_TYPES: dict[AssetType, list[AssetType]] = {
+    AssetType.MESH: [],
+    AssetType.SKELETON: [AssetType.MESH],
+    AssetType.SKINNED_MESH: [AssetType.MESH, AssetType.SKELETON],
+    AssetType.RIG: [AssetType.SKINNED_MESH],
+    AssetType.ANIMATION: [AssetType.RIG],
+}
+
+_TRUE_STRINGS = {"1", "true", "yes", "y"}
+
+
+class AssetSpec:
+    """
+    Everything MainModel.create_asset asks the user, so an asset can be created without prompts.
+    """
+    def __init__(self, name: str, asset_type: AssetType, parent_folder: str = "",
+                 dependencies: dict[AssetType, str] = None, static: bool = False, loop: bool = False,
+                 overwrite: bool = False, lod_count: int = 0, sample_rate: float = 0.0, keep_joints: str = ""):
+        """
+        :param parent_folder: Folder relative to the scenes folder, e.g. Props or Characters/Humans
+        :param dependencies: Assets to import or reference by type, relative to the scenes folder or absolute.
+                             Types create_asset doesn't ask for are ignored, like answering No.
+        :param static: Answer to "Will this be a static mesh?"
+        :param loop: Answer to "Will this animation loop?"
+        :param overwrite: Answer to "<asset> exists, do you want to overwrite the file?"
+        :param lod_count: Answer to "How many LODs should this mesh export with?"
+        :param sample_rate: Answer to "How many frames per second should this animation export with?"
+        :param keep_joints: Answer to "Which joints should animations of this rig always export?",
+                            e.g. "Weapon_R, Prop_*"
+        """
+        self.name = name
+        self.asset_type = asset_type
+        self.parent_folder = parent_folder
+        self.dependencies = dependencies or {}
+        self.static = static
+        self.loop = loop
+        self.overwrite = overwrite
+        self.lod_count = lod_count
+        self.sample_rate = sample_rate
+        self.keep_joints = keep_joints
+
+        if not name:
+            raise ValueError("Asset spec has no name.")
+        if asset_type not in ASSET_DEPENDENCY_TYPES:
+            raise ValueError(f"{name}: can't create an asset of type {asset_type.value}.")
+        if asset_type is AssetType.ANIMATION and AssetType.RIG not in self.dependencies:
+            raise ValueError(f"{name}: animations need a {AssetType.RIG.value} dependency.")
+        if lod_count < 0:
+            raise ValueError(f"{name}: lod_count can't be negative.")
+        if sample_rate < 0:
+            raise ValueError(f"{name}: sample_rate can't be negative.")
+
+    def get_dependency_path(self, asset_type: AssetType, scenes_path: Path) -> Path:
+        """
+        :return: Absolute path of the dependency of this type, None if there isn't one
+        """
+        if asset_type not in ASSET_DEPENDENCY_TYPES[self.asset_type] or asset_type not in self.dependencies:
+            return None
+        return Path(scenes_path) / self.dependencies[asset_type]  # Absolute paths replace scenes_path
+
+    def get_dependency_paths(self, scenes_path: Path) -> list[Path]:
+        paths = [self.get_dependency_path(asset_type, scenes_path)
+                 for asset_type in ASSET_DEPENDENCY_TYPES[self.asset_type]]
+        return [path for path in paths if path is not None]
+
+    def get_asset_path(self, scenes_path: Path) -> Path:
+        return get_new_asset_path(scenes_path, self.parent_folder, self.asset_type, self.name,
+                                  rig_path=self.get_dependency_path(AssetType.RIG, scenes_path))
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "type": self.asset_type.value, "parent_folder": self.parent_folder,
+                "dependencies": {asset_type.value: path for asset_type, path in self.dependencies.items()},
+                "static": self.static, "loop": self.loop, "overwrite": self.overwrite, "lod_count": self.lod_count,
+                "sample_rate": self.sample_rate, "keep_joints": self.keep_joints}
+
+    @staticmethod
+    def from_dict(data: dict) -> "AssetSpec":
+        return AssetSpec(data["name"], AssetType(data["type"]), data.get("parent_folder", ""),
+                         {AssetType(asset_type): path for asset_type, path in data.get("dependencies", {}).items()},
+                         _to_bool(data.get("static", False)), _to_bool(data.get("loop", False)),
+                         _to_bool(data.get("overwrite", False)), lod_count=int(data.get("lod_count") or 0),
+                         sample_rate=float(data.get("sample_rate") or 0), keep_joints=data.get("keep_joints") or "")
+
+    def __repr__(self):
+        return f"AssetSpec({self.asset_type.value} {self.parent_folder}/{self.name})"
+
+
+def load_asset_specs(spec_path: Path) -> list[AssetSpec]:
+    """
+    Reads a JSON or CSV spec file.
+    JSON: a list of objects (or {"assets": [...]}) with name, type, parent_folder, dependencies, static, loop,
+    overwrite, lod_count, sample_rate and keep_joints, where dependencies maps asset types to paths,
+    e.g. {"Rig": "Characters/Hero/Hero_RIG.ma"}.
+    CSV: the same columns, with one column per dependency type instead of dependencies (Mesh, Skeleton, SkinnedMesh,
+    Rig).
+    """
+    spec_path = Path(spec_path)
+
+    if spec_path.suffix.lower() == ".csv":
+        with open(spec_path, "r", encoding="utf-8", newline="") as file:
+            rows = list(csv.DictReader(file))
+        return [AssetSpec.from_dict(_csv_row_to_dict(row)) for row in rows]
+
+    with open(spec_path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    if isinstance(data, dict):
+        data = data["assets"]
+    return [AssetSpec.from_dict(entry) for entry in data]
+
+
+def _csv_row_to_dict(row: dict[str, str]) -> dict:
+    row = {key.strip(): (value or "").strip() for key, value in row.items() if key}
+    dependency_columns = [asset_type.value for asset_type in AssetType if asset_type is not AssetType.NONE]
+    row["dependencies"] = {column: row.pop(column) for column in dependency_columns if row.get(column)}
+    return row
+
+
+def _to_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_STRINGS
+    return bool(value)
@@ -0,0 +1,151 @@
+# Python
+import argparse
+import time
+from pathlib import Path
+
+import maya_pipeline as mp
+from maya_pipeline.main_app.asset_spec import AssetSpec, load_asset_specs
+from maya_pipeline.misc.maya_worker import initialize_maya_worker
+from maya_pipeline.misc.process_pool import create_process_pool
+
+__all__ = ["AssetCreationResult", "plan_creation_waves", "create_assets"]
+
+
+class AssetCreationResult:
+    def __init__(self, spec: AssetSpec, path: Path, succeeded: bool, message: str = ""):
+        self.spec = spec
+        self.path = path
+        self.succeeded = succeeded
+        self.message = message
+
+    def to_dict(self) -> dict:
+        return {"spec": self.spec.to_dict(), "path": str(self.path), "succeeded": self.succeeded,
+                "message": self.message}
+
+    @staticmethod
+    def from_dict(data: dict) -> "AssetCreationResult":
+        return AssetCreationResult(AssetSpec.from_dict(data["spec"]), Path(data["path"]), data["succeeded"],
+                                   data["message"])
+
+    def __repr__(self):
+        return f"{'Created' if self.succeeded else 'FAILED'} {self.path}{': ' + self.message if self.message else ''}"
+
+
+def plan_creation_waves(specs: list[AssetSpec], scenes_path: Path) -> tuple[list[list[AssetSpec]],
+                                                                            list[AssetCreationResult]]:
+    """
+    Groups the specs so every asset is created after the assets in the same spec that it imports or references
+    (e.g. a Rig after its SkinnedMesh). The specs in a wave don't depend on each other, so they run in parallel.
+    :return: The waves in order, and results for the specs that can't be created (e.g. missing dependencies)
+    """
+    scenes_path = Path(scenes_path)
+    specs_by_path: dict[Path, AssetSpec] = {}
+    failed: list[AssetCreationResult] = []
+
+    for spec in specs:
+        path = spec.get_asset_path(scenes_path)
+        if path in specs_by_path:
+            failed.append(AssetCreationResult(spec, path, False, f"Another spec also creates {path.name}."))
+        else:
+            specs_by_path[path] = spec
+
+    remaining: dict[Path, list[Path]] = {}
+    for path, spec in specs_by_path.items():
+        dependency_paths = spec.get_dependency_paths(scenes_path)
+        missing = [dependency_path for dependency_path in dependency_paths
+                   if dependency_path not in specs_by_path and not dependency_path.is_file()]
+        if missing:
+            failed.append(AssetCreationResult(spec, path, False,
+                                              f"Missing dependencies: {', '.join(str(p) for p in missing)}"))
+        else:
+            # Only dependencies created by this batch have to wait
+            remaining[path] = [dependency_path for dependency_path in dependency_paths
+                               if dependency_path in specs_by_path]
+
+    waves: list[list[AssetSpec]] = []
+    while remaining:
+        wave = [path for path, dependency_paths in remaining.items()
+                if not any(dependency_path in remaining for dependency_path in dependency_paths)]
+        if not wave:
+            # Only cycles, or assets that depend on specs that failed, are left
+            for path in remaining:
+                failed.append(AssetCreationResult(specs_by_path[path], path, False,
+                                                  "Depends on an asset in the spec that can't be created."))
+            break
+
+        waves.append([specs_by_path[path] for path in wave])
+        for path in wave:
+            del remaining[path]
+
+    return waves, failed
+
+
+def create_assets(specs: list[AssetSpec], scenes_path: Path, max_workers: int = None) -> list[AssetCreationResult]:
+    """
+    Creates assets in parallel mayapy workers without prompting: each spec answers the questions create_asset asks.
+    """
+    start_time = time.perf_counter()
+    scenes_path = Path(scenes_path)
+    waves, results = plan_creation_waves(specs, scenes_path)
+    mp.debug_log(f"Creating {sum(len(wave) for wave in waves)} assets in {len(waves)} waves "
+                 f"({len(results)} can't be created).")
+
+    with create_process_pool(max_workers, initializer=initialize_maya_worker) as pool:
+        failed_paths: set[Path] = {result.path for result in results}
+
+        for wave in waves:
+            jobs = []
+            for spec in wave:
+                blocked = [path for path in spec.get_dependency_paths(scenes_path) if path in failed_paths]
+                if blocked:
+                    path = spec.get_asset_path(scenes_path)
+                    results.append(AssetCreationResult(spec, path, False, f"Dependency failed: {blocked[0].name}"))
+                    failed_paths.add(path)
+                else:
+                    jobs.append((spec.to_dict(), str(scenes_path)))
+
+            for job_result in pool.map(_create_asset_job, jobs):
+                result = AssetCreationResult.from_dict(job_result)
+                results.append(result)
+                if not result.succeeded:
+                    failed_paths.add(result.path)
+                    mp.debug_warning(f"Failed to create {result.path}: {result.message}")
+
+    created_count = sum(1 for result in results if result.succeeded)
+    mp.debug_log(f"Created {created_count} of {len(results)} assets in {time.perf_counter() - start_time:.0f}s.")
+    return results
+
+
+def _create_asset_job(job: tuple[dict, str]) -> dict:
+    # Runs in the Maya worker processes, so it only returns data and doesn't log.
+    import pymel.core as pm
+
+    spec_dict, scenes_path_str = job
+    spec = AssetSpec.from_dict(spec_dict)
+    scenes_path = Path(scenes_path_str)
+    path = spec.get_asset_path(scenes_path)
+
+    try:
+        # Paths are saved relative to the Maya project, so it has to be set before creating anything
+        pm.workspace(str(scenes_path.parent), openWorkspace=True)
+        pm.newFile(force=True)
+        model = mp.MainModel(build_asset_index=False)
+        path = model.create_asset_from_spec(spec)
+    except Exception as e:
+        return AssetCreationResult(spec, path, False, str(e)).to_dict()
+    return AssetCreationResult(spec, path, True).to_dict()
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Create Maya Pipeline assets from a JSON or CSV spec without "
+                                                 "prompts, in parallel mayapy workers.")
+    parser.add_argument("spec_path", type=Path, help="JSON or CSV file describing the assets to create")
+    parser.add_argument("scenes_path", type=Path, help="The Maya project's scenes folder")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    args = parser.parse_args(argv)
+
+    results = create_assets(load_asset_specs(args.spec_path), args.scenes_path.resolve(), max_workers=args.workers)
+    for result in results:
+        print(result)
+
+    return 0 if all(result.succeeded for result in results) else 1
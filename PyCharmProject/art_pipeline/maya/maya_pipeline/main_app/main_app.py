@@ -1,8 +1,5 @@
 import gc
 
-# Maya
-import pymel.core as pm
-
 import maya_pipeline as mp
 
 __all__ = ["MayaPipeline", "open_mp", "on_close", "cleanup"]
@@ -39,7 +36,6 @@ def open_mp(title: str, mode: mp.UI_Creation_Mode):
         mp_obj.model = mp.MainModel()
         mp_obj.main_controller = mp.MainController(mp_obj.model, mp_obj.main_view)
         mp_obj.main_view.ui.on_dock_closed.connect(on_close)
-        mp_obj.main_view.ui.on_dock_closed.connect(on_close)
     elif mode == mp.UI_Creation_Mode.RESTORE_FROM_MAYA_PREFS:
         # When Maya starts create the UI and restore its previous state when Maya quit
         mp_obj = mp.MayaPipeline(title=title, mode=mp.UI_Creation_Mode.RESTORE_FROM_MAYA_PREFS)
@@ -57,5 +53,6 @@ def on_close():
 
 def cleanup():
     mp.debug_log("Cleaning up Maya Pipeline.")
-    pm.scriptJob(killAll=True)
+    # Only kill the script jobs created by the Maya Pipeline, other tools' jobs stay alive
+    mp.kill_script_jobs()
     gc.collect()
@@ -1,14 +1,12 @@
 # PySide2
-from PySide2.QtCore import QObject
-from PySide2.QtWidgets import QTreeWidgetItem
-
-# Maya
-import pymel.core as pm
+from PySide2.QtCore import QModelIndex, QObject
 
 import maya_pipeline as mp
 
 __all__ = ["MainController"]
 
+SCRIPT_JOB_OWNER = "MainController"
+
 
 class MainController(QObject):
 
@@ -26,17 +24,18 @@ class MainController(QObject):
         self._view.ui.ui_main_window.exportAction.triggered.connect(self.on_export_clicked)
         self._view.ui.ui_main_window.exportToCustomLocationAction.triggered.connect(
             self.on_export_to_custom_location_clicked)
+        self._view.ui.ui_main_window.exportStaticBatchesAction.triggered.connect(self.on_export_static_batches_clicked)
 
         # Create Tab
-        # Asset Parent Folder TODO: Add support for nested folders
-        # Auto select the first item in the tree
-        if self._view.ui.ui_main_window.assetParentFolderTreeWidget.topLevelItemCount() > 0:
-            first_item: QTreeWidgetItem = self._view.ui.ui_main_window.assetParentFolderTreeWidget.topLevelItem(0)
-            first_item.setSelected(True)
-            self.on_asset_parent_folder_tree_clicked(first_item, 0)
-
-        self._view.ui.ui_main_window.assetParentFolderTreeWidget.itemClicked.connect(
-            self.on_asset_parent_folder_tree_clicked)
+        # Asset Parent Folder
+        # Folders are listed in the background, so the first one is selected once the top level has been listed
+        self._asset_folder_model = mp.AssetFolderTreeModel(parent=self)
+        self._asset_folder_model.folders_listed.connect(self.on_asset_parent_folders_listed)
+        self._view.ui.ui_main_window.assetParentFolderTreeView.setModel(self._asset_folder_model)
+        self._view.ui.ui_main_window.assetParentFolderTreeView.selectionModel().currentChanged.connect(
+            self.on_asset_parent_folder_changed)
+        self._model.new_asset_parent_folder = ""
+        self._set_asset_folder_scenes_path()
 
         # Asset Type
         # Auto select the first item in the combo box so the model is initialized
@@ -54,11 +53,19 @@ class MainController(QObject):
         self._model.on_asset_type_changed.connect(self.on_asset_type_changed)
 
         # Script Jobs -----------------------------------------
-        pm.scriptJob(event=("SceneOpened", self._on_scene_opened))
+        # Registered through the callback registry so restoring the dock replaces this job instead of adding one
+        mp.register_script_job(SCRIPT_JOB_OWNER, "SceneOpened", self._on_scene_opened)
 
     def _on_scene_opened(self):
         mp.debug_log(f"Opened scene: {mp.get_current_scene_path()}")
         self._model.init_model()
+        self._set_asset_folder_scenes_path()
+
+    def _set_asset_folder_scenes_path(self):
+        # Opening a scene can switch the Maya project. The model ignores the path if it hasn't changed.
+        scenes_path = mp.get_maya_project_path() / "scenes"
+        if scenes_path.is_dir():
+            self._asset_folder_model.set_scenes_path(scenes_path)
 
     def on_settings_clicked(self):
         mp.debug_log("main_controller > open_settings clicked.")
@@ -72,10 +79,23 @@ class MainController(QObject):
     def on_export_to_custom_location_clicked(self):
         self._model.export_to_custom_location()
 
+    # File > Export Static Batches for Folder
+    def on_export_static_batches_clicked(self):
+        self._model.export_static_batches()
+
     # Asset Parent Folder
-    def on_asset_parent_folder_tree_clicked(self, item: QTreeWidgetItem, column: int):
-        # set new asset parent folder
-        self._model.new_asset_parent_folder = item.text(column)
+    def on_asset_parent_folders_listed(self, parent: QModelIndex):
+        tree_view = self._view.ui.ui_main_window.assetParentFolderTreeView
+        if parent.isValid() or tree_view.currentIndex().isValid():
+            return
+
+        first_index = self._asset_folder_model.index(0, 0)
+        if first_index.isValid():
+            tree_view.setCurrentIndex(first_index)
+
+    def on_asset_parent_folder_changed(self, current: QModelIndex, previous: QModelIndex):
+        # set new asset parent folder, relative to the scenes folder so nested folders work
+        self._model.new_asset_parent_folder = self._asset_folder_model.get_relative_folder(current)
 
     # Asset Type
     def on_asset_type_combobox_changed(self, index: int):
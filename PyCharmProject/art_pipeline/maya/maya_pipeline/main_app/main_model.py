@@ -1,7 +1,10 @@
 # Python
 from enum import Enum
+import os
 from pathlib import Path
 import pathlib
+import sqlite3
+import tempfile
 from typing import Any
 
 # PySide2
@@ -12,36 +15,15 @@ import pymel.core as pm
 import maya.mel as mel
 
 import maya_pipeline as mp
+from maya_pipeline.main_app.asset_definitions import (AssetType, ASSET_EXT, ASSET_EXT_TYPE,
+                                                      ASSET_NODE_NAME, ASSET_TYPE_ATTR_NAME, IMPORTED_NODES_NAMESPACE,
+                                                      STATIC_ATTR_NAME, LOOP_ATTR_NAME, LOD_COUNT_ATTR_NAME,
+                                                      SAMPLE_RATE_ATTR_NAME, KEEP_JOINTS_ATTR_NAME, get_new_asset_path)
 
-__all__ = ["AssetType", "AssetTypeSuffix", "ASSET_EXT", "ASSET_EXT_TYPE", "ASSET_NODE_NAME", "ASSET_TYPE_ATTR_NAME",
-           "IMPORTED_NODES_NAMESPACE", "STATIC_ATTR_NAME", "LOOP_ATTR_NAME", "ANIMATIONS_DIR_NAME", "Response",
-           "Operation","AssetsToImportOrRef", "MainModel", "get_asset_type_from_node"]
+__all__ = ["Response", "Operation", "AssetsToImportOrRef", "MainModel", "get_asset_type_from_node"]
 
-
-class AssetType(Enum):
-    NONE = "None"
-    ANIMATION = "Animation"
-    MESH = "Mesh"
-    SKELETON = "Skeleton"
-    SKINNED_MESH = "SkinnedMesh"
-    RIG = "Rig"
-
-
-class AssetTypeSuffix(Enum):
-    MESH = "_MSH"
-    SKELETON = "_SKL"
-    SKINNED_MESH = "_SKM"
-    RIG = "_RIG"
-
-
-ASSET_EXT = ".ma"
-ASSET_EXT_TYPE = "mayaAscii"
-ASSET_NODE_NAME = "Asset"
-ASSET_TYPE_ATTR_NAME = "asset_type"
-IMPORTED_NODES_NAMESPACE = "ImportedNodes"
-STATIC_ATTR_NAME = "static"
-LOOP_ATTR_NAME = "loop"
-ANIMATIONS_DIR_NAME = "Animations"
+# How long to wait for the asset index to finish building before falling back to the file dialog
+ASSET_INDEX_WAIT_SECONDS = 5.0
 
 
 class Response(Enum):
@@ -65,7 +47,10 @@ class AssetsToImportOrRef:
 
 
 class MainModel(QObject):
-    def __init__(self):
+    def __init__(self, build_asset_index: bool = True):
+        """
+        :param build_asset_index: Whether to index the project's assets for the asset quick pick
+        """
         super().__init__()
         self._current_asset_path: Path
         self._current_asset_node: pm.PyNode
@@ -75,6 +60,12 @@ class MainModel(QObject):
         self._new_asset_type: AssetType = AssetType.MESH
         self._new_asset_name: str = ""
         self._rig_ref_path: Path
+        self._asset_index = mp.AssetIndex()
+        self._asset_index_scenes_path: Path = None
+        # Set while creating an asset from a spec, which answers the prompts instead of the user
+        self._asset_spec: mp.AssetSpec = None
+        if build_asset_index:
+            self._start_asset_index_build()
 
     on_asset_type_changed = Signal(AssetType)
 
@@ -212,6 +203,7 @@ class MainModel(QObject):
     # endregion
 
     # region New Asset Creation
+    @mp.profiled("create_asset")
     def create_asset(self):
         mp.debug_log("Model: create_asset()")
         try:
@@ -284,13 +276,32 @@ class MainModel(QObject):
 
             # Prompt the user to add any additional extra attributes
             if self.new_asset_type == AssetType.MESH:
-                is_static = self._yes_no_prompt("Will this be a static mesh?")
+                is_static = self._yes_no_prompt("Will this be a static mesh?",
+                                                spec_answer=self._asset_spec is not None and self._asset_spec.static)
                 if is_static is Response.YES:
                     self._add_attr_to_asset_node(STATIC_ATTR_NAME, mp.AttributeType.Boolean, True)
+                lod_count = int(self._number_prompt(
+                    "How many LODs should this mesh export with? (0 for none)",
+                    spec_answer=self._asset_spec.lod_count if self._asset_spec is not None else 0))
+                if lod_count > 0:
+                    self._add_attr_to_asset_node(LOD_COUNT_ATTR_NAME, mp.AttributeType.Integer, lod_count)
+            if self.new_asset_type == AssetType.RIG:
+                keep_joints = self._text_prompt(
+                    "Which joints should animations of this rig always export, even when nothing skins or drives "
+                    "them? e.g. Weapon_R, Prop_* (leave empty for none)",
+                    spec_answer=self._asset_spec.keep_joints if self._asset_spec is not None else "")
+                if keep_joints:
+                    self._add_attr_to_asset_node(KEEP_JOINTS_ATTR_NAME, mp.AttributeType.String, keep_joints)
             if self.new_asset_type == AssetType.ANIMATION:
-                is_looping = self._yes_no_prompt("Will this animation loop?")
+                is_looping = self._yes_no_prompt("Will this animation loop?",
+                                                 spec_answer=self._asset_spec is not None and self._asset_spec.loop)
                 if is_looping is Response.YES:
                     self._add_attr_to_asset_node(LOOP_ATTR_NAME, mp.AttributeType.Boolean, True)
+                sample_rate = self._number_prompt(
+                    "How many frames per second should this animation export with? (0 uses the Settings)",
+                    spec_answer=self._asset_spec.sample_rate if self._asset_spec is not None else 0)
+                if sample_rate > 0:
+                    self._add_attr_to_asset_node(SAMPLE_RATE_ATTR_NAME, mp.AttributeType.Float, sample_rate)
 
             # If the new asset is a rig, we don't want to lock it
             # because then we can't move under an animation node later.
@@ -311,14 +322,40 @@ class MainModel(QObject):
             self._move_imported_nodes_to_asset_node()
             self._move_ref_nodes_to_asset_node(references)
 
+            # e.g. leave a Skeleton's Mesh unloaded so the new asset opens quickly
+            mp.apply_reference_load_policy(references)
+
             pm.saveFile(force=True)
+            self._asset_index.add(self.new_asset_path)
         except Exception as e:
+            if self._asset_spec is not None:
+                raise  # Reported by create_asset_from_spec's caller
             mp.debug_error(f"Exception during asset creation: {e}", print_to_script_editor=True)
         else:
             mp.debug_log(f"Created asset at: {self.new_asset_path}", print_to_script_editor=True)
 
+    def create_asset_from_spec(self, spec: mp.AssetSpec) -> pathlib.Path:
+        """
+        Creates an asset without prompting the user, the spec answers every question create_asset would ask.
+        Raises an exception if the asset can't be created.
+        :return: Path of the new asset
+        """
+        self._asset_spec = spec
+        try:
+            self.new_asset_parent_folder = spec.parent_folder
+            self.new_asset_type = spec.asset_type
+            self.new_asset_name = spec.name
+            self.create_asset()
+        finally:
+            self._asset_spec = None
+
+        return self.new_asset_path
+
     def _perform_operation_on_current_or_different_asset(self, operation: Operation,
                                                          asset_type: AssetType) -> pathlib.Path:
+        if self._asset_spec is not None:
+            return self._asset_spec.get_dependency_path(asset_type, mp.get_maya_project_scenes_path())
+
         asset_path_selected = None
 
         if self._current_asset_is_valid() and self.current_asset_type is asset_type:
@@ -336,9 +373,15 @@ class MainModel(QObject):
 
         return asset_path_selected
 
-    def _yes_no_prompt(self, message: str) -> Response:
+    def _yes_no_prompt(self, message: str, spec_answer: bool = False) -> Response:
+        """
+        :param spec_answer: The answer to use instead of prompting when creating an asset from a spec
+        """
         mp.debug_log(f"{message}")
 
+        if self._asset_spec is not None:
+            return Response.YES if spec_answer else Response.NO
+
         response = pm.confirmDialog(
             title=Response.CONFIRM.value,
             message=message,
@@ -350,20 +393,79 @@ class MainModel(QObject):
         mp.debug_log(f"User Response: {response}")
         return Response(response)
 
+    def _text_prompt(self, message: str, spec_answer: str = "") -> str:
+        """
+        :param spec_answer: The answer to use instead of prompting when creating an asset from a spec
+        :return: The text entered, empty if the user cancelled
+        """
+        mp.debug_log(f"{message}")
+
+        if self._asset_spec is not None:
+            return spec_answer
+
+        response = pm.promptDialog(
+            title=Response.CONFIRM.value,
+            message=message,
+            button=[Response.CONFIRM.value, Response.CANCEL.value],
+            defaultButton=Response.CONFIRM.value,
+            cancelButton=Response.CANCEL.value,
+            dismissString=Response.CANCEL.value)
+        text = pm.promptDialog(query=True, text=True) if response == Response.CONFIRM.value else ""
+
+        mp.debug_log(f"User Response: {text}")
+        return text.strip()
+
+    def _number_prompt(self, message: str, spec_answer: float = 0) -> float:
+        """
+        :param spec_answer: The answer to use instead of prompting when creating an asset from a spec
+        :return: The number entered, 0 if the user cancelled or didn't enter a positive number
+        """
+        text = self._text_prompt(message, spec_answer=str(spec_answer))
+        try:
+            return max(0.0, float(text or 0))
+        except ValueError:
+            mp.debug_warning(f"{text} isn't a number, using 0.", print_to_script_editor=True)
+            return 0.0
+
     def _error_msg(self, message: str):
         mp.debug_log(f"{message}")
 
+        if self._asset_spec is not None:
+            raise ValueError(message)
+
         response = pm.confirmDialog(
             title="Error",
             message=message,
             button=["OK"],
             defaultButton="OK")
 
+    def _start_asset_index_build(self):
+        # Checked here instead of get_maya_project_scenes_path() so a project without scenes isn't an error
+        scenes_path = mp.get_maya_project_path() / "scenes"
+        if scenes_path.is_dir():
+            self._asset_index_scenes_path = scenes_path
+            self._asset_index = mp.get_shared_asset_index(scenes_path)
+            mp.debug_log(f"Using asset index for: {scenes_path} ({len(self._asset_index)} assets so far)")
+
     def _select_asset_to_process(self, operation: Operation, asset_type: AssetType) -> pathlib.Path:
         asset_path: pathlib.Path
         selected_file_path: str
 
         mp.debug_log(f"Selecting {asset_type.value} file we will {operation.value.lower()} later on.")
+
+        # The quick pick is the default, the file dialog is only used if the user asks for it
+        # or the asset index isn't ready.
+        if self._asset_index_is_ready():
+            selected_path, browse_requested = mp.pick_asset(self._asset_index, asset_type,
+                                                            title=f"Select {asset_type.value} to "
+                                                                  f"{operation.value.lower()}")
+            if not browse_requested:
+                if selected_path:
+                    mp.debug_log(f"Selected {asset_type.value} file: {selected_path}.")
+                    return selected_path
+                mp.debug_log(f"Cancelled {operation.value.lower()}ing a {asset_type}")
+                return pathlib.Path()
+
         selected_file_path = pm.fileDialog2(
             fileMode=1,
             caption=f"Select {asset_type.value} file",
@@ -381,6 +483,19 @@ class MainModel(QObject):
 
         return asset_path
 
+    def _asset_index_is_ready(self) -> bool:
+        # The project can change while Maya is open, in which case the index is rebuilt for the new project
+        scenes_path = mp.get_maya_project_path() / "scenes"
+        if not scenes_path.is_dir():
+            return False
+        if self._asset_index_scenes_path != scenes_path:
+            self._start_asset_index_build()
+
+        if not self._asset_index.wait_until_built(timeout=ASSET_INDEX_WAIT_SECONDS):
+            mp.debug_warning("Asset index is still being built, using the file dialog instead.")
+            return False
+        return self._asset_index.scenes_path == scenes_path
+
     def _select_path(self, caption: str, starting_path: pathlib.Path) -> pathlib.Path:
         selected_path: pathlib.Path
 
@@ -401,31 +516,20 @@ class MainModel(QObject):
         return selected_path
 
     def _create_new_asset_path(self) -> pathlib.Path:
-        if self.new_asset_type == AssetType.ANIMATION:
-            rig_basename = self.current_rig_ref_path.name[0:-len(ASSET_EXT)]  # remove extension
-            rig_basename = rig_basename[0:-len(AssetTypeSuffix.RIG.value)]  # remove RIG suffix
-            rig_dir = self.current_rig_ref_path.parent.name
-            animation_filename = rig_basename + "@" + self.new_asset_name + ASSET_EXT
-            self.new_asset_path = mp.get_maya_project_scenes_path() /self.new_asset_parent_folder/ rig_dir / ANIMATIONS_DIR_NAME / animation_filename
-        elif self.new_asset_type == AssetType.MESH:
-            mesh_filename = self.new_asset_name + AssetTypeSuffix.MESH.value + ASSET_EXT
-            self.new_asset_path = mp.get_maya_project_scenes_path() /self.new_asset_parent_folder/ self.new_asset_name / mesh_filename
-        elif self.new_asset_type == AssetType.SKELETON:
-            skeleton_filename = self.new_asset_name + AssetTypeSuffix.SKELETON.value + ASSET_EXT
-            self.new_asset_path = mp.get_maya_project_scenes_path() /self.new_asset_parent_folder/ self.new_asset_name / skeleton_filename
-        elif self.new_asset_type == AssetType.SKINNED_MESH:
-            skinned_mesh_filename = self.new_asset_name + AssetTypeSuffix.SKINNED_MESH.value + ASSET_EXT
-            self.new_asset_path = mp.get_maya_project_scenes_path() /self.new_asset_parent_folder/ self.new_asset_name / skinned_mesh_filename
-        elif self.new_asset_type == AssetType.RIG:
-            rig_filename = self.new_asset_name + AssetTypeSuffix.RIG.value + ASSET_EXT
-            self.new_asset_path = mp.get_maya_project_scenes_path() /self.new_asset_parent_folder/ self.new_asset_name / rig_filename
-
+        rig_path = self.current_rig_ref_path if self.new_asset_type == AssetType.ANIMATION else None
+        self.new_asset_path = get_new_asset_path(mp.get_maya_project_scenes_path(), self.new_asset_parent_folder,
+                                                 self.new_asset_type, self.new_asset_name, rig_path=rig_path)
         return self.new_asset_path
 
     def _should_we_overwrite_existing_asset(self, filepath: pathlib.Path) -> Response:
         message = f"{filepath.name} exists, do you want to overwrite the file?"
         mp.debug_warning(f"{message} Full Path: {filepath}", print_to_script_editor=True)
 
+        if self._asset_spec is not None:
+            if not self._asset_spec.overwrite:
+                raise FileExistsError(f"{filepath.name} exists and the spec doesn't allow overwriting it.")
+            return Response.YES
+
         user_response_str = pm.confirmDialog(
             title=Response.CONFIRM.value,
             message=message,
@@ -446,6 +550,9 @@ class MainModel(QObject):
         pm.renameFile(filepath)
         mp.debug_log(f"Created asset file: {filepath}")
         pm.saveFile(force=True)
+
+        if self._asset_spec is not None:
+            return  # Created in the background, so not a file the user has recently worked on
         pm.mel.eval(f'addRecentFile("{str(filepath.as_posix())}","{ASSET_EXT_TYPE}")')
 
     def _ref_asset_from_file(self, filepath: pathlib.Path) -> pm.FileReference:
@@ -471,25 +578,31 @@ class MainModel(QObject):
             mp.debug_error(f"No asset node found in: {filepath}. Can't import.", print_to_script_editor=True)
             return
         else:
-            # Export Asset node only
+            # Export Asset node only, to a file of this process's own, since parallel bulk creation workers can
+            # import the Asset node of the same file at the same time
             pm.select(asset_node, replace=True)
             export_file_basename = filepath.name[0:-len(ASSET_EXT)]
-            export_filepath = filepath.parent / pathlib.Path(export_file_basename + "_AssetNode" + ASSET_EXT)
-            mp.debug_log(f"Exporting Asset Node to: {export_filepath}")
-            pm.exportSelected(str(export_filepath), type=ASSET_EXT_TYPE, force=True, preserveReferences=False)
-
-            # Re-open original file
-            mp.debug_log(f"Re-opening: {original_file}")
-            pm.openFile(filepath=str(original_file), force=True)
-            self.init_model()
-
-            # Import file with Asset node
-            mp.debug_log(f"Importing {export_filepath}")
-            pm.importFile(filepath=export_filepath, namespace=IMPORTED_NODES_NAMESPACE, mergeNamespacesOnClash=True)
-
-            # Delete exported Asset node file
-            mp.debug_log(f"Deleting {export_filepath} \n")
-            export_filepath.unlink(missing_ok=True)
+            descriptor, export_filepath = tempfile.mkstemp(prefix=export_file_basename + "_AssetNode_",
+                                                           suffix=ASSET_EXT)
+            os.close(descriptor)
+            export_filepath = pathlib.Path(export_filepath)
+            try:
+                mp.debug_log(f"Exporting Asset Node to: {export_filepath}")
+                pm.exportSelected(str(export_filepath), type=ASSET_EXT_TYPE, force=True, preserveReferences=False)
+
+                # Re-open original file
+                mp.debug_log(f"Re-opening: {original_file}")
+                pm.openFile(filepath=str(original_file), force=True)
+                self.init_model()
+
+                # Import file with Asset node
+                mp.debug_log(f"Importing {export_filepath}")
+                pm.importFile(filepath=export_filepath, namespace=IMPORTED_NODES_NAMESPACE,
+                              mergeNamespacesOnClash=True)
+            finally:
+                # Delete exported Asset node file
+                mp.debug_log(f"Deleting {export_filepath} \n")
+                export_filepath.unlink(missing_ok=True)
             pm.saveFile(force=True)
 
     def _move_imported_nodes_to_asset_node(self):
@@ -567,6 +680,9 @@ class MainModel(QObject):
         message = "Save changes to untitled scene?"
         mp.debug_log(message)
 
+        if self._asset_spec is not None:
+            return Response.DONT_SAVE
+
         user_response_str = pm.confirmDialog(
             title='Warning: Scene Not Saved',
             message=message,
@@ -581,15 +697,19 @@ class MainModel(QObject):
     # endregion
 
     # region Export
+    @mp.profiled("export")
     def export(self):
         mp.debug_log("Model > export")
         if not self._current_asset_is_valid():
             mp.debug_warning("Asset is invalid. Can't export.", print_to_script_editor=True)
             return
 
+        if not self._validate_current_asset():
+            return
+
         scene_relative_path = mp.get_path_relative_to_maya_project_scenes(mp.get_current_scene_path())
         export_folder_path = mp.unity_project_asset_path() / scene_relative_path.parent
-        mp.export_asset(self.current_asset_node, export_folder_path=export_folder_path)
+        self._export_and_record(export_folder_path)
 
     def export_to_custom_location(self):
         mp.debug_log("Model > export to custom location")
@@ -601,7 +721,62 @@ class MainModel(QObject):
         path_selected: pathlib.Path = self._select_path("Select path to export asset to.", mp.unity_project_asset_path())
 
         if path_selected:
-            mp.export_asset(self.current_asset_node, export_folder_path=path_selected)
+            self._export_and_record(path_selected)
+
+    def export_static_batches(self):
+        """
+        Batches the static meshes in the current scene's folder into the matching Unity folder, see
+        export_static_batches.
+        """
+        mp.debug_log("Model > export static batches")
+        current_scene_path = mp.get_current_scene_path()
+        if not current_scene_path or current_scene_path.suffix != ASSET_EXT:
+            mp.debug_warning("Open an asset in the folder to batch first.", print_to_script_editor=True)
+            return
+
+        pm.saveFile(force=True)  # Every asset in the folder is opened, so save the changes to this one first
+        scene_relative_path = mp.get_path_relative_to_maya_project_scenes(current_scene_path)
+        export_folder_path = mp.unity_project_asset_path() / scene_relative_path.parent
+        try:
+            mp.export_static_batches(current_scene_path.parent, export_folder_path, mp.get_maya_project_scenes_path())
+        except Exception as e:
+            mp.debug_error(f"Exception while exporting static batches: {e}", print_to_script_editor=True)
+        finally:
+            pm.openFile(filepath=str(current_scene_path), force=True)
+
+    def _export_and_record(self, export_folder_path: pathlib.Path):
+        # Every export goes into the project's export history, which batch exports are scheduled from
+        record = mp.export_asset_and_measure(self.current_asset_node, export_folder_path,
+                                             mp.get_maya_project_scenes_path())
+        try:
+            with mp.ExportHistory(mp.get_export_history_path(mp.get_maya_project_path())) as history:
+                expected_durations = history.get_expected_durations(record.asset_path)
+                history.add([record])
+        except sqlite3.Error as e:
+            mp.debug_warning(f"Couldn't record export in the export history: {e}")
+            return
+
+        for regression in mp.find_regressions([record], expected_durations):
+            mp.debug_warning(f"Export time regressed: {regression}", print_to_script_editor=True)
+
+    def _validate_current_asset(self) -> bool:
+        # Pre-flight check of the saved file with the same rules validate_project runs over the whole project
+        current_scene_path = mp.get_current_scene_path()
+        if current_scene_path.suffix != ASSET_EXT:
+            return True
+
+        result = mp.validate_file(current_scene_path, mp.get_maya_project_scenes_path())
+        for issue in result.issues:
+            mp.debug_warning(f"{current_scene_path.name}: {issue}", print_to_script_editor=True)
+
+        errors = [issue for issue in result.issues if issue.severity is mp.ValidationSeverity.ERROR]
+        if not errors:
+            return True
+
+        messages = "\n".join(issue.message for issue in errors)
+        export_anyway = self._yes_no_prompt(f"{current_scene_path.name} has validation errors:\n{messages}\n\n"
+                                            f"Export anyway?")
+        return export_anyway is Response.YES
     # endregion
 
 
@@ -28,6 +28,8 @@ class Ui_MainWindow(object):
         self.exportAction.setObjectName(u"exportAction")
         self.exportToCustomLocationAction = QAction(MainWindow)
         self.exportToCustomLocationAction.setObjectName(u"exportToCustomLocationAction")
+        self.exportStaticBatchesAction = QAction(MainWindow)
+        self.exportStaticBatchesAction.setObjectName(u"exportStaticBatchesAction")
         self.centralwidget = QWidget(MainWindow)
         self.centralwidget.setObjectName(u"centralwidget")
         self.central_widget_verticalLayout = QVBoxLayout(self.centralwidget)
@@ -89,22 +91,13 @@ class Ui_MainWindow(object):
 
         self.verticalLayout.addLayout(self.assetTypeLayout)
 
-        self.assetParentFolderTreeWidget = QTreeWidget(self.createTab)
-        __qtreewidgetitem = QTreeWidgetItem()
-        __qtreewidgetitem.setFont(0, font);
-        self.assetParentFolderTreeWidget.setHeaderItem(__qtreewidgetitem)
-        QTreeWidgetItem(self.assetParentFolderTreeWidget)
-        QTreeWidgetItem(self.assetParentFolderTreeWidget)
-        QTreeWidgetItem(self.assetParentFolderTreeWidget)
-        QTreeWidgetItem(self.assetParentFolderTreeWidget)
-        QTreeWidgetItem(self.assetParentFolderTreeWidget)
-        QTreeWidgetItem(self.assetParentFolderTreeWidget)
-        self.assetParentFolderTreeWidget.setObjectName(u"assetParentFolderTreeWidget")
-        self.assetParentFolderTreeWidget.setMinimumSize(QSize(0, 150))
-        self.assetParentFolderTreeWidget.setMaximumSize(QSize(16777215, 150))
-        self.assetParentFolderTreeWidget.header().setVisible(False)
-
-        self.verticalLayout.addWidget(self.assetParentFolderTreeWidget, 0, Qt.AlignTop)
+        self.assetParentFolderTreeView = QTreeView(self.createTab)
+        self.assetParentFolderTreeView.setObjectName(u"assetParentFolderTreeView")
+        self.assetParentFolderTreeView.setMinimumSize(QSize(0, 150))
+        self.assetParentFolderTreeView.setMaximumSize(QSize(16777215, 150))
+        self.assetParentFolderTreeView.header().setVisible(False)
+
+        self.verticalLayout.addWidget(self.assetParentFolderTreeView, 0, Qt.AlignTop)
 
         self.assetNameLayout = QHBoxLayout()
         self.assetNameLayout.setObjectName(u"assetNameLayout")
@@ -164,6 +157,7 @@ class Ui_MainWindow(object):
         self.editMenu.addAction(self.settingsAction)
         self.menuFile.addAction(self.exportAction)
         self.menuFile.addAction(self.exportToCustomLocationAction)
+        self.menuFile.addAction(self.exportStaticBatchesAction)
 
         self.retranslateUi(MainWindow)
         self.assetNameLineEdit.returnPressed.connect(self.createAssetButton.click)
@@ -182,6 +176,7 @@ class Ui_MainWindow(object):
 #endif // QT_CONFIG(tooltip)
         self.exportAction.setText(QCoreApplication.translate("MainWindow", u"Export", None))
         self.exportToCustomLocationAction.setText(QCoreApplication.translate("MainWindow", u"Export to Custom Location", None))
+        self.exportStaticBatchesAction.setText(QCoreApplication.translate("MainWindow", u"Export Static Batches for Folder", None))
         self.currentAssetTypeHeaderLabel.setText(QCoreApplication.translate("MainWindow", u"Current Asset Type:", None))
         self.currentAssetTypeLabel.setText(QCoreApplication.translate("MainWindow", u"<NONE>", None))
         self.assetTypeLabel.setText(QCoreApplication.translate("MainWindow", u"Asset Type", None))
@@ -191,25 +186,6 @@ class Ui_MainWindow(object):
         self.assetTypeComboBox.setItemText(3, QCoreApplication.translate("MainWindow", u"Rig", None))
         self.assetTypeComboBox.setItemText(4, QCoreApplication.translate("MainWindow", u"Animation", None))
 
-        ___qtreewidgetitem = self.assetParentFolderTreeWidget.headerItem()
-        ___qtreewidgetitem.setText(0, QCoreApplication.translate("MainWindow", u"Asset Parent Folders", None));
-
-        __sortingEnabled = self.assetParentFolderTreeWidget.isSortingEnabled()
-        self.assetParentFolderTreeWidget.setSortingEnabled(False)
-        ___qtreewidgetitem1 = self.assetParentFolderTreeWidget.topLevelItem(0)
-        ___qtreewidgetitem1.setText(0, QCoreApplication.translate("MainWindow", u"Characters", None));
-        ___qtreewidgetitem2 = self.assetParentFolderTreeWidget.topLevelItem(1)
-        ___qtreewidgetitem2.setText(0, QCoreApplication.translate("MainWindow", u"Environment", None));
-        ___qtreewidgetitem3 = self.assetParentFolderTreeWidget.topLevelItem(2)
-        ___qtreewidgetitem3.setText(0, QCoreApplication.translate("MainWindow", u"Items", None));
-        ___qtreewidgetitem4 = self.assetParentFolderTreeWidget.topLevelItem(3)
-        ___qtreewidgetitem4.setText(0, QCoreApplication.translate("MainWindow", u"Props", None));
-        ___qtreewidgetitem5 = self.assetParentFolderTreeWidget.topLevelItem(4)
-        ___qtreewidgetitem5.setText(0, QCoreApplication.translate("MainWindow", u"Structures", None));
-        ___qtreewidgetitem6 = self.assetParentFolderTreeWidget.topLevelItem(5)
-        ___qtreewidgetitem6.setText(0, QCoreApplication.translate("MainWindow", u"Vehicles", None));
-        self.assetParentFolderTreeWidget.setSortingEnabled(__sortingEnabled)
-
         self.assetNameLabel.setText(QCoreApplication.translate("MainWindow", u"Asset Name", None))
         self.createAssetButton.setText(QCoreApplication.translate("MainWindow", u"Create Asset", None))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.createTab), QCoreApplication.translate("MainWindow", u"Create", None))
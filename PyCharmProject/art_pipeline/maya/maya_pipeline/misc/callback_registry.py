@@ -0,0 +1,87 @@
+# Python
+from typing import Callable
+
+# Maya
+import pymel.core as pm
+
+import maya_pipeline as mp
+
+__all__ = ["ScriptJobRecord", "register_script_job", "kill_script_jobs", "live_callback_count",
+           "get_script_job_records"]
+
+
+class ScriptJobRecord:
+    def __init__(self, owner: str, event: str, handler: Callable, job_id: int):
+        self.owner = owner
+        self.event = event
+        self.handler = handler
+        self.job_id = job_id
+
+    def __repr__(self):
+        return f"ScriptJobRecord(owner={self.owner}, event={self.event}, job_id={self.job_id})"
+
+
+# Script jobs created by the Maya Pipeline, keyed on (owner, event).
+# Only one job per owner and event is kept alive, so re-creating an owner (e.g. a new MainController when the
+# dock is restored) replaces its previous job instead of stacking another one on top of it.
+_script_jobs: dict[tuple[str, str], ScriptJobRecord] = {}
+
+
+def register_script_job(owner: str, event: str, handler: Callable) -> int:
+    """
+    :param owner: Name of the object that owns the script job (e.g. "MainController")
+    :param event: Maya event name (e.g. "SceneOpened")
+    :param handler: Function called when the event fires
+    :return: The id of the live script job
+    """
+    key = (owner, event)
+    record = _script_jobs.get(key)
+
+    if record is not None:
+        if record.handler == handler and _job_exists(record.job_id):
+            mp.debug_log(f"Script job already registered: {record}")
+            return record.job_id
+
+        mp.debug_log(f"Replacing script job: {record}")
+        _kill_job(record)
+
+    job_id = pm.scriptJob(event=(event, handler))
+    record = ScriptJobRecord(owner, event, handler, job_id)
+    _script_jobs[key] = record
+    mp.debug_log(f"Registered script job: {record}")
+
+    return job_id
+
+
+def kill_script_jobs(owner: str = None):
+    """
+    Kills the script jobs registered by the Maya Pipeline without touching script jobs created by other tools.
+    :param owner: Only kill the jobs of this owner. Kills all the Maya Pipeline's jobs if None.
+    """
+    for key, record in list(_script_jobs.items()):
+        if owner is None or record.owner == owner:
+            _kill_job(record)
+            del _script_jobs[key]
+
+
+def live_callback_count(owner: str = None) -> int:
+    # Forget any jobs that Maya has already killed (e.g. by a killAll from another tool)
+    for key, record in list(_script_jobs.items()):
+        if not _job_exists(record.job_id):
+            del _script_jobs[key]
+
+    return len([record for record in _script_jobs.values() if owner is None or record.owner == owner])
+
+
+def get_script_job_records() -> list[ScriptJobRecord]:
+    return list(_script_jobs.values())
+
+
+def _job_exists(job_id: int) -> bool:
+    return bool(pm.scriptJob(exists=job_id))
+
+
+def _kill_job(record: ScriptJobRecord):
+    if _job_exists(record.job_id):
+        mp.debug_log(f"Killing script job: {record}")
+        pm.scriptJob(kill=record.job_id, force=True)
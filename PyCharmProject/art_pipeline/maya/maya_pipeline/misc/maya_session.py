@@ -0,0 +1,39 @@
+# Python
+import os
+import sys
+from pathlib import Path
+
+__all__ = ["MAYA_AVAILABLE", "maya_is_running", "get_mayapy_path"]
+
+
+def maya_is_running() -> bool:
+    # maya.cmds only contains commands once Maya (the GUI or maya.standalone) has been initialized,
+    # so this doesn't start Maya when called from mayapy or plain Python.
+    try:
+        import maya.cmds as cmds
+    except ImportError:
+        return False
+
+    return hasattr(cmds, "about")
+
+
+# When False, maya_pipeline only loads the modules that don't need Maya or PySide2
+# (e.g. inside worker processes used to validate or process files in parallel).
+MAYA_AVAILABLE = maya_is_running()
+
+
+def get_mayapy_path() -> Path:
+    python_exe = Path(sys.executable)
+
+    if python_exe.stem.lower() == "mayapy":
+        return python_exe
+
+    # Inside the Maya GUI sys.executable is maya(.exe), and mayapy lives in Maya's bin folder.
+    mayapy_name = "mayapy.exe" if os.name == "nt" else "mayapy"
+    for bin_dir in (python_exe.parent, python_exe.parent.parent / "bin"):
+        mayapy_path = bin_dir / mayapy_name
+        if mayapy_path.is_file():
+            return mayapy_path
+
+    # Not running in Maya, so the current interpreter is the one to use.
+    return python_exe
@@ -0,0 +1,28 @@
+# Python
+import importlib
+import sys
+
+__all__ = ["MAYA_PLUGINS", "initialize_maya_worker"]
+
+# Plugins that jobs run in Maya worker processes rely on
+MAYA_PLUGINS = ["fbxmaya"]
+
+
+def initialize_maya_worker():
+    """
+    Process pool initializer (see create_process_pool) for jobs that need Maya, e.g. opening and exporting scenes.
+    Starts maya.standalone in the worker, then loads the parts of maya_pipeline that need Maya.
+    """
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+
+    import maya.cmds as cmds
+    for plugin in MAYA_PLUGINS:
+        if not cmds.pluginInfo(plugin, query=True, loaded=True):
+            cmds.loadPlugin(plugin, quiet=True)
+
+    # maya_pipeline was imported (to unpickle this initializer) before Maya was running, so it only loaded its
+    # Maya-free modules. Reloading it now that Maya is running loads the rest.
+    from maya_pipeline.misc import maya_session
+    importlib.reload(maya_session)
+    importlib.reload(sys.modules["maya_pipeline"])
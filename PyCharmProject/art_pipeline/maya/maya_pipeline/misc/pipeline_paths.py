@@ -0,0 +1,37 @@
+# Python
+import os
+from pathlib import Path
+from typing import Iterator
+
+__all__ = ["PIPELINE_CACHE_DIR_NAME", "get_pipeline_cache_path", "iter_asset_files"]
+
+PIPELINE_CACHE_DIR_NAME = "maya_pipeline"
+
+
+def get_pipeline_cache_path(maya_project_path: Path) -> Path:
+    # Files the pipeline generates for itself (caches, indexes, etc.) live in the Maya project's cache folder
+    cache_path = Path(maya_project_path) / "cache" / PIPELINE_CACHE_DIR_NAME
+    cache_path.mkdir(parents=True, exist_ok=True)
+    return cache_path
+
+
+def iter_asset_files(scenes_path: Path, extension: str = ".ma") -> Iterator[tuple[Path, os.stat_result]]:
+    """
+    Walks the scenes folder with os.scandir, which gets the stats for free on Windows (and network drives).
+    :return: Each file's path and stats
+    """
+    directories = [Path(scenes_path)]
+
+    while directories:
+        directory = directories.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith("."):
+                    directories.append(Path(entry.path))
+            elif entry.name.endswith(extension):
+                yield Path(entry.path), entry.stat()
@@ -0,0 +1,34 @@
+# Python
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import sys
+from typing import Callable
+
+from maya_pipeline.misc.maya_session import get_mayapy_path
+
+__all__ = ["create_process_pool", "default_worker_count"]
+
+
+def default_worker_count() -> int:
+    # Leave one core for Maya's UI (or the coordinating process)
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def create_process_pool(max_workers: int = None, initializer: Callable = None,
+                        initargs: tuple = ()) -> ProcessPoolExecutor:
+    """
+    :param max_workers: Number of worker processes. Defaults to default_worker_count().
+    :param initializer: Function called once in each worker process before it runs any jobs
+    :param initargs: Arguments passed to the initializer
+    :return: ProcessPoolExecutor that works from inside the Maya GUI
+    """
+    context = multiprocessing.get_context("spawn")
+
+    # Inside the Maya GUI sys.executable is maya(.exe), which would start a new Maya for each worker.
+    python_exe = get_mayapy_path()
+    if str(python_exe) != sys.executable:
+        context.set_executable(str(python_exe))
+
+    return ProcessPoolExecutor(max_workers=max_workers or default_worker_count(), mp_context=context,
+                               initializer=initializer, initargs=initargs)
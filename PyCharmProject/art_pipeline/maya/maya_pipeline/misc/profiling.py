@@ -0,0 +1,143 @@
+# Python
+import contextlib
+import cProfile
+from datetime import datetime
+import functools
+import io
+import os
+from pathlib import Path
+import pstats
+import random
+import threading
+import time
+from typing import Callable, Iterator
+
+from maya_pipeline.misc import maya_session
+from maya_pipeline.mp_logging import logging
+
+__all__ = ["PROFILE_ENV_VAR", "PROFILES_DIR_NAME", "DEFAULT_PROFILE_SAMPLE_RATE", "MIN_PROFILE_INTERVAL_SECONDS",
+           "PROFILE_SUMMARY_LINE_COUNT", "MAX_PROFILE_COUNT", "get_profile_sample_rate", "get_profiles_path",
+           "profile_operation", "profiled"]
+
+# Fraction of operations to profile (e.g. 0.1, or 1 for all of them), overrides the Settings dialog. Worker
+# processes inherit it, so it's also how batch exports are profiled.
+PROFILE_ENV_VAR = "MAYA_PIPELINE_PROFILE"
+# Next to the session logs, in their own folder so pruning the logs doesn't count them
+PROFILES_DIR_NAME = "profiles"
+DEFAULT_PROFILE_SAMPLE_RATE = 0.1
+# An operation isn't profiled again this soon, so profiling many quick operations in a row stays cheap
+MIN_PROFILE_INTERVAL_SECONDS = 30.0
+# Functions listed in each profile's text summary, by cumulative time
+PROFILE_SUMMARY_LINE_COUNT = 40
+# Oldest profiles are deleted beyond this many
+MAX_PROFILE_COUNT = 50
+_last_profile_times: dict[str, float] = {}
+# cProfile can only profile one thing per thread, operations inside a profiled one are part of its profile
+_active = threading.local()
+
+
+def get_profile_sample_rate() -> float:
+    """
+    :return: Fraction of operations to profile, from the environment variable or else the settings. 0 if profiling
+             is off.
+    """
+    rate = os.environ.get(PROFILE_ENV_VAR)
+    if rate is not None:
+        try:
+            return min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            logging.debug_warning(f"{PROFILE_ENV_VAR} should be a number between 0 and 1, not {rate}.")
+            return 0.0
+
+    # The settings need PySide2, so they're only read inside Maya
+    if not maya_session.MAYA_AVAILABLE:
+        return 0.0
+    from maya_pipeline.settings.settings_model import SettingsKeys, read_setting
+    if not read_setting(SettingsKeys.PROFILING_ENABLED):
+        return 0.0
+    return float(read_setting(SettingsKeys.PROFILING_SAMPLE_RATE))
+
+
+def get_profiles_path() -> Path:
+    return logging.log_dir / PROFILES_DIR_NAME
+
+
+@contextlib.contextmanager
+def profile_operation(name: str) -> Iterator[cProfile.Profile]:
+    """
+    Profiles the block with cProfile if it's sampled (see get_profile_sample_rate), and writes <name>.prof and a text
+    summary to the profiles folder next to the session log.
+    :param name: What's profiled, e.g. "export"
+    :return: The profiler, None if the block isn't profiled
+    """
+    profiler = _start_profiler(name)
+    if profiler is None:
+        yield None
+        return
+
+    start_time = time.perf_counter()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        _active.profiling = False
+        _save_profile(profiler, name, time.perf_counter() - start_time)
+
+
+def profiled(name: str) -> Callable:
+    """
+    Decorator that profiles calls to the function with profile_operation
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with profile_operation(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _start_profiler(name: str) -> cProfile.Profile:
+    if getattr(_active, "profiling", False):
+        return None
+
+    sample_rate = get_profile_sample_rate()
+    if sample_rate <= 0.0 or random.random() >= sample_rate:
+        return None
+    now = time.monotonic()
+    if sample_rate < 1.0 and now - _last_profile_times.get(name, -MIN_PROFILE_INTERVAL_SECONDS) < \
+            MIN_PROFILE_INTERVAL_SECONDS:
+        return None
+
+    _last_profile_times[name] = now
+    _active.profiling = True
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def _save_profile(profiler: cProfile.Profile, name: str, duration: float):
+    # Named after the session log, so the profile can be read along with what was logged around it
+    session = logging.log_filepath.stem if logging.log_filepath is not None else f"worker_{os.getpid()}"
+    profile_path = get_profiles_path() / f"{session}_{name}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S-%f')}.prof"
+    summary = io.StringIO()
+    summary.write(f"{name} took {duration:.3f}s\n")
+    pstats.Stats(profiler, stream=summary).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+        PROFILE_SUMMARY_LINE_COUNT)
+
+    try:
+        profile_path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(profile_path))
+        profile_path.with_suffix(".txt").write_text(summary.getvalue(), encoding="utf-8")
+        _prune_profiles()
+    except OSError as e:
+        logging.debug_warning(f"Couldn't save the profile of {name}: {e}")
+        return
+    logging.debug_log(f"Profiled {name} ({duration:.2f}s): {profile_path}")
+
+
+def _prune_profiles():
+    profile_paths = sorted(get_profiles_path().glob("*.prof"), key=lambda path: path.stat().st_mtime)
+    for profile_path in profile_paths[:-MAX_PROFILE_COUNT]:
+        profile_path.unlink(missing_ok=True)
+        profile_path.with_suffix(".txt").unlink(missing_ok=True)
@@ -0,0 +1,138 @@
+# Python
+from enum import Enum
+from pathlib import Path
+import time
+
+# Maya
+import maya.OpenMaya as om
+import pymel.core as pm
+
+import maya_pipeline as mp
+
+__all__ = ["ReferenceLoadPolicy", "should_load_reference", "get_reference_load_policy",
+           "install_reference_load_policy", "uninstall_reference_load_policy", "apply_reference_load_policy",
+           "load_references_for_export"]
+
+
+class ReferenceLoadPolicy(Enum):
+    NONE = "None"
+    SKELETON_AND_RIG = "Skeleton and Rig"
+    ALL = "All"
+
+
+# Skipped by SKELETON_AND_RIG. These hold the geometry (and skin clusters) that makes scenes slow to open.
+_GEOMETRY_ASSET_TYPES = [mp.AssetType.MESH, mp.AssetType.SKINNED_MESH]
+
+
+def should_load_reference(policy: ReferenceLoadPolicy, path: Path) -> bool:
+    if policy is ReferenceLoadPolicy.NONE:
+        return False
+    if policy is ReferenceLoadPolicy.SKELETON_AND_RIG:
+        # Files that don't follow the asset naming conventions aren't ours to skip
+        return mp.get_asset_type_from_filename(Path(path)) not in _GEOMETRY_ASSET_TYPES
+    return True
+
+
+def get_reference_load_policy() -> ReferenceLoadPolicy:
+    try:
+        return ReferenceLoadPolicy(mp.read_setting(mp.SettingsKeys.REFERENCE_LOAD_POLICY))
+    except ValueError:
+        return ReferenceLoadPolicy.ALL
+
+
+class _SceneOpenState:
+    def __init__(self, policy: ReferenceLoadPolicy):
+        self.policy = policy
+        self.start_time = time.perf_counter()
+        self.skipped_references: list[str] = []
+
+
+_callback_ids: list[int] = []
+# Set while a scene is being opened. References the user loads by hand (e.g. from the Reference Editor)
+# are always loaded.
+_open_state: _SceneOpenState = None
+
+
+def install_reference_load_policy():
+    """
+    Applies the reference load policy from the Settings to every scene opened in this Maya session.
+    Installing again (e.g. after reloading the package) replaces the previous callbacks.
+    """
+    uninstall_reference_load_policy()
+    _callback_ids.append(om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeOpen, _on_before_open))
+    _callback_ids.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, _on_after_open))
+    _callback_ids.append(om.MSceneMessage.addCheckFileCallback(om.MSceneMessage.kBeforeLoadReferenceCheck,
+                                                               _on_before_load_reference))
+    mp.debug_log(f"Installed reference load policy: {get_reference_load_policy().value}")
+
+
+def uninstall_reference_load_policy():
+    global _open_state
+    for callback_id in _callback_ids:
+        om.MMessage.removeCallback(callback_id)
+    _callback_ids.clear()
+    _open_state = None
+
+
+def apply_reference_load_policy(references: list[pm.FileReference], policy: ReferenceLoadPolicy = None):
+    """
+    Unloads the references the policy doesn't load, so the saved scene opens without them.
+    Their edits (e.g. being parented under the Asset node) are kept and re-applied when they're loaded.
+    """
+    policy = policy or get_reference_load_policy()
+    for ref in references:
+        if ref.isLoaded() and not should_load_reference(policy, Path(ref.path)):
+            mp.debug_log(f"Unloading {Path(ref.path).name} (reference load policy: {policy.value})")
+            ref.unload()
+
+
+def load_references_for_export(asset_types: list[mp.AssetType]):
+    """
+    Loads the references of these asset types and unloads the rest, so exporting doesn't load or evaluate
+    anything it doesn't need. Only for scenes that are re-opened after exporting.
+    """
+    loaded_refs = set()
+    # Loading a reference can reveal nested references, so keep going until nothing changes
+    while True:
+        refs = [ref for ref in pm.listReferences(recursive=True) if ref.refNode not in loaded_refs]
+        if not refs:
+            break
+
+        for ref in refs:
+            loaded_refs.add(ref.refNode)
+            needed = mp.get_asset_type_from_filename(Path(ref.path)) in asset_types
+            if needed and not ref.isLoaded():
+                mp.debug_log(f"Loading {Path(ref.path).name} for export")
+                ref.load()
+            elif not needed and ref.isLoaded():
+                mp.debug_log(f"Unloading {Path(ref.path).name} for export")
+                ref.unload()
+
+
+def _on_before_open(client_data):
+    global _open_state
+    _open_state = _SceneOpenState(get_reference_load_policy())
+
+
+def _on_after_open(client_data):
+    global _open_state
+    if _open_state is None:
+        return
+
+    message = f"Opened {pm.sceneName()} in {time.perf_counter() - _open_state.start_time:.2f}s"
+    if _open_state.skipped_references:
+        message += (f", left {len(_open_state.skipped_references)} references unloaded "
+                    f"({_open_state.policy.value}): {', '.join(_open_state.skipped_references)}")
+    mp.debug_log(message)
+    _open_state = None
+
+
+def _on_before_load_reference(ret_code, file_object: om.MFileObject, client_data):
+    load = True
+    if _open_state is not None:
+        path = Path(file_object.resolvedFullName() or file_object.rawFullName())
+        load = should_load_reference(_open_state.policy, path)
+        if not load:
+            _open_state.skipped_references.append(path.name)
+
+    om.MScriptUtil.setBool(ret_code, load)
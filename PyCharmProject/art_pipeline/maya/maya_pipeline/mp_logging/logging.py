@@ -4,7 +4,13 @@ import os
 from pathlib import Path
 import inspect
 
-import pymel.core as pm
+from maya_pipeline.misc.maya_session import MAYA_AVAILABLE
+
+if MAYA_AVAILABLE:
+    import pymel.core as pm
+else:
+    # Outside of Maya (e.g. in worker processes) warnings and errors are printed instead
+    pm = None
 
 __all__ = ["FORCE_PRINT_TO_SCRIPT_EDITOR", "LogMode", "MAX_FILE_COUNT",
            "WRITE_IMMEDIATELY", "create_log", "debug_error", "debug_log",
@@ -85,16 +91,16 @@ def _write_to_log(message: str, mode: LogMode, print_to_script_editor: bool):
     global log_filepath
 
     if log_filepath is None or not log_filepath.is_file():
+        if pm is None:
+            # Processes running outside of Maya don't create a log, so only print what would reach the user
+            if print_to_script_editor or FORCE_PRINT_TO_SCRIPT_EDITOR or mode != LogMode.DEFAULT:
+                _print_message(message, mode)
+            return
         pm.error(f"Can't open log file because it doesn't exist at: {log_filepath}")
         return
     with open(log_filepath, "a") as log_file:
         if print_to_script_editor or FORCE_PRINT_TO_SCRIPT_EDITOR:
-            if mode == LogMode.DEFAULT:
-                print(message)
-            elif mode == LogMode.WARNING:
-                pm.warning(message)
-            elif mode == LogMode.ERROR:
-                pm.error(message)
+            _print_message(message, mode)
 
         if mode == LogMode.DEFAULT:
             log_file.write(f"{message}\n")
@@ -106,3 +112,14 @@ def _write_to_log(message: str, mode: LogMode, print_to_script_editor: bool):
         if WRITE_IMMEDIATELY:
             log_file.flush()
             # os.fsync(log_file.fileno())
+
+
+def _print_message(message: str, mode: LogMode):
+    if mode == LogMode.DEFAULT:
+        print(message)
+    elif pm is None:
+        print(f"{mode.name}: {message}")
+    elif mode == LogMode.WARNING:
+        pm.warning(message)
+    elif mode == LogMode.ERROR:
+        pm.error(message)
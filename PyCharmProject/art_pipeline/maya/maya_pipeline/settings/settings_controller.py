@@ -11,6 +11,7 @@ from pathlib import Path
 from PySide2.QtCore import QObject
 
 from maya_pipeline.mp_logging import logging
+from maya_pipeline.misc.reference_loading import ReferenceLoadPolicy
 
 __all__ = ["SettingsController"]
 
@@ -25,6 +26,10 @@ class SettingsController(QObject):
         # Listen for View Changes
         logging.debug_log("Listen for View Changes...")
         self._view.ui.unity_browse_button.clicked.connect(self._on_browse_button_clicked)
+        self._view.ui.reference_load_policy_combo_box.activated.connect(self._on_reference_load_policy_activated)
+        self._view.ui.animation_sample_rate_spin_box.valueChanged.connect(self._on_animation_sample_rate_changed)
+        self._view.ui.profiling_enabled_check_box.toggled.connect(self._on_profiling_enabled_toggled)
+        self._view.ui.profiling_sample_rate_spin_box.valueChanged.connect(self._on_profiling_sample_rate_changed)
         self._view.ui.save_cancel_buttons.accepted.connect(self._on_save_settings)
 
         # Listen for Model Changes
@@ -36,6 +41,19 @@ class SettingsController(QObject):
         logging.debug_log("Browse button clicked...")
         self._model.browse_files(q_dialog=self._view)
 
+    def _on_reference_load_policy_activated(self, index: int):
+        text = self._view.ui.reference_load_policy_combo_box.itemText(index)
+        self._model.reference_load_policy = ReferenceLoadPolicy(text)
+
+    def _on_animation_sample_rate_changed(self, sample_rate: float):
+        self._model.animation_sample_rate = sample_rate
+
+    def _on_profiling_enabled_toggled(self, enabled: bool):
+        self._model.profiling_enabled = enabled
+
+    def _on_profiling_sample_rate_changed(self, sample_rate: float):
+        self._model.profiling_sample_rate = sample_rate
+
     def _on_save_settings(self):
         self._model.save_settings()
 
@@ -10,6 +10,8 @@ from PySide2.QtCore import QObject, Signal
 from PySide2.QtWidgets import QDialog, QFileDialog
 
 from maya_pipeline.mp_logging import logging
+from maya_pipeline.misc.profiling import DEFAULT_PROFILE_SAMPLE_RATE
+from maya_pipeline.misc.reference_loading import ReferenceLoadPolicy
 
 __all__ = ["settings_script_directory", "settings_dir", "SETTINGS_FILENAME", "settings_filepath", "SettingsKeys",
            "settings_defaults", "SettingsModel", "unity_project_asset_path", "create_settings_file",
@@ -23,10 +25,21 @@ settings_filepath: Path = settings_dir / SETTINGS_FILENAME
 
 class SettingsKeys(Enum):
     UNITY_EXPORT_PATH = "UnityExportPath"
+    REFERENCE_LOAD_POLICY = "ReferenceLoadPolicy"
+    ANIMATION_SAMPLE_RATE = "AnimationSampleRate"
+    PROFILING_ENABLED = "ProfilingEnabled"
+    PROFILING_SAMPLE_RATE = "ProfilingSampleRate"
 
 
 settings_defaults = {
     SettingsKeys.UNITY_EXPORT_PATH.value: "",
+    SettingsKeys.REFERENCE_LOAD_POLICY.value: ReferenceLoadPolicy.ALL.value,
+    # Frames per second exported animations are resampled to, unless their Asset node has its own. 0 keeps every frame.
+    SettingsKeys.ANIMATION_SAMPLE_RATE.value: 0.0,
+    # Profiles asset creation and exports with cProfile, see maya_pipeline.misc.profiling
+    SettingsKeys.PROFILING_ENABLED.value: False,
+    # Fraction of them that are profiled
+    SettingsKeys.PROFILING_SAMPLE_RATE.value: DEFAULT_PROFILE_SAMPLE_RATE,
 }
 
 
@@ -38,7 +51,8 @@ class SettingsModel(QObject):
         if not settings_filepath.is_file():
             create_settings_file()
 
-        self.settings_temp: dict[str,str] = load_settings_file() # type: ignore
+        # Settings files saved before a setting existed get its default value
+        self.settings_temp: dict[str,str] = {**settings_defaults, **load_settings_file()} # type: ignore
         logging.debug_log(f"SettingsModel > self.settings_temp: {self.settings_temp}")
 
     @property
@@ -52,6 +66,50 @@ class SettingsModel(QObject):
         self.settings_temp[SettingsKeys.UNITY_EXPORT_PATH.value] = str(path)
         self.unity_project_asset_path_changed.emit(path)
 
+    @property
+    def reference_load_policy(self) -> ReferenceLoadPolicy:
+        return ReferenceLoadPolicy(self.settings_temp[SettingsKeys.REFERENCE_LOAD_POLICY.value])
+
+    reference_load_policy_changed = Signal(ReferenceLoadPolicy)
+
+    @reference_load_policy.setter
+    def reference_load_policy(self, policy: ReferenceLoadPolicy):
+        self.settings_temp[SettingsKeys.REFERENCE_LOAD_POLICY.value] = policy.value
+        self.reference_load_policy_changed.emit(policy)
+
+    @property
+    def animation_sample_rate(self) -> float:
+        return float(self.settings_temp[SettingsKeys.ANIMATION_SAMPLE_RATE.value])
+
+    animation_sample_rate_changed = Signal(float)
+
+    @animation_sample_rate.setter
+    def animation_sample_rate(self, sample_rate: float):
+        self.settings_temp[SettingsKeys.ANIMATION_SAMPLE_RATE.value] = sample_rate
+        self.animation_sample_rate_changed.emit(sample_rate)
+
+    @property
+    def profiling_enabled(self) -> bool:
+        return bool(self.settings_temp[SettingsKeys.PROFILING_ENABLED.value])
+
+    profiling_enabled_changed = Signal(bool)
+
+    @profiling_enabled.setter
+    def profiling_enabled(self, enabled: bool):
+        self.settings_temp[SettingsKeys.PROFILING_ENABLED.value] = enabled
+        self.profiling_enabled_changed.emit(enabled)
+
+    @property
+    def profiling_sample_rate(self) -> float:
+        return float(self.settings_temp[SettingsKeys.PROFILING_SAMPLE_RATE.value])
+
+    profiling_sample_rate_changed = Signal(float)
+
+    @profiling_sample_rate.setter
+    def profiling_sample_rate(self, sample_rate: float):
+        self.settings_temp[SettingsKeys.PROFILING_SAMPLE_RATE.value] = sample_rate
+        self.profiling_sample_rate_changed.emit(sample_rate)
+
     def save_settings(self):
         logging.debug_log(f"Saving self.settings_temp: {self.settings_temp}")
         save_settings_to_file(self.settings_temp)
@@ -109,4 +167,4 @@ def save_settings_to_file(settings: dict[str,str]):
 
 def read_setting(key: SettingsKeys) -> str:
     settings: dict[str,str] = load_settings_file()
-    return settings[key.value]
+    return settings.get(key.value, settings_defaults[key.value])
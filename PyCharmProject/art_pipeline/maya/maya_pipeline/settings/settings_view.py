@@ -16,6 +16,7 @@ import pymel.core as pm
 
 from maya_pipeline.mp_logging import logging
 from maya_pipeline.misc import pyside_utilities
+from maya_pipeline.misc.reference_loading import ReferenceLoadPolicy
 from maya_pipeline.settings import settings_view_ui
 __all__ = ["SettingsView"]
 
@@ -30,6 +31,12 @@ class SettingsView(QDialog):
 
         # init settings
         self.ui.unity_line_edit.setText(str(self._model.unity_project_asset_path))
+        for policy in ReferenceLoadPolicy:
+            self.ui.reference_load_policy_combo_box.addItem(policy.value)
+        self.ui.reference_load_policy_combo_box.setCurrentText(self._model.reference_load_policy.value)
+        self.ui.animation_sample_rate_spin_box.setValue(self._model.animation_sample_rate)
+        self.ui.profiling_enabled_check_box.setChecked(self._model.profiling_enabled)
+        self.ui.profiling_sample_rate_spin_box.setValue(self._model.profiling_sample_rate)
 
     def setup_ui(self):
         self.ui.setupUi(self)
@@ -51,7 +51,47 @@ class Ui_SettingsDialog(object):
 
         self.centralWidget_verticalLayout.addLayout(self.unity_horizontalLayout)
 
-        self.verticalSpacer = QSpacerItem(20, 181, QSizePolicy.Minimum, QSizePolicy.Expanding)
+        self.reference_load_policy_label = QLabel(self.centralWidget)
+        self.reference_load_policy_label.setObjectName(u"reference_load_policy_label")
+
+        self.centralWidget_verticalLayout.addWidget(self.reference_load_policy_label)
+
+        self.reference_load_policy_combo_box = QComboBox(self.centralWidget)
+        self.reference_load_policy_combo_box.setObjectName(u"reference_load_policy_combo_box")
+
+        self.centralWidget_verticalLayout.addWidget(self.reference_load_policy_combo_box)
+
+        self.animation_sample_rate_label = QLabel(self.centralWidget)
+        self.animation_sample_rate_label.setObjectName(u"animation_sample_rate_label")
+
+        self.centralWidget_verticalLayout.addWidget(self.animation_sample_rate_label)
+
+        self.animation_sample_rate_spin_box = QDoubleSpinBox(self.centralWidget)
+        self.animation_sample_rate_spin_box.setObjectName(u"animation_sample_rate_spin_box")
+        self.animation_sample_rate_spin_box.setDecimals(3)
+        self.animation_sample_rate_spin_box.setMaximum(1000.000000000000000)
+
+        self.centralWidget_verticalLayout.addWidget(self.animation_sample_rate_spin_box)
+
+        self.profiling_enabled_check_box = QCheckBox(self.centralWidget)
+        self.profiling_enabled_check_box.setObjectName(u"profiling_enabled_check_box")
+
+        self.centralWidget_verticalLayout.addWidget(self.profiling_enabled_check_box)
+
+        self.profiling_sample_rate_label = QLabel(self.centralWidget)
+        self.profiling_sample_rate_label.setObjectName(u"profiling_sample_rate_label")
+
+        self.centralWidget_verticalLayout.addWidget(self.profiling_sample_rate_label)
+
+        self.profiling_sample_rate_spin_box = QDoubleSpinBox(self.centralWidget)
+        self.profiling_sample_rate_spin_box.setObjectName(u"profiling_sample_rate_spin_box")
+        self.profiling_sample_rate_spin_box.setMinimum(0.010000000000000)
+        self.profiling_sample_rate_spin_box.setMaximum(1.000000000000000)
+        self.profiling_sample_rate_spin_box.setSingleStep(0.050000000000000)
+
+        self.centralWidget_verticalLayout.addWidget(self.profiling_sample_rate_spin_box)
+
+        self.verticalSpacer = QSpacerItem(20, 131, QSizePolicy.Minimum, QSizePolicy.Expanding)
 
         self.centralWidget_verticalLayout.addItem(self.verticalSpacer)
 
@@ -77,5 +117,10 @@ class Ui_SettingsDialog(object):
         SettingsDialog.setWindowTitle(QCoreApplication.translate("SettingsDialog", u"Settings", None))
         self.unity_label.setText(QCoreApplication.translate("SettingsDialog", u"Unity Project Export Path", None))
         self.unity_browse_button.setText(QCoreApplication.translate("SettingsDialog", u"Browse", None))
+        self.reference_load_policy_label.setText(QCoreApplication.translate("SettingsDialog", u"Load References When Opening Scenes", None))
+        self.animation_sample_rate_label.setText(QCoreApplication.translate("SettingsDialog", u"Resample Exported Animations To (FPS)", None))
+        self.animation_sample_rate_spin_box.setSpecialValueText(QCoreApplication.translate("SettingsDialog", u"Scene Frame Rate", None))
+        self.profiling_enabled_check_box.setText(QCoreApplication.translate("SettingsDialog", u"Profile Asset Creation and Exports", None))
+        self.profiling_sample_rate_label.setText(QCoreApplication.translate("SettingsDialog", u"Fraction of Them to Profile", None))
     # retranslateUi
 
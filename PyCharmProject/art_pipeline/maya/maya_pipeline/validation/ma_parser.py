@@ -0,0 +1,179 @@
+# Python
+import hashlib
+import re
+from pathlib import Path
+
+__all__ = ["MayaAsciiNode", "MayaAsciiReference", "MayaAsciiScene", "parse_maya_ascii", "parse_maya_ascii_file",
+           "hash_file_bytes"]
+
+# Only these commands are tokenized. Everything else (mesh data, curves, etc.) is skipped without being parsed,
+# which is what keeps parsing large scenes fast.
+_PARSED_COMMANDS = {b"file", b"createNode", b"addAttr", b"setAttr"}
+_TOKEN_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|[^\s;]+')
+
+
+class MayaAsciiNode:
+    def __init__(self, node_type: str, name: str, parent: str = None):
+        self.node_type = node_type
+        self.name = name
+        self.parent = parent
+        self.attr_names: set[str] = set()
+        self.attr_values: dict[str, str] = {}
+
+    def __repr__(self):
+        return f"MayaAsciiNode(node_type={self.node_type}, name={self.name}, parent={self.parent})"
+
+
+class MayaAsciiReference:
+    def __init__(self, path: str, namespace: str, ref_node: str, deferred: bool):
+        self.path = path
+        self.namespace = namespace
+        self.ref_node = ref_node
+        self.deferred = deferred
+
+    def __repr__(self):
+        return f"MayaAsciiReference(path={self.path}, namespace={self.namespace})"
+
+
+class MayaAsciiScene:
+    def __init__(self, path: Path):
+        self.path = path
+        self.nodes: list[MayaAsciiNode] = []
+        self.references: list[MayaAsciiReference] = []
+
+    def get_top_level_node(self, name: str) -> MayaAsciiNode:
+        for node in self.nodes:
+            if node.name == name and node.parent is None:
+                return node
+        return None
+
+    def get_children(self, parent_name: str) -> list[MayaAsciiNode]:
+        return [node for node in self.nodes if node.parent == parent_name]
+
+
+def hash_file_bytes(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def parse_maya_ascii_file(path: Path) -> MayaAsciiScene:
+    with open(path, "rb") as file:
+        return parse_maya_ascii(file.read(), path)
+
+
+def parse_maya_ascii(data: bytes, path: Path = None) -> MayaAsciiScene:
+    """
+    Parses the parts of a Maya ASCII file the pipeline cares about: file references, nodes, their parents,
+    and the extra attributes (and values) added to them. Doesn't need Maya.
+    :param data: Contents of a .ma file
+    :param path: Path of the file, stored on the returned scene
+    """
+    scene = MayaAsciiScene(path)
+    current_node: MayaAsciiNode = None
+    statement: list[bytes] = []
+    skipping = False
+
+    for line in data.splitlines():
+        if skipping:
+            skipping = not _ends_statement(line)
+            continue
+
+        if not statement:
+            stripped = line.lstrip()
+            if not stripped or stripped.startswith(b"//"):
+                continue
+
+            # Attributes are set by indented sub-commands of the createNode above them,
+            # so any top-level command other than createNode ends the current node.
+            if not line[:1].isspace():
+                current_node = None
+
+            command = stripped.split(None, 1)[0]
+            if command not in _PARSED_COMMANDS:
+                skipping = not _ends_statement(line)
+                continue
+
+        statement.append(line)
+        if not _ends_statement(line):
+            continue
+
+        tokens = _tokenize(b" ".join(statement))
+        statement = []
+        current_node = _apply_statement(scene, tokens, current_node)
+
+    return scene
+
+
+def _ends_statement(line: bytes) -> bool:
+    return line.rstrip().endswith(b";")
+
+
+def _tokenize(statement: bytes) -> list[str]:
+    text = statement.decode("utf-8", errors="replace")
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text):
+        if token.startswith('"'):
+            token = token[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+        tokens.append(token)
+    return tokens
+
+
+def _flag_values(tokens: list[str]) -> dict[str, str]:
+    # Maps each flag to the token that follows it (e.g. {"-n": "Asset"})
+    flags = {}
+    for i, token in enumerate(tokens[:-1]):
+        if token.startswith("-") and not _is_number(token):
+            flags[token] = tokens[i + 1]
+    return flags
+
+
+def _is_number(token: str) -> bool:
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
+
+
+def _apply_statement(scene: MayaAsciiScene, tokens: list[str], current_node: MayaAsciiNode) -> MayaAsciiNode:
+    command = tokens[0]
+    flags = _flag_values(tokens)
+
+    if command == "createNode":
+        current_node = MayaAsciiNode(node_type=tokens[1], name=flags.get("-n"), parent=flags.get("-p"))
+        scene.nodes.append(current_node)
+    elif command == "file":
+        # The first "file -rdi" lines describe the reference hierarchy, "file -r" lines are the references
+        # loaded directly into this scene.
+        if "-r" in tokens:
+            scene.references.append(MayaAsciiReference(path=tokens[-1], namespace=flags.get("-ns"),
+                                                       ref_node=flags.get("-rfn"), deferred=flags.get("-dr") == "1"))
+    elif command == "addAttr" and current_node is not None:
+        long_name = flags.get("-ln") or flags.get("-sn")
+        if long_name:
+            current_node.attr_names.add(long_name)
+    elif command == "setAttr" and current_node is not None:
+        value = _get_set_attr_value(tokens)
+        if value is not None:
+            current_node.attr_values[value[0]] = value[1]
+
+    return current_node
+
+
+def _get_set_attr_value(tokens: list[str]) -> tuple[str, str]:
+    # e.g. setAttr -l on ".asset_type" -type "string" "Mesh"; returns ("asset_type", "Mesh")
+    attr_name = None
+    values = []
+    i = 1
+    while i < len(tokens):
+        token = tokens[i]
+        if attr_name is None and token.startswith("."):
+            attr_name = token[1:]
+        elif token.startswith("-") and not _is_number(token):
+            i += 1  # skip the flag's argument
+        elif attr_name is not None:
+            values.append(token)
+        i += 1
+
+    if attr_name is None or not values:
+        return None
+    return attr_name, values[-1]
@@ -0,0 +1,279 @@
+# Python
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import maya_pipeline as mp
+from maya_pipeline.main_app.asset_definitions import ASSET_EXT
+from maya_pipeline.misc.pipeline_paths import get_pipeline_cache_path, iter_asset_files
+from maya_pipeline.misc.process_pool import create_process_pool
+from maya_pipeline.validation.ma_parser import hash_file_bytes, parse_maya_ascii
+from maya_pipeline.validation.validation_rules import (RULES_VERSION, ValidationContext, ValidationIssue,
+                                                       ValidationSeverity, get_validation_rules)
+
+__all__ = ["VALIDATION_CACHE_FILENAME", "FileValidationResult", "ValidationReport", "validate_file",
+           "validate_project"]
+
+VALIDATION_CACHE_FILENAME = "validation_cache.json"
+# Below this many files to (re)parse, starting worker processes costs more than it saves
+_MIN_FILES_FOR_PROCESS_POOL = 64
+_CHUNK_SIZE = 32
+
+
+class FileValidationResult:
+    def __init__(self, path: str, file_hash: str, size: int, mtime_ns: int, asset_type: str,
+                 issues: list[ValidationIssue], references: list[str]):
+        """
+        :param path: Path relative to the scenes folder (posix style)
+        :param references: Paths of the files the scene references
+        """
+        self.path = path
+        self.file_hash = file_hash
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.asset_type = asset_type
+        self.issues = issues
+        self.references = references
+        self.cached = False
+
+    def to_dict(self) -> dict:
+        return {"path": self.path, "hash": self.file_hash, "size": self.size, "mtime_ns": self.mtime_ns,
+                "asset_type": self.asset_type, "issues": [issue.to_dict() for issue in self.issues],
+                "references": self.references}
+
+    @staticmethod
+    def from_dict(data: dict) -> "FileValidationResult":
+        return FileValidationResult(data["path"], data["hash"], data["size"], data["mtime_ns"], data["asset_type"],
+                                    [ValidationIssue.from_dict(issue) for issue in data["issues"]],
+                                    data["references"])
+
+
+class ValidationReport:
+    def __init__(self, scenes_path: Path, results: list[FileValidationResult], duration: float):
+        self.scenes_path = scenes_path
+        self.results = sorted(results, key=lambda result: result.path)
+        self.duration = duration
+
+    def count(self, severity: ValidationSeverity) -> int:
+        return sum(1 for result in self.results for issue in result.issues if issue.severity is severity)
+
+    @property
+    def error_count(self) -> int:
+        return self.count(ValidationSeverity.ERROR)
+
+    @property
+    def warning_count(self) -> int:
+        return self.count(ValidationSeverity.WARNING)
+
+    def to_dict(self) -> dict:
+        return {
+            "scenes_path": str(self.scenes_path),
+            "rules_version": RULES_VERSION,
+            "rules": list(get_validation_rules().keys()),
+            "summary": {
+                "files": len(self.results),
+                "files_with_errors": sum(1 for result in self.results
+                                         if any(issue.severity is ValidationSeverity.ERROR
+                                                for issue in result.issues)),
+                "errors": self.error_count,
+                "warnings": self.warning_count,
+                "cached": sum(1 for result in self.results if result.cached),
+                "duration_seconds": round(self.duration, 3),
+            },
+            "files": [{"path": result.path, "hash": result.file_hash, "asset_type": result.asset_type,
+                       "issues": [issue.to_dict() for issue in result.issues]} for result in self.results],
+        }
+
+    def write(self, report_path: Path):
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=4)
+        mp.debug_log(f"Wrote validation report to: {report_path}")
+
+
+def validate_file(path: Path, scenes_path: Path) -> FileValidationResult:
+    """
+    Validates a single .ma file in this process.
+    :param path: Absolute path of the .ma file
+    :param scenes_path: The Maya project's scenes folder
+    """
+    stat = os.stat(path)
+    result = FileValidationResult.from_dict(_validate_file_job((str(path), str(scenes_path), None)))
+    result.size, result.mtime_ns = stat.st_size, stat.st_mtime_ns
+    result.issues += _check_references(result.references, scenes_path)
+    return result
+
+
+def validate_project(scenes_path: Path, cache_path: Path = None, max_workers: int = None,
+                     rule_modules: list[str] = (), use_cache: bool = True) -> ValidationReport:
+    """
+    Validates every .ma file under the scenes folder without Maya, reusing cached results for unchanged files.
+    :param scenes_path: The Maya project's scenes folder
+    :param cache_path: Where to store the results cache. Defaults to the project's cache folder.
+    :param max_workers: Number of worker processes
+    :param rule_modules: Modules to import (in every worker) that register extra rules with @validation_rule
+    :param use_cache: If False, every file is parsed again
+    """
+    start_time = time.perf_counter()
+    scenes_path = Path(scenes_path)
+    _import_rule_modules(rule_modules)
+
+    if cache_path is None:
+        cache_path = get_pipeline_cache_path(scenes_path.parent) / VALIDATION_CACHE_FILENAME
+    cached_results = _load_cache(cache_path) if use_cache else {}
+
+    results: list[FileValidationResult] = []
+    jobs: list[tuple[str, str, str]] = []
+    file_stats: dict[str, os.stat_result] = {}
+
+    # Unchanged size and mtime means the file is unchanged, so only the remaining files get read and hashed
+    for path, stat in iter_asset_files(scenes_path, ASSET_EXT):
+        relative_path = path.relative_to(scenes_path).as_posix()
+        file_stats[relative_path] = stat
+        cached = cached_results.get(relative_path)
+
+        if cached is not None and cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns:
+            cached.cached = True
+            results.append(cached)
+        else:
+            previous_hash = cached.file_hash if cached is not None else None
+            jobs.append((str(path), str(scenes_path), previous_hash))
+
+    mp.debug_log(f"Validating {len(jobs)} changed files ({len(results)} cached) in: {scenes_path}")
+
+    for job_result in _run_jobs(jobs, max_workers, rule_modules):
+        relative_path = job_result["path"]
+        stat = file_stats[relative_path]
+
+        if job_result.get("unchanged"):
+            # Touched but the content hash is the same, so the cached issues still apply
+            result = cached_results[relative_path]
+            result.cached = True
+        else:
+            result = FileValidationResult.from_dict(job_result)
+        result.size, result.mtime_ns = stat.st_size, stat.st_mtime_ns
+        results.append(result)
+
+    if use_cache:
+        _save_cache(cache_path, results)
+
+    # References can break without the referencing file changing, so they're checked on every run
+    for result in results:
+        result.issues = result.issues + _check_references(result.references, scenes_path)
+
+    report = ValidationReport(scenes_path, results, time.perf_counter() - start_time)
+    mp.debug_log(f"Validated {len(results)} files in {report.duration:.2f}s: "
+                 f"{report.error_count} errors, {report.warning_count} warnings.")
+    return report
+
+
+def _run_jobs(jobs: list[tuple[str, str, str]], max_workers: int, rule_modules: list[str]):
+    if len(jobs) < _MIN_FILES_FOR_PROCESS_POOL or max_workers == 1:
+        for job in jobs:
+            yield _validate_file_job(job)
+        return
+
+    with create_process_pool(max_workers, initializer=_import_rule_modules, initargs=(list(rule_modules),)) as pool:
+        yield from pool.map(_validate_file_job, jobs, chunksize=_CHUNK_SIZE)
+
+
+def _validate_file_job(job: tuple[str, str, str]) -> dict:
+    # Runs in the worker processes, so it only returns data and doesn't log.
+    path_str, scenes_path_str, previous_hash = job
+    path = Path(path_str)
+    scenes_path = Path(scenes_path_str)
+    relative_path = path.relative_to(scenes_path).as_posix()
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    file_hash = hash_file_bytes(data)
+    if file_hash == previous_hash:
+        return {"path": relative_path, "unchanged": True}
+
+    scene = parse_maya_ascii(data, path)
+    context = ValidationContext(scene, scenes_path)
+    issues: list[ValidationIssue] = []
+
+    for name, rule in get_validation_rules().items():
+        try:
+            issues += rule(context)
+        except Exception as e:
+            issues.append(ValidationIssue(name, ValidationSeverity.ERROR, f"Rule raised an exception: {e}"))
+
+    return FileValidationResult(relative_path, file_hash, 0, 0, context.asset_type.value, issues,
+                                [ref.path for ref in scene.references]).to_dict()
+
+
+def _check_references(references: list[str], scenes_path: Path) -> list[ValidationIssue]:
+    issues = []
+    for ref_path_str in references:
+        ref_path = Path(ref_path_str)
+        if not ref_path.is_absolute():
+            ref_path = scenes_path.parent / ref_path
+        if not ref_path.exists():
+            issues.append(ValidationIssue("missing_reference", ValidationSeverity.ERROR,
+                                          f"Referenced file doesn't exist: {ref_path_str}"))
+    return issues
+
+
+def _import_rule_modules(rule_modules: list[str]):
+    for module_name in rule_modules:
+        importlib.import_module(module_name)
+
+
+def _get_cache_key() -> dict:
+    return {"rules_version": RULES_VERSION, "rules": list(get_validation_rules().keys())}
+
+
+def _load_cache(cache_path: Path) -> dict[str, FileValidationResult]:
+    if not cache_path.is_file():
+        return {}
+
+    try:
+        with open(cache_path, "r", encoding="utf-8") as file:
+            cache = json.load(file)
+    except (OSError, ValueError) as e:
+        mp.debug_warning(f"Ignoring unreadable validation cache {cache_path}: {e}")
+        return {}
+
+    # Results produced by a different set of rules can't be reused
+    if cache.get("key") != _get_cache_key():
+        return {}
+
+    return {entry["path"]: FileValidationResult.from_dict(entry) for entry in cache["files"]}
+
+
+def _save_cache(cache_path: Path, results: list[FileValidationResult]):
+    cache = {"key": _get_cache_key(), "files": [result.to_dict() for result in results]}
+    temp_path = cache_path.with_name(cache_path.name + ".tmp")
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(cache, file)
+    os.replace(temp_path, cache_path)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate every Maya Pipeline asset in a Maya project's scenes "
+                                                 "folder without opening Maya.")
+    parser.add_argument("scenes_path", type=Path, help="The Maya project's scenes folder")
+    parser.add_argument("--report", type=Path, help="Where to write the JSON report. Printed if not set.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--rules", nargs="*", default=[], help="Modules that register extra validation rules")
+    parser.add_argument("--no-cache", action="store_true", help="Validate every file again")
+    args = parser.parse_args(argv)
+
+    report = validate_project(args.scenes_path, max_workers=args.workers, rule_modules=args.rules,
+                              use_cache=not args.no_cache)
+
+    if args.report:
+        report.write(args.report)
+    else:
+        json.dump(report.to_dict(), sys.stdout, indent=4)
+
+    return 1 if report.error_count > 0 else 0
@@ -0,0 +1,177 @@
+# Python
+from enum import Enum
+from pathlib import Path, PurePosixPath
+from typing import Callable
+
+from maya_pipeline.main_app.asset_definitions import (AssetType, AssetTypeSuffix, ASSET_EXT, ASSET_NODE_NAME,
+                                                      ASSET_TYPE_ATTR_NAME, ANIMATIONS_DIR_NAME)
+from maya_pipeline.validation.ma_parser import MayaAsciiScene
+
+__all__ = ["ValidationSeverity", "ValidationIssue", "ValidationContext", "RULES_VERSION", "validation_rule",
+           "get_validation_rules", "get_scene_asset_type"]
+
+# Bump when a built-in rule changes so cached validation results are thrown away
+RULES_VERSION = 1
+
+
+class ValidationSeverity(Enum):
+    WARNING = "Warning"
+    ERROR = "Error"
+
+
+class ValidationIssue:
+    def __init__(self, rule: str, severity: ValidationSeverity, message: str):
+        self.rule = rule
+        self.severity = severity
+        self.message = message
+
+    def to_dict(self) -> dict[str, str]:
+        return {"rule": self.rule, "severity": self.severity.value, "message": self.message}
+
+    @staticmethod
+    def from_dict(data: dict[str, str]) -> "ValidationIssue":
+        return ValidationIssue(data["rule"], ValidationSeverity(data["severity"]), data["message"])
+
+    def __repr__(self):
+        return f"{self.severity.value}: [{self.rule}] {self.message}"
+
+
+class ValidationContext:
+    def __init__(self, scene: MayaAsciiScene, scenes_path: Path):
+        """
+        :param scene: Parsed .ma file
+        :param scenes_path: The Maya project's scenes folder the file belongs to
+        """
+        self.scene = scene
+        self.scenes_path = scenes_path
+        self.relative_path = PurePosixPath(Path(scene.path).relative_to(scenes_path).as_posix())
+        self.asset_type = get_scene_asset_type(scene)
+
+
+ValidationRule = Callable[[ValidationContext], list[ValidationIssue]]
+
+# Rules run on every file, in registration order.
+# Other modules can add rules with the @validation_rule decorator (see validation_engine.validate_project).
+_rules: dict[str, ValidationRule] = {}
+
+
+def validation_rule(name: str) -> Callable[[ValidationRule], ValidationRule]:
+    def register(rule: ValidationRule) -> ValidationRule:
+        _rules[name] = rule
+        return rule
+    return register
+
+
+def get_validation_rules() -> dict[str, ValidationRule]:
+    return dict(_rules)
+
+
+def get_scene_asset_type(scene: MayaAsciiScene) -> AssetType:
+    asset_node = scene.get_top_level_node(ASSET_NODE_NAME)
+    if asset_node is None or ASSET_TYPE_ATTR_NAME not in asset_node.attr_names:
+        return AssetType.NONE
+
+    try:
+        return AssetType(asset_node.attr_values.get(ASSET_TYPE_ATTR_NAME))
+    except ValueError:
+        return AssetType.NONE
+
+
+def _get_suffix(asset_type: AssetType) -> AssetTypeSuffix:
+    if asset_type.name in AssetTypeSuffix.__members__:
+        return AssetTypeSuffix[asset_type.name]
+    return None
+
+
+# region Built-in Rules
+@validation_rule("asset_node")
+def _asset_node_exists(context: ValidationContext) -> list[ValidationIssue]:
+    if context.scene.get_top_level_node(ASSET_NODE_NAME) is None:
+        return [ValidationIssue("asset_node", ValidationSeverity.ERROR,
+                                f"No top level {ASSET_NODE_NAME} node.")]
+    return []
+
+
+@validation_rule("asset_type_attr")
+def _asset_type_attr_is_valid(context: ValidationContext) -> list[ValidationIssue]:
+    asset_node = context.scene.get_top_level_node(ASSET_NODE_NAME)
+    if asset_node is None:
+        return []  # Reported by the asset_node rule
+
+    if ASSET_TYPE_ATTR_NAME not in asset_node.attr_names:
+        return [ValidationIssue("asset_type_attr", ValidationSeverity.ERROR,
+                                f"{ASSET_NODE_NAME} node has no {ASSET_TYPE_ATTR_NAME} attribute.")]
+
+    if context.asset_type is AssetType.NONE:
+        value = asset_node.attr_values.get(ASSET_TYPE_ATTR_NAME)
+        return [ValidationIssue("asset_type_attr", ValidationSeverity.ERROR,
+                                f"{ASSET_TYPE_ATTR_NAME} has an invalid value: {value}.")]
+    return []
+
+
+@validation_rule("file_name")
+def _file_name_matches_asset_type(context: ValidationContext) -> list[ValidationIssue]:
+    stem = context.relative_path.stem
+
+    if context.asset_type is AssetType.ANIMATION:
+        # e.g. Hero@Walk.ma
+        rig_name, _, clip_name = stem.partition("@")
+        if not rig_name or not clip_name or "@" in clip_name:
+            return [ValidationIssue("file_name", ValidationSeverity.ERROR,
+                                    f"Animation file {context.relative_path.name} isn't named <Rig Name>@<Clip Name>"
+                                    f"{ASSET_EXT}.")]
+        return []
+
+    suffix = _get_suffix(context.asset_type)
+    if suffix is not None and not stem.endswith(suffix.value):
+        return [ValidationIssue("file_name", ValidationSeverity.ERROR,
+                                f"{context.asset_type.value} file {context.relative_path.name} doesn't end with "
+                                f"{suffix.value}{ASSET_EXT}.")]
+    if "@" in stem:
+        return [ValidationIssue("file_name", ValidationSeverity.ERROR,
+                                f"Only animation files can have @ in their name: {context.relative_path.name}.")]
+    return []
+
+
+@validation_rule("asset_folder")
+def _asset_is_in_expected_folder(context: ValidationContext) -> list[ValidationIssue]:
+    folder = context.relative_path.parent
+
+    if context.asset_type is AssetType.ANIMATION:
+        # e.g. Characters/Hero/Animations/Hero@Walk.ma
+        if folder.name != ANIMATIONS_DIR_NAME:
+            return [ValidationIssue("asset_folder", ValidationSeverity.ERROR,
+                                    f"Animation isn't in an {ANIMATIONS_DIR_NAME} folder: {context.relative_path}.")]
+        return []
+
+    if folder.name == ANIMATIONS_DIR_NAME:
+        return [ValidationIssue("asset_folder", ValidationSeverity.ERROR,
+                                f"Only animations belong in {ANIMATIONS_DIR_NAME} folders: {context.relative_path}.")]
+
+    # e.g. Props/Crate/Crate_MSH.ma
+    suffix = _get_suffix(context.asset_type)
+    if suffix is not None and context.relative_path.stem.endswith(suffix.value):
+        asset_name = context.relative_path.stem[0:-len(suffix.value)]
+        if folder.name != asset_name:
+            return [ValidationIssue("asset_folder", ValidationSeverity.WARNING,
+                                    f"{context.relative_path.name} isn't in a folder named {asset_name}.")]
+    return []
+
+
+@validation_rule("animation_rig")
+def _animation_references_its_rig(context: ValidationContext) -> list[ValidationIssue]:
+    if context.asset_type is not AssetType.ANIMATION:
+        return []
+
+    rig_refs = [ref for ref in context.scene.references
+                if PurePosixPath(ref.path.replace("\\", "/")).stem.endswith(AssetTypeSuffix.RIG.value)]
+    if not rig_refs:
+        return [ValidationIssue("animation_rig", ValidationSeverity.ERROR, "Animation doesn't reference a Rig.")]
+
+    rig_name = context.relative_path.stem.partition("@")[0]
+    rig_stems = [PurePosixPath(ref.path.replace("\\", "/")).stem for ref in rig_refs]
+    if rig_name + AssetTypeSuffix.RIG.value not in rig_stems:
+        return [ValidationIssue("animation_rig", ValidationSeverity.WARNING,
+                                f"Animation is named after {rig_name} but references: {', '.join(rig_stems)}.")]
+    return []
+# endregion
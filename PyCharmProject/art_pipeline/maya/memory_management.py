@@ -10,14 +10,49 @@ import gc
 module_names = [
     "userSetup",
     "maya_pipeline",
+    "maya_pipeline.exporter.artifact_cache",
+    "maya_pipeline.exporter.bake_cache",
+    "maya_pipeline.exporter.batch_export",
+    "maya_pipeline.exporter.decimation",
+    "maya_pipeline.exporter.distributed_export",
     "maya_pipeline.exporter.export",
+    "maya_pipeline.exporter.export_history",
+    "maya_pipeline.exporter.export_journal",
+    "maya_pipeline.exporter.fast_bake",
+    "maya_pipeline.exporter.fbx_animation_writer",
+    "maya_pipeline.exporter.fbx_inspection",
+    "maya_pipeline.exporter.fbx_normalization",
+    "maya_pipeline.exporter.joint_pruning",
+    "maya_pipeline.exporter.mesh_export",
+    "maya_pipeline.exporter.mesh_optimization",
+    "maya_pipeline.exporter.publishing",
+    "maya_pipeline.exporter.resample",
+    "maya_pipeline.exporter.skin_export",
+    "maya_pipeline.exporter.skin_weights",
+    "maya_pipeline.exporter.static_batch_export",
+    "maya_pipeline.exporter.static_batching",
+    "maya_pipeline.exporter.unity_meta",
+    "maya_pipeline.exporter.watch_export",
+    "maya_pipeline.main_app.asset_definitions",
+    "maya_pipeline.main_app.asset_folder_model",
+    "maya_pipeline.main_app.asset_index",
+    "maya_pipeline.main_app.asset_quick_pick",
+    "maya_pipeline.main_app.asset_spec",
+    "maya_pipeline.main_app.bulk_create",
     "maya_pipeline.main_app.main_model",
     "maya_pipeline.main_app.main_controller",
     "maya_pipeline.main_app.main_view",
     "maya_pipeline.main_app.main_view_ui",
+    "maya_pipeline.misc.callback_registry",
     "maya_pipeline.misc.dockable_main_window",
+    "maya_pipeline.misc.maya_session",
+    "maya_pipeline.misc.maya_worker",
+    "maya_pipeline.misc.pipeline_paths",
+    "maya_pipeline.misc.process_pool",
+    "maya_pipeline.misc.profiling",
     "maya_pipeline.misc.maya_utilities",
     "maya_pipeline.misc.pyside_utilities",
+    "maya_pipeline.misc.reference_loading",
     "maya_pipeline.misc.ui_creation_mode",
     "maya_pipeline.mp_logging.mp_logging",
     "maya_pipeline.settings.settings",
@@ -25,6 +60,9 @@ module_names = [
     "maya_pipeline.settings.settings_controller",
     "maya_pipeline.settings.settings_view",
     "maya_pipeline.settings.settings_view_ui",
+    "maya_pipeline.validation.ma_parser",
+    "maya_pipeline.validation.validation_rules",
+    "maya_pipeline.validation.validation_engine",
     "maya_pipeline.main_app.main_app"
 ]
 
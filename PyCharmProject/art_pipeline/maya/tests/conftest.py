@@ -0,0 +1,6 @@
+# Python
+import sys
+from pathlib import Path
+
+# The tests run from plain Python, where maya_pipeline only loads the modules that don't need Maya
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
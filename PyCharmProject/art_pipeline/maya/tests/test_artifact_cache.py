@@ -0,0 +1,60 @@
+# Python
+from pathlib import Path
+
+# Internal
+import maya_pipeline as mp
+
+_SCENE = """//Maya ASCII 2023 scene
+//Name: {name}
+//Last modified: {modified}
+requires maya "2023";
+createNode transform -n "Asset";
+createNode mesh -n "RockShape" -p "Asset";
+"""
+
+
+def _write_scene(folder_path: Path, name: str, modified: str = "Mon, Jan 02, 2023 10:00:00 AM") -> Path:
+    scene_path = folder_path / name
+    scene_path.write_text(_SCENE.format(name=name, modified=modified), encoding="utf-8")
+    return scene_path
+
+
+def _get_key(scene_path: Path, project_path: Path, preset_path: Path) -> str:
+    return mp.get_artifact_cache_key(scene_path, project_path, preset_path, {"maya": "20230000"})
+
+
+def test_identical_scenes_of_different_assets_dont_share_an_entry(tmp_path: Path):
+    scenes_path = tmp_path / "scenes"
+    scenes_path.mkdir()
+    preset_path = tmp_path / "mesh.fbxexportpreset"
+    preset_path.write_text("preset", encoding="utf-8")
+    scene_a_path = _write_scene(scenes_path, "Rock_A_MSH.ma")
+    scene_b_path = _write_scene(scenes_path, "Rock_B_MSH.ma")
+    key_a = _get_key(scene_a_path, tmp_path, preset_path)
+    key_b = _get_key(scene_b_path, tmp_path, preset_path)
+    assert key_a != key_b
+
+    fbx_path = tmp_path / "export" / "Rock_A_MSH.fbx"
+    fbx_path.parent.mkdir()
+    fbx_path.write_bytes(b"Kaydara FBX Binary  \x00rock")
+    cache = mp.ArtifactCache(tmp_path / "cache")
+    cache.put(key_a, [fbx_path], {"importer_settings": {}})
+
+    b_folder_path = tmp_path / "b"
+    assert cache.fetch(key_b, b_folder_path) is None
+    assert not b_folder_path.exists()
+
+    a_folder_path = tmp_path / "a"
+    assert cache.fetch(key_a, a_folder_path) == {"importer_settings": {}}
+    assert (a_folder_path / "Rock_A_MSH.fbx").read_bytes() == fbx_path.read_bytes()
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_resaving_a_scene_keeps_its_key(tmp_path: Path):
+    preset_path = tmp_path / "mesh.fbxexportpreset"
+    preset_path.write_text("preset", encoding="utf-8")
+    scene_path = _write_scene(tmp_path, "Rock_A_MSH.ma")
+    key = _get_key(scene_path, tmp_path, preset_path)
+
+    _write_scene(tmp_path, "Rock_A_MSH.ma", modified="Tue, Jan 03, 2023 11:00:00 AM")
+    assert _get_key(scene_path, tmp_path, preset_path) == key
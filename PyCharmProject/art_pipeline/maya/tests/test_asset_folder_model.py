@@ -0,0 +1,21 @@
+# Python
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide2")
+
+# Internal
+from maya_pipeline.main_app.asset_folder_model import list_asset_parent_folders
+
+
+def test_list_asset_parent_folders(tmp_path: Path):
+    for relative_path in ["Crate/Crate_MSH.ma", "Hero/Animations/Hero@Walk.ma", "Hero/Hero_RIG.ma",
+                          "Reference/Layout.ma", "Backups/Crate_MSH.ma", "Empty/.keep", ".hidden/Thing_MSH.ma",
+                          "Animations/Hero@Run.ma"]:
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+    # Folders holding .ma files that aren't named after them aren't asset folders
+    assert list_asset_parent_folders(tmp_path) == ["Backups", "Empty", "Reference"]
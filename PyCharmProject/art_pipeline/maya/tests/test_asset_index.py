@@ -0,0 +1,61 @@
+# Python
+from pathlib import Path
+
+# Internal
+import maya_pipeline as mp
+
+
+def _create_assets(scenes_path: Path, relative_paths: list[str]):
+    for relative_path in relative_paths:
+        path = scenes_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+
+def _search(index: mp.AssetIndex, query: str) -> list[str]:
+    return [entry.name for entry in index.search(query)]
+
+
+def test_search(tmp_path: Path):
+    _create_assets(tmp_path, ["Props/Crate/Crate_MSH.ma", "Props/Big_Crate/Big_Crate_MSH.ma",
+                              "Props/Barrel/Barrel_MSH.ma", "Hero/Hero_RIG.ma", "Hero/Animations/Hero@Crouch.ma"])
+    index = mp.AssetIndex()
+    index.build(tmp_path)
+
+    assert _search(index, "crate") == ["Crate", "Big_Crate"]
+    assert _search(index, "crat") == ["Crate", "Big_Crate"]
+    assert _search(index, "crrate")[:1] == ["Crate"]
+    assert [entry.name for entry in index.search("", asset_type=mp.AssetType.RIG)] == ["Hero"]
+
+
+def test_short_queries_only_match_prefixes(tmp_path: Path):
+    _create_assets(tmp_path, ["Props/Crate/Crate_MSH.ma", "Props/Big_Crate/Big_Crate_MSH.ma",
+                              "Props/Barrel/Barrel_MSH.ma"])
+    index = mp.AssetIndex()
+    index.build(tmp_path)
+
+    assert _search(index, "cr") == ["Crate"]
+    assert sorted(_search(index, "b")) == ["Barrel", "Big_Crate"]
+    assert _search(index, "ra") == []
+    assert _search(index, "rat") == ["Crate", "Big_Crate"]
+
+
+def test_shared_index_is_reused(tmp_path: Path, monkeypatch):
+    scenes_path = tmp_path / "scenes"
+    _create_assets(scenes_path, ["Props/Crate/Crate_MSH.ma"])
+    index = mp.get_shared_asset_index(scenes_path)
+    assert index.wait_until_built(timeout=10)
+
+    # e.g. Maya restoring the dock
+    _create_assets(scenes_path, ["Props/Barrel/Barrel_MSH.ma"])
+    assert mp.get_shared_asset_index(scenes_path) is index
+    assert _search(index, "") == ["Crate"]
+
+    # An old index keeps answering searches while it's rebuilt
+    monkeypatch.setattr(mp.main_app.asset_index, "SHARED_INDEX_MAX_AGE_SECONDS", -1.0)
+    assert mp.get_shared_asset_index(scenes_path) is index
+    assert index.wait_until_built(timeout=0)
+    index._build_thread.join(10)
+    assert sorted(_search(index, "")) == ["Barrel", "Crate"]
+
+    assert mp.get_shared_asset_index(tmp_path / "other_scenes") is not index
@@ -0,0 +1,50 @@
+# Python
+import json
+from pathlib import Path
+
+import pytest
+
+# Internal
+import maya_pipeline as mp
+
+
+def test_load_csv_asset_specs(tmp_path: Path):
+    spec_path = tmp_path / "assets.csv"
+    spec_path.write_text("name,type,parent_folder,static,lod_count,sample_rate,Rig\n"
+                         "Crate,Mesh,Props,yes,2,,\n"
+                         "Rock,Mesh,Props,,,,\n"
+                         "Walk,Animation,,,,15,Characters/Hero/Hero_RIG.ma\n", encoding="utf-8")
+    crate, rock, walk = mp.load_asset_specs(spec_path)
+
+    assert (crate.static, crate.lod_count) == (True, 2)
+    assert (rock.static, rock.lod_count) == (False, 0)
+    assert walk.sample_rate == 15.0
+    assert crate.sample_rate == 0.0
+    assert crate.keep_joints == ""
+
+
+def test_load_csv_keep_joints(tmp_path: Path):
+    spec_path = tmp_path / "assets.csv"
+    spec_path.write_text("name,type,parent_folder,keep_joints,SkinnedMesh\n"
+                         "Hero,Rig,Characters,\"Weapon_R, Prop_*\",Characters/Hero/Hero_SKN.ma\n", encoding="utf-8")
+    hero, = mp.load_asset_specs(spec_path)
+
+    assert mp.parse_keep_joints(hero.keep_joints) == ["Weapon_R", "Prop_*"]
+
+
+def test_load_json_asset_specs_round_trips(tmp_path: Path):
+    specs = [mp.AssetSpec("Crate", mp.AssetType.MESH, "Props", lod_count=3),
+             mp.AssetSpec("Walk", mp.AssetType.ANIMATION, dependencies={mp.AssetType.RIG: "Hero/Hero_RIG.ma"},
+                          sample_rate=12.5),
+             mp.AssetSpec("Hero", mp.AssetType.RIG, dependencies={mp.AssetType.SKINNED_MESH: "Hero/Hero_SKN.ma"},
+                          keep_joints="Weapon_R; Prop_*")]
+    spec_path = tmp_path / "assets.json"
+    spec_path.write_text(json.dumps({"assets": [spec.to_dict() for spec in specs]}), encoding="utf-8")
+
+    assert [spec.to_dict() for spec in mp.load_asset_specs(spec_path)] == [spec.to_dict() for spec in specs]
+
+
+@pytest.mark.parametrize("kwargs", [{"lod_count": -1}, {"sample_rate": -1.0}])
+def test_negative_counts_are_rejected(kwargs: dict):
+    with pytest.raises(ValueError):
+        mp.AssetSpec("Crate", mp.AssetType.MESH, **kwargs)
@@ -0,0 +1,63 @@
+# Python
+import numpy as np
+
+# Internal
+import maya_pipeline as mp
+
+
+def _create_grid(size: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    :return: Positions and triangles of a flat size x size quad grid on the XY plane, facing +Z
+    """
+    x, y = np.meshgrid(np.arange(size + 1, dtype=np.float64), np.arange(size + 1, dtype=np.float64))
+    positions = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+    triangles = []
+    for row in range(size):
+        for column in range(size):
+            corner = row * (size + 1) + column
+            triangles.append([corner, corner + 1, corner + size + 2])
+            triangles.append([corner, corner + size + 2, corner + size + 1])
+    return positions, np.array(triangles)
+
+
+def _get_normals(positions: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    corners = positions[triangles]
+    return np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+
+def test_lod_triangle_counts():
+    assert mp.get_lod_triangle_counts(1000, 3) == [500, 250, 125]
+    assert mp.get_lod_triangle_counts(3, 3, reduction=0.25) == [1, 1, 1]
+
+
+def test_decimate_keeps_the_border_and_corners():
+    positions, triangles = _create_grid(16)
+    faces, lod_triangles, corner_ids = mp.decimate(positions, triangles, len(triangles) // 4)
+
+    assert len(lod_triangles) <= len(triangles) // 2
+    assert np.array_equal(lod_triangles, corner_ids)
+    assert np.array_equal(np.sort(faces), np.unique(faces)) and faces.max() < len(triangles)
+    assert np.all(_get_normals(positions, lod_triangles)[:, 2] > 0), "No triangle is flipped or degenerate"
+    # Flat and with the same outline, so the surface covers the same area
+    assert np.isclose(np.sum(_get_normals(positions, lod_triangles)[:, 2]) / 2, 16 * 16)
+    used = np.unique(lod_triangles)
+    for corner in (0, 16, 16 * 17, 17 * 17 - 1):
+        assert corner in used
+
+
+def test_decimate_keeps_seams():
+    positions, triangles = _create_grid(16)
+    # The left and right halves have different UVs, so the column at x = 8 is a seam
+    corner_ids = np.where(positions[triangles, 0] >= 8, triangles + len(positions), triangles)
+    left = np.all(positions[triangles, 0] <= 8, axis=1)
+    corner_ids[left] = triangles[left]
+
+    _, lod_triangles, lod_corner_ids = mp.decimate(positions, triangles, len(triangles) // 4, corner_ids=corner_ids)
+
+    assert len(lod_triangles) < len(triangles)
+    corners_x = positions[lod_triangles, 0]
+    # No triangle crosses the seam, and each side still uses its own attributes
+    assert np.all(np.all(corners_x <= 8, axis=1) | np.all(corners_x >= 8, axis=1))
+    right = np.all(corners_x >= 8, axis=1) & np.any(corners_x > 8, axis=1)
+    assert np.all(lod_corner_ids[right] >= len(positions))
+    assert np.all(lod_corner_ids[~right] < len(positions))
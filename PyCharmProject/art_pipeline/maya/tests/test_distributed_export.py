@@ -0,0 +1,119 @@
+# Python
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import multiprocessing
+import os
+from pathlib import Path
+import signal
+import time
+
+import pytest
+
+# Internal
+import maya_pipeline as mp
+
+_JOB_COUNT = 20
+_TIMEOUT_SECONDS = 60.0
+# Exports of assets with this in their name never finish on hanging workers
+_HANGING_NAME = "Hang"
+
+
+def _stub_export_job(path_str: str, scenes_path_str: str, export_root_path_str: str, hang: bool = False) -> dict:
+    """
+    Logs which process exported the asset instead of exporting it
+    """
+    path = Path(path_str)
+    if hang and _HANGING_NAME in path.name:
+        time.sleep(_TIMEOUT_SECONDS)
+    time.sleep(0.05)
+    with open(Path(export_root_path_str) / "exports.log", "a", encoding="utf-8") as file:
+        file.write(f"{os.getpid()} {path.name}\n")
+    asset_path = path.relative_to(scenes_path_str).as_posix()
+    return mp.ExportRecord(asset_path, mp.get_asset_type_from_filename(path).value, time.time(), 0.05,
+                           path.stat().st_size).to_dict()
+
+
+def _run_worker(job_dir: str, lease_seconds: float, hang: bool):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        worker = mp.DistributedExportWorker(Path(job_dir), max_workers=2, lease_seconds=lease_seconds,
+                                            heartbeat_interval=lease_seconds / 4,
+                                            export_job=partial(_stub_export_job, hang=hang), executor=executor)
+        worker.run(poll_interval=0.05)
+
+
+def _submit(tmp_path: Path, names: list[str]) -> Path:
+    scenes_path = tmp_path / "scenes"
+    paths = []
+    for name in names:
+        path = scenes_path / "Props" / name / f"{name}_MSH.ma"
+        path.parent.mkdir(parents=True)
+        path.write_text("createNode transform -n \"Asset\";\n", encoding="utf-8")
+        paths.append(path)
+    export_root_path = tmp_path / "Assets"
+    export_root_path.mkdir()
+
+    job_dir = tmp_path / "jobs"
+    mp.submit_distributed_export(job_dir, paths, scenes_path, export_root_path, tmp_path / "history.db")
+    return job_dir
+
+
+def _read_exports(tmp_path: Path) -> list[str]:
+    log_path = tmp_path / "Assets" / "exports.log"
+    return [line.split()[1] for line in log_path.read_text(encoding="utf-8").splitlines()] if log_path.exists() \
+        else []
+
+
+def _start_worker(job_dir: Path, lease_seconds: float, hang: bool = False) -> multiprocessing.Process:
+    process = multiprocessing.get_context("spawn").Process(target=_run_worker,
+                                                           args=(str(job_dir), lease_seconds, hang))
+    process.start()
+    return process
+
+
+def test_workers_share_the_jobs(tmp_path: Path):
+    job_dir = _submit(tmp_path, [f"Crate{index:02d}" for index in range(_JOB_COUNT)])
+
+    processes = [_start_worker(job_dir, lease_seconds=30.0) for _ in range(3)]
+    for process in processes:
+        process.join(_TIMEOUT_SECONDS)
+        assert process.exitcode == 0
+
+    assert mp.get_distributed_export_status(job_dir).finished
+    records = mp.collect_distributed_results(job_dir)
+    assert len(records) == _JOB_COUNT
+    assert all(record.outcome is mp.ExportOutcome.SUCCEEDED for record in records)
+    exports = _read_exports(tmp_path)
+    assert sorted(exports) == sorted(set(exports)) and len(exports) == _JOB_COUNT
+    assert not os.listdir(job_dir / "leases")
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="Needs SIGKILL")
+def test_leases_of_a_killed_worker_are_reclaimed(tmp_path: Path):
+    names = [f"Crate{index:02d}" for index in range(4)]
+    job_dir = _submit(tmp_path, [f"{_HANGING_NAME}{index}" for index in range(2)] + names)
+    lease_seconds = 1.0
+
+    # Claims two jobs, hangs on them and is killed like a machine that crashed
+    hanging_process = _start_worker(job_dir, lease_seconds, hang=True)
+    end_time = time.monotonic() + _TIMEOUT_SECONDS
+    while len(os.listdir(job_dir / "leases")) < 2 and time.monotonic() < end_time:
+        time.sleep(0.02)
+    leased = sorted(os.listdir(job_dir / "leases"))
+    assert len(leased) == 2
+    os.kill(hanging_process.pid, signal.SIGKILL)
+    hanging_process.join(_TIMEOUT_SECONDS)
+
+    # The hanging jobs are reclaimed by another worker after their leases expire
+    process = _start_worker(job_dir, lease_seconds)
+    process.join(_TIMEOUT_SECONDS)
+    assert process.exitcode == 0
+
+    records = {record.asset_path: record for record in mp.collect_distributed_results(job_dir)}
+    assert len(records) == len(names) + 2
+    assert all(record.outcome is mp.ExportOutcome.SUCCEEDED for record in records.values())
+    exports = _read_exports(tmp_path)
+    assert len(exports) == len(set(exports)) == len(records)
+    # Leases that expired count as attempts
+    attempts = os.listdir(job_dir / "attempts")
+    for lease_name in leased:
+        assert sum(1 for name in attempts if name.startswith(lease_name[:-len(".lease")] + ".")) >= 1
@@ -0,0 +1,52 @@
+# Python
+from pathlib import Path
+import time
+
+import pytest
+
+# Internal
+import maya_pipeline as mp
+
+
+def _create_record(asset_path: str) -> mp.ExportRecord:
+    return mp.ExportRecord(asset_path, mp.AssetType.MESH.value, time.time(), 1.0, 100, output_size=4)
+
+
+@pytest.mark.parametrize("interrupted", [False, True])
+def test_export_finished_in_a_publish_batch_is_finished_after_it_commits(tmp_path: Path, interrupted: bool):
+    source_path = tmp_path / "scenes" / "Rock_MSH.ma"
+    source_path.parent.mkdir()
+    source_path.write_text("createNode transform -n \"Asset\";", encoding="utf-8")
+    export_root_path = tmp_path / "Assets"
+    output_path = export_root_path / "Rock_MSH.fbx"
+    journal_path = tmp_path / mp.EXPORT_JOURNAL_FILENAME
+
+    with mp.ExportJournal(journal_path) as journal:
+        try:
+            with mp.PublishBatch(export_root_path):
+                journal.start("Rock_MSH.ma")
+                mp.publish_bytes(b"rock", output_path)
+                assert not output_path.exists()
+                journal.finish(_create_record("Rock_MSH.ma"), source_path, output_path)
+                if interrupted:
+                    raise KeyboardInterrupt
+        except KeyboardInterrupt:
+            pass
+
+    assert output_path.read_bytes() == b"rock"
+    with mp.ExportJournal(journal_path) as journal:
+        assert journal.is_finished("Rock_MSH.ma", source_path, output_path)
+        output_path.write_bytes(b"rock, changed")
+        assert not journal.is_finished("Rock_MSH.ma", source_path, output_path)
+
+
+def test_released_starts_arent_attempts(tmp_path: Path):
+    journal_path = tmp_path / mp.EXPORT_JOURNAL_FILENAME
+    with mp.ExportJournal(journal_path) as journal:
+        journal.start("Hero@Walk_ANIM.ma")
+        journal.start("Hero@Run_ANIM.ma")
+        journal.release("Hero@Run_ANIM.ma")
+
+    with mp.ExportJournal(journal_path) as journal:
+        assert journal.get_attempt_count("Hero@Walk_ANIM.ma") == 1
+        assert journal.get_attempt_count("Hero@Run_ANIM.ma") == 0
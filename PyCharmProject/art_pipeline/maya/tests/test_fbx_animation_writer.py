@@ -0,0 +1,77 @@
+# Python
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Internal
+import maya_pipeline as mp
+
+_JOINTS = [mp.FbxJointDefinition("|Hips", joint_orient=(0.0, 90.0, 0.0)),
+           mp.FbxJointDefinition("|Hips|Spine", rotate_order=2, rest_values=(0.0, 10.0, 0.0, 0.0, 0.0, 0.0,
+                                                                              1.0, 1.0, 1.0)),
+           mp.FbxJointDefinition("|Hips|Spine|Head")]
+_USER_PROPERTIES = {mp.ASSET_TYPE_ATTR_NAME: mp.AssetType.ANIMATION.value, mp.LOOP_ATTR_NAME: True}
+
+
+def _create_baked_animation(channel_names: list[str], frame_count: int = 12) -> mp.BakedAnimation:
+    rng = np.random.default_rng(7)
+    values = rng.uniform(-90.0, 90.0, (frame_count, len(_JOINTS), len(channel_names))).astype(np.float32)
+    return mp.BakedAnimation([joint.name for joint in _JOINTS], channel_names, 5, values)
+
+
+def _write(path: Path, baked_animation: mp.BakedAnimation, frames: np.ndarray = None):
+    # Not verified by the writer, so what's tested is what's read back here
+    mp.write_animation_fbx(path, "Asset", "Skeleton", _JOINTS, baked_animation, 30.0, frames, _USER_PROPERTIES,
+                           verify=False)
+
+
+def test_animation_fbx_round_trips(tmp_path: Path):
+    baked_animation = _create_baked_animation(list(mp.FBX_ANIMATION_CHANNELS))
+    fbx_path = tmp_path / "Hero@Walk.fbx"
+    _write(fbx_path, baked_animation)
+
+    frames, read_animation = mp.read_animation_fbx(fbx_path)
+    assert np.allclose(frames, np.arange(5, 17), rtol=0.0, atol=1e-6)
+    assert read_animation.start_frame == 5
+    assert read_animation.joint_names == baked_animation.joint_names
+    assert read_animation.channel_names == baked_animation.channel_names
+    assert np.array_equal(read_animation.values, baked_animation.values)
+
+    inspection = mp.inspect_fbx(fbx_path)
+    assert inspection.root_models == ["Asset"]
+    assert mp.verify_fbx(inspection, _USER_PROPERTIES, has_animation=True) == []
+    assert inspection.object_counts["Model/LimbNode"] == len(_JOINTS)
+    assert inspection.curve_count == len(_JOINTS) * len(mp.FBX_ANIMATION_CHANNELS)
+    assert inspection.key_count == inspection.curve_count * baked_animation.frame_count
+
+
+def test_resampled_animation_fbx_round_trips(tmp_path: Path):
+    baked_animation = _create_baked_animation(["rotateX", "rotateY", "rotateZ"], frame_count=5)
+    frames = np.array([5.0, 7.5, 10.0, 12.5, 15.0])
+    fbx_path = tmp_path / "Hero@Walk.fbx"
+    _write(fbx_path, baked_animation, frames)
+
+    read_frames, read_animation = mp.read_animation_fbx(fbx_path)
+    assert np.allclose(read_frames, frames, rtol=0.0, atol=1e-6)
+    rotate_indices = [list(mp.FBX_ANIMATION_CHANNELS).index(channel) for channel in baked_animation.channel_names]
+    assert np.array_equal(read_animation.values[:, :, rotate_indices], baked_animation.values)
+    # Channels without curves read back as the joints' rest values
+    assert np.all(read_animation.values[:, 1, 1] == 10.0)
+    assert np.all(read_animation.values[:, :, 6:] == 1.0)
+    assert mp.inspect_fbx(fbx_path).key_count == 3 * len(_JOINTS) * len(frames)
+
+
+def test_same_animation_writes_the_same_bytes(tmp_path: Path):
+    baked_animation = _create_baked_animation(list(mp.FBX_ANIMATION_CHANNELS))
+    _write(tmp_path / "a.fbx", baked_animation)
+    _write(tmp_path / "b.fbx", baked_animation)
+    assert (tmp_path / "a.fbx").read_bytes() == (tmp_path / "b.fbx").read_bytes()
+
+
+def test_joint_whose_parent_isnt_written_is_rejected():
+    baked_animation = _create_baked_animation(list(mp.FBX_ANIMATION_CHANNELS))
+    joints = [_JOINTS[0], _JOINTS[2]]
+    baked_animation = baked_animation.get_joints([joint.name for joint in joints])
+    with pytest.raises(ValueError):
+        mp.create_animation_fbx("Asset", "Skeleton", joints, baked_animation, 30.0)
@@ -0,0 +1,71 @@
+# Python
+import numpy as np
+
+# Internal
+import maya_pipeline as mp
+
+
+def _create_patch_grid(patches: int, size: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    :return: Positions and shuffled triangles of patches x patches quad grids of size x size quads each, side by side
+             on the XY plane and not sharing the vertices along their edges, like combined meshes
+    """
+    positions, triangles = [], []
+    for patch_y in range(patches):
+        for patch_x in range(patches):
+            x, y = np.meshgrid(np.arange(size + 1) + patch_x * size, np.arange(size + 1) + patch_y * size)
+            first = sum(len(patch_positions) for patch_positions in positions)
+            positions.append(np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1).astype(np.float64))
+            for row in range(size):
+                for column in range(size):
+                    corner = first + row * (size + 1) + column
+                    triangles.append([corner, corner + 1, corner + size + 2])
+                    triangles.append([corner, corner + size + 2, corner + size + 1])
+    triangles = np.array(triangles)
+    return np.concatenate(positions), triangles[np.random.default_rng(seed).permutation(len(triangles))]
+
+
+def _optimize(positions: np.ndarray, triangles: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    What optimize_mesh does to the geometry
+    """
+    positions, remap = mp.weld_vertices(positions)
+    triangles = remap[triangles]
+    triangles = triangles[~mp.get_degenerate_triangles(triangles)]
+    triangles = triangles[mp.get_cache_friendly_triangle_order(positions, triangles)]
+    vertex_order, vertex_remap = mp.get_first_use_vertex_order(triangles, len(positions))
+    return positions[vertex_order], vertex_remap[triangles]
+
+
+def _get_triangle_corners(positions: np.ndarray, triangles: np.ndarray) -> set[tuple]:
+    """
+    :return: The corner positions of each triangle, starting from its smallest one so the winding is kept
+    """
+    corners = set()
+    for triangle in positions[triangles].tolist():
+        triangle = [tuple(corner) for corner in triangle]
+        start = triangle.index(min(triangle))
+        corners.add(tuple(triangle[start:] + triangle[:start]))
+    return corners
+
+
+def test_optimizing_welds_and_reorders():
+    positions, triangles = _create_patch_grid(2, 8)
+    optimized_positions, optimized_triangles = _optimize(positions, triangles)
+    before, after = mp.get_mesh_stats(triangles), mp.get_mesh_stats(optimized_triangles)
+
+    assert (before.vertex_count, after.vertex_count) == (4 * 9 * 9, 17 * 17)
+    assert after.index_count == before.index_count
+    assert after.acmr < before.acmr
+    # The vertex buffer is read front to back
+    first_uses = np.unique(optimized_triangles.reshape(-1), return_index=True)[1]
+    assert np.all(np.diff(first_uses) > 0)
+    # The same triangles, with the same winding
+    assert _get_triangle_corners(optimized_positions, optimized_triangles) == _get_triangle_corners(positions,
+                                                                                                    triangles)
+
+
+def test_total_mesh_stats():
+    total = mp.get_total_mesh_stats([mp.MeshStats(4, 6, 2.0), mp.MeshStats(10, 18, 1.0)])
+    assert (total.vertex_count, total.index_count, total.acmr) == (14, 24, 1.25)
+    assert mp.get_total_mesh_stats([]).acmr == 0.0
@@ -0,0 +1,40 @@
+# Python
+from pathlib import Path
+
+import pytest
+
+# Internal
+import maya_pipeline as mp
+
+
+def test_publish_batch_publishes_staged_files_and_deletions_together(tmp_path: Path):
+    old_path = tmp_path / "Kit_Chunk_1.fbx"
+    old_path.write_bytes(b"old")
+    old_path.with_name("Kit_Chunk_1.fbx.meta").write_text("meta", encoding="utf-8")
+
+    with mp.PublishBatch(tmp_path) as publish_batch:
+        mp.publish_bytes(b"new", tmp_path / "Kit_Chunk_0.fbx")
+        publish_batch.delete(old_path)
+        assert not (tmp_path / "Kit_Chunk_0.fbx").exists()
+        assert old_path.exists()
+
+    assert (tmp_path / "Kit_Chunk_0.fbx").read_bytes() == b"new"
+    assert not old_path.exists() and not old_path.with_name("Kit_Chunk_1.fbx.meta").exists()
+    assert not (tmp_path / mp.PUBLISH_STAGING_DIR_NAME).exists()
+
+
+@pytest.mark.parametrize("discard_on_error", [False, True])
+def test_publish_batch_that_fails(tmp_path: Path, discard_on_error: bool):
+    old_path = tmp_path / "Kit_Chunk_1.fbx"
+    old_path.write_bytes(b"old")
+
+    with pytest.raises(RuntimeError):
+        with mp.PublishBatch(tmp_path, discard_on_error=discard_on_error) as publish_batch:
+            mp.publish_bytes(b"new", tmp_path / "Kit_Chunk_0.fbx")
+            publish_batch.delete(old_path)
+            raise RuntimeError("The next chunk failed to export.")
+
+    # Deletions are never done after a failure, the staged files are only published if they're not discarded
+    assert old_path.read_bytes() == b"old"
+    assert (tmp_path / "Kit_Chunk_0.fbx").exists() is not discard_on_error
+    assert not (tmp_path / mp.PUBLISH_STAGING_DIR_NAME).exists()
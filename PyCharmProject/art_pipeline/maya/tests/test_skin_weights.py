@@ -0,0 +1,66 @@
+# Python
+import numpy as np
+import pytest
+
+# Internal
+import maya_pipeline as mp
+
+
+def _create_weights(vertex_count: int, influence_count: int, seed: int = 0) -> np.ndarray:
+    """
+    :return: Random weights that add up to 1 per vertex
+    """
+    weights = np.random.default_rng(seed).random((vertex_count, influence_count))
+    return weights / weights.sum(axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("max_influences", [1, 2, 4, 8])
+def test_max_influences(max_influences: int):
+    weights = _create_weights(100, 8)
+    pruned = mp.prune_skin_weights(weights, max_influences=max_influences, threshold=0.0)
+
+    assert pruned.shape == weights.shape
+    assert np.count_nonzero(pruned, axis=1).max() == max_influences
+    assert np.allclose(pruned.sum(axis=1), 1.0)
+    # The kept weights are the largest ones, in the same proportions
+    for row, pruned_row in zip(weights, pruned):
+        kept = np.flatnonzero(pruned_row)
+        assert set(kept) == set(np.argsort(-row)[:max_influences])
+        assert np.allclose(pruned_row[kept], row[kept] / row[kept].sum())
+
+
+def test_weight_threshold():
+    weights = np.array([[0.7, 0.2995, 0.0005, 0.0],
+                        [0.25, 0.25, 0.25, 0.25],
+                        [0.0004, 0.0003, 0.0002, 0.0001],
+                        [0.0, 0.0, 0.0, 0.0]])
+    pruned = mp.prune_skin_weights(weights, max_influences=4, threshold=0.001)
+
+    assert np.allclose(pruned[0], [0.7 / 0.9995, 0.2995 / 0.9995, 0.0, 0.0])
+    assert np.allclose(pruned[1], weights[1])
+    # A vertex whose weights are all below the threshold keeps its largest one
+    assert np.allclose(pruned[2], [1.0, 0.0, 0.0, 0.0])
+    assert np.allclose(pruned[3], [1.0, 0.0, 0.0, 0.0])
+    assert np.allclose(pruned.sum(axis=1), 1.0)
+
+
+def test_default_limits():
+    weights = _create_weights(50, 12, seed=1)
+    weights[:, 0] += 10.0
+    weights /= weights.sum(axis=1, keepdims=True)
+    pruned = mp.prune_skin_weights(weights)
+
+    stats = mp.get_influence_stats(pruned)
+    assert stats.vertex_count == 50
+    assert stats.max_influences <= mp.DEFAULT_MAX_INFLUENCES
+    assert np.all(pruned[pruned > 0] >= mp.DEFAULT_WEIGHT_THRESHOLD)
+    assert np.allclose(pruned.sum(axis=1), 1.0)
+
+
+def test_influence_stats():
+    weights = np.array([[1.0, 0.0, 0.0],
+                        [0.5, 0.5, 0.0],
+                        [0.2, 0.3, 0.5]])
+    stats = mp.get_influence_stats(weights)
+    assert (stats.max_influences, stats.mean_influences, stats.vertex_count) == (3, 2.0, 3)
+    assert mp.get_influence_stats(np.zeros((0, 4))).vertex_count == 0
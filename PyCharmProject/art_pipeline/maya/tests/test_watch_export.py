@@ -0,0 +1,106 @@
+# Python
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import threading
+import time
+
+import pytest
+
+# Internal
+import maya_pipeline as mp
+
+_DEBOUNCE_SECONDS = 0.1
+_TIMEOUT_SECONDS = 10.0
+_RIG_PATH = "scenes/Characters/Hero/Hero_RIG.ma"
+
+
+class _StubExporter:
+    """
+    Records the content of every scene it's asked to export instead of exporting it. Exports of the scenes in
+    blocked wait until they're released.
+    """
+    def __init__(self):
+        self.exports: list[tuple[str, str]] = []
+        self.blocked: set[str] = set()
+        self.released = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, path_str: str, scenes_path_str: str, export_root_path_str: str) -> dict:
+        path = Path(path_str)
+        with self._lock:
+            self.exports.append((path.name, path.read_text(encoding="utf-8")))
+        if path.name in self.blocked:
+            self.released.wait(_TIMEOUT_SECONDS)
+        asset_path = path.relative_to(scenes_path_str).as_posix()
+        return mp.ExportRecord(asset_path, mp.get_watched_asset_type(path).value, time.time(), 0.01,
+                               path.stat().st_size).to_dict()
+
+    def get_exports(self, name: str) -> list[str]:
+        with self._lock:
+            return [content for export_name, content in self.exports if export_name == name]
+
+
+def _save(path: Path, content: str, modified: str = "Mon, Jan 02, 2023 10:00:00 AM", references: str = ""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"//Maya ASCII 2023 scene\n//Last modified: {modified}\n{references}"
+                    f"createNode transform -n \"Asset\";\n{content}\n", encoding="utf-8")
+
+
+def _wait_for(condition) -> bool:
+    end_time = time.monotonic() + _TIMEOUT_SECONDS
+    while not condition():
+        if time.monotonic() > end_time:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watch_exporter(tmp_path: Path, use_inotify: bool):
+    scenes_path = tmp_path / "scenes"
+    rig_path = tmp_path / _RIG_PATH
+    walk_path = scenes_path / "Characters" / "Hero" / "Animations" / "Hero@Walk.ma"
+    crate_path = scenes_path / "Props" / "Crate" / "Crate_MSH.ma"
+    _save(rig_path, "// rig 1")
+    _save(walk_path, "// walk 1", references=f'file -r -ns "Hero" -rfn "Hero_RIGRN" "{_RIG_PATH}";\n')
+    _save(crate_path, "// crate 1")
+
+    stub_exporter = _StubExporter()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        watch_exporter = mp.WatchExporter(scenes_path, tmp_path / "Assets", debounce_seconds=_DEBOUNCE_SECONDS,
+                                          poll_interval=0.05, use_inotify=use_inotify,
+                                          history_path=tmp_path / "history.db", export_job=stub_exporter,
+                                          executor=executor)
+        watch_exporter.start()
+        try:
+            assert watch_exporter.wait_until_watching(_TIMEOUT_SECONDS)
+
+            # Saving a rig exports the animations that reference it, the rig itself isn't exported
+            _save(rig_path, 'createNode joint -n "Hips";')
+            assert _wait_for(lambda: len(stub_exporter.exports) == 1)
+            assert [name for name, _ in stub_exporter.exports] == ["Hero@Walk.ma"]
+
+            # A save that only changes comments isn't exported again, the crate saved with it is
+            walk_content = walk_path.read_text(encoding="utf-8")
+            walk_path.write_text(walk_content.replace("Mon, Jan 02", "Tue, Jan 03"), encoding="utf-8")
+            _save(crate_path, 'createNode mesh -n "CrateShape";')
+            assert _wait_for(lambda: len(stub_exporter.get_exports("Crate_MSH.ma")) == 1)
+            assert watch_exporter.wait_until_idle(_TIMEOUT_SECONDS)
+            assert len(stub_exporter.get_exports("Hero@Walk.ma")) == 1
+
+            # Saving while the asset is exporting exports it once more after that, with the latest save
+            stub_exporter.blocked.add("Crate_MSH.ma")
+            _save(crate_path, 'createNode mesh -n "CrateShape2";')
+            assert _wait_for(lambda: len(stub_exporter.get_exports("Crate_MSH.ma")) == 2)
+            _save(crate_path, 'createNode mesh -n "CrateShape3";')
+            time.sleep(_DEBOUNCE_SECONDS * 5)  # Settles while the first export is still running
+            assert len(stub_exporter.get_exports("Crate_MSH.ma")) == 2
+            stub_exporter.released.set()
+            assert _wait_for(lambda: len(stub_exporter.get_exports("Crate_MSH.ma")) == 3)
+            assert "CrateShape3" in stub_exporter.get_exports("Crate_MSH.ma")[-1]
+            assert watch_exporter.wait_until_idle(_TIMEOUT_SECONDS)
+        finally:
+            watch_exporter.stop(_TIMEOUT_SECONDS)
+
+    assert len(stub_exporter.get_exports("Crate_MSH.ma")) == 3
+    assert [record.outcome for record in watch_exporter.records] == [mp.ExportOutcome.SUCCEEDED] * 4
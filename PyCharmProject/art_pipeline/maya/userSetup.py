@@ -5,6 +5,7 @@ import maya.cmds as cmds
 
 def init():
     mp.create_log()
+    mp.install_reference_load_policy()
     cmds.scriptJob(event=("quitApplication", on_quit_application))
 
 
@@ -0,0 +1,8 @@
+# Validates every asset in a Maya project without opening Maya, e.g.:
+# python validate_assets.py C:/Projects/MyGame/scenes --report C:/Temp/validation_report.json
+import sys
+
+import maya_pipeline as mp
+
+if __name__ == "__main__":
+    sys.exit(mp.validation.validation_engine.main())
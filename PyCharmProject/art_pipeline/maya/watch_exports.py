@@ -0,0 +1,8 @@
+# Exports Maya Pipeline assets in mayapy workers whenever they're saved, until stopped with Ctrl+C, e.g.:
+# mayapy watch_exports.py C:/Projects/MyGame/scenes C:/Projects/MyGameUnity/Assets --workers 2
+import sys
+
+import maya_pipeline as mp
+
+if __name__ == "__main__":
+    sys.exit(mp.exporter.watch_export.main())
@@ -76,7 +76,12 @@ namespace UnitEditorPipeline
         void OnPreprocessModel()
         {
             ModelImporter modelImporter = assetImporter as ModelImporter;
-            modelImporter.materialImportMode = ModelImporterMaterialImportMode.None;
+
+            //The Maya Pipeline writes it to the .meta file, so it's usually already set
+            if (modelImporter.materialImportMode != ModelImporterMaterialImportMode.None)
+            {
+                modelImporter.materialImportMode = ModelImporterMaterialImportMode.None;
+            }
         }
 
         void OnPostprocessGameObjectWithUserProperties(GameObject go, string[] propNames, object[] values)
@@ -108,6 +113,14 @@ namespace UnitEditorPipeline
             {
                 ModelImporter modelImporter = assetImporter as ModelImporter;
                 Debug.Log($"PreProcessingAnimation for {modelImporter.assetPath}");
+
+                //The Maya Pipeline writes the clips to the .meta file, so they only need fixing (and re-importing)
+                //for FBXs exported without one
+                if (ClipsAreSetUp(modelImporter.clipAnimations, ModelData.AnimationProperties.Loop))
+                {
+                    return;
+                }
+
                 ModelImporterClipAnimation[] clipAnimations = modelImporter.defaultClipAnimations;
 
                 for (int i = 0; i < clipAnimations.Length; i++)
@@ -125,5 +138,23 @@ namespace UnitEditorPipeline
                 modelImporter.SaveAndReimport();
             }
         }
+
+        private static bool ClipsAreSetUp(ModelImporterClipAnimation[] clipAnimations, bool loop)
+        {
+            if (clipAnimations.Length == 0)
+            {
+                return false;
+            }
+
+            foreach (ModelImporterClipAnimation clipAnimation in clipAnimations)
+            {
+                if (clipAnimation.loopTime != loop)
+                {
+                    return false;
+                }
+            }
+
+            return true;
+        }
     }
 }
\ No newline at end of file